@@ -15,14 +15,16 @@ import pandas as pd
 from plotly import tools, subplots
 import plotly.graph_objs as go
 from plotly.colors import DEFAULT_PLOTLY_COLORS
+from scipy.special import erfc
 
 # Project imports
 from groundhog.general.plotting import plot_with_log, GROUNDHOG_PLOTTING_CONFIG
 from groundhog.general.parameter_mapping import map_depth_properties, merge_two_dicts, reverse_dict
 from groundhog.siteinvestigation.insitutests.pcpt_correlations import *
-from groundhog.general.soilprofile import SoilProfile, plot_fence_diagram
+from groundhog.general.soilprofile import SoilProfile, plot_fence_diagram, profile_from_dataframe
 from groundhog.general.parameter_mapping import offsets, latlon_distance
 from groundhog.general.agsconversion import AGSConverter
+from groundhog.general.validation import validation_mask
 
 
 PORE_PRESSURE_FOURIER = {
@@ -244,6 +246,78 @@ def consolidation_degree(time, cv, drainage_length, distribution='uniform'):
     }
 
 
+def consolidation_degree_terzaghi(time, cv, drainage_length, no_terms=6, **kwargs):
+    """
+    Returns the average degree of consolidation for a uniform initial excess pore pressure distribution
+    from the exact solution of the one-dimensional consolidation equation. The inputs can be scalars or arrays
+    (e.g. for many layers and times) which are broadcast to a common shape.
+
+    Unlike ``consolidation_degree``, the solution is not interpolated from published curves
+    and tends to 100% for large time factors. For small time factors (:math:`T_v < 0.2`), the Fourier series
+    converges slowly and the equivalent series of complementary error functions is used.
+    Negative times (e.g. before the application of a load) return a degree of consolidation of zero.
+    Entries with a coefficient of consolidation or drainage length outside the validation ranges
+    of ``consolidation_degree`` return NaN.
+
+    :param time: Time at which the degree of consolidation is computed (:math:`t`) [:math:`s`]
+    :param cv: Coefficient of consolidation (:math:`c_v`) [:math:`m^2/yr`]
+    :param drainage_length: Drainage length (:math:`H_{dr}`) [:math:`m`]
+    :param no_terms: Number of terms for the Fourier series (default=6, sufficient for :math:`T_v \\geq 0.2`)
+
+    .. math::
+        U = 1 - \\sum_{m=0}^{\\infty} \\frac{2}{M^2} \\exp \\left( -M^2 T_v \\right); \\ T_v \\geq 0.2
+
+        U = 2 \\sqrt{T_v} \\left[ \\frac{1}{\\sqrt{\\pi}} + 2 \\sum_{n=1}^{\\infty} (-1)^n \\text{ierfc} \\left( \\frac{n}{\\sqrt{T_v}} \\right) \\right]; \\ T_v < 0.2
+
+        M = \\frac{\\pi}{2} \\left( 2m + 1 \\right)
+
+        \\text{ierfc}(x) = \\frac{\\exp(-x^2)}{\\sqrt{\\pi}} - x \\ \\text{erfc}(x)
+
+        T_v = \\frac{c_v t}{H_{dr}^2}
+
+    :returns: Dictionary with the following keys:
+
+        - 'U [pct]': Degree of consolidation (:math:`U`)  [%]
+        - 'Tv [-]': Time factor (:math:`T_v`)  [:math:`-`]
+
+    Reference - Carslaw and Jaeger (1959). Conduction of heat in solids. Oxford University Press.
+    """
+    _valid = validation_mask(CONSOLIDATION_DEGREE, cv=cv, drainage_length=drainage_length, **kwargs)
+    time, cv, drainage_length = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (time, cv, drainage_length)])
+    _valid = np.broadcast_to(_valid, time.shape)
+
+    _cv_m2_s = cv / (365 * 24 * 3600)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        _Tv = _cv_m2_s * time / (drainage_length ** 2)
+
+    # Each solution is only evaluated for the time factors where it applies
+    _U = np.zeros(time.shape)
+    _short = (_Tv > 0) & (_Tv < 0.2)
+    _long = _Tv >= 0.2
+
+    # Series of complementary error functions for short times
+    _sqrt_Tv = np.sqrt(_Tv[_short])
+    _U_short = np.full(_sqrt_Tv.shape, 1 / np.sqrt(np.pi))
+    for n in range(1, 4):
+        _x = n / _sqrt_Tv
+        _U_short += 2 * ((-1) ** n) * (np.exp(-_x ** 2) / np.sqrt(np.pi) - _x * erfc(_x))
+    _U[_short] = 2 * _sqrt_Tv * _U_short
+
+    # Fourier series for longer times
+    _Tv_long = _Tv[_long]
+    _U_long = np.ones(_Tv_long.shape)
+    for m in range(no_terms):
+        _M = 0.5 * np.pi * (2 * m + 1)
+        _U_long -= (2 / (_M ** 2)) * np.exp(-(_M ** 2) * _Tv_long)
+    _U[_long] = _U_long
+
+    return {
+        'U [pct]': np.where(_valid & ~np.isnan(_Tv), 100 * _U, np.nan),
+        'Tv [-]': np.where(_valid, _Tv, np.nan)
+    }
+
+
 class ConsolidationCalculation(object):
     """
     The consolidation equation can be discretised as follows:
@@ -401,4 +475,138 @@ class ConsolidationCalculation(object):
             title=plot_title,
             hovermode='closest')
         if showfig:
-            self.fig.show()
\ No newline at end of file
+            self.fig.show()
+
+
+class TimeSettlementCalculation(object):
+    """
+    Calculates the consolidation settlement versus time for a layered soil profile under a staged loading schedule.
+
+    The final consolidation settlement of each layer for each load stage is calculated from the compressibility
+    (:math:`\\Delta z = m_v \\cdot \\Delta \\sigma_v \\cdot H_0`, see ``consolidationsettlement_mv``). The stress
+    increase in each layer is the applied load increment multiplied with an influence factor
+    (1 for one-dimensional loading, e.g. a wide embankment).
+
+    Each layer consolidates with its own coefficient of consolidation and drainage length, using the average
+    degree of consolidation from ``consolidation_degree_terzaghi``. The stage responses are superposed
+    in time:
+
+    .. math::
+        s(t) = \\sum_{layers} \\sum_{stages} \\Delta z_{layer, stage} \\cdot U_{layer} \\left( t - t_{stage} \\right)
+
+    The calculation is vectorised over layers, load stages and time points. Layers without a coefficient
+    of consolidation are free-draining and settle immediately when a load is applied, layers without
+    a compressibility do not settle. The validation range of ``consolidation_degree`` is not applied to the
+    coefficient of consolidation, so layers with a high coefficient of consolidation (e.g. sand) consolidate
+    rapidly rather than returning NaN. Gradual loading (e.g. during construction) can be represented by
+    a sequence of smaller load stages.
+    """
+
+    def __init__(self, soilprofile, cv_key='cv [m2/yr]', compressibility_key='mv [1/kPa]', drainage='double'):
+        """
+        Initialises the calculation with a ``SoilProfile`` object containing the coefficient of consolidation and
+        the compressibility for each layer. Parameters varying linearly in a layer are evaluated at
+        the center of the layer.
+
+        The drainage length of each layer is calculated from the layer thickness and the drainage condition,
+        unless a column ``'Drainage length [m]'`` is defined in the soil profile.
+
+        :param soilprofile: ``SoilProfile`` object with the coefficient of consolidation and the compressibility
+        :param cv_key: Column key for the coefficient of consolidation in m2/yr (default=``'cv [m2/yr]'``)
+        :param compressibility_key: Column key for the compressibility in 1/kPa (default=``'mv [1/kPa]'``)
+        :param drainage: Drainage condition of the layers: ``'double'`` (default, drainage at top and bottom) or ``'single'``
+        """
+        self.soilprofile = profile_from_dataframe(deepcopy(soilprofile))
+        self.thickness = (
+            self.soilprofile[self.soilprofile.depth_to_col] -
+            self.soilprofile[self.soilprofile.depth_from_col]).values.astype(float)
+        self.cv = self._layer_values(cv_key)
+        self.compressibility = self._layer_values(compressibility_key)
+        if 'Drainage length [m]' in self.soilprofile.columns:
+            self.drainage_length = self.soilprofile['Drainage length [m]'].values.astype(float)
+        elif drainage == 'double':
+            self.drainage_length = 0.5 * self.thickness
+        elif drainage == 'single':
+            self.drainage_length = self.thickness
+        else:
+            raise ValueError("drainage must be 'double' or 'single'")
+        _invalid = (~np.isnan(self.cv)) & (~(self.cv > 0) | ~(self.drainage_length > 0))
+        if _invalid.any():
+            raise ValueError(
+                "The coefficient of consolidation and the drainage length need to be positive "
+                "for consolidating layers (layers %s)" % list(np.where(_invalid)[0]))
+
+    def _layer_values(self, key):
+        """
+        Returns the values of a parameter at the center of each layer
+        """
+        if key in self.soilprofile.columns:
+            return self.soilprofile[key].values.astype(float)
+        elif key.replace(' [', ' from [') in self.soilprofile.columns:
+            return 0.5 * (
+                self.soilprofile[key.replace(' [', ' from [')].values.astype(float) +
+                self.soilprofile[key.replace(' [', ' to [')].values.astype(float))
+        else:
+            raise KeyError("'%s' needs to be defined in the soil profile" % key)
+
+    def set_loading(self, load_increments, start_times, influence_factors=1.0):
+        """
+        Sets the staged loading schedule. Each load stage applies a load increment at a given start time.
+
+        :param load_increments: Load increments for the successive load stages [kPa]
+        :param start_times: Times at which the load increments are applied [s]
+        :param influence_factors: Ratio of the stress increase in each layer to the applied load increment [-]. A scalar, an array with a value per layer or an array with a value per layer and load stage can be specified (default=1.0 for one-dimensional loading)
+        """
+        self.load_increments = np.atleast_1d(np.asarray(load_increments, dtype=float))
+        self.start_times = np.atleast_1d(np.asarray(start_times, dtype=float))
+        if self.load_increments.__len__() != self.start_times.__len__():
+            raise ValueError("Load increments and start times need to be of equal length")
+        _influence = np.asarray(influence_factors, dtype=float)
+        if _influence.ndim == 1:
+            _influence = _influence[:, np.newaxis]
+        self.influence_factors = np.broadcast_to(
+            _influence, (self.thickness.__len__(), self.load_increments.__len__()))
+        # Final settlement for each layer (rows) and load stage (columns)
+        self.final_settlements = np.nan_to_num(self.compressibility[:, np.newaxis]) * \
+            self.thickness[:, np.newaxis] * self.influence_factors * self.load_increments[np.newaxis, :]
+
+    def calculate(self, times, max_chunk_size=1000000):
+        """
+        Calculates the settlement at the specified times by superposing the responses to all load stages
+        for all layers. Time points are processed in chunks to limit the number of layer-stage-time combinations
+        evaluated at once to ``max_chunk_size``.
+
+        The settlement of each layer is stored in the attribute ``layer_settlement`` (layers x times)
+        and the total settlement in ``settlement``. The dataframe ``results`` contains the columns
+        ``'Time [s]'``, ``'Settlement [m]'`` and ``'U [pct]'`` (settlement relative to the final settlement under
+        all load stages).
+
+        :param times: Times at which the settlement is calculated [s]
+        :param max_chunk_size: Maximum number of layer-stage-time combinations evaluated at once (default=1000000)
+        """
+        self.times = np.atleast_1d(np.asarray(times, dtype=float))
+        _free_draining = np.isnan(self.cv)
+        _cv = np.where(_free_draining, 1.0, self.cv)[:, np.newaxis, np.newaxis]
+        _drainage_length = self.drainage_length[:, np.newaxis, np.newaxis]
+        _free_draining = _free_draining[:, np.newaxis, np.newaxis]
+
+        self.layer_settlement = np.zeros((self.thickness.__len__(), self.times.__len__()))
+        _chunk = max(int(max_chunk_size // max(self.final_settlements.size, 1)), 1)
+        for _start in range(0, self.times.__len__(), _chunk):
+            _slice = slice(_start, _start + _chunk)
+            # Dimensions: layers, stages, times
+            _elapsed = self.times[np.newaxis, np.newaxis, _slice] - self.start_times[np.newaxis, :, np.newaxis]
+            # The validation range of cv is not applied, high values (e.g. for sand) lead to rapid consolidation
+            _U = 0.01 * consolidation_degree_terzaghi(
+                time=_elapsed, cv=_cv, drainage_length=_drainage_length, cv__min=0.0, cv__max=None)['U [pct]']
+            _U = np.where(_free_draining, (_elapsed >= 0).astype(float), _U)
+            self.layer_settlement[:, _slice] = np.einsum('ls,lst->lt', self.final_settlements, _U)
+
+        self.settlement = self.layer_settlement.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            _U_total = 100 * self.settlement / self.final_settlements.sum()
+        self.results = pd.DataFrame({
+            'Time [s]': self.times,
+            'Settlement [m]': self.settlement,
+            'U [pct]': _U_total
+        })
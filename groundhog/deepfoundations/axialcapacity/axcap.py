@@ -6,6 +6,8 @@ __author__ = 'Bruno Stuyts'
 # Native Python packages
 from logging import warning
 import warnings
+import re
+from concurrent.futures import ProcessPoolExecutor
 
 # 3rd party packages
 import numpy as np
@@ -13,12 +15,56 @@ import pandas as pd
 
 # Project imports
 from groundhog.general.parameter_mapping import SOIL_PARAMETER_MAPPING, reverse_dict
-from groundhog.deepfoundations.axialcapacity.skinfriction import SKINFRICTION_METHODS, SKINFRICTION_PARAMETERS
-from groundhog.deepfoundations.axialcapacity.endbearing import ENDBEARING_METHODS, ENDBEARING_PARAMETERS
-from groundhog.general.soilprofile import CalculationGrid
+from groundhog.deepfoundations.axialcapacity.skinfriction import SKINFRICTION_METHODS, SKINFRICTION_PARAMETERS, \
+    SKINFRICTION_METHODS_ARRAY
+from groundhog.deepfoundations.axialcapacity.endbearing import ENDBEARING_METHODS, ENDBEARING_PARAMETERS, \
+    ENDBEARING_METHODS_ARRAY
+from groundhog.general.soilprofile import CalculationGrid, profile_from_dataframe
 from groundhog.general.plotting import LogPlot
 
 
+SKINFRICTION_OUTPUT = {
+    'f_s_comp_out [kPa]': "Unit skin friction outside compression [kPa]",
+    'f_s_comp_in [kPa]': "Unit skin friction inside compression [kPa]",
+    'f_s_tens_out [kPa]': "Unit skin friction outside tension [kPa]",
+    'f_s_tens_in [kPa]': "Unit skin friction inside tension [kPa]",
+}
+
+ENDBEARING_OUTPUT = {
+    'q_b_plugged [kPa]': "Unit end bearing plugged [kPa]",
+    'q_b_coring [kPa]': "Unit end bearing coring [kPa]",
+}
+
+
+def evaluate_method(method, methods, array_methods, parameters, keys):
+    """
+    Evaluates a unit skin friction or unit end bearing method for a group of elements sharing that method.
+    When an array version of the method is registered, it is called once for the entire group.
+    Otherwise, the scalar function is called for every entry.
+
+    :param method: Name of the method (e.g. ``'API RP2 GEO Sand'``)
+    :param methods: Dictionary with the scalar functions (e.g. ``SKINFRICTION_METHODS``)
+    :param array_methods: Dictionary with the array functions (e.g. ``SKINFRICTION_METHODS_ARRAY``)
+    :param parameters: Dictionary with the function arguments as scalars or arrays which can be broadcast to a common shape
+    :param keys: Keys of the function output which need to be returned
+    :return: Dictionary with float arrays for the requested keys, with the common shape of the parameters
+    """
+    _shape = np.broadcast_shapes(*[np.shape(_value) for _value in parameters.values()])
+    if method in array_methods:
+        _result = array_methods[method](**parameters)
+        return {
+            _key: np.broadcast_to(np.asarray(_result[_key], dtype=float), _shape) for _key in keys}
+    else:
+        _parameters = {
+            _key: np.broadcast_to(np.asarray(_value, dtype=object), _shape) for _key, _value in parameters.items()}
+        _output = {_key: np.full(_shape, np.nan) for _key in keys}
+        for _index in np.ndindex(_shape):
+            _result = methods[method](**{_key: _value[_index] for _key, _value in _parameters.items()})
+            for _key in keys:
+                _output[_key][_index] = _result[_key]
+        return _output
+
+
 class AxCapCalculation(object):
 
     def __init__(self, soilprofile):
@@ -135,12 +181,16 @@ class AxCapCalculation(object):
         self.fs_check = False
         self.output.rename(columns=SOIL_PARAMETER_MAPPING, inplace=True)
         try:
-            for i, _element in self.output.iterrows():
-                _fs_calc = SKINFRICTION_METHODS[_element['Unit skin friction']](**dict(_element))
-                self.output.loc[i, "Unit skin friction outside compression [kPa]"] = _fs_calc['f_s_comp_out [kPa]']
-                self.output.loc[i, "Unit skin friction inside compression [kPa]"] = _fs_calc['f_s_comp_in [kPa]']
-                self.output.loc[i, "Unit skin friction outside tension [kPa]"] = _fs_calc['f_s_tens_out [kPa]']
-                self.output.loc[i, "Unit skin friction inside tension [kPa]"] = _fs_calc['f_s_tens_in [kPa]']
+            _parameters = {_key: np.array(self.output[_key]) for _key in self.output.columns}
+            _methods = np.array(self.output['Unit skin friction'])
+            for _method in self.output['Unit skin friction'].unique():
+                _mask = _methods == _method
+                _fs_calc = evaluate_method(
+                    method=_method, methods=SKINFRICTION_METHODS, array_methods=SKINFRICTION_METHODS_ARRAY,
+                    parameters={_key: _value[_mask] for _key, _value in _parameters.items()},
+                    keys=SKINFRICTION_OUTPUT.keys())
+                for _key, _column in SKINFRICTION_OUTPUT.items():
+                    self.output.loc[_mask, _column] = _fs_calc[_key]
         except Exception as err:
             warnings.warn('Error during calculation of unit skin friction (%s). Check inputs.' % str(err))
         finally:
@@ -165,11 +215,16 @@ class AxCapCalculation(object):
         self.qb_check = False
         self.output.rename(columns=SOIL_PARAMETER_MAPPING, inplace=True)
         try:
-            for i, _element in self.output.iterrows():
-                _qb_calc = ENDBEARING_METHODS[_element['Unit end bearing']](**dict(_element))
-                self.output.loc[i, "Unit end bearing plugged [kPa]"] = _qb_calc['q_b_plugged [kPa]']
-                self.output.loc[i, "Unit end bearing coring [kPa]"] = _qb_calc['q_b_coring [kPa]']
-            self.output.rename(columns=reverse_dict(SOIL_PARAMETER_MAPPING), inplace=True)
+            _parameters = {_key: np.array(self.output[_key]) for _key in self.output.columns}
+            _methods = np.array(self.output['Unit end bearing'])
+            for _method in self.output['Unit end bearing'].unique():
+                _mask = _methods == _method
+                _qb_calc = evaluate_method(
+                    method=_method, methods=ENDBEARING_METHODS, array_methods=ENDBEARING_METHODS_ARRAY,
+                    parameters={_key: _value[_mask] for _key, _value in _parameters.items()},
+                    keys=ENDBEARING_OUTPUT.keys())
+                for _key, _column in ENDBEARING_OUTPUT.items():
+                    self.output.loc[_mask, _column] = _qb_calc[_key]
         except Exception as err:
             warnings.warn('Error during calculation of unit end bearing (%s). Check inputs.' % str(err))
         finally:
@@ -297,13 +352,111 @@ class AxCapCalculation(object):
             'Plugged tension': _plugged_tension
         }
 
+    def calculate_unitresistance_profile(self):
+        """
+        Calculates the unit resistances vs pile penetration, independent of the pile geometry.
+        The profile is calculated for every nodal position (except 0m).
+
+        The calculation is incremental. Unit skin friction for methods which do not depend on pile penetration
+        is calculated once for every element. For methods depending on pile penetration (e.g. friction fatigue
+        through the embedded length), the unit skin friction of the elements is calculated for all pile penetrations
+        at once. The unit skin friction integrated over the shaft for all penetrations then follows from cumulative sums
+        and the unit end bearing is taken from the element directly above each penetration.
+        Elements sharing a method are evaluated with a single call to the array version of the method
+        (see ``SKINFRICTION_METHODS_ARRAY`` and ``ENDBEARING_METHODS_ARRAY``) when it is available.
+
+        The result is stored in the ``unitresistance_profile`` attribute, a dataframe with the pile penetration,
+        the integrated unit skin friction (outside/inside, compression/tension) in kN per m of circumference
+        and the unit end bearing (plugged/coring). Multiplying these with the pile circumference and base areas gives
+        the pile capacity (see ``capacity_from_unitresistance``).
+        """
+        _elements = self.grid.elements.rename(columns=SOIL_PARAMETER_MAPPING)
+        _parameters = {_key: np.array(_elements[_key]) for _key in _elements.columns}
+        _penetrations = np.array(self.grid.elements["Depth to [m]"], dtype=float)
+        _dz = np.array(self.grid.elements["dz [m]"], dtype=float)
+        _no_elements = _penetrations.__len__()
+        _penetration_dependent = "Embedded length [m]" in self.grid.elements.keys()
+        if _penetration_dependent:
+            # Elements are evaluated with the pile tip at the bottom of the element
+            _parameters['embedded_length'] = _penetrations
+
+        # Unit skin friction of penetration-independent elements (rows correspond to SKINFRICTION_OUTPUT)
+        _fs_element = np.zeros((4, _no_elements))
+        # Integrated unit skin friction of penetration-dependent elements for all penetrations
+        _fs_integrated = np.zeros((4, _no_elements))
+        # Unit skin friction in the element directly above each penetration
+        _fs_tip = np.zeros((4, _no_elements))
+        # Unit end bearing for all penetrations (rows correspond to ENDBEARING_OUTPUT)
+        _qb = np.full((2, _no_elements), np.nan)
+
+        _fs_methods = np.array(_elements['Unit skin friction'])
+        for _method in _elements['Unit skin friction'].unique():
+            _indices = np.where(_fs_methods == _method)[0]
+            _group = {_key: _value[_indices] for _key, _value in _parameters.items()}
+            if _penetration_dependent and ('embedded_length' in SKINFRICTION_PARAMETERS[_method]):
+                # Elements along the first axis and pile penetrations along the second axis
+                _group = {_key: _value[:, np.newaxis] for _key, _value in _group.items()}
+                _group['embedded_length'] = _penetrations[np.newaxis, :]
+                _above_tip = _indices[:, np.newaxis] <= np.arange(_no_elements)[np.newaxis, :]
+                _fs_calc = evaluate_method(
+                    method=_method, methods=SKINFRICTION_METHODS, array_methods=SKINFRICTION_METHODS_ARRAY,
+                    parameters=_group, keys=SKINFRICTION_OUTPUT.keys())
+                for i, _key in enumerate(SKINFRICTION_OUTPUT.keys()):
+                    _fs_tip[i, _indices] = _fs_calc[_key][np.arange(_indices.__len__()), _indices]
+                    _fs_integrated[i] += np.where(
+                        _above_tip & ~np.isnan(_fs_calc[_key]),
+                        _fs_calc[_key] * _dz[_indices, np.newaxis], 0).sum(axis=0)
+            else:
+                _fs_calc = evaluate_method(
+                    method=_method, methods=SKINFRICTION_METHODS, array_methods=SKINFRICTION_METHODS_ARRAY,
+                    parameters=_group, keys=SKINFRICTION_OUTPUT.keys())
+                for i, _key in enumerate(SKINFRICTION_OUTPUT.keys()):
+                    _fs_tip[i, _indices] = _fs_calc[_key]
+                    _fs_element[i, _indices] = _fs_calc[_key]
+
+        _qb_methods = np.array(_elements['Unit end bearing'])
+        for _method in _elements['Unit end bearing'].unique():
+            _indices = np.where(_qb_methods == _method)[0]
+            _qb_calc = evaluate_method(
+                method=_method, methods=ENDBEARING_METHODS, array_methods=ENDBEARING_METHODS_ARRAY,
+                parameters={_key: _value[_indices] for _key, _value in _parameters.items()},
+                keys=ENDBEARING_OUTPUT.keys())
+            for i, _key in enumerate(ENDBEARING_OUTPUT.keys()):
+                _qb[i, _indices] = _qb_calc[_key]
+
+        _fs_integrated += np.cumsum(np.where(np.isnan(_fs_element), 0, _fs_element * _dz), axis=1)
+        _fs_tip_nan = np.isnan(_fs_tip)
+
+        if _fs_tip_nan[0].any():
+            warnings.warn("NaN found in unit skin friction in output. Check parameter combinations.")
+        if np.isnan(_qb[0]).any():
+            warnings.warn("NaN found in unit end bearing in output. Check parameter combinations.")
+
+        # NaN values in the unit skin friction of the element at the pile tip are retained
+        _fs_integrated[_fs_tip_nan] = np.nan
+
+        self.unitresistance_profile = pd.DataFrame({
+            'Pile penetration [m]': _penetrations,
+            'Integrated skin friction outside compression [kN/m]': _fs_integrated[0],
+            'Integrated skin friction inside compression [kN/m]': _fs_integrated[1],
+            'Integrated skin friction outside tension [kN/m]': _fs_integrated[2],
+            'Integrated skin friction inside tension [kN/m]': _fs_integrated[3],
+            'Unit end bearing plugged [kPa]': _qb[0],
+            'Unit end bearing coring [kPa]': _qb[1],
+        })
+
     def calculate_capacity_profile(self, circumference, base_area, internal_circumference=np.nan, annulus_area=np.nan,
         pile_weight_permeter=0, soilplug_weight_permeter=0):
         """
         Calculates compression and tension capacity vs pile penetration.
-        Due to the possible dependence of unit skin friction and unit end bearing on pile penetration (e.g. friction fatigue effects),
         The pile capacity profile is calculated for every nodal position (except 0m) and stored in a dataframe.
 
+        The unit resistances are calculated incrementally using ``calculate_unitresistance_profile``
+        and are then multiplied by the pile dimensions using ``capacity_from_unitresistance``.
+
+        After the calculation, the ``output`` and ``result`` attributes hold the detailed calculation for the deepest
+        penetration.
+
         :param circumference: Pile circumference [m]. 
         :param base_area: Pile base area [m2]. Full end area used for plugged conditions.
         :param internal_circumference: Internal pile circumference used when ``plugged=False``
@@ -311,23 +464,28 @@ class AxCapCalculation(object):
         :param pile_weight_permeter: Pile weight in [kN/m] used for plugged tension capacity (default = 0kN/m). This value is multiplied by the actual pile penetration to obtain the total pile weight at the considered penetration.
         :param soilplug_weight_permeter: Soil plug weight in [kN/m] used for the plugged tension capacity (default = 0kN/m). This value is multiplied by the actual pile penetration to obtain the total soil plug weight at the considered penetration.
         """
-        _capacity_profile = pd.DataFrame()
-        for i, _z in enumerate(np.array(self.grid.nodes["z [m]"])[1:]):
-            self.set_pilepenetration(pile_penetration=_z)
-            self.calculate_unitskinfriction()
-            self.calculate_unitendbearing()
-            self.calculate_pilecapacity(
-                circumference=circumference,
-                base_area=base_area,
-                internal_circumference=internal_circumference,
-                annulus_area=annulus_area,
-                pile_weight=pile_weight_permeter * _z,
-                soilplug_weight=soilplug_weight_permeter * _z)
-            _capacity_profile.loc[i, "Pile penetration [m]"] = _z
-            for _key in self.result.keys():
-                _capacity_profile.loc[i, _key] = self.result[_key]
-        
-        self.capacity_profile = _capacity_profile
+        self.calculate_unitresistance_profile()
+        self.capacity_profile = pd.DataFrame(capacity_from_unitresistance(
+            self.unitresistance_profile,
+            circumference=circumference,
+            base_area=base_area,
+            internal_circumference=internal_circumference,
+            annulus_area=annulus_area,
+            pile_weight_permeter=pile_weight_permeter,
+            soilplug_weight_permeter=soilplug_weight_permeter))
+
+        # Detailed output for the deepest penetration
+        _penetration = self.unitresistance_profile['Pile penetration [m]'].iloc[-1]
+        self.set_pilepenetration(pile_penetration=_penetration)
+        self.calculate_unitskinfriction()
+        self.calculate_unitendbearing()
+        self.calculate_pilecapacity(
+            circumference=circumference,
+            base_area=base_area,
+            internal_circumference=internal_circumference,
+            annulus_area=annulus_area,
+            pile_weight=pile_weight_permeter * _penetration,
+            soilplug_weight=soilplug_weight_permeter * _penetration)
 
     def plot_single_penetration(self, return_fig=False, plot_title=None, fillcolordict={'SAND': 'yellow', 'CLAY': 'brown'}, latex_titles=True):
         """
@@ -513,4 +671,198 @@ class AxCapCalculation(object):
         if return_fig:
             return all_penetrations_plot
         else:
-            all_penetrations_plot.show()
\ No newline at end of file
+            all_penetrations_plot.show()
+
+
+def capacity_from_unitresistance(unitresistance_profile, circumference, base_area, internal_circumference=np.nan,
+                                 annulus_area=np.nan, pile_weight_permeter=0, soilplug_weight_permeter=0):
+    """
+    Calculates compression and tension capacity vs pile penetration from a profile of unit resistances
+    (see ``AxCapCalculation.calculate_unitresistance_profile``). The unit resistances do not depend on the pile
+    geometry, the same profile can therefore be used for many pile geometries.
+
+    The pile dimensions can be scalars or arrays which can be broadcast to a common shape. The pile penetrations
+    are added as the last axis of the output arrays. The capacity components and the plugging criteria are the same as
+    for ``AxCapCalculation.calculate_pilecapacity``.
+
+    :param unitresistance_profile: Dataframe with the unit resistance profile
+    :param circumference: Pile circumference [m]
+    :param base_area: Pile base area [m2]. Full end area used for plugged conditions.
+    :param internal_circumference: Internal pile circumference [m]
+    :param annulus_area: Pile annular base area [m2]
+    :param pile_weight_permeter: Pile weight in [kN/m] (default = 0kN/m)
+    :param soilplug_weight_permeter: Soil plug weight in [kN/m] (default = 0kN/m)
+    :return: Dictionary with the keys of ``AxCapCalculation.capacity_profile``
+    """
+    def _geometry(value):
+        return np.asarray(value, dtype=float)[..., np.newaxis]
+
+    circumference = _geometry(circumference)
+    base_area = _geometry(base_area)
+    internal_circumference = _geometry(internal_circumference)
+    annulus_area = _geometry(annulus_area)
+    pile_weight_permeter = _geometry(pile_weight_permeter)
+    soilplug_weight_permeter = _geometry(soilplug_weight_permeter)
+
+    _penetrations = np.array(unitresistance_profile['Pile penetration [m]'], dtype=float)
+    _Fs_compression_outside = circumference * np.array(
+        unitresistance_profile['Integrated skin friction outside compression [kN/m]'])
+    _Fs_compression_inside = internal_circumference * np.array(
+        unitresistance_profile['Integrated skin friction inside compression [kN/m]'])
+    _Fs_tension_outside = circumference * np.array(
+        unitresistance_profile['Integrated skin friction outside tension [kN/m]'])
+    _Fs_tension_inside = internal_circumference * np.array(
+        unitresistance_profile['Integrated skin friction inside tension [kN/m]'])
+    _Rb_plugged = base_area * np.array(unitresistance_profile['Unit end bearing plugged [kPa]'])
+    _Rb_coring = annulus_area * np.array(unitresistance_profile['Unit end bearing coring [kPa]'])
+    _Rb_internal = (base_area - annulus_area) * np.array(unitresistance_profile['Unit end bearing plugged [kPa]'])
+    _pile_weight = pile_weight_permeter * _penetrations
+    _soilplug_weight = soilplug_weight_permeter * _penetrations
+
+    _Rt_compression_plugged = _Fs_compression_outside + _Rb_plugged
+    _Rt_compression_coring = _Fs_compression_outside + _Fs_compression_inside + _Rb_coring
+    _plugged_compression = _Rb_internal < _Fs_compression_inside
+    _Rt_tension_plugged = _Fs_tension_outside + _pile_weight + _soilplug_weight
+    _Rt_tension_coring = _Fs_tension_outside + _Fs_tension_inside + _pile_weight
+    _plugged_tension = _Fs_compression_inside > _soilplug_weight
+
+    _shape = np.broadcast_shapes(
+        _Rt_compression_plugged.shape, _Rt_compression_coring.shape,
+        _Rt_tension_plugged.shape, _Rt_tension_coring.shape)
+
+    _result = {
+        'Pile penetration [m]': _penetrations,
+        'Rs compression plugged [kN]': _Fs_compression_outside,
+        'Rb plugged [kN]': _Rb_plugged,
+        'Rs compression coring [kN]': _Fs_compression_outside + _Fs_compression_inside,
+        'Rb coring [kN]': _Rb_coring,
+        'Rb internal [kN]': _Rb_internal,
+        'Rt compression plugged [kN]': _Rt_compression_plugged,
+        'Rt compression coring [kN]': _Rt_compression_coring,
+        'Rt compression [kN]': np.where(
+            _plugged_compression, _Rt_compression_plugged, _Rt_compression_coring),
+        'Plugged compression': _plugged_compression,
+        'Rs tension plugged [kN]': _Fs_tension_outside,
+        'Rs tension coring [kN]': _Fs_tension_outside + _Fs_tension_inside,
+        'Pile weight [kN]': _pile_weight,
+        'Soil plug weight [kN]': _soilplug_weight,
+        'Rt tension plugged [kN]': _Rt_tension_plugged,
+        'Rt tension coring [kN]': _Rt_tension_coring,
+        'Rt tension [kN]': np.where(
+            _plugged_tension, _Rt_tension_plugged, _Rt_tension_coring),
+        'Plugged tension': _plugged_tension
+    }
+    return {_key: np.broadcast_to(_value, _shape) for _key, _value in _result.items()}
+
+
+def pile_design_sweep(soilprofile, diameters, wall_thicknesses, target_loads, pile_weight_permeter=None,
+                      steel_unitweight=78.5, soilplug_weight_permeter=0, capacity_key='Rt compression [kN]', dz=1):
+    """
+    Evaluates a matrix of open-ended tubular pile designs for a ``SoilProfile``. Every combination of diameter and
+    wall thickness is combined with every target load and the minimum pile penetration for which the capacity
+    reaches the target load is determined.
+
+    The unit resistances do not depend on the pile geometry. They are calculated once
+    (see ``AxCapCalculation.calculate_unitresistance_profile``) and are shared by all pile geometries.
+
+    The pile dimensions follow from the diameter :math:`D` and wall thickness :math:`t`:
+
+    .. math::
+        C_{out} = \\pi \\cdot D
+
+        C_{in} = \\pi \\cdot (D - 2 t)
+
+        A_{base} = \\frac{\\pi}{4} \\cdot D^2
+
+        A_{annulus} = \\frac{\\pi}{4} \\cdot \\left( D^2 - (D - 2 t)^2 \\right)
+
+    :param soilprofile: ``SoilProfile`` object with the columns ``Unit skin friction`` and ``Unit end bearing`` and the parameters required for the selected methods
+    :param diameters: Array with outer pile diameters [m]
+    :param wall_thicknesses: Array with pile wall thicknesses [m]
+    :param target_loads: Array with the loads to be resisted [kN]
+    :param pile_weight_permeter: Pile weights in [kN/m] for all combinations of diameter (rows) and wall thickness (columns) (default=None to calculate the weight from the steel unit weight and the annulus area)
+    :param steel_unitweight: Unit weight of the pile material [kN/m3] used when ``pile_weight_permeter`` is not specified (default=78.5kN/m3). Use the submerged unit weight for submerged piles.
+    :param soilplug_weight_permeter: Soil plug weight in [kN/m], scalar or array which can be broadcast against the matrix of diameters and wall thicknesses (default = 0kN/m)
+    :param capacity_key: Capacity from ``AxCapCalculation.capacity_profile`` compared to the target loads (default='Rt compression [kN]')
+    :param dz: Node spacing of the calculation grid [m] (default=1m)
+    :return: Dataframe with the columns ``Diameter [m]``, ``Wall thickness [m]``, ``Pile weight [kN/m]``, ``Target load [kN]`` and ``Minimum penetration [m]``. The minimum penetration is NaN when the target load cannot be reached within the soil profile.
+    """
+    diameters = np.atleast_1d(np.asarray(diameters, dtype=float))
+    wall_thicknesses = np.atleast_1d(np.asarray(wall_thicknesses, dtype=float))
+    target_loads = np.atleast_1d(np.asarray(target_loads, dtype=float))
+
+    _diameter, _thickness = np.meshgrid(diameters, wall_thicknesses, indexing='ij')
+    _internal_diameter = _diameter - 2 * _thickness
+    if (_internal_diameter <= 0).any():
+        raise ValueError("The wall thickness should be smaller than half of the pile diameter")
+    _annulus_area = 0.25 * np.pi * (_diameter ** 2 - _internal_diameter ** 2)
+    if pile_weight_permeter is None:
+        pile_weight_permeter = steel_unitweight * _annulus_area
+    else:
+        pile_weight_permeter = np.broadcast_to(np.asarray(pile_weight_permeter, dtype=float), _diameter.shape)
+
+    _calc = AxCapCalculation(soilprofile)
+    _calc.check_methods(raise_errors=True)
+    _calc.create_grid(dz=dz)
+    _calc.calculate_unitresistance_profile()
+    _capacity = capacity_from_unitresistance(
+        _calc.unitresistance_profile,
+        circumference=np.pi * _diameter,
+        base_area=0.25 * np.pi * _diameter ** 2,
+        internal_circumference=np.pi * _internal_diameter,
+        annulus_area=_annulus_area,
+        pile_weight_permeter=pile_weight_permeter,
+        soilplug_weight_permeter=soilplug_weight_permeter)[capacity_key]
+    _penetrations = np.array(_calc.unitresistance_profile['Pile penetration [m]'])
+
+    # Axes: diameter, wall thickness, target load, pile penetration
+    _sufficient = _capacity[:, :, np.newaxis, :] >= target_loads[np.newaxis, np.newaxis, :, np.newaxis]
+    _minimum_penetration = np.where(
+        _sufficient.any(axis=-1), _penetrations[_sufficient.argmax(axis=-1)], np.nan)
+
+    _shape = _minimum_penetration.shape
+    return pd.DataFrame({
+        'Diameter [m]': np.broadcast_to(_diameter[:, :, np.newaxis], _shape).flatten(),
+        'Wall thickness [m]': np.broadcast_to(_thickness[:, :, np.newaxis], _shape).flatten(),
+        'Pile weight [kN/m]': np.broadcast_to(pile_weight_permeter[:, :, np.newaxis], _shape).flatten(),
+        'Target load [kN]': np.broadcast_to(target_loads, _shape).flatten(),
+        'Minimum penetration [m]': _minimum_penetration.flatten()
+    })
+
+
+def _pile_design_sweep_dataframe(df, depth_key, unit, **kwargs):
+    """
+    Runs ``pile_design_sweep`` for a soil profile specified as a dataframe (used by the worker processes)
+    """
+    return pile_design_sweep(profile_from_dataframe(df, depth_key=depth_key, unit=unit), **kwargs)
+
+
+def pile_design_sweep_locations(soilprofiles, processes=None, **kwargs):
+    """
+    Runs ``pile_design_sweep`` for the soil profiles at several locations. The locations are independent and can be
+    processed in parallel by a pool of worker processes.
+
+    :param soilprofiles: Dictionary with the location names as keys and ``SoilProfile`` objects as values
+    :param processes: Number of worker processes (default=None for sequential processing in the current process)
+    :param kwargs: Keyword arguments for ``pile_design_sweep`` (``diameters``, ``wall_thicknesses``, ``target_loads``, ...)
+    :return: Dataframe with the results of ``pile_design_sweep`` for all locations with an additional column ``Location``
+    """
+    _locations = list(soilprofiles.keys())
+    if processes is None:
+        _results = [pile_design_sweep(soilprofiles[_location], **kwargs) for _location in _locations]
+    else:
+        # Soil profiles are sent to the workers as dataframes with the name and unit of the depth columns
+        _profiles = []
+        for _location in _locations:
+            _match = re.search(
+                r'(?P<depth_key>.+) from \[(?P<unit>.+)\]', soilprofiles[_location].depth_from_col)
+            _profiles.append((
+                pd.DataFrame(soilprofiles[_location]), _match.group('depth_key'), _match.group('unit')))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            _futures = [
+                executor.submit(_pile_design_sweep_dataframe, *_profile, **kwargs) for _profile in _profiles]
+            _results = [_future.result() for _future in _futures]
+
+    for _location, _result in zip(_locations, _results):
+        _result.insert(0, 'Location', _location)
+    return pd.concat(_results, ignore_index=True)
@@ -6,11 +6,12 @@ __author__ = 'Bruno Stuyts'
 # Native Python packages
 import warnings
 from copy import deepcopy
+from functools import lru_cache
 
 # 3rd party packages
 import numpy as np
 import pandas as pd
-from scipy.interpolate import interp1d
+from scipy.interpolate import interp1d, RegularGridInterpolator
 from scipy.optimize import brentq
 try:
     from plotly import tools, subplots
@@ -31,6 +32,150 @@ DEBEER_SOILTYPES_MAPPING = {
     7: "Sand"}
 
 
+@lru_cache(maxsize=None)
+def _beta_lookup_table(phi_max=60, no_phi=121, no_points=401):
+    """
+    Builds the lookup table of the angle beta as a function of the friction angle and the normalised depth
+    :math:`s = (h/d) / (h/d)_{max}`, with :math:`(h/d)_{max}` the value of h/d for :math:`\\beta = \\pi / 2`.
+    Since :math:`\\sin(\\beta) \\cdot \\exp(\\beta \\cdot \\tan \\varphi)` increases monotonically between 0 and
+    :math:`\\pi / 2`, each column of the table is obtained by inverting the explicit relation.
+    The table is built only once and is cached for subsequent calculations.
+
+    :param phi_max: Maximum friction angle in the table [deg]
+    :param no_phi: Number of friction angles in the table
+    :param no_points: Number of normalised depths in the table
+    :return: ``RegularGridInterpolator`` returning beta [rad] for points (friction angle [rad], normalised depth [-])
+    """
+    _phi = np.linspace(0, np.deg2rad(phi_max), no_phi)
+    _s = np.linspace(0, 1, no_points)
+    _beta = np.linspace(0, 0.5 * np.pi, 4 * no_points)
+    _table = np.zeros((no_phi, no_points))
+    for i, _frictionangle in enumerate(_phi):
+        _s_beta = np.sin(_beta) * np.exp((_beta - 0.5 * np.pi) * np.tan(_frictionangle))
+        _s_beta[-1] = 1
+        _table[i, :] = np.interp(_s, _s_beta, _beta)
+    return RegularGridInterpolator((_phi, _s), _table)
+
+
+def beta_debeer(hd, frictionangle, exact=False, tolerance=1e-10, max_iterations=50):
+    """
+    Calculates the angle beta of the failure mechanism of De Beer for arrays of normalised depths and friction angles.
+    The angle beta is the root of Equation 60 of the paper by De Beer (see ``DeBeerCalculation.optimisation_func``)
+    between 0 and :math:`\\pi / 2`. When there is no root in this interval, :math:`\\pi / 2` is returned.
+
+    By default, a starting value is interpolated bilinearly from a cached lookup table of beta. The starting value
+    is refined with a safeguarded Newton iteration for all elements at once. Equation 60 increases monotonically
+    with beta, so a sign change of the equation between :math:`\\beta - \\text{tolerance}` and
+    :math:`\\beta + \\text{tolerance}` guarantees that the error on beta is less than ``tolerance``.
+    Elements for which this sign change cannot be verified are solved with ``brentq``. The difference with the
+    result of ``brentq`` (``exact=True``) is therefore less than ``tolerance`` plus the tolerance of ``brentq``.
+
+    :param hd: Value(s) of h/D for the pile or h/d for the CPT [-]
+    :param frictionangle: Friction angle(s) [rad]
+    :param exact: Boolean determining whether beta is found with ``brentq`` for each element (default=False for the lookup table)
+    :param tolerance: Maximum absolute error on beta for the lookup table solution (default=1e-10) [rad]
+    :param max_iterations: Maximum number of Newton iterations (default=50)
+    :return: Numpy array with values of beta [rad] with the broadcasted shape of ``hd`` and ``frictionangle``
+    """
+    hd, frictionangle = np.broadcast_arrays(
+        np.asarray(hd, dtype=float), np.asarray(frictionangle, dtype=float))
+    _shape = hd.shape
+    hd = hd.ravel()
+    frictionangle = frictionangle.ravel()
+    beta = np.full(hd.shape, 0.5 * np.pi)
+
+    if exact:
+        _exact = np.ones(hd.shape, dtype=bool)
+    else:
+        _exact = ~(np.isfinite(hd) & np.isfinite(frictionangle))
+        _hd = np.where(_exact, 0, hd)
+        _phi = np.where(_exact, 0, frictionangle)
+        _f_lower = DeBeerCalculation.optimisation_func(0, _hd, _phi)
+        _f_upper = DeBeerCalculation.optimisation_func(0.5 * np.pi, _hd, _phi)
+        beta[(_f_lower == 0) & ~_exact] = 0
+        _root = (_f_lower < 0) & (_f_upper > 0) & ~_exact
+
+        if _root.any():
+            _hd = _hd[_root]
+            _phi = _phi[_root]
+            _lookup = _beta_lookup_table()
+            _beta = _lookup(np.column_stack((
+                np.clip(_phi, 0, _lookup.grid[0][-1]),
+                np.clip(-_f_lower[_root] / (_f_upper[_root] - _f_lower[_root]), 0, 1))))
+            _lower = np.zeros(_beta.shape)
+            _upper = np.full(_beta.shape, 0.5 * np.pi)
+            _factor = np.tan(0.25 * np.pi + 0.5 * _phi) * np.exp(0.5 * np.pi * np.tan(_phi)) / \
+                (1 + np.sin(2 * _phi))
+            for i in range(max_iterations):
+                _f = DeBeerCalculation.optimisation_func(_beta, _hd, _phi)
+                _lower = np.where(_f < 0, _beta, _lower)
+                _upper = np.where(_f > 0, _beta, _upper)
+                _derivative = _factor * np.exp(_beta * np.tan(_phi)) * (
+                    np.cos(_beta) + np.tan(_phi) * np.sin(_beta))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    _newton = _beta - _f / _derivative
+                _bisection = ~((_newton > _lower) & (_newton < _upper))
+                _newton[_bisection] = 0.5 * (_lower + _upper)[_bisection]
+                _step = np.abs(_newton - _beta)
+                _beta = _newton
+                if _step.max() < 0.01 * tolerance:
+                    break
+            # Verification of the error bound
+            _verified = \
+                (DeBeerCalculation.optimisation_func(np.maximum(_beta - tolerance, 0), _hd, _phi) <= 0) & \
+                (DeBeerCalculation.optimisation_func(np.minimum(_beta + tolerance, 0.5 * np.pi), _hd, _phi) >= 0)
+            beta[_root] = _beta
+            _exact[np.where(_root)[0][~_verified]] = True
+
+    for _index in np.where(_exact)[0]:
+        try:
+            beta[_index] = brentq(
+                f=DeBeerCalculation.optimisation_func,
+                a=0,
+                b=0.5 * np.pi,
+                args=(hd[_index], frictionangle[_index]))
+        except:
+            beta[_index] = 0.5 * np.pi
+
+    return beta.reshape(_shape)
+
+
+def _interpolate_standard_diameters(diameter, diameter_1, diameter_2, qb_1, qb_2):
+    """
+    Linear interpolation of the unit base resistance between the standard diameters below and above a pile diameter
+    """
+    if diameter_1 == diameter_2:
+        return np.array(qb_1)
+    return qb_1 + ((qb_2 - qb_1) / (diameter_2 - diameter_1)) * (diameter - diameter_1)
+
+
+def _interval_mean(depth, values, lower, upper):
+    """
+    Calculates the mean of the values at depths between a lower and upper bound (both inclusive) for many intervals
+    at once. NaN values are skipped. Depths need to be sorted in ascending order. The interval bounds are found with a
+    binary search and the means follow from cumulative sums, the cost per interval is therefore independent of its length.
+
+    :param depth: Numpy array with the ascending depths [m]
+    :param values: Numpy array with the values to be averaged, depth along the first axis
+    :param lower: Lower bound(s) of the intervals [m], the shape of the bounds needs to match the trailing axes of ``values``
+    :param upper: Upper bound(s) of the intervals [m]
+    :return: Numpy array with the means, shape of the bounds (NaN for intervals without valid values)
+    """
+    depth = np.asarray(depth, dtype=float)
+    values = np.asarray(values, dtype=float)
+    lower, upper = np.broadcast_arrays(np.asarray(lower, dtype=float), np.asarray(upper, dtype=float))
+    _valid = ~np.isnan(values)
+    _sum = np.concatenate((
+        np.zeros((1,) + values.shape[1:]), np.cumsum(np.where(_valid, values, 0), axis=0)))
+    _count = np.concatenate((
+        np.zeros((1,) + values.shape[1:]), np.cumsum(_valid, axis=0)))
+    _start = np.searchsorted(depth, lower.ravel(), side='left').reshape(lower.shape)
+    _end = np.searchsorted(depth, upper.ravel(), side='right').reshape(upper.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (np.take_along_axis(_sum, _end, axis=0) - np.take_along_axis(_sum, _start, axis=0)) / \
+            (np.take_along_axis(_count, _end, axis=0) - np.take_along_axis(_count, _start, axis=0))
+
+
 class DeBeerCalculation(object):
 
     def __init__(self, depth, qc, diameter_pile, diameter_cone=0.0357):
@@ -225,7 +370,18 @@ class DeBeerCalculation(object):
         except:
             return qc
 
-    def calculate_base_resistance(self, vanimpecorrection=False, hcrit=0.2):
+    @staticmethod
+    def standard_diameters(diameter):
+        """
+        Returns the multiples of 0.2m directly below and above a given pile diameter. When the diameter
+        is a multiple of 0.2m, both values are equal to the diameter.
+
+        :param diameter: Pile diameter [m]
+        :return: Tuple with the standard diameter below and above the given diameter [m]
+        """
+        return np.round(0.2 * np.floor(diameter / 0.2 + 1e-9), 1), np.round(0.2 * np.ceil(diameter / 0.2 - 1e-9), 1)
+
+    def calculate_base_resistance(self, vanimpecorrection=False, hcrit=0.2, exact_beta=False):
         """
         Calculates the base resistance for any pile diameter.
 
@@ -235,35 +391,125 @@ class DeBeerCalculation(object):
 
         :param vanimpecorrection: Boolean determining whether the upward correction according to De Beer's paper (default) or Van Impe (multiplier of 2) needs to be applied.
         :param hcrit: :math:`h_{crit}` adopted for De Beer's calculation (based on the mechanical cone). Default=0.2m
+        :param exact_beta: Boolean determining whether the angles beta are found with ``brentq`` for each row (default=False for the vectorised lookup table solution, see ``beta_debeer``)
         :return: Sets two dataframes `calc_1` and `calc_2`, one for the multiple of 0.2m lower than the given diameter and one for the multiple of 0.2m higher than the given diameter. Finally, the attribute `qb` is set through linear interpolation.
         """
 
-        if self.diameter_pile % 0.2 == 0:
-            # Calculation for pile diameter being a multiple of 0.2m
-            self.diameter_1 = self.diameter_pile
-            self.diameter_2 = self.diameter_pile
-        else:
-            self.diameter_1 = np.round(self.diameter_pile - (self.diameter_pile % 0.2), 1)
-            self.diameter_2 = np.round(self.diameter_pile + (self.diameter_pile % 0.2), 1)
+        self.diameter_1, self.diameter_2 = self.standard_diameters(self.diameter_pile)
         self.calc_1 = self.calculate_base_resistance_standard_diameter(
-            pile_diameter=self.diameter_1, vanimpecorrection=vanimpecorrection, hcrit=hcrit
+            pile_diameter=self.diameter_1, vanimpecorrection=vanimpecorrection, hcrit=hcrit,
+            exact_beta=exact_beta
         )
         self.calc_2 = self.calculate_base_resistance_standard_diameter(
-            pile_diameter=self.diameter_2, vanimpecorrection=vanimpecorrection, hcrit=hcrit
+            pile_diameter=self.diameter_2, vanimpecorrection=vanimpecorrection, hcrit=hcrit,
+            exact_beta=exact_beta
         )
-        _qb = []
-        for i, row in self.calc_1.iterrows():
-            _qb.append(
-                np.interp(
-                    self.diameter_pile,
-                    [self.diameter_1, self.diameter_2],
-                    [self.calc_1.loc[i, "qb [MPa]"], self.calc_2.loc[i, "qb [MPa]"]]
-                )
-            )
-        self.qb = np.array(_qb)
+        self.qb = _interpolate_standard_diameters(
+            diameter=self.diameter_pile, diameter_1=self.diameter_1, diameter_2=self.diameter_2,
+            qb_1=np.array(self.calc_1["qb [MPa]"]), qb_2=np.array(self.calc_2["qb [MPa]"]))
         self.depth_qb = self.calc_1['z [m]']
 
-    def calculate_base_resistance_standard_diameter(self, pile_diameter, vanimpecorrection=False, hcrit=0.2):
+    def calculate_base_resistance_diameters(self, diameters, vanimpecorrection=False, hcrit=0.2, exact_beta=False):
+        """
+        Calculates the base resistance according to De Beer's method for several pile diameters at once.
+
+        The standard diameters (multiples of 0.2m) bracketing each of the given diameters are collected and the five
+        steps of ``calculate_base_resistance_standard_diameter`` are carried out for all standard diameters in one pass.
+        The friction angle, the angle :math:`\\beta_c` for the CPT and the stresses do not depend on the pile diameter
+        and are only calculated once. The downward and upward corrections (steps 3 and 4) proceed along the depth for
+        all standard diameters simultaneously and the averaging of step 5 uses cumulative sums.
+        The unit base resistance for each diameter is finally interpolated linearly between its standard diameters.
+
+        :param diameters: List or Numpy array with pile diameters [m], the minimum diameter is 0.2m
+        :param vanimpecorrection: Boolean determining whether the upward correction according to De Beer's paper (default) or Van Impe (multiplier of 2) needs to be applied.
+        :param hcrit: :math:`h_{crit}` adopted for De Beer's calculation (based on the mechanical cone). Default=0.2m
+        :param exact_beta: Boolean determining whether the angles beta are found with ``brentq`` for each row (default=False for the vectorised lookup table solution, see ``beta_debeer``)
+        :return: Numpy array with the unit base resistance [MPa] with depths along the rows and diameters along the columns. The array is also set as the attribute ``qb_diameters``, the diameters are set as ``diameters_qb``.
+        """
+        diameters = np.atleast_1d(np.array(diameters, dtype=float))
+        if diameters.min() < 0.2:
+            raise ValueError("The minimum pile diameter for applying De Beer's method is 0.2m")
+
+        _brackets = np.array([self.standard_diameters(_diameter) for _diameter in diameters])
+        _standard_diameters, _bracket_index = np.unique(_brackets, return_inverse=True)
+        _bracket_index = _bracket_index.reshape(_brackets.shape)
+
+        # Diameter-independent quantities
+        _z = np.array(self.calculation_data['z [m]'], dtype=float)
+        _qc = np.array(self.calculation_data['qc [MPa]'], dtype=float)
+        _qc[_qc < 0] = 0
+        _calc = pd.DataFrame(self.calculation_data).assign(**{'qc [MPa]': _qc})
+        _phi = np.deg2rad(self._friction_angle(_calc))
+        _po = np.array(self.calculation_data['Vertical effective stress [kPa]'], dtype=float)[:, None]
+        _gamma = np.array(self.calculation_data['Effective unit weight [kN/m3]'], dtype=float)[:, None]
+        _beta_c = beta_debeer(hd=_z / self.diameter_cone, frictionangle=_phi, exact=exact_beta)
+
+        # Step 1: Shallow depth failure surface correction
+        _beta_p = beta_debeer(
+            hd=_z[:, None] / _standard_diameters[None, :], frictionangle=_phi[:, None], exact=exact_beta)
+        _qp = _qc[:, None] / np.exp(2 * (_beta_c[:, None] - _beta_p) * np.tan(_phi[:, None]))
+
+        # Step 2: Stress level correction, zero overburden pressure leaves qp unchanged
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _a_qp = self.stress_correction(
+                qc=_qp, po=_po, diameter_pile=_standard_diameters[None, :], diameter_cone=self.diameter_cone,
+                gamma=_gamma, hcrit=hcrit)
+        _a_qp = np.where(_po == 0, _qp, _a_qp)
+        _a_qp = np.where(_a_qp < _qc[:, None], _a_qp, _qc[:, None])
+
+        # Step 3: Corrections for transition from weaker to stronger layers
+        _ratio = self.diameter_cone / _standard_diameters
+        _qd = np.zeros(_a_qp.shape)
+        for i in range(1, _qd.shape[0]):
+            _qd_i = _qd[i - 1] + (_a_qp[i] - _qd[i - 1]) * _ratio
+            _qd[i] = np.where(_qd_i < _a_qp[i], _qd_i, _a_qp[i])
+
+        # Step 4: Corrections for transition from stronger to weaker layers
+        if vanimpecorrection:
+            coefficient = 2.0
+        else:
+            coefficient = 1.0
+        _qu = np.zeros(_qd.shape)
+        _qu[-1] = _qd[-1]
+        for i in range(_qu.shape[0] - 2, -1, -1):
+            _qu_i = _qu[i + 1] + coefficient * (_qd[i] - _qu[i + 1]) * _ratio
+            _qu[i] = np.where(_qd[i] < _qu_i, _qd[i], _qu_i)
+
+        # Step 5: Averaging to 1D below the reference level
+        _qu_avg = _interval_mean(
+            depth=_z, values=_qu, lower=_z[:, None], upper=_z[:, None] + _standard_diameters[None, :])
+        _qb = np.where(_qu_avg < _qu, _qu_avg, _qu)
+
+        self.diameters_qb = diameters
+        self.qb_diameters = np.column_stack([
+            _interpolate_standard_diameters(
+                diameter=_diameter,
+                diameter_1=_standard_diameters[_bracket_index[j, 0]],
+                diameter_2=_standard_diameters[_bracket_index[j, 1]],
+                qb_1=_qb[:, _bracket_index[j, 0]],
+                qb_2=_qb[:, _bracket_index[j, 1]]) for j, _diameter in enumerate(diameters)])
+        return self.qb_diameters
+
+    def _friction_angle(self, calc):
+        """
+        Calculates the friction angle according to Equation 23 for all rows of the calculation data.
+        Rows outside the range of the interpolation function get a friction angle of 45deg.
+
+        :param calc: Dataframe with the calculation data
+        :return: Numpy array with the friction angles [deg]
+        """
+        _phi_func = self.phi_func()
+        _phi = np.full(calc.__len__(), 45.0)
+        try:
+            _v_bd = np.array(1000 * calc['qc [MPa]'] / calc['Effective vertical stress [kPa]'])
+            _in_range = ~((_v_bd < _phi_func.x[0]) | (_v_bd > _phi_func.x[-1]))
+            _phi[_in_range] = np.rad2deg(_phi_func(_v_bd[_in_range]))
+        except:
+            pass
+        return _phi
+
+    def calculate_base_resistance_standard_diameter(self, pile_diameter, vanimpecorrection=False, hcrit=0.2,
+                                                    exact_beta=False):
         """
         Calculates the base resistance according to De Beer's method for a pile diameter which is a multiple of 0.2m. The calculation happens in five steps:
 
@@ -306,48 +552,27 @@ class DeBeerCalculation(object):
         :param pile_diameter: Diameter of the pile as a multiple of 0.2m
         :param vanimpecorrection: Boolean determining whether the upward correction according to De Beer's original paper (default) or Van Impe (multiplier of 2) needs to be taken into account.
         :param hcrit: :math:`h_{crit}` adopted for De Beer's calculation (based on the mechanical cone). Default=0.2m
+        :param exact_beta: Boolean determining whether the angles beta are found with ``brentq`` for each row (default=False for the vectorised lookup table solution, see ``beta_debeer``)
 
         :return: Returns a dataframe `calc` with the different correction stages
         """
         calc = deepcopy(self.calculation_data)
-        for i, row in calc.iterrows():
-            if row['qc [MPa]'] < 0:
-                calc.loc[i, 'qc [MPa]'] = 0
+        calc.loc[calc['qc [MPa]'] < 0, 'qc [MPa]'] = 0
 
         # ----------------------------------------------------
         # Step 1: Shallow depth failure surface correction
         # ----------------------------------------------------
 
         # Calculate phi according to Equation 23
-        for i, row in calc.iterrows():
-            try:
-                calc.loc[i, 'phi [deg]'] = np.rad2deg(
-                    self.phi_func()(1000 * row['qc [MPa]'] / row['Effective vertical stress [kPa]']))
-            except:
-                calc.loc[i, 'phi [deg]'] = 45
+        calc['phi [deg]'] = self._friction_angle(calc)
         # Determine the values of the normalised depths h/d and h/D
         calc['h/d [-]'] = calc['z [m]'] / self.diameter_cone
         calc['h/D [-]'] = calc['z [m]'] / pile_diameter
         # Find values of beta for cone penetration test and pile according to Equation 60
-        for i, row in calc.iterrows():
-            try:
-                root = brentq(
-                    f=self.optimisation_func,
-                    a=0,
-                    b=0.5 * np.pi,
-                    args=(row['h/d [-]'], np.deg2rad(row['phi [deg]'])))
-            except:
-                root = 0.5 * np.pi
-            calc.loc[i, 'beta_c [rad]'] = root
-            try:
-                root = brentq(
-                    f=self.optimisation_func,
-                    a=0,
-                    b=0.5 * np.pi,
-                    args=(row['h/D [-]'], np.deg2rad(row['phi [deg]'])))
-            except:
-                root = 0.5 * np.pi
-            calc.loc[i, 'beta_p [rad]'] = root
+        calc['beta_c [rad]'] = beta_debeer(
+            hd=calc['h/d [-]'], frictionangle=np.deg2rad(calc['phi [deg]']), exact=exact_beta)
+        calc['beta_p [rad]'] = beta_debeer(
+            hd=calc['h/D [-]'], frictionangle=np.deg2rad(calc['phi [deg]']), exact=exact_beta)
         # Apply Equation 62 to obtain qp
         calc['qp [MPa]'] = calc['qc [MPa]'] / \
             (np.exp(
@@ -399,16 +624,10 @@ class DeBeerCalculation(object):
         # --------------------------------------------------------------------
         # Step 5: Averaging to 1D below the reference level
         # --------------------------------------------------------------------
-        for i, row in calc.iterrows():
-            try:
-                _window_data = calc[
-                    (calc['z [m]'] >= row['z [m]']) &
-                    (calc['z [m]'] <= (row['z [m]'] + pile_diameter))]
-                calc.loc[i, "qb [MPa]"] = min(
-                    row['qp,q+1 [MPa]'],
-                    _window_data['qp,q+1 [MPa]'].mean())
-            except:
-                calc.loc[i, "qb [MPa]"] = row['qp,q+1 [MPa]']
+        _qu = np.array(calc['qp,q+1 [MPa]'], dtype=float)
+        _z = np.array(calc['z [m]'], dtype=float)
+        _qu_avg = _interval_mean(depth=_z, values=_qu, lower=_z, upper=_z + pile_diameter)
+        calc["qb [MPa]"] = np.where(_qu_avg < _qu, _qu_avg, _qu)
 
         return calc
 
@@ -525,10 +744,12 @@ class DeBeerCalculation(object):
         if qc_avg_override is not None:
             self.layering["qc avg [MPa]"] = qc_avg_override
         else:
-            for i, row in self.layering.iterrows():
-                self.layering.loc[i, "qc avg [MPa]"] = np.nan_to_num(self.qc_corrected[
-                    (self.depth_raw >= row["Depth from [m]"]) &
-                    (self.depth_raw <= row["Depth to [m]"])]).mean()
+            _order = np.argsort(self.depth_raw, kind='stable')
+            self.layering["qc avg [MPa]"] = _interval_mean(
+                depth=self.depth_raw[_order],
+                values=np.nan_to_num(self.qc_corrected[_order]),
+                lower=np.array(self.layering["Depth from [m]"]),
+                upper=np.array(self.layering["Depth to [m]"]))
 
     def calculate_unit_shaft_friction(self):
         """
@@ -548,32 +769,24 @@ class DeBeerCalculation(object):
             Unit shaft friction according to Belgian practice
         """
 
-        for i, row in self.layering.iterrows():
-            if row['Soil type'] == 'Clay':
-                if row['qc avg [MPa]'] <= 4.5:
-                    self.layering.loc[i, "qs [kPa]"] = 1000 * (1 / 30) * row['qc avg [MPa]']
-                else:
-                    self.layering.loc[i, "qs [kPa]"] = 150
-            elif row['Soil type'] == 'Loam (silt)':
-                if row['qc avg [MPa]'] <= 6:
-                    self.layering.loc[i, "qs [kPa]"] = 1000 * (1 / 60) * row['qc avg [MPa]']
-                else:
-                    self.layering.loc[i, "qs [kPa]"] = 100
-            elif (row['Soil type'] == 'Sandy clay / loam (silt)') or (row['Soil type'] == 'Clayey sand / loam (silt)'):
-                if row['qc avg [MPa]'] <= 10:
-                    self.layering.loc[i, "qs [kPa]"] = 1000 * (1 / 80) * row['qc avg [MPa]']
-                else:
-                    self.layering.loc[i, "qs [kPa]"] = 125
-            elif row['Soil type'] == 'Sand':
-                if row['qc avg [MPa]'] <= 10:
-                    self.layering.loc[i, "qs [kPa]"] = 1000 * (1 / 90) * row['qc avg [MPa]']
-                elif 10 < row['qc avg [MPa]'] <= 20:
-                    self.layering.loc[i, "qs [kPa]"] = 110 + 4 * (row['qc avg [MPa]'] - 10)
-                else:
-                    self.layering.loc[i, "qs [kPa]"] = 150
-            else:
-                warnings.warn("Unrecognized soil type (%s) for layer %i" % (row['Soil type'], i+1))
-                self.layering.loc[i, "qs [kPa]"] = np.nan
+        _soiltype = np.array(self.layering['Soil type'])
+        _qc_avg = np.array(self.layering['qc avg [MPa]'], dtype=float)
+        with np.errstate(invalid='ignore'):
+            _qs = np.select(
+                [_soiltype == 'Clay',
+                 _soiltype == 'Loam (silt)',
+                 (_soiltype == 'Sandy clay / loam (silt)') | (_soiltype == 'Clayey sand / loam (silt)'),
+                 _soiltype == 'Sand'],
+                [np.where(_qc_avg <= 4.5, 1000 * (1 / 30) * _qc_avg, 150),
+                 np.where(_qc_avg <= 6, 1000 * (1 / 60) * _qc_avg, 100),
+                 np.where(_qc_avg <= 10, 1000 * (1 / 80) * _qc_avg, 125),
+                 np.where(_qc_avg <= 10, 1000 * (1 / 90) * _qc_avg,
+                          np.where((10 < _qc_avg) & (_qc_avg <= 20), 110 + 4 * (_qc_avg - 10), 150))],
+                default=np.nan)
+        for i in np.where(~np.isin(_soiltype, [
+                'Clay', 'Loam (silt)', 'Sandy clay / loam (silt)', 'Clayey sand / loam (silt)', 'Sand']))[0]:
+            warnings.warn("Unrecognized soil type (%s) for layer %i" % (_soiltype[i], i+1))
+        self.layering["qs [kPa]"] = _qs
 
     def plot_unit_shaft_friction(self, plot_title=None, plot_height=800, plot_width=600,
                                  plot_margin=dict(t=100, l=50, b=50), show_fig=True,
@@ -10,7 +10,7 @@ import numpy as np
 
 # Project imports
 from groundhog.siteinvestigation.classification.phaserelations import voidratio_bulkunitweight, porosity_voidratio
-from groundhog.general.validation import Validator
+from groundhog.general.validation import Validator, validation_mask
 
 
 API_UNIT_END_BEARING_CLAY = {
@@ -56,6 +56,24 @@ def API_unit_end_bearing_clay(undrained_shear_strength,N_c=9.0,**kwargs):
         'internal_friction': False
     }
 
+def API_unit_end_bearing_clay_array(undrained_shear_strength, N_c=9.0, **kwargs):
+    """
+    Array version of ``API_unit_end_bearing_clay``. The inputs can be scalars or arrays
+    which are broadcast to a common shape. Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``API_unit_end_bearing_clay`` containing arrays for the unit end bearing
+    """
+    _valid = validation_mask(API_UNIT_END_BEARING_CLAY, undrained_shear_strength=undrained_shear_strength, N_c=N_c,
+                            **kwargs)
+    q_b = np.where(_valid, N_c * np.asarray(undrained_shear_strength, dtype=float), np.nan)
+
+    return {
+        'q_b_coring [kPa]': q_b,
+        'q_b_plugged [kPa]': q_b,
+        'plugged': None,
+        'internal_friction': False
+    }
+
 API_UNIT_END_BEARING_SAND_RP2GEO = {
     'api_relativedensity':{'type': 'string','options':("Very loose","Loose","Medium dense","Dense","Very dense"),'regex':None},
     'api_soildescription':{'type': 'string','options':("Sand","Sand-silt"),'regex':None},
@@ -141,6 +159,53 @@ def API_unit_end_bearing_sand_rp2geo(api_relativedensity, api_soildescription, s
         'Nq [-]': Nq
     }
 
+API_UNIT_END_BEARING_SAND_RP2GEO_TABLE = {
+    # (api_soildescription, api_relativedensity): (Nq, qb_lim)
+    ("Sand", "Medium dense"): (20.0, 5000.0),
+    ("Sand", "Dense"): (40.0, 10000.0),
+    ("Sand", "Very dense"): (50.0, 12000.0),
+    ("Sand-silt", "Medium dense"): (12.0, 3000.0),
+    ("Sand-silt", "Dense"): (20.0, 5000.0),
+    ("Sand-silt", "Very dense"): (40.0, 10000.0),
+}
+
+
+def API_unit_end_bearing_sand_rp2geo_array(api_relativedensity, api_soildescription, sigma_vo_eff, qb_limit=False,
+                                           **kwargs):
+    """
+    Array version of ``API_unit_end_bearing_sand_rp2geo``. The inputs can be scalars or arrays
+    which are broadcast to a common shape. Entries with inputs outside the validation ranges or without tabulated
+    values for Nq return NaN, as the scalar function does.
+
+    :returns: Dictionary with the same keys as ``API_unit_end_bearing_sand_rp2geo`` containing arrays for the unit end bearing, Nq and the limit
+    """
+    api_relativedensity = np.asarray(api_relativedensity, dtype=object)
+    api_soildescription = np.asarray(api_soildescription, dtype=object)
+    _shape = np.broadcast(api_relativedensity, api_soildescription, np.asarray(sigma_vo_eff)).shape
+    _valid = np.broadcast_to(validation_mask(
+        API_UNIT_END_BEARING_SAND_RP2GEO, api_relativedensity=api_relativedensity,
+        api_soildescription=api_soildescription, sigma_vo_eff=sigma_vo_eff, **kwargs), _shape)
+
+    Nq = np.full(_shape, np.nan)
+    qb_lim = np.full(_shape, np.nan)
+    for (_description, _density), (_Nq, _qb_lim) in API_UNIT_END_BEARING_SAND_RP2GEO_TABLE.items():
+        _mask = np.broadcast_to(
+            (api_soildescription == _description) & (api_relativedensity == _density), _shape) & _valid
+        Nq[_mask] = _Nq
+        qb_lim[_mask] = _qb_lim
+
+    _q_b = Nq * np.asarray(sigma_vo_eff, dtype=float)
+    q_b = np.where(np.asarray(qb_limit, dtype=bool), np.minimum(_q_b, qb_lim), _q_b)
+
+    return {
+        'q_b_coring [kPa]': q_b,
+        'q_b_plugged [kPa]': q_b,
+        'plugged': None,
+        'internal_friction': False,
+        'q_b_lim [kPa]': qb_lim,
+        'Nq [-]': Nq
+    }
+
 UNITENDBEARING_SAND_ALMHAMRE = {
     'qt': {'type': 'float', 'min_value': 0.0, 'max_value': 120.0},
     'sigma_vo_eff': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -195,6 +260,29 @@ def unitendbearing_sand_almhamre(
     }
 
 
+def unitendbearing_sand_almhamre_array(
+        qt, sigma_vo_eff,
+        multiplier=0.15, exponent=0.2, **kwargs):
+    """
+    Array version of ``unitendbearing_sand_almhamre``. The inputs can be scalars or arrays
+    which are broadcast to a common shape. Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``unitendbearing_sand_almhamre`` containing arrays for the unit end bearing
+    """
+    _valid = validation_mask(UNITENDBEARING_SAND_ALMHAMRE, qt=qt, sigma_vo_eff=sigma_vo_eff, **kwargs)
+    qt = np.where(_valid, np.asarray(qt, dtype=float), np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _q_b_coring = multiplier * (1000 * qt) * ((1000 * qt / np.asarray(sigma_vo_eff, dtype=float)) ** exponent)
+
+    return {
+        'q_b_coring [kPa]': _q_b_coring,
+        'q_b_plugged [kPa]': _q_b_coring,
+        'plugged []': False,
+        'internal_friction []': True,
+    }
+
+
 UNITENDBEARING_CLAY_ALMHAMRE = {
     'qt': {'type': 'float', 'min_value': 0.0, 'max_value': 120.0},
     'multiplier': {'type': 'float', 'min_value': None, 'max_value': None},
@@ -246,6 +334,26 @@ def unitendbearing_clay_almhamre(
     }
 
 
+def unitendbearing_clay_almhamre_array(
+        qt,
+        multiplier=0.6, **kwargs):
+    """
+    Array version of ``unitendbearing_clay_almhamre``. The inputs can be scalars or arrays.
+    Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``unitendbearing_clay_almhamre`` containing arrays for the unit end bearing
+    """
+    _valid = validation_mask(UNITENDBEARING_CLAY_ALMHAMRE, qt=qt, **kwargs)
+    _q_b_coring = np.where(_valid, multiplier * 1000 * np.asarray(qt, dtype=float), np.nan)
+
+    return {
+        'q_b_coring [kPa]': _q_b_coring,
+        'q_b_plugged [kPa]': np.where(_valid, 0.0, np.nan),
+        'plugged []': False,
+        'internal_friction []': True,
+    }
+
+
 ENDBEARING_METHODS = {
     'API RP2 GEO Sand': API_unit_end_bearing_sand_rp2geo,
     'API RP2 GEO Clay': API_unit_end_bearing_clay,
@@ -253,6 +361,13 @@ ENDBEARING_METHODS = {
     'Alm and Hamre Clay': unitendbearing_clay_almhamre
 }
 
+ENDBEARING_METHODS_ARRAY = {
+    'API RP2 GEO Sand': API_unit_end_bearing_sand_rp2geo_array,
+    'API RP2 GEO Clay': API_unit_end_bearing_clay_array,
+    'Alm and Hamre Sand': unitendbearing_sand_almhamre_array,
+    'Alm and Hamre Clay': unitendbearing_clay_almhamre_array
+}
+
 ENDBEARING_PARAMETERS = {
     'API RP2 GEO Sand': ['api_relativedensity', 'api_soildescription', 'sigma_vo_eff'],
     'API RP2 GEO Clay': ['undrained_shear_strength',],
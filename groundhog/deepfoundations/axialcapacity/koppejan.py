@@ -20,6 +20,96 @@ from groundhog.general.parameter_mapping import map_depth_properties
 from groundhog.general.plotting import GROUNDHOG_PLOTTING_CONFIG
 
 
+def _running_minimum_mean(qc, end, length, initial=np.inf, max_chunk_size=1000000):
+    """
+    Calculates the mean of the running minimum of the cone resistance taken upward from the bottom of each window.
+    The windows contain the ``length`` points above index ``end`` (exclusive) of the cone resistance array.
+    The first (bottom) value of each window is limited to ``initial``.
+    The windows are gathered in a padded array, processed in chunks of rows to limit memory use.
+
+    :return: Tuple with the means of the running minimum and the minimum over each window (NaN for empty windows)
+    """
+    _mean = np.full(end.__len__(), np.nan)
+    _minimum = np.full(end.__len__(), np.nan)
+    _width = max(int(length.max()), 1) if end.__len__() > 0 else 1
+    _chunk = max(max_chunk_size // _width, 1)
+    initial = np.broadcast_to(np.asarray(initial, dtype=float), end.shape)
+    for i in range(0, end.__len__(), _chunk):
+        _rows = slice(i, min(i + _chunk, end.__len__()))
+        _indices = end[_rows, np.newaxis] - 1 - np.arange(_width)[np.newaxis, :]
+        _keep = np.arange(_width)[np.newaxis, :] < length[_rows, np.newaxis]
+        _values = np.where(_keep, qc[np.clip(_indices, 0, qc.__len__() - 1)], np.inf)
+        _values[:, 0] = np.minimum(_values[:, 0], initial[_rows])
+        _envelope = np.minimum.accumulate(_values, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _mean[_rows] = np.where(_keep, _envelope, 0.0).sum(axis=1) / length[_rows]
+        _minimum[_rows] = np.where(
+            length[_rows] > 0, _envelope[np.arange(_envelope.shape[0]), np.maximum(length[_rows] - 1, 0)], np.nan)
+    return _mean, _minimum
+
+
+def koppejan_qc_profile(depth, qc, diameter, penetrations, no_windows=50, max_chunk_size=1000000):
+    """
+    Calculates the cone resistance values :math:`q_{cI}`, :math:`q_{cII}` and :math:`q_{cIII}` of Koppejan's
+    construction for a series of pile penetrations at once. The construction is the same as in
+    ``KoppejanCalculation.calculate_base_resistance``.
+
+    The window means for :math:`q_{cII}` follow from prefix sums of the cone resistance with window bounds found by
+    binary search. The non-increasing envelopes for :math:`q_{cI}` and :math:`q_{cIII}` are running minima taken upward
+    from the bottom of each window. NaN values of cone resistance are discarded.
+
+    :param depth: List or Numpy array with depths [m]
+    :param qc: List or Numpy array with cone resistance values [MPa] - same length as depth array
+    :param diameter: Pile diameter [m]
+    :param penetrations: List or Numpy array with pile penetrations [m]
+    :param no_windows: Number of window sizes between 0.7D and 4D for the calculation of :math:`q_{cII}` (default=50)
+    :param max_chunk_size: Maximum number of window entries processed at once for the envelopes (default=1000000)
+    :returns: Dictionary with keys ``'qcI [MPa]'``, ``'qcII [MPa]'``, ``'qcIII [MPa]'`` and ``'qcII depth [m]'``. The arrays have the same length as ``penetrations``.
+    """
+    depth = np.asarray(depth, dtype=float)
+    qc = np.asarray(qc, dtype=float)
+    penetrations = np.atleast_1d(np.asarray(penetrations, dtype=float))
+    if depth.__len__() != qc.__len__():
+        raise ValueError("depth and qc arrays need to have the same length!")
+
+    _valid = ~np.isnan(qc)
+    _order = np.argsort(depth[_valid], kind='stable')
+    _z = depth[_valid][_order]
+    _qc = qc[_valid][_order]
+    _qc_sum = np.concatenate(([0.0], np.cumsum(_qc)))
+
+    # Calculation of qcII, the minimum over all window sizes
+    _window_sizes = np.linspace(0.7 * diameter, 4.0 * diameter, no_windows)
+    _start = np.searchsorted(_z, penetrations, side='left')
+    _window_bottoms = penetrations[:, np.newaxis] + _window_sizes[np.newaxis, :]
+    _end = np.searchsorted(_z, _window_bottoms, side='right')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _qcII_values = (_qc_sum[_end] - _qc_sum[_start, np.newaxis]) / (_end - _start[:, np.newaxis])
+    _selected = np.argmin(np.where(np.isnan(_qcII_values), np.inf, _qcII_values), axis=1)
+    _rows = np.arange(penetrations.__len__())
+    qcII = _qcII_values[_rows, _selected]
+    qcII_depth = _window_bottoms[_rows, _selected]
+
+    # Calculation of qcI, from the bottom of the selected qcII window up to the pile tip
+    qcI, _qcI_minimum = _running_minimum_mean(
+        _qc, end=_end[_rows, _selected], length=_end[_rows, _selected] - _start,
+        max_chunk_size=max_chunk_size)
+
+    # Calculation of qcIII, from the pile tip up to 8D above the tip
+    _end_III = np.searchsorted(_z, penetrations, side='right')
+    _start_III = np.searchsorted(_z, penetrations - 8.0 * diameter, side='left')
+    qcIII, _ = _running_minimum_mean(
+        _qc, end=_end_III, length=_end_III - _start_III, initial=_qcI_minimum,
+        max_chunk_size=max_chunk_size)
+
+    return {
+        'qcI [MPa]': qcI,
+        'qcII [MPa]': qcII,
+        'qcIII [MPa]': qcIII,
+        'qcII depth [m]': qcII_depth
+    }
+
+
 class KoppejanCalculation(object):
 
     def __init__(self, depth, qc, diameter, penetration):
@@ -273,6 +363,56 @@ class KoppejanCalculation(object):
 
         self.Frb = 1000 * self.qbmax * self.base_area
 
+    def calculate_resistance_profile(self, alpha_s, alpha_p, base_coefficient=1, crosssection_coefficient=1,
+                                     coring=False, wall_thickness=np.nan, penetrations=None):
+        """
+        Calculates the base and shaft resistance according to Koppejan's method for a series of pile penetrations.
+        The base resistance construction is carried out for all penetrations at once (see ``koppejan_qc_profile``)
+        and the shaft resistance follows from the cumulative shaft friction calculated with ``calculate_side_friction``.
+        The parameters are the same as for ``calculate_side_friction`` and ``calculate_base_resistance``.
+
+        :param alpha_s: The value of the shaft friction coefficient for the given pile type
+        :param alpha_p: Coefficient for the base resistance based on pile type
+        :param base_coefficient: Coefficient for enlarged bases (default=1 for a uniform pile)
+        :param crosssection_coefficient: Coefficient for non-circular cross-sections (default=1 for a circular cross-section
+        :param coring: Boolean determining whether the pile behaves in a coring manner (default=False)
+        :param wall_thickness: Wall thickness [mm]. Only needs to be specified for coring deepfoundations
+        :param penetrations: List or Numpy array with pile penetrations [m] (default=None for all CPT depths up to the maximum CPT depth - 4D)
+        :return: Sets the attribute ``resistance_profile``, a dataframe with columns ``'Penetration [m]'``, ``'qcI [MPa]'``, ``'qcII [MPa]'``, ``'qcIII [MPa]'``, ``'qcavg [MPa]'``, ``'qbmax [MPa]'``, ``'Frb [kN]'`` and ``'Frs [kN]'``
+        """
+        if penetrations is None:
+            penetrations = np.array(
+                self.data.loc[self.data['z [m]'] <= (self.data['z [m]'].max() - 4 * self.diameter), 'z [m]'])
+        else:
+            penetrations = np.atleast_1d(np.asarray(penetrations, dtype=float))
+            if penetrations.max() > (self.data['z [m]'].max() - 4 * self.diameter):
+                raise ValueError("The pile penetration cannot be deeper than the maximum CPT depth - 4D")
+
+        if coring and np.isnan(wall_thickness):
+            raise ValueError("For a coring pile, a wall thickness needs to be provided (in mm)")
+
+        if coring:
+            _base_area = 0.25 * np.pi * ((self.diameter ** 2) - ((self.diameter - 2 * 0.001 * wall_thickness) ** 2))
+        else:
+            _base_area = 0.25 * np.pi * (self.diameter ** 2)
+
+        self.calculate_side_friction(alpha_s=alpha_s)
+        _qc = koppejan_qc_profile(
+            depth=self.data['z [m]'], qc=self.data['qc [MPa]'], diameter=self.diameter, penetrations=penetrations)
+        _qcavg = 0.5 * (0.5 * (_qc['qcI [MPa]'] + _qc['qcII [MPa]']) + _qc['qcIII [MPa]'])
+        _qbmax = np.minimum(15.0, alpha_p * base_coefficient * crosssection_coefficient * _qcavg)
+
+        self.resistance_profile = pd.DataFrame({
+            'Penetration [m]': penetrations,
+            'qcI [MPa]': _qc['qcI [MPa]'],
+            'qcII [MPa]': _qc['qcII [MPa]'],
+            'qcIII [MPa]': _qc['qcIII [MPa]'],
+            'qcavg [MPa]': _qcavg,
+            'qbmax [MPa]': _qbmax,
+            'Frb [kN]': 1000 * _qbmax * _base_area,
+            'Frs [kN]': np.interp(penetrations, self.data['z [m]'], self.data['Frs [kN]'])
+        })
+
     def plot_shaft_resistance(
             self, plot_width=800, plot_height=600, plot_title=None, plot_margin=dict(t=100, l=50, b=50), show_fig=True,
             x_ranges=((0, 50), (0, 250), (0, 50), (0, 2000)), x_ticks=(10, 50, 10, 400), y_range=None, y_tick=2,
@@ -5,7 +5,6 @@ __author__ = 'Bruno Stuyts'
 
 # Native Python packages
 import warnings
-from copy import deepcopy
 
 # 3rd party packages
 import numpy as np
@@ -262,6 +261,131 @@ LCPC_FACTORS = {
     }
 }
 
+LCPC_FACTOR_GROUPS = {
+    _factor: list(LCPC_FACTORS[_factor].keys()) for _factor in LCPC_FACTORS.keys()
+}
+
+# Factors as arrays with the pile groups along the first axis and the soil types of LCPC_SOILTYPES_DETAIL along the second axis
+LCPC_FACTOR_ARRAYS = {
+    _factor: np.array([
+        [LCPC_FACTORS[_factor][_group][_soiltype] for _soiltype in LCPC_SOILTYPES_DETAIL]
+        for _group in LCPC_FACTOR_GROUPS[_factor]]) for _factor in LCPC_FACTORS.keys()
+}
+
+
+def soiltype_lcpc_codes(qc, soiltype):
+    """
+    Vectorised classification of the soil type according to the LCPC method tables. The classification
+    is identical to ``LCPCAxcapCalculation.soiltype_lcpc`` but integer codes are returned. The codes are the indices
+    of the detailed soil types in ``LCPC_SOILTYPES_DETAIL`` and can be used to index ``LCPC_FACTOR_ARRAYS``.
+
+    :param qc: Array with cone resistance values [MPa]
+    :param soiltype: Array with soil types (select from ``LCPC_SOILTYPES``)
+    :returns: Array with integer codes of the detailed soil types
+    """
+    qc = np.asarray(qc, dtype=float)
+    soiltype = np.asarray(soiltype, dtype=object)
+
+    def _code(name):
+        return LCPC_SOILTYPES_DETAIL.index(name)
+
+    with np.errstate(invalid='ignore'):
+        _clay = np.select(
+            [qc < 1, (qc <= 1) & (qc < 5)],
+            [_code("Soft clay and mud"), _code("Moderately compact clay")],
+            _code("Compact to stiff clay"))
+        _silt = np.where(qc <= 5, _code("Silt"), _code("Compact silt"))
+        _sand = np.select(
+            [qc <= 5, (5 < qc) & (qc <= 12)],
+            [_code("Loose sand"), _code("Moderately compact sand")],
+            _code("Compact to very compact sand"))
+        _chalk = np.where(qc <= 5, _code("Soft chalk"), _code("Weathered to fragmented chalk"))
+        _gravel = np.where(
+            (5 < qc) & (qc <= 12), _code("Moderately compact gravel"), _code("Compact to very compact gravel"))
+        if ((soiltype == 'Gravel') & (qc <= 5)).any():
+            raise ValueError("qc < 5 not defined for gravel")
+
+    _unknown = ~np.isin(soiltype, LCPC_SOILTYPES)
+    if _unknown.any():
+        raise ValueError("Soil type %s not recognised. Needs to be one of %s" % (
+            str(soiltype[_unknown][0]), str(LCPC_SOILTYPES)))
+
+    return np.select(
+        [soiltype == 'Clay', soiltype == 'Silt', soiltype == 'Sand', soiltype == 'Chalk'],
+        [_clay, _silt, _sand, _chalk], _gravel)
+
+
+def qca_lcpc(depth, qc, diameters, window_factor=1.5, lower_factor=0.7, upper_factor=1.3, max_chunk_size=1000000):
+    """
+    Calculates the depth-averaged cone resistance according to the LCPC method for one or more pile diameters.
+
+    For every depth, the average cone resistance :math:`q'_{ca}` of the points in a window from 1.5D above to
+    1.5D below the considered depth is calculated. Points with cone resistance lower than 0.7 times or higher than
+    1.3 times this average are left out and the average is recalculated using the remaining points to obtain :math:`q_{ca}`.
+
+    The depths are sorted once and the window bounds for every depth follow from a binary search in the sorted
+    depths. The averages before and after clipping are calculated as masked sums over the values of each window.
+    Windows with the same number of points are processed together, in chunks of rows to limit memory use.
+    Each window is summed separately (rather than using cumulative sums over the entire profile), so round-off
+    errors do not change the points retained at the clipping bounds. NaN values of cone resistance are ignored.
+
+    :param depth: List or Numpy array with depths [m]
+    :param qc: List or Numpy array with cone resistance values [MPa] - same length as depth array
+    :param diameters: Pile diameter or list of pile diameters [m]
+    :param window_factor: Multiplier on the diameter for the half-width of the averaging window (default=1.5)
+    :param lower_factor: Points below this factor times the average are left out (default=0.7)
+    :param upper_factor: Points above this factor times the average are left out (default=1.3)
+    :param max_chunk_size: Maximum number of window entries processed at once for the clipping step (default=1000000)
+    :returns: Dictionary with keys ``'qca prime [MPa]'`` and ``'qca [MPa]'``. The arrays have the pile diameters along the first axis and the depths (in the order specified) along the second axis.
+    """
+    depth = np.asarray(depth, dtype=float)
+    qc = np.asarray(qc, dtype=float)
+    diameters = np.atleast_1d(np.asarray(diameters, dtype=float))
+    if depth.__len__() != qc.__len__():
+        raise ValueError("depth and qc arrays need to have the same length!")
+
+    _order = np.argsort(depth, kind='stable')
+    _z = depth[_order]
+    _qc = qc[_order]
+    _no_points = _z.__len__()
+
+    qca_prime = np.full((diameters.__len__(), _no_points), np.nan)
+    qca = np.full((diameters.__len__(), _no_points), np.nan)
+
+    for k, _diameter in enumerate(diameters):
+        # Window contains depths strictly between z - 1.5D and z + 1.5D
+        _start = np.searchsorted(_z, _z - window_factor * _diameter, side='right')
+        _end = np.searchsorted(_z, _z + window_factor * _diameter, side='left')
+
+        _length = _end - _start
+        _mean = np.full(_no_points, np.nan)
+        _qca = np.full(_no_points, np.nan)
+        # Windows with the same number of points are summed together, each row is summed in the same order
+        # as a direct summation over the window
+        for _width in np.unique(_length[_length > 0]):
+            _window_rows = np.where(_length == _width)[0]
+            _chunk = max(max_chunk_size // _width, 1)
+            for i in range(0, _window_rows.__len__(), _chunk):
+                _rows = _window_rows[i:i + _chunk]
+                _values = _qc[_start[_rows, np.newaxis] + np.arange(_width)[np.newaxis, :]]
+                _in_window = ~np.isnan(_values)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    _mean[_rows] = np.where(_in_window, _values, 0.0).sum(axis=1) / _in_window.sum(axis=1)
+                _keep = _in_window & \
+                    (_values >= lower_factor * _mean[_rows, np.newaxis]) & \
+                    (_values <= upper_factor * _mean[_rows, np.newaxis])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    _qca[_rows] = np.where(_keep, _values, 0.0).sum(axis=1) / _keep.sum(axis=1)
+
+        qca_prime[k, _order] = _mean
+        qca[k, _order] = _qca
+
+    return {
+        'qca prime [MPa]': qca_prime,
+        'qca [MPa]': qca
+    }
+
+
 class LCPCAxcapCalculation(object):
 
     def __init__(self, depth, qc, diameter_pile, group_base, group_shaft, diameter_shaft=np.nan):
@@ -397,22 +521,61 @@ class LCPCAxcapCalculation(object):
 
             Cone resistance averaging procedure
 
+        The averaging is carried out by ``qca_lcpc``, which can also be used directly to calculate the averaged
+        cone resistance for several pile diameters at once.
+
         :returns Stored the average cone resistance for the end bearing calculation in the dataframe with calculation data
         """
-        for i, row in self.calculation_data.iterrows():
-            try:
-                _qc_df = deepcopy(self.calculation_data[
-                    (self.calculation_data["z [m]"] > row["z [m]"] - 1.5 * self.diameter_base) &
-                    (self.calculation_data["z [m]"] < row["z [m]"] + 1.5 * self.diameter_base)])
-                _qc_df.reset_index(drop=True, inplace=True)
-                _qc_mean = _qc_df["qc [MPa]"].mean()
-                self.calculation_data.loc[i, "qca prime [MPa]"] = _qc_mean
-                for j, point in _qc_df.iterrows():
-                    if (point["qc [MPa]"] < 0.7 * _qc_mean) or (point["qc [MPa]"] > 1.3 * _qc_mean):
-                        _qc_df.loc[j, "qc [MPa]"] = np.nan
-                self.calculation_data.loc[i, "qca [MPa]"] = _qc_df["qc [MPa]"].mean()
-            except:
-                self.calculation_data.loc[i, "qca [MPa]"] = np.nan
+        _qca = qca_lcpc(
+            depth=self.calculation_data["z [m]"],
+            qc=self.calculation_data["qc [MPa]"],
+            diameters=self.diameter_base)
+        self.calculation_data["qca prime [MPa]"] = _qca["qca prime [MPa]"][0]
+        self.calculation_data["qca [MPa]"] = _qca["qca [MPa]"][0]
+
+    def _factors(self, factor, groups):
+        """
+        Returns the factors for all rows of the calculation data (second axis) and the selected pile groups (first axis)
+        """
+        _codes = soiltype_lcpc_codes(
+            qc=self.calculation_data["qc [MPa]"], soiltype=self.calculation_data["Soil type"])
+        for _group in groups:
+            if _group not in LCPC_FACTOR_GROUPS[factor]:
+                raise ValueError("Pile group %s not recognised for %s. Select from %s" % (
+                    _group, factor, str(LCPC_FACTOR_GROUPS[factor])))
+        _group_indices = [LCPC_FACTOR_GROUPS[factor].index(_group) for _group in groups]
+        return LCPC_FACTOR_ARRAYS[factor][np.array(_group_indices)[:, np.newaxis], _codes[np.newaxis, :]]
+
+    def _base_resistance(self, groups):
+        """
+        Returns unit base resistance [MPa] and base resistance [kN] for the selected pile groups (first axis)
+        """
+        _area_base = 0.25 * np.pi * (self.diameter_base ** 2)
+        _qb = self._factors('kc', groups) * np.array(self.calculation_data["qca [MPa]"], dtype=float)
+        return _qb, 1e3 * _area_base * _qb
+
+    def _shaft_resistance(self, groups, careful_execution=False):
+        """
+        Returns unit shaft friction [kPa], limiting unit shaft friction [kPa] and shaft resistance [kN]
+        for the selected pile groups (first axis). The values for the first row are NaN.
+        """
+        if careful_execution:
+            _fslim_key = "fslim careful execution"
+        else:
+            _fslim_key = "fslim standard"
+
+        _qc = np.array(self.calculation_data["qc [MPa]"], dtype=float)
+        _dz = np.array(self.calculation_data["z [m]"].diff(), dtype=float)
+        _ignore = np.array(self.calculation_data["Ignore shaft friction"], dtype=bool)
+        _fs_lim = self._factors(_fslim_key, groups).astype(float)
+        _fs = np.where(
+            _ignore, 0, np.minimum(1e3 * _qc / self._factors('alpha', groups), _fs_lim))
+        _fs_lim[:, _ignore] = np.nan
+        _fs[:, 0] = np.nan
+        _fs_lim[:, 0] = np.nan
+        _Qs = np.full(_fs.shape, np.nan)
+        _Qs[:, 1:] = np.cumsum(_dz[1:] * _fs[:, 1:] * np.pi * self.diameter_shaft, axis=1)
+        return _fs, _fs_lim, _Qs
 
     def calculate_base_resistance(self):
         """
@@ -424,6 +587,8 @@ class LCPCAxcapCalculation(object):
             Q_b = A_b \\cdot q_b
 
         The factors are taken according to the soil and pile type specified.
+        The calculation is vectorised, the factors are taken from ``LCPC_FACTOR_ARRAYS`` using the soil type codes
+        from ``soiltype_lcpc_codes``.
 
         .. figure:: images/base_factors_LCPC.png
             :figwidth: 500.0
@@ -435,14 +600,9 @@ class LCPCAxcapCalculation(object):
 
         :return: Adds columns ``"qb [MPa]"`` and ``"Qb [kN]"`` to the dataframe with calculation results.
         """
-        _area_base = 0.25 * np.pi * (self.diameter_base ** 2)
-
-        for i, row in self.calculation_data.iterrows():
-            _soiltype = self.soiltype_lcpc(qc=row["qc [MPa]"], soiltype=row["Soil type"])
-            self.calculation_data.loc[i, "qb [MPa]"] = \
-                LCPC_FACTORS['kc'][self.group_base][_soiltype] * row["qca [MPa]"]
-            self.calculation_data.loc[i, "Qb [kN]"] = \
-                1e3 * _area_base * LCPC_FACTORS['kc'][self.group_base][_soiltype] * row["qca [MPa]"]
+        _qb, _Qb = self._base_resistance(groups=[self.group_base, ])
+        self.calculation_data["qb [MPa]"] = _qb[0]
+        self.calculation_data["Qb [kN]"] = _Qb[0]
 
     def calculate_shaft_resistance(self, careful_execution=False):
         """
@@ -456,6 +616,8 @@ class LCPCAxcapCalculation(object):
             Q_s = \\pi D \\int_{0}^{z} f_s(z) dz
 
         The factors are taken according to the soil and pile type specified.
+        The calculation is vectorised, the factors are taken from ``LCPC_FACTOR_ARRAYS`` using the soil type codes
+        from ``soiltype_lcpc_codes``.
 
         .. figure:: images/shaft_factors_LCPC.png
             :figwidth: 700.0
@@ -467,28 +629,64 @@ class LCPCAxcapCalculation(object):
         :return: Adds columns ``"fs [kPa]"``, ``"Fs [kN/m]"`` and ``"Qs [kN]"`` to the dataframe with calculation results.
         """
         self.calculation_data["dz [m]"] = self.calculation_data["z [m]"].diff()
-        if careful_execution:
-            _fslim_key = "fslim careful execution"
-        else:
-            _fslim_key = "fslim standard"
+        _fs, _fs_lim, _Qs = self._shaft_resistance(
+            groups=[self.group_shaft, ], careful_execution=careful_execution)
+        self.calculation_data["fs [kPa]"] = _fs[0]
+        self.calculation_data["fs lim [kPa]"] = _fs_lim[0]
+        self.calculation_data["Fs [kN/m]"] = _fs[0] * np.pi * self.diameter_shaft
+        self.calculation_data["Qs [kN]"] = _Qs[0]
+
+    def calculate_resistance_pilegroups(self, groups_base=("I", "II"), groups_shaft=("IA", "IB", "IIA", "IIB"),
+                                        careful_execution=False):
+        """
+        Calculates the base resistance for several base groups and the shaft resistance for several shaft groups
+        in one pass. This allows comparing pile types on the same CPT. The averaged cone resistance needs to be
+        calculated first (``qca_calculation``).
+
+        :param groups_base: Pile groups for the base factors (default=all groups ``("I", "II")``)
+        :param groups_shaft: Pile groups for the shaft factors (default=all groups ``("IA", "IB", "IIA", "IIB")``)
+        :param careful_execution: Boolean determining whether the limiting shaft friction for careful execution is used (default=False)
+        :return: Sets the attribute ``pilegroup_resistance``, a dataframe with the depth and the columns ``"qb group <group> [MPa]"`` and ``"Qb group <group> [kN]"`` for every base group and ``"fs group <group> [kPa]"`` and ``"Qs group <group> [kN]"`` for every shaft group
+        """
+        _qb, _Qb = self._base_resistance(groups=groups_base)
+        _fs, _fs_lim, _Qs = self._shaft_resistance(groups=groups_shaft, careful_execution=careful_execution)
+        self.pilegroups_base = list(groups_base)
+        self.pilegroups_shaft = list(groups_shaft)
+        self.pilegroup_resistance = pd.DataFrame({"z [m]": np.array(self.calculation_data["z [m]"])})
+        for i, _group in enumerate(groups_base):
+            self.pilegroup_resistance["qb group %s [MPa]" % _group] = _qb[i]
+            self.pilegroup_resistance["Qb group %s [kN]" % _group] = _Qb[i]
+        for i, _group in enumerate(groups_shaft):
+            self.pilegroup_resistance["fs group %s [kPa]" % _group] = _fs[i]
+            self.pilegroup_resistance["Qs group %s [kN]" % _group] = _Qs[i]
+
+    def get_axialpileresistance_pilegroups(self, pile_penetration):
+        """
+        Returns the shaft resistance, base resistance and total resistance at the selected depth for all combinations
+        of the base and shaft groups calculated with ``calculate_resistance_pilegroups``.
 
-        _Qs = 0
-        for i, row in self.calculation_data.iterrows():
-            _soiltype = self.soiltype_lcpc(qc=row["qc [MPa]"], soiltype=row["Soil type"])
-            if i > 0:
-                if row["Ignore shaft friction"]:
-                    _fs = 0
-                    _fs_lim = np.nan
-                else:
-                    _fs_lim = LCPC_FACTORS[_fslim_key][self.group_shaft][_soiltype]
-                    _fs = min(
-                        1e3 * row["qc [MPa]"] / LCPC_FACTORS['alpha'][self.group_shaft][_soiltype],
-                        _fs_lim)
-                self.calculation_data.loc[i, "fs [kPa]"] = _fs
-                self.calculation_data.loc[i, "fs lim [kPa]"] = _fs_lim
-                self.calculation_data.loc[i, "Fs [kN/m]"] = _fs * np.pi * self.diameter_shaft
-                _Qs += row["dz [m]"] * _fs * np.pi * self.diameter_shaft
-                self.calculation_data.loc[i, "Qs [kN]"] = _Qs
+        :param pile_penetration: Pile penetration [m]
+        :return: Dataframe with the columns ``"Group base"``, ``"Group shaft"``, ``"Rs [kN]"``, ``"Rb [kN]"`` and ``"Rc [kN]"``
+        """
+        if pile_penetration > self.pilegroup_resistance["z [m]"].max():
+            raise ValueError("Pile penetration should be less than the maximum CPT depth. Actually, 1.5D of data is required below the tip depth.")
+        _result = []
+        for _group_base in self.pilegroups_base:
+            _Rb = np.interp(
+                pile_penetration, self.pilegroup_resistance["z [m]"],
+                self.pilegroup_resistance["Qb group %s [kN]" % _group_base])
+            for _group_shaft in self.pilegroups_shaft:
+                _Rs = np.interp(
+                    pile_penetration, self.pilegroup_resistance["z [m]"],
+                    self.pilegroup_resistance["Qs group %s [kN]" % _group_shaft])
+                _result.append({
+                    "Group base": _group_base,
+                    "Group shaft": _group_shaft,
+                    "Rs [kN]": _Rs,
+                    "Rb [kN]": _Rb,
+                    "Rc [kN]": _Rs + _Rb
+                })
+        return pd.DataFrame(_result)
 
     def get_axialpileresistance(self, pile_penetration):
         """
@@ -4,6 +4,7 @@
 __author__ = 'Bruno Stuyts'
 
 # Native Python packages
+import warnings
 
 # 3rd party packages
 import numpy as np
@@ -13,6 +14,39 @@ from scipy.integrate import cumulative_trapezoid
 from groundhog.general.validation import Validator
 
 
+def _linear_recursion(a, b, initial):
+    """
+    Evaluates the first-order linear recursion :math:`x_i = a_i \\cdot x_{i-1} + b_i` for all scenarios at once.
+    The recursion is written as a scaled cumulative sum using the cumulative product of the coefficients :math:`a_i`.
+    The depth range is split in segments to keep the cumulative products within the floating point range.
+    For non-positive coefficients, the recursion is evaluated step by step.
+
+    :param a: Array with the coefficients :math:`a_i` (length n - 1 or scenarios x (n - 1))
+    :param b: Array with the terms :math:`b_i` (length n - 1 or scenarios x (n - 1))
+    :param initial: Initial value :math:`x_0` (scalar or array with a value per scenario)
+    :return: Array with the values :math:`x_i` (scenarios x n)
+    """
+    b = np.atleast_2d(np.asarray(b, dtype=float))
+    a = np.broadcast_to(np.atleast_2d(np.asarray(a, dtype=float)), b.shape)
+    result = np.zeros((b.shape[0], b.shape[1] + 1))
+    result[:, 0] = initial
+    if (a <= 0).any():
+        for i in range(b.shape[1]):
+            result[:, i + 1] = a[:, i] * result[:, i] + b[:, i]
+        return result
+    _log_a = np.log(a)
+    _log_product = np.cumsum(_log_a, axis=1)
+    # The total variation of the logarithm of the cumulative products is limited in each segment
+    _variation = np.cumsum(np.abs(_log_a).sum(axis=0))
+    _bounds = np.flatnonzero(np.diff(np.floor(_variation / 200))) + 1
+    for _start, _end in zip(np.append(0, _bounds), np.append(_bounds, b.shape[1])):
+        _product = np.exp(_log_product[:, _start:_end] - _log_product[:, _start:_start + 1])
+        _terms = b[:, _start:_end] / _product
+        _terms[:, 0] = a[:, _start] * result[:, _start] + b[:, _start]
+        result[:, _start + 1:_end + 1] = _product * np.cumsum(_terms, axis=1)
+    return result
+
+
 NEGATIVESKINFRICTION_PILEGROUP_ZEEVAERTDEBEER = {
     'depths': {'type': 'list', 'elementtype': 'float', 'order': 'ascending', 'unique': True, 'empty_allowed': False},
     'effective_unit_weights': {'type': 'list', 'elementtype': 'float', 'order': None, 'unique': False,
@@ -102,14 +136,11 @@ def negativeskinfriction_pilegroup_zeevaertdebeer(
         y=np.array(effective_unit_weights),
         x=np.array(depths))) + surcharge
 
-    sigma_v_neg_fd = np.zeros(len(depths))
-    sigma_v_neg_fd[0] = surcharge
-    for i, z in enumerate(depths):
-        if i > 0:
-            sigma_v_neg_fd[i] = np.diff(depths)[0] * (
-                    effective_unit_weights[i] -
-                    m_values[i] * sigma_v_neg_fd[i - 1] +
-                    (sigma_v_neg_fd[i - 1] / np.diff(depths)[0]))
+    _dz = np.diff(depths)
+    sigma_v_neg_fd = _linear_recursion(
+        a=1 - m_values[1:] * _dz,
+        b=_dz * np.array(effective_unit_weights)[1:],
+        initial=surcharge)[0]
     _group_effective_stress = sigma_v_neg_fd
     _negative_skin_friction_profile_single = \
         np.append(0, cumulative_trapezoid(_virgin_effective_stress, depths)) * \
@@ -130,4 +161,142 @@ def negativeskinfriction_pilegroup_zeevaertdebeer(
         'negative_skin_friction_profile_group [kN]': _negative_skin_friction_profile_group,
         'negative_skin_friction [kN]': _negative_skin_friction,
         'negative_skin_friction_group [kN]': _negative_skin_friction_group,
-    }
\ No newline at end of file
+    }
+
+
+def negativeskinfriction_zeevaertdebeer_scenarios(
+        depths, effective_unit_weights, lateral_earth_pressure_coefficients, interface_friction_angles,
+        diameter, diameter_influence, surcharges=0, drawdowns=0, pile_load=0, base_resistance=0,
+        water_depth=0, unit_weight_water=10):
+    """
+    Calculates the negative skin friction according to the method of Zeevaert en De Beer for a batch of
+    scenarios in a single call. Scenarios are defined by combinations of the surcharge (e.g. fill height multiplied
+    by the fill unit weight), the groundwater drawdown, the diameter of the zone of influence (pile spacing in the group),
+    the pile diameter, the pile head load and the base resistance. All scenario inputs are broadcast against
+    each other. The layer thicknesses are calculated once and the finite difference recursion
+    of ``negativeskinfriction_pilegroup_zeevaertdebeer`` is evaluated for all depths and scenarios using cumulative
+    products and sums.
+
+    A drawdown lowers the water table from the reference water depth. The soil in the drained zone is assumed
+    to remain saturated and its unit weight is increased by the unit weight of water.
+
+    The neutral plane is determined with the force equilibrium method. The pile head load and the
+    accumulated negative skin friction above the neutral plane are in equilibrium with the base resistance and the
+    positive shaft resistance below the neutral plane. Unit shaft friction is calculated with the same
+    effective stress profile for the negative and positive shaft resistance. The drag load is the accumulated negative
+    skin friction at the neutral plane. When the base resistance exceeds the sum of the pile head load and total
+    shaft friction, the neutral plane is at the pile tip. When the pile head load exceeds the sum of the base
+    resistance and the total shaft friction, no neutral plane exists and NaN is returned.
+
+    .. math::
+        \\sigma_{v,i}^{\\prime} = \\Delta z_i \\cdot \\gamma_i^{\\prime} + \\left( 1 - m_i \\cdot \\Delta z_i \\right) \\cdot \\sigma_{v,i-1}^{\\prime}
+
+        F_n(z) = \\int_0^z \\pi \\cdot D_p \\cdot K_0 \\cdot \\tan \\delta^{\\prime} \\cdot \\sigma_v^{\\prime} dz
+
+        Q + F_n(z_{np}) = R_b + F_n(L) - F_n(z_{np})
+
+    :param depths: Array with depths used for the calculation (:math:`z`) [:math:`m`]
+    :param effective_unit_weights: Array with effective unit weights for the reference water depth (:math:`\\gamma^{\\prime}`) [:math:`kN/m3`]
+    :param lateral_earth_pressure_coefficients: Array with lateral earth pressure coefficient at each depth (:math:`K_0`) [:math:`-`]
+    :param interface_friction_angles: Array with interface friction angles (:math:`\\delta^{\\prime}`) [:math:`deg`]
+    :param diameter: Pile diameter (:math:`D_p`), scalar or array with a value per scenario [:math:`m`]
+    :param diameter_influence: Diameter of the zone of influence for negative skin friction (:math:`D_n`), scalar or array with a value per scenario [:math:`m`]
+    :param surcharges: Surcharge applied on top of the soil mass (:math:`p_0^{\\prime}`), scalar or array with a value per scenario [:math:`kPa`] (default=0)
+    :param drawdowns: Lowering of the water table below the reference water depth, scalar or array with a value per scenario [:math:`m`] (default=0)
+    :param pile_load: Permanent load on the pile head (:math:`Q`), scalar or array with a value per scenario [:math:`kN`] (default=0)
+    :param base_resistance: Base resistance of the pile (:math:`R_b`), scalar or array with a value per scenario [:math:`kN`] (default=0)
+    :param water_depth: Depth of the reference water table [:math:`m`] (default=0)
+    :param unit_weight_water: Unit weight of water [:math:`kN/m3`] (default=10)
+
+    :returns: Dictionary with the following keys:
+
+        - 'surcharge [kPa]': Surcharge for each scenario
+        - 'drawdown [m]': Drawdown for each scenario
+        - 'virgin_effective_stress [kPa]': Effective stress profiles without the effect of soil hanging on the pile (scenarios along the rows, depths along the columns)
+        - 'group_effective_stress [kPa]': Effective stress profiles accounting for the effect of soil hanging on the pile (scenarios along the rows, depths along the columns)
+        - 'negative_skin_friction_profile_single [kN]': Cumulative negative skin friction for a single pile (scenarios along the rows, depths along the columns)
+        - 'negative_skin_friction_profile_group [kN]': Cumulative negative skin friction for a pile in the group (scenarios along the rows, depths along the columns)
+        - 'negative_skin_friction [kN]': Total negative skin friction for a single pile for each scenario
+        - 'negative_skin_friction_group [kN]': Total negative skin friction for a pile in the group for each scenario
+        - 'neutral_plane_single [m]': Depth of the neutral plane for a single pile for each scenario
+        - 'neutral_plane_group [m]': Depth of the neutral plane for a pile in the group for each scenario
+        - 'drag_load_single [kN]': Drag load for a single pile for each scenario
+        - 'drag_load_group [kN]': Drag load for a pile in the group for each scenario
+
+    Reference - Zeevaert - De Beer (1966)
+
+    """
+    depths = np.asarray(depths, dtype=float)
+    effective_unit_weights = np.asarray(effective_unit_weights, dtype=float)
+    lateral_earth_pressure_coefficients = np.asarray(lateral_earth_pressure_coefficients, dtype=float)
+    interface_friction_angles = np.asarray(interface_friction_angles, dtype=float)
+    if depths.__len__() != effective_unit_weights.__len__() or \
+            depths.__len__() != lateral_earth_pressure_coefficients.__len__() or \
+            depths.__len__() != interface_friction_angles.__len__():
+        raise ValueError("All array inputs should have equal lengths")
+    if (np.diff(depths) <= 0).any():
+        raise ValueError("Depths should be unique and in ascending order")
+    surcharges, drawdowns, diameter, diameter_influence, pile_load, base_resistance = [
+        np.atleast_1d(_value).astype(float).ravel() for _value in np.broadcast_arrays(
+            surcharges, drawdowns, diameter, diameter_influence, pile_load, base_resistance)]
+    if (diameter_influence < diameter).any():
+        raise ValueError("Diameter of the zone of influence should be greated than the pile diameter")
+    if (drawdowns < 0).any():
+        raise ValueError("Drawdowns should be positive")
+
+    _dz = np.diff(depths)
+    _friction = lateral_earth_pressure_coefficients * np.tan(np.radians(interface_friction_angles))
+    _circumference = np.pi * diameter[:, np.newaxis]
+    _area = 0.25 * np.pi * (diameter_influence[:, np.newaxis] ** 2 - diameter[:, np.newaxis] ** 2)
+
+    # Effective unit weights with the drained zone
+    _drained = (depths[np.newaxis, :] > water_depth) & \
+        (depths[np.newaxis, :] <= water_depth + drawdowns[:, np.newaxis])
+    _unit_weights = effective_unit_weights[np.newaxis, :] + unit_weight_water * _drained
+
+    _virgin_effective_stress = surcharges[:, np.newaxis] + np.append(
+        np.zeros((surcharges.__len__(), 1)),
+        cumulative_trapezoid(y=_unit_weights, x=depths, axis=1), axis=1)
+    _group_effective_stress = _linear_recursion(
+        a=1 - (_friction[1:] * _circumference / _area) * _dz,
+        b=_dz * _unit_weights[:, 1:],
+        initial=surcharges)
+
+    result = {
+        'surcharge [kPa]': surcharges,
+        'drawdown [m]': drawdowns,
+        'virgin_effective_stress [kPa]': _virgin_effective_stress,
+        'group_effective_stress [kPa]': _group_effective_stress,
+    }
+    _scenarios = np.arange(surcharges.__len__())
+    for _key, _stress in zip(['single', 'group'], [_virgin_effective_stress, _group_effective_stress]):
+        _profile = _circumference * np.append(
+            np.zeros((surcharges.__len__(), 1)),
+            cumulative_trapezoid(y=_friction * _stress, x=depths, axis=1), axis=1)
+        _total = _profile[:, -1]
+        # Difference between the downward and upward forces, increasing with depth
+        _balance = (pile_load - base_resistance - _total)[:, np.newaxis] + 2 * _profile
+        _index = np.clip(np.argmax(_balance >= 0, axis=1), 1, depths.__len__() - 1)
+        _lower = _balance[_scenarios, _index - 1]
+        _upper = _balance[_scenarios, _index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _ratio = np.clip(np.where(_upper > _lower, -_lower / (_upper - _lower), 0), 0, 1)
+        _neutral_plane = depths[_index - 1] + _ratio * _dz[_index - 1]
+        _drag_load = _profile[_scenarios, _index - 1] + _ratio * (
+            _profile[_scenarios, _index] - _profile[_scenarios, _index - 1])
+        _neutral_plane[_balance[:, -1] < 0] = depths[-1]
+        _drag_load[_balance[:, -1] < 0] = _total[_balance[:, -1] < 0]
+        _failure = _balance[:, 0] > 0
+        if _failure.any():
+            warnings.warn(
+                "Pile head load exceeds the pile resistance for %i scenarios, no neutral plane calculated" %
+                _failure.sum())
+        _neutral_plane[_failure] = np.nan
+        _drag_load[_failure] = np.nan
+        result['negative_skin_friction_profile_%s [kN]' % _key] = _profile
+        result['neutral_plane_%s [m]' % _key] = _neutral_plane
+        result['drag_load_%s [kN]' % _key] = _drag_load
+    result['negative_skin_friction [kN]'] = result['negative_skin_friction_profile_single [kN]'][:, -1]
+    result['negative_skin_friction_group [kN]'] = result['negative_skin_friction_profile_group [kN]'][:, -1]
+
+    return result
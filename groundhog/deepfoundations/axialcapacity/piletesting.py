@@ -4,9 +4,11 @@
 __author__ = "Bruno Stuyts"
 
 # Native Python packages
+from concurrent.futures import ProcessPoolExecutor
 
 # 3rd party packages
 import numpy as np
+import pandas as pd
 from scipy.stats import linregress
 import warnings
 from plotly import subplots
@@ -118,4 +120,129 @@ def piletest_chinkondler(loads, settlements, no_discard_points=1, max_settlement
         'Q [kN]': _reconstruction_Q,
         'construction_fig': construction_fig,
         'extrapolation_fig': extrapolation_fig
-    }
\ No newline at end of file
+    }
+
+
+def piletest_chinkondler_batch(
+        tests, test_column='Test', load_column='Load [kN]', settlement_column='Settlement [mm]',
+        no_discard_points=1, selected_settlement=40, max_settlement=50, create_figs=False, processes=None):
+    """
+    Interprets a database of pile load tests with the procedure by Chin-Kondler. The load tests are provided as
+    a dataframe in long format with a row for each point of the load-settlement curves. The straight line
+    through the points :math:`s/Q` vs :math:`s` is fitted with least squares for all tests at once using sums
+    per test. The results are identical to those of ``piletest_chinkondler``, except for the pile resistance
+    at the selected displacement which is calculated directly from the hyperbola.
+
+    Points are used in the order in which they appear in the dataframe. The first ``no_discard_points`` points
+    of each test are discarded and points with zero load are not used for the fitting. Tests with less
+    than three points remaining do not have the standard errors of the fit and tests with less than two points
+    remaining return NaN values.
+
+    The figures for the Chin-Kondler construction are only created when ``create_figs`` is True. They are
+    calculated with ``piletest_chinkondler`` for each test. The tests can be distributed over a pool of worker processes.
+
+    :param tests: Dataframe with the test identifier, load and settlement for each point of the load-settlement curves. Unload-reload loops should be removed
+    :param test_column: Name of the column with the test identifiers (default='Test')
+    :param load_column: Name of the column with the loads (:math:`Q`) [kN] (default='Load [kN]')
+    :param settlement_column: Name of the column with the settlements (:math:`s`) [mm] (default='Settlement [mm]')
+    :param no_discard_points: Number of points at the start of each curve to discard for the fitting of the straight line (default=1)
+    :param selected_settlement: Settlement at which pile capacity is calculated (e.g. 10% of OD) [mm] (default=40mm)
+    :param max_settlement: Maximum settlement used for plotting the reconstructed pile head load-settlement curve [mm] (default=50mm)
+    :param create_figs: Boolean determining whether the figures for the Chin-Kondler construction are created for each test (default=False)
+    :param processes: Number of worker processes (default=None for sequential processing in the current process)
+
+    .. math::
+        \\frac{s}{Q} = a + b \\cdot s
+
+        Q_{\\text{ult}} = 1 / b
+
+        Q_{s=s_\\text{selected}} = \\frac{s_\\text{selected}}{a + b \\cdot s_\\text{selected}}
+
+    :returns: Dataframe with a row for each test and the following columns:
+
+        - Test identifier (column name ``test_column``)
+        - 'Number of points [-]': Number of points used for the linear regression
+        - 'intercept [mm/kN]': Coefficient :math:`a` from the linear regression [mm/kN]
+        - 'slope [1/kN]': Slope :math:`b` for the linear regression [1/kN]
+        - 'Correlation coefficient [-]': Pearson correlation coefficient for the points used for the construction
+        - 'Standard error slope [1/kN]': Standard error of the slope :math:`b` [1/kN]
+        - 'Standard error intercept [mm/kN]': Standard error of the intercept :math:`a` [mm/kN]
+        - 'Qmax [kN]': Ultimate pile resistance (fully mobilised shaft and base) (:math:`Q_{\\text{ult}}`) [kN]
+        - 'Qdisp [kN]': Pile resistance at the selected displacement level (:math:`Q_{s=s_\\text{selected}}`) [kN]
+        - 'construction_fig' and 'extrapolation_fig': Figures of ``piletest_chinkondler`` (only when ``create_figs`` is True)
+    """
+    for _column in [test_column, load_column, settlement_column]:
+        if _column not in tests.columns:
+            raise ValueError("Column %s not found in the dataframe with load tests" % _column)
+    _kwargs = dict(
+        test_column=test_column, load_column=load_column, settlement_column=settlement_column,
+        no_discard_points=no_discard_points, selected_settlement=selected_settlement,
+        max_settlement=max_settlement, create_figs=create_figs)
+
+    _codes, _ids = pd.factorize(tests[test_column], sort=False)
+    if processes is not None:
+        _chunks = [_chunk for _chunk in np.array_split(np.arange(_ids.__len__()), processes) if _chunk.__len__()]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            _futures = [
+                executor.submit(piletest_chinkondler_batch, tests[np.isin(_codes, _chunk)], **_kwargs)
+                for _chunk in _chunks]
+            _results = [_future.result() for _future in _futures]
+        return pd.concat(_results, ignore_index=True)
+
+    _no_tests = _ids.__len__()
+    _loads = tests[load_column].to_numpy(dtype=float)
+    _settlements = tests[settlement_column].to_numpy(dtype=float)
+
+    # Position of each point within its test
+    _order = np.argsort(_codes, kind='stable')
+    _starts = np.append(0, np.cumsum(np.bincount(_codes, minlength=_no_tests)))[:-1]
+    _rank = np.empty(_codes.__len__(), dtype=int)
+    _rank[_order] = np.arange(_codes.__len__()) - _starts[_codes[_order]]
+
+    _selected = (_rank >= no_discard_points) & (_loads != 0) & np.isfinite(_loads) & np.isfinite(_settlements)
+    _group = _codes[_selected]
+    _x = _settlements[_selected]
+    _y = _settlements[_selected] / _loads[_selected]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _n = np.bincount(_group, minlength=_no_tests).astype(float)
+        _mean_x = np.bincount(_group, weights=_x, minlength=_no_tests) / _n
+        _mean_y = np.bincount(_group, weights=_y, minlength=_no_tests) / _n
+        _dx = _x - _mean_x[_group]
+        _dy = _y - _mean_y[_group]
+        _sxx = np.bincount(_group, weights=_dx ** 2, minlength=_no_tests)
+        _syy = np.bincount(_group, weights=_dy ** 2, minlength=_no_tests)
+        _sxy = np.bincount(_group, weights=_dx * _dy, minlength=_no_tests)
+        _slope = _sxy / _sxx
+        _intercept = _mean_y - _slope * _mean_x
+        _r = np.clip(_sxy / np.sqrt(_sxx * _syy), -1, 1)
+        _stderr = np.sqrt((1 - _r ** 2) * _syy / _sxx / (_n - 2))
+        _intercept_stderr = _stderr * np.sqrt(_sxx / _n + _mean_x ** 2)
+        _stderr[_n < 3] = np.nan
+        _intercept_stderr[_n < 3] = np.nan
+        _qmax = 1 / _slope
+        _qdisp = selected_settlement / (_intercept + _slope * selected_settlement)
+    if (_n < 2).any():
+        warnings.warn("Less than two points available for the fitting of %i tests" % (_n < 2).sum())
+
+    result = pd.DataFrame({
+        test_column: _ids,
+        'Number of points [-]': _n.astype(int),
+        'intercept [mm/kN]': _intercept,
+        'slope [1/kN]': _slope,
+        'Correlation coefficient [-]': _r,
+        'Standard error slope [1/kN]': _stderr,
+        'Standard error intercept [mm/kN]': _intercept_stderr,
+        'Qmax [kN]': _qmax,
+        'Qdisp [kN]': _qdisp
+    })
+
+    if create_figs:
+        _figs = [piletest_chinkondler(
+            loads=list(_loads[_codes == i]), settlements=list(_settlements[_codes == i]),
+            no_discard_points=no_discard_points, max_settlement=max_settlement,
+            selected_settlement=selected_settlement, show_fig=False) for i in range(_no_tests)]
+        result['construction_fig'] = [_fig['construction_fig'] for _fig in _figs]
+        result['extrapolation_fig'] = [_fig['extrapolation_fig'] for _fig in _figs]
+
+    return result
@@ -10,7 +10,7 @@ import numpy as np
 
 # Project imports
 from groundhog.siteinvestigation.classification.phaserelations import voidratio_bulkunitweight, porosity_voidratio
-from groundhog.general.validation import Validator
+from groundhog.general.validation import Validator, validation_mask
 
 
 API_UNIT_SHAFT_FRICTION_SAND_RP2GEO = {
@@ -98,6 +98,57 @@ def API_unit_shaft_friction_sand_rp2geo(api_relativedensity, api_soildescription
     }
 
 
+API_UNIT_SHAFT_FRICTION_SAND_RP2GEO_TABLE = {
+    # (api_soildescription, api_relativedensity): (beta, f_s_lim)
+    ("Sand", "Medium dense"): (0.37, 81.0),
+    ("Sand", "Dense"): (0.46, 96.0),
+    ("Sand", "Very dense"): (0.56, 115.0),
+    ("Sand-silt", "Medium dense"): (0.29, 67.0),
+    ("Sand-silt", "Dense"): (0.37, 81.0),
+    ("Sand-silt", "Very dense"): (0.46, 96.0),
+}
+
+
+def API_unit_shaft_friction_sand_rp2geo_array(api_relativedensity, api_soildescription, sigma_vo_eff, fs_limit=False,
+                                              tension_modifier=1.0, **kwargs):
+    """
+    Array version of ``API_unit_shaft_friction_sand_rp2geo``. The inputs can be scalars or arrays
+    which are broadcast to a common shape. Entries with inputs outside the validation ranges or without tabulated
+    values for beta return NaN, as the scalar function does.
+
+    :returns: Dictionary with the same keys as ``API_unit_shaft_friction_sand_rp2geo`` containing arrays
+    """
+    api_relativedensity = np.asarray(api_relativedensity, dtype=object)
+    api_soildescription = np.asarray(api_soildescription, dtype=object)
+    _shape = np.broadcast(api_relativedensity, api_soildescription, np.asarray(sigma_vo_eff)).shape
+    _valid = np.broadcast_to(validation_mask(
+        API_UNIT_SHAFT_FRICTION_SAND_RP2GEO, api_relativedensity=api_relativedensity,
+        api_soildescription=api_soildescription, sigma_vo_eff=sigma_vo_eff,
+        tension_modifier=tension_modifier, **kwargs), _shape)
+    sigma_vo_eff = np.where(_valid, np.asarray(sigma_vo_eff, dtype=float), np.nan)
+
+    beta = np.full(_shape, np.nan)
+    f_s_lim = np.full(_shape, np.nan)
+    for (_description, _density), (_beta, _f_s_lim) in API_UNIT_SHAFT_FRICTION_SAND_RP2GEO_TABLE.items():
+        _mask = np.broadcast_to(
+            (api_soildescription == _description) & (api_relativedensity == _density), _shape) & _valid
+        beta[_mask] = _beta
+        f_s_lim[_mask] = _f_s_lim
+
+    f_s_comp = np.where(
+        np.asarray(fs_limit, dtype=bool), np.minimum(beta * sigma_vo_eff, f_s_lim), beta * sigma_vo_eff)
+    f_s_tens = tension_modifier * f_s_comp
+
+    return {
+        'f_s_comp_out [kPa]': f_s_comp,
+        'f_s_comp_in [kPa]': f_s_comp,
+        'f_s_tens_out [kPa]': f_s_tens,
+        'f_s_tens_in [kPa]': f_s_tens,
+        'f_s_lim [kPa]': f_s_lim,
+        'beta [-]': beta,
+    }
+
+
 API_UNIT_SHAFT_FRICTION_CLAY = {
     'undrained_shear_strength':{'type': 'float','min_value':0.0,'max_value':400.0},
     'sigma_vo_eff':{'type': 'float','min_value':0.0,'max_value':None},
@@ -157,6 +208,33 @@ def API_unit_shaft_friction_clay(undrained_shear_strength, sigma_vo_eff, **kwarg
         'alpha [-]': alpha,
     }
 
+def API_unit_shaft_friction_clay_array(undrained_shear_strength, sigma_vo_eff, **kwargs):
+    """
+    Array version of ``API_unit_shaft_friction_clay``. The inputs can be scalars or arrays
+    which are broadcast to a common shape. Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``API_unit_shaft_friction_clay`` containing arrays
+    """
+    _valid = validation_mask(
+        API_UNIT_SHAFT_FRICTION_CLAY, undrained_shear_strength=undrained_shear_strength, sigma_vo_eff=sigma_vo_eff,
+        **kwargs)
+    undrained_shear_strength = np.where(_valid, np.asarray(undrained_shear_strength, dtype=float), np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        psi = undrained_shear_strength / np.asarray(sigma_vo_eff, dtype=float)
+        alpha = np.where(psi <= 1.0, 0.5 * (psi ** -0.5), 0.5 * (psi ** -0.25))
+
+    f_s = alpha * undrained_shear_strength
+
+    return {
+        'f_s_comp_out [kPa]': f_s,
+        'f_s_comp_in [kPa]': f_s,
+        'f_s_tens_out [kPa]': f_s,
+        'f_s_tens_in [kPa]': f_s,
+        'psi [-]': psi,
+        'alpha [-]': alpha,
+    }
+
 ALMHAMRE_UNITSKINFRICTION_SAND = {
     'qt': {'type': 'float', 'min_value': 0.0, 'max_value': 120.0},
     'sigma_vo_eff': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -256,6 +334,43 @@ def unitskinfriction_sand_almhamre(
     }
 
 
+def unitskinfriction_sand_almhamre_array(
+        qt, sigma_vo_eff, interface_friction_angle, depth, embedded_length,
+        shape_factor_multiplier=80.0, atmospheric_pressure=101.325, fsi_sand_multiplier=0.0132, fsi_sand_exponent=0.13,
+        multiplier_fsres=0.2, multiplier_outside=0.5, multiplier_inside=0.5, **kwargs):
+    """
+    Array version of ``unitskinfriction_sand_almhamre``. The inputs can be scalars or arrays
+    which are broadcast to a common shape. This allows evaluating the friction fatigue for an element
+    at several pile tip depths in a single call. Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``unitskinfriction_sand_almhamre`` containing arrays
+    """
+    _valid = validation_mask(
+        ALMHAMRE_UNITSKINFRICTION_SAND, qt=qt, sigma_vo_eff=sigma_vo_eff,
+        interface_friction_angle=interface_friction_angle, depth=depth, embedded_length=embedded_length,
+        **kwargs)
+    qt = np.where(_valid, np.asarray(qt, dtype=float), np.nan)
+    sigma_vo_eff = np.asarray(sigma_vo_eff, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _f_s_initial = fsi_sand_multiplier * (1000 * qt) * \
+                       ((sigma_vo_eff / atmospheric_pressure) ** fsi_sand_exponent) * \
+                       np.tan(np.radians(interface_friction_angle))
+        _f_s_res = multiplier_fsres * _f_s_initial
+        _shape_factor = np.sqrt(1000 * qt / sigma_vo_eff) / shape_factor_multiplier
+        _fs = _f_s_res + (_f_s_initial - _f_s_res) * \
+              np.exp(_shape_factor * (np.asarray(depth, dtype=float) - np.asarray(embedded_length, dtype=float)))
+
+    return {
+        'f_s_comp_out [kPa]': multiplier_outside * _fs,
+        'f_s_comp_in [kPa]': multiplier_inside * _fs,
+        'f_s_tens_out [kPa]': np.zeros_like(_fs),
+        'f_s_tens_in [kPa]': np.zeros_like(_fs),
+        'f_s_initial [kPa]': _f_s_initial,
+        'f_s_res [kPa]': _f_s_res,
+    }
+
+
 ALMHAMRE_UNITSKINFRICTION_CLAY = {
     'depth': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'embedded_length': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -347,6 +462,40 @@ def unitskinfriction_clay_almhamre(
     }
 
 
+def unitskinfriction_clay_almhamre_array(
+        depth, embedded_length, qt, fs, sigma_vo_eff,
+        shape_factor_multiplier=80.0, multiplier_fsres_1=0.004, multiplier_fsres_2=0.0025, multiplier_fs_initial=1.0,
+        multiplier_outside=1.0, multiplier_inside=1.0, **kwargs):
+    """
+    Array version of ``unitskinfriction_clay_almhamre``. The inputs can be scalars or arrays
+    which are broadcast to a common shape. This allows evaluating the friction fatigue for an element
+    at several pile tip depths in a single call. Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``unitskinfriction_clay_almhamre`` containing arrays
+    """
+    _valid = validation_mask(
+        ALMHAMRE_UNITSKINFRICTION_CLAY, depth=depth, embedded_length=embedded_length, qt=qt, fs=fs,
+        sigma_vo_eff=sigma_vo_eff, **kwargs)
+    qt = np.where(_valid, np.asarray(qt, dtype=float), np.nan)
+    sigma_vo_eff = np.asarray(sigma_vo_eff, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _f_s_initial = np.where(_valid, multiplier_fs_initial * 1000 * np.asarray(fs, dtype=float), np.nan)
+        _f_s_res = multiplier_fsres_1 * (1000 * qt) * (1 - multiplier_fsres_2 * (1000 * qt / sigma_vo_eff))
+        _shape_factor = np.sqrt(1000 * qt / sigma_vo_eff) / shape_factor_multiplier
+        _fs = _f_s_res + (_f_s_initial - _f_s_res) * \
+              np.exp(_shape_factor * (np.asarray(depth, dtype=float) - np.asarray(embedded_length, dtype=float)))
+
+    return {
+        'f_s_comp_out [kPa]': multiplier_outside * _fs,
+        'f_s_comp_in [kPa]': multiplier_inside * _fs,
+        'f_s_tens_out [kPa]': np.zeros_like(_fs),
+        'f_s_tens_in [kPa]': np.zeros_like(_fs),
+        'f_s_initial [kPa]': _f_s_initial,
+        'f_s_res [kPa]': _f_s_res,
+    }
+
+
 SKINFRICTION_METHODS = {
     'API RP2 GEO Sand': API_unit_shaft_friction_sand_rp2geo,
     'API RP2 GEO Clay': API_unit_shaft_friction_clay,
@@ -354,6 +503,13 @@ SKINFRICTION_METHODS = {
     'Alm and Hamre Clay': unitskinfriction_clay_almhamre
 }
 
+SKINFRICTION_METHODS_ARRAY = {
+    'API RP2 GEO Sand': API_unit_shaft_friction_sand_rp2geo_array,
+    'API RP2 GEO Clay': API_unit_shaft_friction_clay_array,
+    'Alm and Hamre Sand': unitskinfriction_sand_almhamre_array,
+    'Alm and Hamre Clay': unitskinfriction_clay_almhamre_array
+}
+
 SKINFRICTION_PARAMETERS = {
     'API RP2 GEO Sand': ['api_relativedensity', 'api_soildescription', 'sigma_vo_eff'],
     'API RP2 GEO Clay': ['undrained_shear_strength', 'sigma_vo_eff'],
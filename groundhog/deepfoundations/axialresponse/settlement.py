@@ -4,9 +4,11 @@
 __author__ = 'Bruno Stuyts'
 
 # Native Python packages
+import warnings
 
 # 3rd party packages
 import numpy as np
+from scipy.linalg import solve_banded
 
 # Project imports
 from groundhog.general.validation import Validator
@@ -144,4 +146,248 @@ def pile_settlement_curves(
             'w [m]': _w_total,
             'F [kN]': _f_total
         }
-    }
\ No newline at end of file
+    }
+
+
+def _mobilisation(w, curve_w, curve_f, antisymmetric=True):
+    """
+    Evaluates a normalised mobilisation curve and its slope for an array of displacements.
+    The curve is constant beyond the last point. For negative displacements, the curve is extended antisymmetrically
+    (t-z curves) or the mobilisation and slope are zero when ``antisymmetric=False`` (q-z curves, no base tension).
+    """
+    _w_abs = np.abs(w)
+    _index = np.clip(np.searchsorted(curve_w, _w_abs, side='right') - 1, 0, curve_w.__len__() - 2)
+    _slope = (curve_f[_index + 1] - curve_f[_index]) / (curve_w[_index + 1] - curve_w[_index])
+    _slope[_w_abs >= curve_w[-1]] = 0
+    _f = np.sign(w) * np.interp(_w_abs, curve_w, curve_f)
+    if not antisymmetric:
+        _slope[w < 0] = 0
+        _f[w < 0] = 0
+    return _f, _slope
+
+
+def pile_loadtransfer(
+        depth_from, depth_to, shaft_resistance, base_resistance, axial_stiffness, loads, diameter,
+        pile_type='driven', tz_curve=None, qz_curve=None, tolerance=1e-6, max_iterations=50):
+    """
+    Calculates the load-settlement curve of an axially loaded pile with the load-transfer method.
+
+    The pile is discretised in elements (e.g. the elements of a ``CalculationGrid``) with the axial stiffness
+    of the pile between the nodes. The shaft resistance of each element is mobilised according to a t-z curve
+    evaluated at the average displacement of the element and is lumped to the element nodes.
+    The base resistance is mobilised according to a q-z curve at the pile tip.
+
+    The nonlinear system of nodal equilibrium equations is solved for each load step with Newton iterations.
+    The tangent stiffness matrix is tridiagonal and is solved as a banded system.
+    The solution of the previous load step is used as the starting point of the next one.
+
+    .. math::
+        \\frac{EA_{i-1}}{L_{i-1}} (w_{i-1} - w_i) - \\frac{EA_{i}}{L_{i}} (w_i - w_{i+1}) = \\frac{1}{2} \\left( T_{i-1}(\\bar{w}_{i-1}) + T_i(\\bar{w}_i) \\right)
+
+        T_i(\\bar{w}_i) = R_{s,i} \\cdot f_{tz}(\\bar{w}_i)
+
+        Q_b(w_{tip}) = R_b \\cdot f_{qz}(w_{tip} / D)
+
+    By default, the normalised shaft and base mobilisation curves of ``pile_settlement_curves`` for the given
+    pile type are used, with the first point of these empirical fits set to zero mobilisation at zero displacement.
+    Custom curves can be provided as dictionaries with the same keys and are used as given, they should start
+    from zero mobilisation at zero displacement. The t-z curves are extended antisymmetrically for negative
+    (upward) displacements. The base cannot carry tension, the q-z curve gives zero resistance for negative
+    displacements.
+
+    Compression load steps exceeding the sum of the fully mobilised shaft and base resistance and tension load steps
+    exceeding the fully mobilised shaft resistance cannot be solved and return NaN values.
+
+    :param depth_from: Array with the top depths of the pile elements, starting at the pile head [m]
+    :param depth_to: Array with the bottom depths of the pile elements, ending at the pile tip [m]
+    :param shaft_resistance: Array with the ultimate shaft resistance of each element [kN]
+    :param base_resistance: Ultimate base resistance [kN]
+    :param axial_stiffness: Axial stiffness of the pile (:math:`EA`), scalar or array with a value per element [kN]
+    :param loads: Array with the pile head loads of the load steps, compression positive and tension negative [kN]
+    :param diameter: Pile diameter used to denormalise the q-z curve [m]
+    :param pile_type: Pile type for the default mobilisation curves - Options: ('driven', 'CFA', 'bored')
+    :param tz_curve: Dictionary with keys 'w [m]' and 'Fs/Fsmax [-]' defining the t-z curve (default=None for the default curve)
+    :param qz_curve: Dictionary with keys 'w/D [-]' and 'Fb/Fbmax [-]' defining the q-z curve (default=None for the default curve)
+    :param tolerance: Tolerance on the sum of the absolute out-of-balance nodal forces, relative to the ultimate resistance (default=1e-6)
+    :param max_iterations: Maximum number of Newton iterations per load step (default=50)
+
+    :returns: Dictionary with the following keys:
+
+        - 'z [m]': Depths of the nodes
+        - 'F [kN]': Pile head loads
+        - 'w head [m]': Pile head settlement for each load step
+        - 'w tip [m]': Pile tip settlement for each load step
+        - 'Fs [kN]': Mobilised shaft resistance for each load step
+        - 'Fb [kN]': Mobilised base resistance for each load step
+        - 'w [m]': Nodal settlements (load steps along the rows, nodes along the columns)
+        - 'N [kN]': Axial force in the pile elements (load steps along the rows, elements along the columns)
+        - 'converged': Boolean array determining whether the Newton iterations converged for each load step
+    """
+    depth_from = np.asarray(depth_from, dtype=float)
+    depth_to = np.asarray(depth_to, dtype=float)
+    shaft_resistance = np.asarray(shaft_resistance, dtype=float)
+    loads = np.atleast_1d(np.asarray(loads, dtype=float))
+    _length = depth_to - depth_from
+    if (_length <= 0).any():
+        raise ValueError("Pile elements need to have a positive length")
+    if shaft_resistance.__len__() != _length.__len__():
+        raise ValueError("An ultimate shaft resistance needs to be specified for each element")
+    _invalid = ~(shaft_resistance >= 0)
+    if _invalid.any():
+        raise ValueError(
+            "The ultimate shaft resistance needs to be finite and non-negative, check elements %s" % (
+                str(np.where(_invalid)[0].tolist())))
+    if not (0 <= base_resistance < np.inf):
+        raise ValueError(
+            "The ultimate base resistance needs to be finite and non-negative, got %s" % str(base_resistance))
+    _stiffness = np.broadcast_to(np.asarray(axial_stiffness, dtype=float), _length.shape) / _length
+
+    if tz_curve is None or qz_curve is None:
+        _curves = pile_settlement_curves(
+            diameter=diameter, shaft_resistance=1, base_resistance=1, pile_type=pile_type)
+        if _curves['shaft_normalised'] is None:
+            raise ValueError("Pile type %s not recognised" % pile_type)
+    _default_tz = tz_curve is None
+    _default_qz = qz_curve is None
+    if _default_tz:
+        tz_curve = _curves['shaft_normalised']
+    if _default_qz:
+        qz_curve = _curves['base_normalised']
+    _tz_w = np.array(tz_curve['w [m]'], dtype=float)
+    _tz_f = np.array(tz_curve['Fs/Fsmax [-]'], dtype=float)
+    _qz_w = diameter * np.array(qz_curve['w/D [-]'], dtype=float)
+    _qz_f = np.array(qz_curve['Fb/Fbmax [-]'], dtype=float)
+    if _default_tz:
+        _tz_f[_tz_w == 0] = 0
+    if _default_qz:
+        _qz_f[_qz_w == 0] = 0
+
+    _no_nodes = _length.__len__() + 1
+    _capacity_tension = shaft_resistance.sum() * _tz_f.max()
+    _capacity = _capacity_tension + base_resistance * _qz_f.max()
+    _exceeded = (loads >= _capacity) | ((loads < 0) & (-loads >= _capacity_tension))
+    _force_tolerance = tolerance * max(shaft_resistance.sum() + base_resistance, 1)
+
+    # Elastic stiffness matrix in banded form
+    _k_diagonal = np.zeros(_no_nodes)
+    _k_diagonal[:-1] += _stiffness
+    _k_diagonal[1:] += _stiffness
+
+    def _residual(w, load):
+        _w_avg = 0.5 * (w[:-1] + w[1:])
+        _t, _t_slope = _mobilisation(_w_avg, _tz_w, _tz_f)
+        _qb, _qb_slope = _mobilisation(w[-1:], _qz_w, _qz_f, antisymmetric=False)
+        _n = _stiffness * (w[:-1] - w[1:])
+        _r = np.zeros(_no_nodes)
+        _r[:-1] += _n + 0.5 * shaft_resistance * _t
+        _r[1:] += -_n + 0.5 * shaft_resistance * _t
+        _r[-1] += base_resistance * _qb[0]
+        _r[0] -= load
+        _jacobian = np.zeros((3, _no_nodes))
+        _k_tz = 0.25 * shaft_resistance * _t_slope
+        _jacobian[1] = _k_diagonal
+        _jacobian[1, :-1] += _k_tz
+        _jacobian[1, 1:] += _k_tz
+        _jacobian[1, -1] += base_resistance * _qb_slope[0]
+        _jacobian[0, 1:] = -_stiffness + _k_tz
+        _jacobian[2, :-1] = -_stiffness + _k_tz
+        # Out-of-balance forces which cannot be resolved in floating point arithmetic
+        _roundoff = 10 * np.finfo(float).eps * (_stiffness * (np.abs(w[:-1]) + np.abs(w[1:]))).sum()
+        return _r, _jacobian, _roundoff
+
+    _w = np.full((loads.__len__(), _no_nodes), np.nan)
+    _converged = np.zeros(loads.__len__(), dtype=bool)
+    _w_current = np.zeros(_no_nodes)
+    _w_last = np.zeros(_no_nodes)
+    for j, _load in enumerate(loads):
+        if _exceeded[j]:
+            continue
+        _r, _jacobian, _roundoff = _residual(_w_current, _load)
+        _norm = np.abs(_r).sum()
+        for i in range(max_iterations):
+            if _norm < max(_force_tolerance, _roundoff):
+                _converged[j] = True
+                break
+            _step = solve_banded((1, 1), _jacobian, -_r)
+            # Backtracking on the out-of-balance forces
+            _factor = 1.0
+            for k in range(20):
+                _r_trial, _jacobian_trial, _roundoff_trial = _residual(_w_current + _factor * _step, _load)
+                _norm_trial = np.abs(_r_trial).sum()
+                if _norm_trial < _norm:
+                    break
+                _factor *= 0.5
+            _w_current = _w_current + _factor * _step
+            _r, _jacobian, _roundoff, _norm = _r_trial, _jacobian_trial, _roundoff_trial, _norm_trial
+        else:
+            _converged[j] = _norm < max(_force_tolerance, _roundoff)
+        if _converged[j]:
+            _w[j] = _w_current
+            _w_last = _w_current
+        else:
+            _w_current = _w_last
+
+    if not _converged[~_exceeded].all():
+        warnings.warn("Newton iterations did not converge for all load steps")
+    if _exceeded.any():
+        warnings.warn(
+            "Load steps exceeding the ultimate pile resistance of %.1fkN in compression and %.1fkN in tension "
+            "are not calculated" % (_capacity, _capacity_tension))
+
+    _fb = base_resistance * _mobilisation(_w[:, -1], _qz_w, _qz_f, antisymmetric=False)[0]
+    _fs = (shaft_resistance[np.newaxis, :] * _mobilisation(0.5 * (_w[:, :-1] + _w[:, 1:]), _tz_w, _tz_f)[0]).sum(axis=1)
+    _n = _stiffness[np.newaxis, :] * (_w[:, :-1] - _w[:, 1:])
+
+    return {
+        'z [m]': np.append(depth_from, depth_to[-1]),
+        'F [kN]': loads,
+        'w head [m]': _w[:, 0],
+        'w tip [m]': _w[:, -1],
+        'Fs [kN]': _fs,
+        'Fb [kN]': _fb,
+        'w [m]': _w,
+        'N [kN]': _n,
+        'converged': _converged
+    }
+
+
+def pile_loadtransfer_axcap(calculation, circumference, base_area, axial_stiffness, loads, diameter,
+                            internal_circumference=0, plugged=True, **kwargs):
+    """
+    Calculates the load-settlement curve of an axially loaded pile with the load-transfer method (see ``pile_loadtransfer``)
+    using the depth distribution of unit skin friction and the unit end bearing of an ``AxCapCalculation``.
+    The elements of the ``output`` attribute of the calculation (elements of the ``CalculationGrid`` above the
+    pile tip) are used as pile elements, so the unit skin friction and unit end bearing need to be calculated first.
+
+    The ultimate shaft resistance of each element follows from the unit skin friction in compression multiplied by
+    the circumference and element length. Inside skin friction is included with the internal circumference.
+    As for the pile capacity of the ``AxCapCalculation``, NaN values of unit skin friction are treated as zero.
+    The base resistance follows from the unit end bearing of the element at the pile tip.
+
+    :param calculation: ``AxCapCalculation`` object for which the unit skin friction and unit end bearing have been calculated
+    :param circumference: Pile circumference [m]
+    :param base_area: Pile base area [m2], the full end area for plugged conditions and the annulus area for coring conditions
+    :param axial_stiffness: Axial stiffness of the pile (:math:`EA`) [kN]
+    :param loads: Array with the pile head loads of the load steps [kN]
+    :param diameter: Pile diameter used to denormalise the q-z curve [m]
+    :param internal_circumference: Internal pile circumference for coring conditions (default=0 for plugged conditions) [m]
+    :param plugged: Boolean determining whether the plugged or coring unit end bearing is used (default=True)
+    :param kwargs: Optional keyword arguments for ``pile_loadtransfer``
+    :return: Dictionary returned by ``pile_loadtransfer``
+    """
+    _elements = calculation.output
+    _dz = np.array(_elements['dz [m]'], dtype=float)
+    _shaft_resistance = circumference * _dz * np.nan_to_num(np.array(
+        _elements['Unit skin friction outside compression [kPa]'], dtype=float))
+    if internal_circumference > 0:
+        _shaft_resistance = _shaft_resistance + internal_circumference * _dz * np.nan_to_num(np.array(
+            _elements['Unit skin friction inside compression [kPa]'], dtype=float))
+    if plugged:
+        _base_resistance = base_area * _elements['Unit end bearing plugged [kPa]'].iloc[-1]
+    else:
+        _base_resistance = base_area * _elements['Unit end bearing coring [kPa]'].iloc[-1]
+
+    return pile_loadtransfer(
+        depth_from=_elements['Depth from [m]'], depth_to=_elements['Depth to [m]'],
+        shaft_resistance=_shaft_resistance, base_resistance=_base_resistance,
+        axial_stiffness=axial_stiffness, loads=loads, diameter=diameter, **kwargs)
@@ -16,7 +16,7 @@ import plotly.graph_objs as go
 from plotly.colors import DEFAULT_PLOTLY_COLORS
 
 # Project imports
-from groundhog.general.validation import Validator
+from groundhog.general.validation import Validator, validation_mask
 
 
 STRESS_ELASTIC_ISOTROPIC = {
@@ -93,6 +93,39 @@ def stress_cylinder_elastic_isotropic(
     }
 
 
+def _newton_bisection(func, lower, upper, tolerance=1e-12, max_iterations=100):
+    """
+    Solves ``func(x) = 0`` for arrays of bracketed roots at once. Newton steps are used when they remain inside
+    the bracket, bisection steps are used otherwise. The brackets are updated at every iteration.
+
+    :param func: Function returning a tuple with the function values and derivatives for an array of x-values
+    :param lower: Array with the lower bounds of the brackets
+    :param upper: Array with the upper bounds of the brackets, the function values at the bounds have opposite signs
+    :param tolerance: Relative tolerance on the root (default=1e-12)
+    :param max_iterations: Maximum number of iterations (default=100)
+    :return: Array with the roots
+    """
+    _f_lower = func(lower)[0]
+    # Orient the brackets so that the function is negative at x_negative
+    _x_negative = np.where(_f_lower < 0, lower, upper)
+    _x_positive = np.where(_f_lower < 0, upper, lower)
+    _x = 0.5 * (lower + upper)
+    _active = np.ones(_x.shape, dtype=bool)
+    for i in range(max_iterations):
+        _f, _df = func(_x)
+        _x_negative = np.where(_f < 0, _x, _x_negative)
+        _x_positive = np.where(_f > 0, _x, _x_positive)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _x_newton = _x - _f / _df
+        _inside = (_x_newton - _x_negative) * (_x_newton - _x_positive) < 0
+        _x_new = np.where(_inside, _x_newton, 0.5 * (_x_negative + _x_positive))
+        _active = _active & (_f != 0) & (np.abs(_x_new - _x) > tolerance * np.abs(_x))
+        _x = np.where(_active, _x_new, _x)
+        if not _active.any():
+            break
+    return _x
+
+
 EXPANSION_TRESCA_THICKSPHERE = {
     'undrained_shear_strength': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'internal_radius': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -208,7 +241,7 @@ def expansion_tresca_thicksphere(
                                    (((1 - 2 * poissons_ratio) * _radii +
                                      (((1 + poissons_ratio) * (external_radius ** 3)) /
                                       (2 * _radii ** 2))) / (((external_radius / internal_radius) ** 3) - 1))
-    _yielding_pressure = internal_pressure + (4 * undrained_shear_strength / 3) * \
+    _yielding_pressure = external_pressure + (4 * undrained_shear_strength / 3) * \
                          (1 - ((internal_radius / external_radius) ** 3))
 
     def wall_expansion(c, a0, b0, su, E, nu):
@@ -291,6 +324,79 @@ def expansion_tresca_thicksphere(
     }
 
 
+def expansion_tresca_thicksphere_array(
+        undrained_shear_strength, internal_radius, external_radius, internal_pressure, external_pressure,
+        youngs_modulus, poissons_ratio, **kwargs):
+    """
+    Array version of ``expansion_tresca_thicksphere``. The inputs can be scalars or arrays (e.g. for all depths
+    of a profile or for several internal pressures) which are broadcast to a common shape.
+
+    The plastic radius is bracketed between the internal radius and a sequence of decreasing trial radii,
+    as in ``expansion_tresca_thicksphere``, and is solved for all entries simultaneously with a
+    hybrid Newton-bisection method. Entries for which no feasible plastic radius is found and entries with inputs
+    outside the validation ranges return NaN. The stress distributions are not calculated.
+
+    :returns: Dictionary with the keys 'yielding_pressure [kPa]', 'plastic_radius [m]' and 'expanded_radius [m]' of ``expansion_tresca_thicksphere`` containing arrays
+    """
+    _valid = validation_mask(
+        EXPANSION_TRESCA_THICKSPHERE, undrained_shear_strength=undrained_shear_strength,
+        internal_radius=internal_radius, external_radius=external_radius, internal_pressure=internal_pressure,
+        external_pressure=external_pressure, youngs_modulus=youngs_modulus, poissons_ratio=poissons_ratio)
+    su, a0, b0, p, p0, E, nu = np.broadcast_arrays(*[np.asarray(_value, dtype=float) for _value in (
+        undrained_shear_strength, internal_radius, external_radius, internal_pressure, external_pressure,
+        youngs_modulus, poissons_ratio)])
+    _valid = np.broadcast_to(_valid, su.shape)
+
+    _coefficient_a = 6 * (1 - nu) * su / (E * (a0 ** 3))
+    _coefficient_b = 4 * (1 - 2 * nu) * su / E
+
+    def wall_expansion_cubed(c, index=Ellipsis):
+        # Cube of the ratio between expanded and initial wall radius and its derivative with respect to c
+        _g = 1 + _coefficient_a[index] * (c ** 3) - _coefficient_b[index] * (
+            3 * np.log(c / a0[index]) + 1 - ((c / b0[index]) ** 3))
+        _dg = 3 * _coefficient_a[index] * (c ** 2) - _coefficient_b[index] * (
+            3 / c - 3 * (c ** 2) / (b0[index] ** 3))
+        return _g, _dg
+
+    def optimisation_func(c, index=Ellipsis):
+        _g, _dg = wall_expansion_cubed(c, index)
+        _su = su[index]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            _f = 4 * _su * np.log(c / (a0[index] * np.cbrt(_g))) + \
+                (4 * _su / 3) * (1 - ((c / b0[index]) ** 3)) + p0[index] - p[index]
+            _f = np.where(_g > 0, _f, np.nan)
+            _df = 4 * _su * (1 / c - _dg / (3 * _g)) - 4 * _su * (c ** 2) / (b0[index] ** 3)
+        return _f, _df
+
+    # Upper bounds of the bracket are reduced with 5% until a sign change is found
+    with np.errstate(invalid='ignore', divide='ignore'):
+        _no_trials = int(np.nanmax(np.append(np.ceil(np.log(a0 / b0) / np.log(0.95)), 0)))
+    _f_lower = optimisation_func(a0)[0]
+    _upper = np.full(su.shape, np.nan)
+    _found = np.zeros(su.shape, dtype=bool)
+    for k in range(_no_trials + 1):
+        _trial = b0 * (0.95 ** k)
+        _f_trial = optimisation_func(_trial)[0]
+        _sign_change = (~_found) & (_trial > a0) & (_f_lower * _f_trial <= 0)
+        _upper = np.where(_sign_change, _trial, _upper)
+        _found = _found | _sign_change
+    _found = _found & _valid
+    if not _found.all():
+        warnings.warn("A feasible plastic radius could not be found for %i entries" % (~_found).sum())
+
+    _plastic_radius = np.full(su.shape, np.nan)
+    _plastic_radius[_found] = _newton_bisection(
+        func=lambda c: optimisation_func(c, _found), lower=a0[_found], upper=_upper[_found])
+    with np.errstate(invalid='ignore'):
+        _expanded_radius = a0 * np.cbrt(wall_expansion_cubed(_plastic_radius)[0])
+
+    return {
+        'yielding_pressure [kPa]': np.where(_valid, p0 + (4 * su / 3) * (1 - ((a0 / b0) ** 3)), np.nan),
+        'plastic_radius [m]': _plastic_radius,
+        'expanded_radius [m]': _expanded_radius,
+    }
+
+
 EXPANSION_CYLINDER_TRESCA = {
     'insitu_pressure': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'borehole_pressure': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -465,4 +571,98 @@ def expansion_cylinder_tresca(
         'elastic wall expansion [m]': _elastic_wall_expansion,
         'plastic wall expansion [m]': _plastic_wall_expansion,
         'plastic radius [m]': _plastic_radius,
-    }
\ No newline at end of file
+    }
+
+
+def expansion_cylinder_tresca_array(
+        insitu_pressure, borehole_pressure, diameter, undrained_shear_strength, shear_modulus,
+        poissons_ratio=0.5, max_radius_multiplier=10.0, number_radii=250, **kwargs):
+    """
+    Array version of ``expansion_cylinder_tresca``. The inputs can be scalars or arrays which are broadcast
+    to a common shape (e.g. depths of a soil profile along the rows and borehole pressures along the columns).
+    The pressure-expansion relation is calculated for all soil conditions at once and the mud pressure window is
+    returned for each entry.
+
+    The mud pressure window is defined by the following pressures:
+
+        - Minimum pressure: Borehole pressure below which yielding occurs due to unloading of the borehole wall (:math:`p_0 - S_u`, not lower than zero)
+        - Yielding pressure: Borehole pressure above which yielding occurs due to expansion of the borehole (:math:`p_0 + S_u`)
+        - Maximum pressure: Borehole pressure above which excessive deformation occurs (the pressure difference of the pressure-expansion relation at the maximum radius is exceeded)
+
+    Entries with inputs outside the validation ranges return NaN. Stresses around the borehole are not calculated.
+
+    :returns: Dictionary with the following keys:
+
+        - 'yielding': Boolean array determining whether plastic deformation is taking place or not
+        - 'pressure expansion function': Dictionary with the pressure-expansion relation with keys `expansion [m]` and `pressure difference [kPa]`. The radii are added as the last dimension to the common shape of the inputs other than the borehole pressure
+        - 'yielding pressure [kPa]': Borehole pressure at which yield occurs due to expansion [:math:`kPa`]
+        - 'minimum pressure [kPa]': Borehole pressure at which yield occurs due to unloading [:math:`kPa`]
+        - 'maximum pressure [kPa]': Borehole pressure at which excessive deformation occurs [:math:`kPa`]
+        - 'elastic wall expansion [m]': Borehole elastic wall expansion [:math:`m`]
+        - 'plastic wall expansion [m]': Borehole plastic wall expansion (:math:`a - a_0`)  [:math:`m`]
+        - 'plastic radius [m]': Radius of the plastic zone (:math:`c`)  [:math:`m`]
+    """
+    _valid = validation_mask(
+        EXPANSION_CYLINDER_TRESCA, insitu_pressure=insitu_pressure, borehole_pressure=borehole_pressure,
+        diameter=diameter, undrained_shear_strength=undrained_shear_strength, shear_modulus=shear_modulus,
+        poissons_ratio=poissons_ratio, max_radius_multiplier=max_radius_multiplier)
+    p0, su, G, nu, _borehole_radius, _multiplier = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (
+            insitu_pressure, undrained_shear_strength, shear_modulus, poissons_ratio, 0.5 * np.asarray(diameter),
+            max_radius_multiplier)])
+    _soil_valid = np.broadcast_to(validation_mask(
+        EXPANSION_CYLINDER_TRESCA, insitu_pressure=insitu_pressure, diameter=diameter,
+        undrained_shear_strength=undrained_shear_strength, shear_modulus=shear_modulus,
+        poissons_ratio=poissons_ratio, max_radius_multiplier=max_radius_multiplier), p0.shape)
+    p0, su, G, _borehole_radius = [np.where(_soil_valid, _value, np.nan) for _value in (
+        p0, su, G, _borehole_radius)]
+
+    _radii = _borehole_radius[..., np.newaxis] * (
+        1 + (_multiplier - 1)[..., np.newaxis] * np.linspace(0, 1, number_radii))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _pressure_expansion_function = {
+            'expansion [m]': _radii - _borehole_radius[..., np.newaxis],
+            'pressure difference [kPa]': su[..., np.newaxis] * (1 + np.log(
+                (G / su)[..., np.newaxis] +
+                (1 - G / su)[..., np.newaxis] * ((_borehole_radius[..., np.newaxis] / _radii) ** 2)))
+        }
+    _maximum_pressure = p0 + np.max(_pressure_expansion_function['pressure difference [kPa]'], axis=-1)
+    _yielding_pressure = p0 + su
+    _minimum_pressure = np.maximum(p0 - su, 0)
+
+    p = np.where(_valid, np.asarray(borehole_pressure, dtype=float), np.nan)
+    p, p0, su, G, nu, _borehole_radius, _pressure_limit = np.broadcast_arrays(
+        p, p0, su, G, nu, _borehole_radius, _maximum_pressure)
+    _youngs_modulus = 2 * G * (1 + nu)
+    _yielding = ~(np.abs(p0 - p) < su)
+    _excessive = p > _pressure_limit
+    if _excessive.any():
+        warnings.warn(
+            "Selected borehole pressure leads to excessive deformation for %i entries. "
+            "Expansions are not calculated." % _excessive.sum())
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _first_term = (_borehole_radius ** 2) * (1 - G / su)
+        _second_term = np.exp(((p - p0) / su) - 1) - (G / su)
+        _expanded_radius = np.sqrt(_first_term / _second_term)
+        _n = 4 * (1 + (nu ** 2)) * su / _youngs_modulus
+        _plastic_radius = np.where(
+            _yielding,
+            _expanded_radius * np.sqrt(
+                ((_borehole_radius / _expanded_radius) ** 2) +
+                (1 / _n) * (1 - ((_borehole_radius / _expanded_radius) ** 2))),
+            _borehole_radius)
+    _plastic_wall_expansion = np.where(_yielding, _expanded_radius - _borehole_radius, 0)
+    _elastic_wall_expansion = ((1 + nu) * (p - p0)) / _youngs_modulus
+    _invalid = _excessive | np.isnan(p)
+
+    return {
+        'yielding': _yielding & ~np.isnan(p),
+        'pressure expansion function': _pressure_expansion_function,
+        'yielding pressure [kPa]': _yielding_pressure,
+        'minimum pressure [kPa]': _minimum_pressure,
+        'maximum pressure [kPa]': _maximum_pressure,
+        'elastic wall expansion [m]': np.where(_invalid, np.nan, _elastic_wall_expansion),
+        'plastic wall expansion [m]': np.where(_invalid, np.nan, _plastic_wall_expansion),
+        'plastic radius [m]': np.where(_invalid, np.nan, _plastic_radius),
+    }
@@ -117,7 +117,7 @@ def reinforced_circularsection_inertia(diameter, modulus_ratio, n_bars, offset,
 
 PILEGROUPEFFECT_REESEVANIMPE = {
     'pile_x': {'type': 'list', 'elementtype': 'float', 'order': None, 'unique': False, 'empty_allowed': False},
-    'pile_x': {'type': 'list', 'elementtype': 'float', 'order': None, 'unique': False, 'empty_allowed': False},
+    'pile_y': {'type': 'list', 'elementtype': 'float', 'order': None, 'unique': False, 'empty_allowed': False},
     'pile_diameters': {'type': 'list', 'elementtype': 'float', 'order': None, 'unique': False, 'empty_allowed': False},
     'load_x': {"type": "float", "min_value": None, "max_value": None},
     'load_y': {"type": "float", "min_value": None, "max_value": None}
@@ -130,7 +130,7 @@ PILEGROUPEFFECT_REESEVANIMPE_ERRORRETURN = {
 }
 
 @Validator(PILEGROUPEFFECT_REESEVANIMPE, PILEGROUPEFFECT_REESEVANIMPE_ERRORRETURN)
-def pilegroupeffect_reesevanimpe(pile_x, pile_y, pile_diameters, load_x, load_y, show_fig=True, plot_height=600, plot_width=400, **kwargs):
+def pilegroupeffect_reesevanimpe(pile_x, pile_y, pile_diameters, load_x, load_y, show_fig=True, plot_fig=False, plot_height=600, plot_width=400, **kwargs):
     """
     When piles are arranged in a group, they influence one another and the lateral reaction for a given displacement can be less than that for a single pile.
     Reese and Van Impe suggest a method for calculating the efficiency of each pile. A distinction is made between in-line leading piles, in-line trailing piles and side-by-side piles.
@@ -146,7 +146,8 @@ def pilegroupeffect_reesevanimpe(pile_x, pile_y, pile_diameters, load_x, load_y,
     :param pile_diameters: List of pile diameters (:math:`y`) [m]
     :param load_x: X-component of the load vector (:math:`x_{\\text{load}}`)
     :param load_y: Y-component of the load vector (:math:`x_{\\text{load}}`)
-    :param show_fig: Boolean determining whether the figures for the Chin-Kondler construction need to be plotted (default behaviour) or returned in the output dictionary.
+    :param show_fig: Boolean determining whether the figure with the pile layout is shown (default=True). The figure is only created when it is shown or when ``plot_fig`` is True.
+    :param plot_fig: Boolean determining whether the figure with the pile layout is created and returned without showing it (default=False)
 
     .. math::
         \\text{Side by side piles: } e = 0.64 \\left( \\frac{s}{D} \\right)^{0.34} \\text{ for } 1 \\leq \\frac{s}{D} \\leq 3.75, e=1 \\text{ for } \\frac{s}{D} > 3.75
@@ -163,65 +164,22 @@ def pilegroupeffect_reesevanimpe(pile_x, pile_y, pile_diameters, load_x, load_y,
 
         - 'efficiency_matrix': Matrix with the efficiency of each pile vis-à-vis the others (row i, column j quantifies the influence of pile j on pile i)
         - 'efficiencies': List with the combined efficiencies of each pile (list with an element for each pile)
-        - 'pile_fig': Figure with the dimensions of the piles.
+        - 'pile_fig': Figure with the dimensions of the piles (None when ``show_fig`` and ``plot_fig`` are both False).
     """
     if (pile_x.__len__() != pile_y.__len__()) or (pile_x.__len__() != pile_diameters.__len__()):
         raise ValueError("Lists of pile x- and y-coordinates and diameters need to be the same length.")
 
-    def efficiency_sideside(spacing, diameter):
-        if (spacing / diameter) < 3.75:
-            return 0.64 * ((spacing / diameter) ** 0.34)
-        else:
-            return 1
-    def efficiency_inline_leading(spacing, diameter):
-        if (spacing / diameter) < 4:
-            return 0.70 * ((spacing / diameter) ** 0.26)
-        else:
-            return 1
-    def efficiency_inline_trailing(spacing, diameter):
-        if (spacing / diameter) < 7:
-            return 0.48 * ((spacing / diameter) ** 0.38)
-        else:
-            return 1
-
-    load_vector = np.array([load_x, load_y])
-    efficiency_factors = np.ones((pile_x.__len__(), pile_y.__len__()))
-    combined_efficiency = np.ones(pile_x.__len__())
-
-    for i, (_xi, _yi, _Di) in enumerate(zip(pile_x, pile_y, pile_diameters)):
-        # Loop over all other piles
-        _combined_efficiency = 1
-        for j, (_xj, _yj) in enumerate(zip(pile_x, pile_y)):
-            if i == j:
-                pass
-            else:
-                _pile_vector = np.array([_xj - _xi, _yj - _yi])
-                if np.dot(_pile_vector, load_vector) > 0:
-                    _trailing = True
-                else:
-                    _trailing = False 
-                _cos_theta = np.dot(load_vector, _pile_vector) / (np.linalg.norm(load_vector) * np.linalg.norm(_pile_vector))
-                _s_inline = np.abs(np.dot(load_vector, _pile_vector) / np.linalg.norm(load_vector))
-                _s_sideside = np.abs(np.sqrt(np.linalg.norm(_pile_vector) ** 2 - _s_inline ** 2))
-                _s_pile = np.linalg.norm(_pile_vector)
-                # Sideside efficiency
-                _e_sideside = efficiency_sideside(_s_sideside, _Di)
-                # Inline efficiency
-                if _trailing:
-                    _e_inline = efficiency_inline_trailing(_s_inline, _Di)
-                    _s_D_max = np.sqrt(7 ** 2 * _cos_theta ** 2 + 3.75 ** 2 * (1 - _cos_theta ** 2))
-                else:
-                    _e_inline = efficiency_inline_leading(_s_inline, _Di)
-                    _s_D_max = np.sqrt(4 ** 2 * _cos_theta ** 2 + 3.75 ** 2 * (1 - _cos_theta ** 2))
-                
-                if _s_pile / _Di < _s_D_max:
-                    _efficiency = np.sqrt(_e_inline ** 2 * _cos_theta ** 2 + _e_sideside ** 2 * (1 - _cos_theta ** 2))
-                else:
-                    _efficiency = 1
-                    
-                efficiency_factors[i][j] = _efficiency
-                _combined_efficiency = _combined_efficiency * _efficiency
-        combined_efficiency[i] = _combined_efficiency
+    _result = pilegroupeffect_reesevanimpe_directions(
+        pile_x=pile_x, pile_y=pile_y, pile_diameters=pile_diameters, load_x=load_x, load_y=load_y)
+    efficiency_factors = _result['efficiency_matrix'][0]
+    combined_efficiency = _result['efficiencies'][0]
+
+    if not (show_fig or plot_fig):
+        return {
+            'efficiency_matrix': efficiency_factors,
+            'efficiencies': combined_efficiency,
+            'pile_fig': None
+        }
 
     pile_fig = subplots.make_subplots(rows=1, cols=1, print_grid=False)
     for i, (_x, _y, _D) in enumerate(zip(pile_x, pile_y, pile_diameters)):
@@ -261,4 +219,80 @@ def pilegroupeffect_reesevanimpe(pile_x, pile_y, pile_diameters, load_x, load_y,
         'efficiency_matrix': efficiency_factors,
         'efficiencies': combined_efficiency,
         'pile_fig': pile_fig
-    }
\ No newline at end of file
+    }
+
+
+def _efficiency(ratio, limit, factor, exponent):
+    """
+    Returns the efficiency :math:`e = \\text{factor} \\cdot (s/D)^{\\text{exponent}}` below the limiting normalised spacing and 1 above
+    """
+    return np.where(ratio < limit, factor * (ratio ** exponent), 1)
+
+
+def pilegroupeffect_reesevanimpe_directions(
+        pile_x, pile_y, pile_diameters, load_x, load_y, max_chunk_size=1000000):
+    """
+    Calculates the pile group efficiency according to Reese and Van Impe for an array of load directions at once.
+    The spacings and angles between all pile pairs are calculated using array broadcasting. The calculation is
+    identical to ``pilegroupeffect_reesevanimpe`` but no figure is created.
+
+    The load directions are processed in chunks to limit the memory use for large pile groups.
+
+    :param pile_x: Array of X-coordinates of the pile centers (:math:`x`) [m]
+    :param pile_y: Array of Y-coordinates of the pile centers (:math:`y`) [m]
+    :param pile_diameters: Array of pile diameters (:math:`D`) [m]
+    :param load_x: X-component of the load vector, scalar or array with a value for each load direction (:math:`x_{\\text{load}}`)
+    :param load_y: Y-component of the load vector, scalar or array with a value for each load direction (:math:`y_{\\text{load}}`)
+    :param max_chunk_size: Maximum number of pile pairs for all load directions processed at once (default=1000000)
+
+    :returns: Dictionary with the following keys:
+
+        - 'efficiency_matrix': Array with the efficiency of each pile vis-à-vis the others for each load direction (load directions x piles x piles). Element [k, i, j] quantifies the influence of pile j on pile i for load direction k.
+        - 'efficiencies': Array with the combined efficiencies of each pile for each load direction (load directions x piles)
+    """
+    pile_x = np.asarray(pile_x, dtype=float)
+    pile_y = np.asarray(pile_y, dtype=float)
+    pile_diameters = np.asarray(pile_diameters, dtype=float)
+    if (pile_x.__len__() != pile_y.__len__()) or (pile_x.__len__() != pile_diameters.__len__()):
+        raise ValueError("Lists of pile x- and y-coordinates and diameters need to be the same length.")
+    load_x, load_y = [np.atleast_1d(_value).astype(float).ravel() for _value in np.broadcast_arrays(load_x, load_y)]
+    _load_norm = np.sqrt(load_x ** 2 + load_y ** 2)
+    if (_load_norm == 0).any():
+        raise ValueError("Load vectors should have a non-zero magnitude")
+
+    # Pile vectors from pile i (rows) to pile j (columns), independent of the load direction
+    _dx = pile_x[np.newaxis, :] - pile_x[:, np.newaxis]
+    _dy = pile_y[np.newaxis, :] - pile_y[:, np.newaxis]
+    _s_pile = np.sqrt(_dx ** 2 + _dy ** 2)
+    _diameters = pile_diameters[:, np.newaxis]
+    _others = ~np.eye(pile_x.__len__(), dtype=bool)
+
+    efficiency_factors = np.ones((load_x.__len__(), pile_x.__len__(), pile_x.__len__()))
+    _chunk = max(1, int(max_chunk_size // max(_s_pile.size, 1)))
+    for _start in range(0, load_x.__len__(), _chunk):
+        _ux = (load_x / _load_norm)[_start:_start + _chunk, np.newaxis, np.newaxis]
+        _uy = (load_y / _load_norm)[_start:_start + _chunk, np.newaxis, np.newaxis]
+        _dot = _ux * _dx + _uy * _dy
+        _trailing = _dot > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _cos_theta_squared = (_dot / _s_pile) ** 2
+        _s_inline = np.abs(_dot)
+        _s_sideside = np.sqrt(np.maximum(_s_pile ** 2 - _s_inline ** 2, 0))
+        _e_sideside = _efficiency(_s_sideside / _diameters, 3.75, 0.64, 0.34)
+        _e_inline = np.where(
+            _trailing,
+            _efficiency(_s_inline / _diameters, 7, 0.48, 0.38),
+            _efficiency(_s_inline / _diameters, 4, 0.70, 0.26))
+        _s_D_max = np.sqrt(
+            np.where(_trailing, 7 ** 2, 4 ** 2) * _cos_theta_squared + 3.75 ** 2 * (1 - _cos_theta_squared))
+        with np.errstate(invalid='ignore'):
+            _efficiency_pairs = np.where(
+                (_s_pile / _diameters < _s_D_max) & _others,
+                np.sqrt(_e_inline ** 2 * _cos_theta_squared + _e_sideside ** 2 * (1 - _cos_theta_squared)),
+                1)
+        efficiency_factors[_start:_start + _chunk] = _efficiency_pairs
+
+    return {
+        'efficiency_matrix': efficiency_factors,
+        'efficiencies': efficiency_factors.prod(axis=2)
+    }
@@ -1028,43 +1028,67 @@ class AGSConverter(object):
         else:
             raise ValueError("AGS format %s not recognised. Use '4' or '3.1' for currently supported formats")
 
+    @staticmethod
+    def ags_header_names(columns, units):
+        """
+        Combines the column headers of an AGS group with the units into column keys of the format ``HEADING [UNIT]``.
+        When no unit is defined, the heading is used as column key.
+
+        :param columns: Iterable with the column headers
+        :param units: Iterable with the units for each column (same length as ``columns``)
+        :return: List with the column keys
+        """
+        return [
+            "%s" % _col if str(_unit) == 'nan' else "%s [%s]" % (_col, _unit)
+            for _col, _unit in zip(columns, units)]
+
+    @staticmethod
+    def numeric_ags_types(types):
+        """
+        Returns a boolean mask identifying the numerical columns based on the TYPE row of an AGS 4.x group.
+        Columns with a data type containing decimal places (``DP``) or significant figures (``SF``) are numerical.
+
+        :param types: Pandas Series or iterable with the data types of the columns
+        :return: Numpy array with booleans (True for numerical columns)
+        """
+        return pd.Series(types).astype(str).str.contains('DP|SF').values
+
     @staticmethod
     def convert_ags_headers(df, agsformat):
         """
         Converts the headers of an AGS-based dataframes from the three rows in the AGS to a single column header.
         Numerical data is also converted into the correct datatype.
+
+        For AGS 4.x, the columns identified as numerical in the TYPE row are parsed with ``pd.to_numeric``,
+        values which cannot be parsed are set to NaN. For AGS 3.1, a column is converted when all
+        its values are numerical.
+
         :param df: Dataframe with the group data
         :return: Dataframe with updated headers
         """
-        # Rename the headers
-        new_headers = []
-        datatypes = dict()
         if agsformat == "3.1":
             if df[df.columns[0]].iloc[0] == "<UNITS>":
                 pass
             else:
                 return df
-        for i, original_header in enumerate(df.columns):
-            if str(df.loc[0, original_header]) == 'nan':
-                new_name = "%s" % (original_header)
-            else:
-                new_name = "%s [%s]" % (original_header, df.loc[0, original_header])
-            new_headers.append(new_name)
-            if agsformat == '4':
-                if ("DP" in df.loc[1, original_header]) or ("SF" in df.loc[1, original_header]):
-                    datatypes[new_name] = 'float'
-        df.columns = new_headers
+        elif agsformat != '4':
+            raise ValueError("AGS format %s not recognised. Use '4' or '3.1' for currently supported formats")
+
+        new_headers = AGSConverter.ags_header_names(df.columns, df.iloc[0].values)
         if agsformat == '4':
-            df = df[2:].reset_index(drop=True).astype(datatypes)
-        elif agsformat == "3.1":
-            df = df[1:].reset_index(drop=True)
-            for _col in df.columns:
-                try:
-                    df[_col] = pd.to_numeric(df[_col])
-                except:
-                    pass
+            numeric = AGSConverter.numeric_ags_types(df.iloc[1])
+            df = df.iloc[2:].reset_index(drop=True)
+            df.columns = new_headers
+            for _col in df.columns[numeric]:
+                df[_col] = pd.to_numeric(df[_col], errors='coerce').astype(float)
         else:
-            raise ValueError("AGS format %s not recognised. Use '4' or '3.1' for currently supported formats")
+            df = df.iloc[1:].reset_index(drop=True)
+            df.columns = new_headers
+            converted = df.apply(pd.to_numeric, errors='coerce')
+            # Only convert columns where no values are lost by the conversion
+            numeric = (converted.notna() | df.isna()).all(axis=0).values
+            for _col in df.columns[numeric]:
+                df[_col] = converted[_col]
         return df
 
     def convert_ags_group(self, groupname, verbose_keys=False, additional_keys=dict(), use_shorthands=False,
@@ -1104,11 +1128,33 @@ class AGSConverter(object):
             _end_index = self.raw_dataframe.__len__()
 
         # Read only the data for the group
-        _group_data = pd.read_csv(
-            StringIO(self.textstring),
-            skiprows=_start_index + 1,
-            nrows=_end_index - _start_index - 2,
-            **kwargs)
+        if self.agsformat == "4":
+            # Read the UNIT and TYPE rows first so numerical columns are parsed directly as floats
+            _group_header = pd.read_csv(
+                StringIO(self.textstring),
+                skiprows=_start_index + 1,
+                nrows=2,
+                dtype=str,
+                **kwargs)
+            _units = _group_header.iloc[0].values
+            _numeric = self.numeric_ags_types(_group_header.iloc[1])
+            _group_data = pd.read_csv(
+                StringIO(self.textstring),
+                skiprows=_start_index + 4,
+                nrows=max(_end_index - _start_index - 4, 0),
+                header=None,
+                names=_group_header.columns,
+                dtype={_col: str for _col in _group_header.columns[~_numeric]},
+                **kwargs)
+            for _col in _group_data.columns[_numeric]:
+                if _group_data[_col].dtype != float:
+                    _group_data[_col] = pd.to_numeric(_group_data[_col], errors='coerce').astype(float)
+        else:
+            _group_data = pd.read_csv(
+                StringIO(self.textstring),
+                skiprows=_start_index + 1,
+                nrows=_end_index - _start_index - 2,
+                **kwargs)
 
         # Remove * from header names in AGS3.1
         if self.agsformat == "3.1":
@@ -1129,8 +1175,11 @@ class AGSConverter(object):
             except Exception as err:
                 warnings.warn("Verbose names for group %s not found. AGS column names kept - %s" % (groupname, str(err)))
 
-        # Convert the headers using the convert_ags_headers function (only for AGS 4.x format)
-        _group_data = self.convert_ags_headers(_group_data, agsformat=self.agsformat)
+        # Add the units to the headers and convert the datatypes (already done during reading for AGS 4.x)
+        if self.agsformat == "4":
+            _group_data.columns = self.ags_header_names(_group_data.columns, _units)
+        else:
+            _group_data = self.convert_ags_headers(_group_data, agsformat=self.agsformat)
 
         # Drop the HEADING [UNIT] column if required
         if drop_heading_col:
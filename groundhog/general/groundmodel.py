@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Bruno Stuyts'
+
+# Native Python packages
+
+# 3rd party packages
+import numpy as np
+import pandas as pd
+
+# Project imports
+from groundhog.general.soilprofile import SoilProfile
+from groundhog.general.sitecatalog import SiteCatalog
+
+
+class GroundModel(object):
+    """
+    The ``GroundModel`` class estimates soil parameters at arbitrary locations between positioned
+    ``SoilProfile`` and ``PCPTProcessing`` objects.
+
+    Interpolation is performed with inverse distance weighting on a neighbourhood of locations
+    selected with the KD-tree of a ``SiteCatalog``. Parameter values are first evaluated at the requested
+    depth (or elevation) for each neighbouring location and then combined using the inverse distance weights.
+    Neighbours for which the parameter is not defined at the requested depth are ignored.
+
+    For ``SoilProfile`` objects, horizon surfaces can be interpolated. A horizon is identified by the value in
+    a column of the soil profiles (e.g. a geological unit) or by the layer number when no column is specified.
+    The interpolated horizon surfaces are used to create ``SoilProfile`` objects at target locations.
+
+    All queries are vectorised over the target locations.
+    """
+
+    def __init__(self, items, latlon=False, depth_key='z [m]'):
+        """
+        Initialises a ``GroundModel`` from a list of positioned objects.
+
+        :param items: List with positioned ``SoilProfile`` and/or ``PCPTProcessing`` objects (positions need to be set with ``set_position``)
+        :param latlon: Boolean defining whether coordinates are specified in longitude and latitude (default=False for easting and northing in m)
+        :param depth_key: Depth key in the ``data`` attribute of in-situ test objects (default='z [m]')
+        """
+        self.catalog = SiteCatalog(items, latlon=latlon)
+        self.depth_key = depth_key
+
+    def __len__(self):
+        return self.catalog.__len__()
+
+    def neighbours(self, x, y, n_neighbours=4, power=2, max_distance=np.inf):
+        """
+        Finds the neighbouring locations for a set of target locations and calculates inverse distance weights.
+        When a target location coincides with a location in the ground model, only that location is used.
+
+        :param x: Array with easting or longitude of the target locations
+        :param y: Array with northing or latitude of the target locations
+        :param n_neighbours: Number of neighbouring locations used for the interpolation (default=4)
+        :param power: Power of the inverse distance weights (default=2)
+        :param max_distance: Maximum distance between a target location and a neighbouring location [m] (default=np.inf)
+        :return: Tuple with an array with the indices of the neighbouring locations and an array with the weights. Both arrays have shape (number of targets, number of neighbours). Missing neighbours have zero weight.
+        """
+        _x, _y = self.catalog.project(np.atleast_1d(x), np.atleast_1d(y))
+        _valid_count = self.catalog.valid_indices.__len__()
+        if _valid_count == 0:
+            raise ValueError("The ground model does not contain locations with a valid position")
+        _k = min(n_neighbours, _valid_count)
+        distances, indices = self.catalog.tree.query(
+            np.column_stack((_x, _y)), k=_k, distance_upper_bound=max_distance)
+        distances = distances.reshape(-1, _k)
+        indices = indices.reshape(-1, _k)
+
+        missing = indices >= _valid_count
+        with np.errstate(divide='ignore'):
+            weights = 1 / (distances ** power)
+        exact = (distances == 0).any(axis=1)
+        weights[exact, :] = (distances[exact, :] == 0).astype(float)
+        weights[missing] = 0
+        indices = self.catalog.valid_indices[np.minimum(indices, _valid_count - 1)]
+        return indices, weights
+
+    def values_at_depth(self, index, parameter, depths):
+        """
+        Returns the values of a parameter for a location in the ground model at the requested depths.
+        For ``SoilProfile`` objects, linearly varying parameters are interpolated within the layer.
+        For in-situ test objects, the parameter is interpolated between the measurements.
+        NaN is returned for depths outside the depth range of the location or when the parameter is not available.
+
+        :param index: Index of the location in the ground model
+        :param parameter: Name of the numerical parameter (e.g. ``'qc [MPa]'`` or ``'Su [kPa]'``)
+        :param depths: Array with depths below the surface at the location [m]
+        :return: Array with the parameter values
+        """
+        _item = self.catalog.items[index]
+        depths = np.asarray(depths, dtype=float)
+        if isinstance(_item, SoilProfile):
+            if parameter not in _item.numerical_soil_parameters():
+                return np.full(depths.shape, np.nan)
+            _z, _values = _item.soilparameter_series(parameter)
+        else:
+            try:
+                _data = _item.data[[self.depth_key, parameter]].dropna().sort_values(self.depth_key)
+            except KeyError:
+                return np.full(depths.shape, np.nan)
+            _z = np.array(_data[self.depth_key])
+            _values = np.array(_data[parameter])
+        if _z.__len__() == 0:
+            return np.full(depths.shape, np.nan)
+        return np.interp(depths, _z, np.array(_values, dtype=float), left=np.nan, right=np.nan)
+
+    @staticmethod
+    def weighted_average(values, weights):
+        """
+        Combines values for the neighbouring locations using the weights. NaN values are ignored and the
+        weights of the remaining values are rescaled. NaN is returned when no values are available.
+
+        :param values: Array with values (number of targets, number of neighbours)
+        :param weights: Array with weights (number of targets, number of neighbours)
+        :return: Array with the weighted averages (number of targets)
+        """
+        _weights = np.where(np.isnan(values), 0, weights)
+        _sum_weights = _weights.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(
+                _sum_weights > 0,
+                np.nansum(np.where(_weights > 0, values, 0) * _weights, axis=1) / _sum_weights,
+                np.nan)
+
+    def interpolate(self, x, y, z, parameter, reference='depth', n_neighbours=4, power=2, max_distance=np.inf):
+        """
+        Interpolates a numerical parameter at a set of target points (x, y, z).
+
+        With ``reference='depth'``, z is the depth below the surface and the parameter is evaluated at the
+        same depth below the surface at each neighbouring location. With ``reference='elevation'``, z is an elevation
+        and the elevations of the neighbouring locations are used to convert it to a depth at each location.
+
+        :param x: Array with easting or longitude of the target points
+        :param y: Array with northing or latitude of the target points
+        :param z: Array with depth below surface or elevation of the target points [m]
+        :param parameter: Name of the numerical parameter (e.g. ``'qc [MPa]'`` or ``'Su [kPa]'``)
+        :param reference: ``'depth'`` (default) or ``'elevation'``
+        :param n_neighbours: Number of neighbouring locations used for the interpolation (default=4)
+        :param power: Power of the inverse distance weights (default=2)
+        :param max_distance: Maximum distance between a target location and a neighbouring location [m] (default=np.inf)
+        :return: Array with the interpolated parameter values (NaN where no neighbour provides a value)
+        """
+        if reference not in ['depth', 'elevation']:
+            raise ValueError("reference should be 'depth' or 'elevation'")
+        x, y, z = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(x, dtype=float)),
+            np.atleast_1d(np.asarray(y, dtype=float)),
+            np.atleast_1d(np.asarray(z, dtype=float)))
+        indices, weights = self.neighbours(
+            x, y, n_neighbours=n_neighbours, power=power, max_distance=max_distance)
+        values = np.full(indices.shape, np.nan)
+        _depths = np.broadcast_to(z[:, None], indices.shape)
+        if reference == 'elevation':
+            _depths = self.catalog.z[indices] - _depths
+        # Each location is evaluated once for all target points for which it is a neighbour
+        for _index in np.unique(indices[weights > 0]):
+            _mask = (indices == _index) & (weights > 0)
+            values[_mask] = self.values_at_depth(_index, parameter, _depths[_mask])
+        return self.weighted_average(values, weights)
+
+    def horizons(self, horizon_key=None, reference='depth'):
+        """
+        Creates a table with the top and base of each horizon for each ``SoilProfile`` in the ground model.
+
+        :param horizon_key: Column of the soil profiles identifying the horizon (e.g. ``'Unit'``). Default=None uses the layer number.
+        :param reference: ``'depth'`` (default) for depths below the surface or ``'elevation'`` for elevations
+        :return: Dataframe with the columns ``Index``, ``Horizon``, ``Top``, ``Base`` and the numerical parameters. The numerical parameters are taken from the first layer of the horizon (from the last layer for ``to`` values).
+        """
+        _rows = []
+        for i, _item in enumerate(self.catalog.items):
+            if not (isinstance(_item, SoilProfile) and self.catalog.valid[i]):
+                continue
+            _profile = pd.DataFrame(_item).reset_index(drop=True)
+            if horizon_key is None:
+                _horizon_ids = np.arange(1, _profile.__len__() + 1)
+            else:
+                _horizon_ids = np.array(_profile[horizon_key])
+            for _horizon in pd.unique(_horizon_ids):
+                _layers = _profile[_horizon_ids == _horizon]
+                _row = {
+                    'Index': i,
+                    'Horizon': _horizon,
+                    'Top': _layers[_item.depth_from_col].min(),
+                    'Base': _layers[_item.depth_to_col].max()
+                }
+                for _col in _profile.columns:
+                    if _col in [_item.depth_from_col, _item.depth_to_col] or \
+                            not pd.api.types.is_numeric_dtype(_profile[_col]):
+                        continue
+                    if " to [" in _col:
+                        _row[_col] = _layers[_col].iloc[-1]
+                    else:
+                        _row[_col] = _layers[_col].iloc[0]
+                if reference == 'elevation':
+                    _row['Top'] = self.catalog.z[i] - _row['Top']
+                    _row['Base'] = self.catalog.z[i] - _row['Base']
+                _rows.append(_row)
+        return pd.DataFrame(_rows)
+
+    def horizon_surfaces(self, x, y, horizon_key=None, reference='depth', parameters=None,
+                         n_neighbours=4, power=2, max_distance=np.inf):
+        """
+        Interpolates the top and base of each horizon at a set of target locations.
+        Numerical parameters of the horizons can also be interpolated.
+
+        Neighbouring soil profiles where a horizon is absent are ignored for that horizon.
+
+        :param x: Array with easting or longitude of the target locations
+        :param y: Array with northing or latitude of the target locations
+        :param horizon_key: Column of the soil profiles identifying the horizon (e.g. ``'Unit'``). Default=None uses the layer number.
+        :param reference: ``'depth'`` (default) for depths below the surface or ``'elevation'`` for elevations
+        :param parameters: List with numerical horizon parameters (columns of the soil profiles) to be interpolated (default=None for none)
+        :param n_neighbours: Number of neighbouring locations used for the interpolation (default=4)
+        :param power: Power of the inverse distance weights (default=2)
+        :param max_distance: Maximum distance between a target location and a neighbouring location [m] (default=np.inf)
+        :return: Dataframe with one row per target location and horizon with the columns ``Target``, ``X``, ``Y``, ``Horizon``, ``Top``, ``Base`` and the selected parameters
+        """
+        if parameters is None:
+            parameters = []
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        _horizons = self.horizons(horizon_key=horizon_key, reference=reference)
+        if _horizons.__len__() == 0:
+            raise ValueError("The ground model does not contain positioned SoilProfile objects")
+        indices, weights = self.neighbours(
+            x, y, n_neighbours=n_neighbours, power=power, max_distance=max_distance)
+
+        _results = []
+        for _horizon in pd.unique(_horizons['Horizon']):
+            _table = _horizons[_horizons['Horizon'] == _horizon].set_index('Index')
+            _result = pd.DataFrame({
+                'Target': np.arange(x.__len__()),
+                'X': x,
+                'Y': y,
+                'Horizon': _horizon})
+            for _col in ['Top', 'Base'] + list(parameters):
+                _lookup = np.full(self.__len__(), np.nan)
+                if _col in _table.columns:
+                    _lookup[np.array(_table.index)] = np.array(_table[_col], dtype=float)
+                _result[_col] = self.weighted_average(_lookup[indices], weights)
+            _results.append(_result)
+
+        result = pd.concat(_results, ignore_index=True)
+        result = result[~(result['Top'].isna() | result['Base'].isna())]
+        if reference == 'elevation':
+            return result.sort_values(['Target', 'Top'], ascending=[True, False]).reset_index(drop=True)
+        else:
+            return result.sort_values(['Target', 'Top']).reset_index(drop=True)
+
+    def soilprofile_at(self, x, y, horizon_key=None, parameters=None, title=None, **kwargs):
+        """
+        Creates a ``SoilProfile`` at a target location from the interpolated horizon surfaces.
+        Layer boundaries follow from the interpolated horizon tops. Where horizons overlap after interpolation,
+        the top of the deeper horizon is used as the base of the shallower one. The base of the deepest horizon
+        is the interpolated base.
+
+        :param x: Easting or longitude of the target location
+        :param y: Northing or latitude of the target location
+        :param horizon_key: Column of the soil profiles identifying the horizon (e.g. ``'Unit'``). Default=None uses the layer number.
+        :param parameters: List with numerical horizon parameters (columns of the soil profiles) to be interpolated (default=None for none)
+        :param title: Title of the soil profile (default=None)
+        :param kwargs: Optional keyword arguments for ``horizon_surfaces`` (e.g. ``n_neighbours``, ``power``)
+        :return: ``SoilProfile`` object with depths below the surface at the target location
+        """
+        _surfaces = self.horizon_surfaces(
+            x, y, horizon_key=horizon_key, parameters=parameters, **kwargs)
+        if _surfaces.__len__() == 0:
+            raise ValueError("No horizons found for the target location")
+        _tops = np.array(_surfaces['Top'])
+        _bases = np.append(_tops[1:], _surfaces['Base'].iloc[-1])
+        _profile_data = {
+            'Depth from [m]': _tops,
+            'Depth to [m]': _bases,
+            ('Horizon' if horizon_key is None else horizon_key): list(_surfaces['Horizon'])
+        }
+        if parameters is not None:
+            for _param in parameters:
+                _profile_data[_param] = np.array(_surfaces[_param])
+        _profile = SoilProfile(_profile_data)
+        _profile.title = title
+        return _profile
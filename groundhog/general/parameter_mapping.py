@@ -287,18 +287,23 @@ def reverse_dict(input_dict):
     return {y: x for x, y in input_dict.items()}
 
 
+WGS84_GEOD = Geod(ellps="WGS84")
+
+
 def latlon_distance(lon1, lat1, lon2, lat2):
     """
     Calculates the offset in meters from two pairs of coordinates specified in longitude and latitude (WGS84)
 
+    The coordinates can also be specified as arrays of equal length. The geodesic distances are then calculated
+    for all pairs at once.
+
     :param lon1: Longitude (easting) of the first point
     :param lat1: Latitude (northing) of the first point
     :param lon2: Longitude (easting) of the second point
     :param lat2: Latitude (northing) of the second point
     :return: distance in meters
     """
-    wgs84_geod = Geod(ellps="WGS84")
-    az12, az21, dist = wgs84_geod.inv(lon1, lat1, lon2, lat2)
+    az12, az21, dist = WGS84_GEOD.inv(lon1, lat1, lon2, lat2)
     return dist
 
 
@@ -436,3 +441,106 @@ def offsets(startpoint, endpoint, point, latlon=False):
         "before start": before_start,
         "behind end": behind_end,
     }
+
+
+def offsets_array(startpoints, endpoints, points, latlon=False):
+    """
+    Calculates the offsets between a set of points and one or more lines joining given start- and endpoints.
+    This is the array version of ``offsets``, all points and lines are processed at once using broadcasting.
+
+    The start- and endpoints can be given as a single x, y pair or as an array with shape (M, 2) for M lines.
+    The points are given as an array with shape (N, 2). The results have shape (M, N) or (N,) when a single line
+    is specified.
+
+    The projected offsets are signed. The offset to the start projected is the chainage along the line, which is
+    negative before the start point. The offset to the end projected is negative behind the end point.
+
+    When coordinates are specified in longitude and latitude, the geodesic distances and azimuths are calculated
+    with ``pyproj.Geod.inv`` in array mode. The offset to the line and the chainage follow from the distance to
+    the start point and the difference in azimuth between the line and the point (local tangent plane
+    approximation at the start point, accurate for the extent of a typical site).
+
+    :param startpoints: Tuple or array with x and y coordinates of the start point(s)
+    :param endpoints: Tuple or array with x and y coordinates of the end point(s)
+    :param points: Array with x and y coordinates of the points for which the offsets need to be computed
+    :param latlon: Boolean defining whether coordinates are specified in latitude/longitude (default=False)
+
+    :returns: Dictionary with the following keys:
+
+        - 'offset start to point': Distance between start point and point of interest
+        - 'offset end to point': Distance between end point and point of interest
+        - 'offset to line': Offset between point and the line joining start and end point
+        - 'offset to start projected': Offset from the start point (negative is before the start point)
+        - 'offset to end projected': Offset from the end point (negative is behind the end point)
+        - 'angle start [deg]': Angle between line joining start and end point and line joining point and start point
+        - 'angle end [deg]': Angle between line joining start and end point and line joining point and end point
+        - 'before start': Boolean determining if point lies before the start point
+        - 'behind end': Boolean determining if point lies behind the end point
+
+    """
+    single_line = np.ndim(startpoints) == 1
+    startpoints = np.atleast_2d(np.asarray(startpoints, dtype=float))[:, None, :]
+    endpoints = np.atleast_2d(np.asarray(endpoints, dtype=float))[:, None, :]
+    points = np.atleast_2d(np.asarray(points, dtype=float))[None, :, :]
+    if startpoints.shape != endpoints.shape:
+        raise ValueError("The number of start points and end points should be equal")
+
+    if latlon:
+        _shape = np.broadcast_shapes(startpoints.shape[:2], points.shape[:2])
+
+        def _geodesic(first, second):
+            _lon1, _lat1, _lon2, _lat2 = [
+                np.broadcast_to(_coord, _shape).ravel() for _coord in (
+                    first[:, :, 0], first[:, :, 1], second[:, :, 0], second[:, :, 1])]
+            az12, az21, dist = WGS84_GEOD.inv(_lon1, _lat1, _lon2, _lat2)
+            return az12.reshape(_shape), az21.reshape(_shape), dist.reshape(_shape)
+
+        az_line, az_back, line_length = _geodesic(startpoints, endpoints)
+        az_start, _, offset_start = _geodesic(startpoints, points)
+        az_end, _, offset_end = _geodesic(endpoints, points)
+        # Angles between the line direction and the direction towards the point (wrapped to 0-180deg)
+        angle_start = np.abs((az_start - az_line + 180) % 360 - 180)
+        angle_end = np.abs((az_end - (az_back + 180) + 180) % 360 - 180)
+        offset_to_start = offset_start * np.cos(np.radians(angle_start))
+        offset_to_line = offset_start * np.sin(np.radians(angle_start))
+        offset_to_end = line_length - offset_to_start
+        # The angles are undefined for points coinciding with the start or end point
+        angle_start = np.where(offset_start == 0, np.nan, angle_start)
+        angle_end = np.where(offset_end == 0, np.nan, angle_end)
+    else:
+        vector_1 = endpoints - startpoints
+        vector_2 = points - startpoints
+        vector_3 = points - endpoints
+        line_length = np.linalg.norm(vector_1, axis=-1)
+        offset_start = np.linalg.norm(vector_2, axis=-1)
+        offset_end = np.linalg.norm(vector_3, axis=-1)
+        dot_product_start = np.sum(vector_1 * vector_2, axis=-1)
+        dot_product_end = np.sum(vector_1 * vector_3, axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            angle_start = np.degrees(np.arccos(np.clip(
+                dot_product_start / (line_length * offset_start), -1, 1)))
+            angle_end = np.degrees(np.arccos(np.clip(
+                dot_product_end / (line_length * offset_end), -1, 1)))
+            offset_to_start = dot_product_start / line_length
+            offset_to_line = np.abs(
+                vector_1[:, :, 0] * vector_2[:, :, 1] - vector_1[:, :, 1] * vector_2[:, :, 0]) / line_length
+        offset_to_end = line_length - offset_to_start
+
+    # Same convention as ``offsets``: a point on the end point (undefined angle) lies behind the end point
+    before_start = angle_start > 90
+    behind_end = ~(angle_end > 90)
+
+    result = {
+        "offset start to point": offset_start,
+        "offset end to point": offset_end,
+        "offset to line": offset_to_line,
+        "offset to start projected": offset_to_start,
+        "offset to end projected": offset_to_end,
+        "angle start [deg]": angle_start,
+        "angle end [deg]": angle_end,
+        "before start": before_start,
+        "behind end": behind_end,
+    }
+    if single_line:
+        result = {_key: _value[0] for _key, _value in result.items()}
+    return result
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Bruno Stuyts'
+
+# Native Python packages
+import warnings
+
+# 3rd party packages
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from pyproj import Transformer
+
+# Project imports
+from groundhog.general.parameter_mapping import offsets_array
+
+
+class SiteCatalog(object):
+    """
+    The ``SiteCatalog`` class provides a spatial index over a collection of positioned objects
+    (e.g. ``PCPTProcessing``, ``SPTProcessing`` or ``SoilProfile`` objects). The objects need to have the
+    attributes ``easting``, ``northing``, ``elevation`` and ``title``, which are set using ``set_position``.
+
+    A KD-tree is built on the projected coordinates of the objects. Nearest neighbour, radius and corridor
+    queries are answered in vectorised form. When coordinates are specified in longitude and latitude, they are
+    projected on a local azimuthal equidistant projection centered on the site. Distances from the center
+    of the site are exact and distortions remain negligible for the extent of a typical site.
+
+    Objects without a valid position (including objects for which the position cannot be read) are kept
+    in the catalog but never returned by the queries.
+    """
+
+    def __init__(self, items, latlon=False):
+        """
+        Initialises a ``SiteCatalog`` from a list of positioned objects.
+
+        :param items: List with objects having ``easting``, ``northing``, ``elevation`` and ``title`` attributes
+        :param latlon: Boolean defining whether coordinates are specified in longitude and latitude (default=False for easting and northing in m)
+        """
+        self.items = list(items)
+        self.latlon = latlon
+        self.titles = []
+        self.x = np.full(self.items.__len__(), np.nan)
+        self.y = np.full(self.items.__len__(), np.nan)
+        self.z = np.full(self.items.__len__(), np.nan)
+        for i, _item in enumerate(self.items):
+            try:
+                self.x[i] = _item.easting
+                self.y[i] = _item.northing
+                self.z[i] = _item.elevation
+            except Exception as err:
+                self.x[i], self.y[i], self.z[i] = np.nan, np.nan, np.nan
+                warnings.warn(
+                    "Item %i - Error during processing of position, item is excluded from the queries - %s" % (
+                        i, str(err)))
+            self.titles.append(getattr(_item, 'title', None))
+
+        self.valid = np.isfinite(self.x) & np.isfinite(self.y)
+
+        if self.latlon:
+            if self.valid.any():
+                _lon_0 = self.x[self.valid].mean()
+                _lat_0 = self.y[self.valid].mean()
+            else:
+                _lon_0, _lat_0 = 0, 0
+            self.transformer = Transformer.from_crs(
+                "EPSG:4326",
+                "+proj=aeqd +lat_0=%.10f +lon_0=%.10f +datum=WGS84 +units=m" % (_lat_0, _lon_0),
+                always_xy=True)
+        else:
+            self.transformer = None
+
+        self.x_projected, self.y_projected = self.project(self.x, self.y)
+        self.valid_indices = np.where(self.valid)[0]
+        self.tree = cKDTree(np.column_stack((
+            self.x_projected[self.valid], self.y_projected[self.valid])))
+
+    def __len__(self):
+        return self.items.__len__()
+
+    def project(self, x, y):
+        """
+        Projects coordinates to the planar coordinate system used for the spatial index.
+        Planar coordinates are returned unchanged.
+
+        :param x: Easting or longitude (scalar or array)
+        :param y: Northing or latitude (scalar or array)
+        :return: Tuple with arrays of projected x and y coordinates
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if self.transformer is None:
+            return x, y
+        else:
+            return self.transformer.transform(x, y)
+
+    def _select(self, indices, **columns):
+        """
+        Returns a dataframe with the objects for the selected indices and additional columns
+        """
+        indices = np.asarray(indices, dtype=int)
+        result = pd.DataFrame({
+            'Objects': [self.items[i] for i in indices],
+            'Titles': [self.titles[i] for i in indices],
+            'X': self.x[indices],
+            'Y': self.y[indices],
+            'Z': self.z[indices]
+        }, index=indices)
+        for _key, _value in columns.items():
+            result[_key] = _value
+        return result
+
+    def nearest(self, point, n=1):
+        """
+        Returns the ``n`` objects nearest to a given point, sorted by increasing distance.
+
+        :param point: Tuple with the x and y coordinates of the point of interest
+        :param n: Number of objects to return (default=1)
+        :return: Dataframe with the columns ``Objects``, ``Titles``, ``X``, ``Y``, ``Z`` and ``Distance``. The index corresponds to the position in the catalog.
+        """
+        n = min(n, self.valid_indices.__len__())
+        if n == 0:
+            return self._select([], Distance=[])
+        _x, _y = self.project(point[0], point[1])
+        distances, indices = self.tree.query([float(_x), float(_y)], k=n)
+        distances = np.atleast_1d(distances)
+        indices = np.atleast_1d(indices)
+        return self._select(self.valid_indices[indices], Distance=distances)
+
+    def within_radius(self, point, radius):
+        """
+        Returns the objects within a given radius of a point, sorted by increasing distance.
+
+        :param point: Tuple with the x and y coordinates of the point of interest
+        :param radius: Search radius [m]
+        :return: Dataframe with the columns ``Objects``, ``Titles``, ``X``, ``Y``, ``Z`` and ``Distance``. The index corresponds to the position in the catalog.
+        """
+        _x, _y = self.project(point[0], point[1])
+        indices = self.valid_indices[
+            np.array(self.tree.query_ball_point([float(_x), float(_y)], r=radius), dtype=int)]
+        distances = np.sqrt(
+            (self.x_projected[indices] - _x) ** 2 + (self.y_projected[indices] - _y) ** 2)
+        _order = np.argsort(distances, kind='stable')
+        return self._select(indices[_order], Distance=distances[_order])
+
+    def section_offsets(self, start, end, indices=None):
+        """
+        Calculates the offsets of the objects with respect to a section line joining a start and end point.
+        All objects (or the objects with the selected indices) are processed at once.
+
+        The following quantities are calculated:
+
+            - ``Offset``: Perpendicular offset between the object and the (infinite) line through start and end point
+            - ``Projected offset``: Distance along the line from the start point to the projected position (negative before the start point)
+            - ``Before start``: Boolean determining if the projected position lies before the start point
+            - ``Behind end``: Boolean determining if the projected position lies behind the end point
+
+        Objects located exactly at the start or end point have zero offset and are neither before the start nor behind the end.
+
+        :param start: Tuple with the x and y coordinates of the start point
+        :param end: Tuple with the x and y coordinates of the end point
+        :param indices: Indices of the objects to be processed (default=None for all objects)
+        :return: Dataframe with the columns ``Objects``, ``Titles``, ``X``, ``Y``, ``Z``, ``Offset``, ``Projected offset``, ``Before start`` and ``Behind end``
+        """
+        if indices is None:
+            indices = np.arange(self.items.__len__())
+        indices = np.asarray(indices, dtype=int)
+        _xs, _ys = self.project(start[0], start[1])
+        _xe, _ye = self.project(end[0], end[1])
+        _length = np.sqrt(float(_xe - _xs) ** 2 + float(_ye - _ys) ** 2)
+        if _length == 0:
+            raise ValueError("Start and end point of the section line should not coincide")
+        _offsets = offsets_array(
+            startpoints=(float(_xs), float(_ys)),
+            endpoints=(float(_xe), float(_ye)),
+            points=np.column_stack((self.x_projected[indices], self.y_projected[indices])))
+        offset = _offsets['offset to line']
+        projected_offset = _offsets['offset to start projected']
+        before_start = _offsets['before start'] & np.isfinite(projected_offset)
+        behind_end = (projected_offset > _length) & np.isfinite(projected_offset)
+
+        # Exact treatment of objects at the start and end point
+        at_start = (self.x[indices] == start[0]) & (self.y[indices] == start[1])
+        at_end = (self.x[indices] == end[0]) & (self.y[indices] == end[1]) & (~at_start)
+        offset[at_start | at_end] = 0
+        projected_offset[at_start] = 0
+        projected_offset[at_end] = _length
+        before_start[at_start | at_end] = False
+        behind_end[at_start | at_end] = False
+
+        return self._select(
+            indices, **{
+                'Offset': offset,
+                'Projected offset': projected_offset,
+                'Before start': before_start,
+                'Behind end': behind_end})
+
+    def corridor(self, start, end, band=1000, extend_profile=False):
+        """
+        Returns the objects within a corridor around a section line, sorted by the projected offset along the line.
+        When ``extend_profile`` is False, only objects projecting between the start and end point are returned.
+        Candidates are preselected using the KD-tree before the exact offsets are calculated.
+
+        :param start: Tuple with the x and y coordinates of the start point
+        :param end: Tuple with the x and y coordinates of the end point
+        :param band: Maximum offset from the line connecting start and end points [m] (default=1000m)
+        :param extend_profile: Boolean determining whether the corridor extends beyond the start and end points (default=False)
+        :return: Dataframe with the columns of ``section_offsets`` for the objects in the corridor. The index corresponds to the position in the catalog.
+        """
+        if extend_profile:
+            candidates = self.valid_indices
+        else:
+            _xs, _ys = self.project(start[0], start[1])
+            _xe, _ye = self.project(end[0], end[1])
+            _radius = 0.5 * np.sqrt(float(_xe - _xs) ** 2 + float(_ye - _ys) ** 2) + band
+            candidates = self.valid_indices[np.array(self.tree.query_ball_point(
+                [0.5 * float(_xs + _xe), 0.5 * float(_ys + _ye)], r=_radius * (1 + 1e-9)), dtype=int)]
+            candidates.sort()
+
+        result = self.section_offsets(start, end, indices=candidates)
+        if extend_profile:
+            result = result[result['Offset'] <= band]
+        else:
+            result = result[
+                (result['Offset'] <= band) &
+                (result['Before start'] == False) &
+                (result['Behind end'] == False)]
+
+        return result.sort_values('Projected offset', kind='stable')
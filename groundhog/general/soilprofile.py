@@ -20,6 +20,7 @@ import requests
 # Project imports
 from groundhog.general.plotting import plot_with_log, GROUNDHOG_PLOTTING_CONFIG
 from groundhog.general.parameter_mapping import offsets, latlon_distance
+from groundhog.general.sitecatalog import SiteCatalog
 from groundhog.siteinvestigation.insitutests.pcpt_correlations import ROBERTSON_CLASSES
 
 
@@ -1068,20 +1069,10 @@ def plot_fence_diagram(
     :return: Plotly figure object
     """
 
-    profile_names = []
-    x_coords = []
-    y_coords = []
-    elevations = []
-    for _profile in profiles:
-        try:
-            x_coords.append(_profile.easting)
-            y_coords.append(_profile.northing)
-            elevations.append(_profile.elevation)
-            profile_names.append(_profile.title)
-        except Exception as err:
-            warnings.warn(
-                "Profile %s - Error during processing for profile - %s" % (_profile.title, str(err)))
-            raise
+    catalog = SiteCatalog(profiles, latlon=latlon)
+    profile_names = catalog.titles
+    x_coords = list(catalog.x)
+    y_coords = list(catalog.y)
 
     if option == 'name':
         if start not in profile_names:
@@ -1102,49 +1093,10 @@ def plot_fence_diagram(
         raise ValueError("option should be 'name' or 'coords'")
 
 
-    profile_df = pd.DataFrame({
-        'Soil profiles': profiles,
-        'Titles': profile_names,
-        'X': x_coords,
-        'Y': y_coords,
-        'Z': elevations
-    })
-
-    # Calculate offsets from profile line
-    for i, row in profile_df.iterrows():
-        if row['X'] == start_point[0] and row['Y'] == start_point[1]:
-            profile_df.loc[i, "Offset"] = 0
-            profile_df.loc[i, "Projected offset"] = 0
-            profile_df.loc[i, "Before start"] = False
-            profile_df.loc[i, "Behind end"] = False
-        elif row['X'] == end_point[0] and row['Y'] == end_point[1]:
-            profile_df.loc[i, "Offset"] = 0
-            if latlon:
-                profile_df.loc[i, "Projected offset"] = latlon_distance(
-                    start_point[0], start_point[1], end_point[0], end_point[1])
-            else:
-                profile_df.loc[i, "Projected offset"] = np.sqrt(
-                    (start_point[0] - end_point[0]) ** 2 +
-                    (start_point[1] - end_point[1]) ** 2)
-            profile_df.loc[i, "Before start"] = False
-            profile_df.loc[i, "Behind end"] = False
-        else:
-            result = offsets(start_point, end_point, (row['X'], row['Y']), latlon=latlon)
-            profile_df.loc[i, "Offset"] = result['offset to line']
-            profile_df.loc[i, "Projected offset"] = result['offset to start projected']
-            profile_df.loc[i, "Before start"] = result['before start']
-            profile_df.loc[i, "Behind end"] = result['behind end']
-
-    # Determine which soil profiles need to be plotted
-    if extend_profile:
-        selected_profiles = deepcopy(profile_df[profile_df['Offset'] <= band])
-    else:
-        selected_profiles = deepcopy(profile_df[
-            (profile_df['Offset'] <= band) &
-            (profile_df['Before start'] == False) &
-            (profile_df['Behind end'] == False)])
-
-    selected_profiles.sort_values('Projected offset', inplace=True)
+    # Select the soil profiles in the corridor around the profile line
+    selected_profiles = catalog.corridor(
+        start_point, end_point, band=band, extend_profile=extend_profile).rename(
+        columns={'Objects': 'Soil profiles'})
 
     _layers = []
     _backbone_traces = []
@@ -1258,7 +1210,7 @@ def plot_fence_diagram(
         if plotmap:
             fig.update_layout(
                 mapbox_style='open-street-map', mapbox_zoom=10,
-                mapbox_center={'lat': profile_df['Y'].mean(), 'lon': profile_df['X'].mean()}
+                mapbox_center={'lat': np.nanmean(catalog.y), 'lon': np.nanmean(catalog.x)}
             )
 
         if show_annotations:
@@ -215,6 +215,84 @@ def map_args(method,var,*args,**kwargs):
         raise ValueError("Error during mapping of validation parameters to function parameters - %s" % str(err))
 
 
+def validation_mask(validationspec, **kwargs):
+    """
+    Vectorised counterpart of the ``Validator`` for array inputs. Float and string parameters are validated
+    elementwise against the validation data structure. Other parameter types and keyword arguments
+    not included in the validation data structure are ignored.
+
+    Entries which cannot be converted to a floating point number (e.g. ``None``) are invalid.
+    As for the ``Validator``, NaN values pass the validation of the bounds and the minimum and maximum
+    values can be overridden using keyword arguments ending with ``__min`` and ``__max``. The keyword arguments
+    ``customvalidation`` (replacement validation data structure) and ``validate`` (set to False to skip validation)
+    are also handled as for the ``Validator``.
+
+    :param validationspec: The validation data structure, as used for the ``Validator`` decorator
+    :param kwargs: Parameter values (scalars or arrays which can be broadcast to a common shape)
+    :returns: Boolean array which is True for entries where all parameters pass the validation
+    """
+    if kwargs.pop('validate', True) is False:
+        return np.array(True)
+    validationspec = kwargs.pop('customvalidation', validationspec)
+    if any(key.endswith('__min') or key.endswith('__max') for key in kwargs.keys()):
+        validationspec = deepcopy(validationspec)
+        for key in list(kwargs.keys()):
+            for _suffix, _bound in (('__min', 'min_value'), ('__max', 'max_value')):
+                if key.endswith(_suffix):
+                    _value = kwargs.pop(key)
+                    if key[:-len(_suffix)] in validationspec:
+                        validationspec[key[:-len(_suffix)]][_bound] = _value
+    mask = np.array(True)
+    for key, value in kwargs.items():
+        try:
+            _spec = validationspec[key]
+        except KeyError:
+            continue
+        if _spec['type'] == 'float':
+            _value = np.asarray(value)
+            try:
+                _float_value = _value.astype(float)
+                _valid = np.ones(_value.shape, dtype=bool)
+            except (TypeError, ValueError):
+                _float_value = np.vectorize(_float_or_nan, otypes=[float])(_value)
+                _valid = np.vectorize(_is_float, otypes=[bool])(_value)
+            if _value.dtype == object:
+                _valid &= np.vectorize(lambda x: x is not None, otypes=[bool])(_value)
+            with np.errstate(invalid='ignore'):
+                if _spec['min_value'] is not None:
+                    _valid &= ~(_float_value < _spec['min_value'])
+                if _spec['max_value'] is not None:
+                    _valid &= ~(_float_value > _spec['max_value'])
+        elif _spec['type'] == 'string':
+            _value = np.asarray(value, dtype=object)
+            _valid = np.vectorize(lambda x: isinstance(x, str), otypes=[bool])(_value)
+            if _spec['options'] is not None:
+                _valid &= np.isin(_value, list(_spec['options']))
+            if _spec['regex'] is not None:
+                _pattern = re.compile(_spec['regex'])
+                _valid &= np.vectorize(
+                    lambda x: isinstance(x, str) and bool(re.match(_pattern, x)), otypes=[bool])(_value)
+        else:
+            continue
+        mask = mask & _valid
+    return mask
+
+
+def _is_float(value):
+    try:
+        float(value)
+        return True
+    except Exception:
+        return False
+
+
+def _float_or_nan(value):
+    try:
+        return float(value)
+    except Exception:
+        return np.nan
+
+
 class Validator(object):
     """
     The Validator has the following features
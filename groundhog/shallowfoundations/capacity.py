@@ -5,15 +5,17 @@ __author__ = 'Bruno Stuyts'
 
 # Django and native Python packages
 import warnings
+import time
 
 # 3rd party packages
 import numpy as np
+import pandas as pd
 from plotly import subplots
 import plotly.graph_objs as go
 from plotly.colors import DEFAULT_PLOTLY_COLORS
 
 # Project imports
-from groundhog.general.validation import Validator
+from groundhog.general.validation import Validator, validation_mask
 from groundhog.general.plotting import GROUNDHOG_PLOTTING_CONFIG
 
 
@@ -212,7 +214,7 @@ def verticalcapacity_undrained_api(effective_length, effective_width, su_base, s
                                         0.25 * su_increase * effective_width)
         vertical_capacity = qu * effective_length * effective_width
         if not skirted:
-            vertical_capacity += base_sigma_v * effective_width * effective_width
+            vertical_capacity += base_sigma_v * effective_width * effective_length
 
     return {
         'qu [kPa]': qu,
@@ -228,6 +230,93 @@ def verticalcapacity_undrained_api(effective_length, effective_width, su_base, s
     }
 
 
+def verticalcapacity_undrained_api_array(effective_length, effective_width, su_base, su_increase=0.0,
+                                         su_above_base=np.nan, base_depth=0.0, skirted=True, base_sigma_v=0.0,
+                                         roughness=0.67, horizontal_load=0.0, foundation_inclination=0.0,
+                                         ground_surface_inclination=0.0, bearing_capacity_factor=5.14,
+                                         factor_f_override=np.nan, **kwargs):
+    """
+    Array version of ``verticalcapacity_undrained_api``. The inputs can be scalars or arrays (e.g. for many
+    horizontal loads, footing dimensions or soil parameter sets) which are broadcast to a common shape.
+    Cases with constant and linearly increasing undrained shear strength can be mixed.
+
+    Entries with inputs outside the validation ranges, with a horizontal load exceeding the horizontal capacity
+    of the effective area or without ``su_above_base`` for linearly increasing shear strength return NaN,
+    as the scalar function does.
+
+    :returns: Dictionary with the same keys as ``verticalcapacity_undrained_api`` containing arrays
+    """
+    _valid = validation_mask(
+        VERTICALCAPACITY_UNDRAINED_API, effective_length=effective_length, effective_width=effective_width,
+        su_base=su_base, su_increase=su_increase, su_above_base=su_above_base, base_depth=base_depth,
+        base_sigma_v=base_sigma_v, roughness=roughness, horizontal_load=horizontal_load,
+        foundation_inclination=foundation_inclination, ground_surface_inclination=ground_surface_inclination,
+        bearing_capacity_factor=bearing_capacity_factor, factor_f_override=factor_f_override)
+    L, B, su0, k, su_ave, D, sigma_v, roughness, H, nu, beta, Nc, F_override = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (
+            effective_length, effective_width, su_base, su_increase, su_above_base, base_depth, base_sigma_v,
+            roughness, horizontal_load, foundation_inclination, ground_surface_inclination,
+            bearing_capacity_factor, factor_f_override)])
+    skirted = np.broadcast_to(np.asarray(skirted, dtype=bool), L.shape)
+    _valid = np.broadcast_to(_valid, L.shape)
+    _constant = (k == 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        _load_ratio = H / (su0 * L * B)
+        _valid = _valid & ~(_constant & (_load_ratio > 1.0)) & ~((~_constant) & np.isnan(su_ave))
+
+        # Correction factors for linearly increasing su
+        dimensionless_increase = k * B / su0
+        _outside_f = (~_constant) & np.isnan(F_override) & \
+            ((dimensionless_increase < 0.0) | (dimensionless_increase > 25.0))
+        if (_outside_f & _valid).any():
+            warnings.warn("kB/Suo outside interpolation range, value for kB/Suo=25 is used", Warning)
+        _x_f = np.where(_outside_f, 10.0, dimensionless_increase)
+        F_smooth = 1.372 + 0.07 * _x_f - np.sqrt(((-0.128 + 0.07 * _x_f) ** 2.0) + ((0.342) ** 2.0))
+        F_rough = 2.56 + 0.457 * _x_f - np.sqrt(((0.713 + 0.457 * _x_f) ** 2.0) + ((1.38) ** 2.0))
+        F_factor = np.where(
+            np.isnan(F_override), F_smooth + np.clip(roughness, 0.0, 1.0) * (F_rough - F_smooth), F_override)
+        _outside_s = (~_constant) & ((dimensionless_increase < 0.0) | (dimensionless_increase > 10.0))
+        if (_outside_s & _valid).any():
+            warnings.warn("kB/Suo outside interpolation range, value for kB/Suo=10 is used", Warning)
+        _x_s = np.where(_outside_s, 10.0, dimensionless_increase)
+        s_cv = 0.18 - 0.155 * (_x_s ** 0.5) + 0.021 * _x_s
+        su2 = F_factor * (Nc * su0 + 0.25 * k * B) / Nc
+
+        i_c = np.where(
+            _constant,
+            0.5 - 0.5 * np.maximum(0.0, 1.0 - _load_ratio) ** 0.5,
+            0.5 - 0.5 * (1.0 - _load_ratio) ** 0.5)
+        s_c = np.where(_constant, 0.18, s_cv) * (1.0 - 2.0 * i_c) * (B / L)
+        d_c = 0.3 * np.where(_constant, 1.0, su_ave / su2) * np.arctan(D / B)
+        b_c = 2.0 * np.radians(nu) / (np.pi + 2.0)
+        g_c = 2.0 * np.radians(beta) / (np.pi + 2.0)
+        K_c = 1.0 + s_c + d_c - i_c - b_c - g_c
+
+        qu = np.where(_constant, su0 * Nc * K_c, F_factor * K_c * (su0 * Nc + 0.25 * k * B))
+        vertical_capacity = (qu + np.where(skirted, 0.0, sigma_v)) * B * L
+
+    if ((~skirted) & (sigma_v == 0.0) & (D != 0) & _valid).any():
+        warnings.warn("Vertical effective stress at base for base embedded foundation is zero. Specify base_sigma_v"
+                      " to take a non-zero value into account")
+
+    def _masked(value, mask=_valid):
+        return np.where(mask, value, np.nan)
+
+    return {
+        'qu [kPa]': _masked(qu),
+        'vertical_capacity [kN]': _masked(vertical_capacity),
+        'Su2 [kPa]': _masked(su2, _valid & ~_constant),
+        'K_c [-]': _masked(K_c),
+        's_c [-]': _masked(s_c),
+        'd_c [-]': _masked(d_c),
+        'i_c [-]': _masked(i_c),
+        'b_c [-]': _masked(b_c),
+        'g_c [-]': _masked(g_c),
+        'F [-]': _masked(F_factor, _valid & ~_constant),
+    }
+
+
 VERTICALCAPACITY_DRAINED_API = {
     'vertical_effective_stress': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'effective_friction_angle': {'type': 'float', 'min_value': 20.0, 'max_value': 50.0},
@@ -334,6 +423,8 @@ def verticalcapacity_drained_api(vertical_effective_stress, effective_friction_a
     """
     if load_inclination != 0.0:
         effective_width = effective_width - 2.0 * (np.tan(np.radians(load_inclination)) *  base_depth)
+        if effective_width <= 0.0:
+            raise ValueError("Effective width is reduced to zero by the eccentricity resulting from the load inclination")
 
     i_q = (1.0 - 0.5 * np.tan(np.radians(load_inclination))) ** 5.0
     i_gamma = (1.0 - 0.7 * np.tan(np.radians(load_inclination))) ** 5.0
@@ -384,6 +475,81 @@ def verticalcapacity_drained_api(vertical_effective_stress, effective_friction_a
         'g_gamma [-]': g_gamma,
     }
 
+
+def verticalcapacity_drained_api_array(vertical_effective_stress, effective_friction_angle, effective_unit_weight,
+                                       effective_length, effective_width, base_depth=0.0, skirted=True,
+                                       load_inclination=0.0, foundation_inclination=0.0,
+                                       ground_surface_inclination=0.0, **kwargs):
+    """
+    Array version of ``verticalcapacity_drained_api``. The inputs can be scalars or arrays (e.g. for many
+    load inclinations, footing dimensions or soil parameter sets) which are broadcast to a common shape.
+    Entries with inputs outside the validation ranges or with an effective width reduced to zero by the load
+    inclination return NaN.
+
+    :returns: Dictionary with the same keys as ``verticalcapacity_drained_api`` containing arrays
+    """
+    _valid = validation_mask(
+        VERTICALCAPACITY_DRAINED_API, vertical_effective_stress=vertical_effective_stress,
+        effective_friction_angle=effective_friction_angle, effective_unit_weight=effective_unit_weight,
+        effective_length=effective_length, effective_width=effective_width, base_depth=base_depth,
+        load_inclination=load_inclination, foundation_inclination=foundation_inclination,
+        ground_surface_inclination=ground_surface_inclination)
+    p0, phi, gamma, L, B, D, inclination, nu, beta = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (
+            vertical_effective_stress, effective_friction_angle, effective_unit_weight, effective_length,
+            effective_width, base_depth, load_inclination, foundation_inclination, ground_surface_inclination)])
+    skirted = np.broadcast_to(np.asarray(skirted, dtype=bool), p0.shape)
+    _valid = np.broadcast_to(_valid, p0.shape)
+
+    _tan_inclination = np.tan(np.radians(inclination))
+    _tan_phi = np.tan(np.radians(phi))
+    _sin_phi = np.sin(np.radians(phi))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        B = B - 2.0 * _tan_inclination * D
+        _valid = _valid & ~(B <= 0.0)
+
+        i_q = (1.0 - 0.5 * _tan_inclination) ** 5.0
+        i_gamma = (1.0 - 0.7 * _tan_inclination) ** 5.0
+        s_q = 1.0 + i_q * (B / L) * _sin_phi
+        s_gamma = 1.0 - 0.4 * i_gamma * (B / L)
+        d_q = 1.0 + 1.2 * (D / B) * _tan_phi * ((1.0 - _sin_phi) ** 2.0)
+        d_gamma = np.ones(p0.shape)
+        b_q = np.exp(-2.0 * np.radians(nu) * _tan_phi)
+        b_gamma = np.exp(-2.7 * np.radians(nu) * _tan_phi)
+        g_q = (1.0 - 0.5 * np.tan(np.radians(beta))) ** 5.0
+        g_gamma = g_q
+
+        K_q = i_q * s_q * d_q * b_q * g_q
+        K_gamma = i_gamma * s_gamma * d_gamma * b_gamma * g_gamma
+
+        N_q = np.exp(np.pi * _tan_phi) * ((np.tan(np.radians(45.0 + 0.5 * phi))) ** 2.0)
+        N_gamma = 1.5 * (N_q - 1.0) * _tan_phi
+
+        q_u = p0 * np.where((~skirted) & (D > 0), N_q, N_q - 1.0) * K_q + \
+            0.5 * gamma * B * N_gamma * K_gamma
+        vertical_capacity = q_u * B * L
+
+    _result = {
+        'qu [kPa]': q_u,
+        'vertical_capacity [kN]': vertical_capacity,
+        'N_q [-]': N_q,
+        'N_gamma [-]': N_gamma,
+        'K_q [-]': K_q,
+        'K_gamma [-]': K_gamma,
+        's_q [-]': s_q,
+        's_gamma [-]': s_gamma,
+        'd_q [-]': d_q,
+        'd_gamma [-]': d_gamma,
+        'i_q [-]': i_q,
+        'i_gamma [-]': i_gamma,
+        'b_q [-]': b_q,
+        'b_gamma [-]': b_gamma,
+        'g_q [-]': g_q,
+        'g_gamma [-]': g_gamma,
+    }
+    return {_key: np.where(_valid, _value, np.nan) for _key, _value in _result.items()}
+
+
 SLIDINGCAPACITY_UNDRAINED_API = {
     'su_base': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'foundation_area': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -434,6 +600,32 @@ def slidingcapacity_undrained_api(su_base, foundation_area, su_above_base=0.0, e
     }
 
 
+def slidingcapacity_undrained_api_array(su_base, foundation_area, su_above_base=0.0, embedded_section_area=0.0,
+                                        soil_reaction_coefficient=4.0, **kwargs):
+    """
+    Array version of ``slidingcapacity_undrained_api``. The inputs can be scalars or arrays which are broadcast
+    to a common shape. Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``slidingcapacity_undrained_api`` containing arrays
+    """
+    _valid = validation_mask(
+        SLIDINGCAPACITY_UNDRAINED_API, su_base=su_base, foundation_area=foundation_area,
+        su_above_base=su_above_base, embedded_section_area=embedded_section_area,
+        soil_reaction_coefficient=soil_reaction_coefficient)
+    base_resistance = np.asarray(su_base, dtype=float) * np.asarray(foundation_area, dtype=float)
+    skirt_resistance = np.asarray(soil_reaction_coefficient, dtype=float) * \
+        np.asarray(su_above_base, dtype=float) * np.asarray(embedded_section_area, dtype=float)
+    base_resistance, skirt_resistance, _valid = np.broadcast_arrays(base_resistance, skirt_resistance, _valid)
+    base_resistance = np.where(_valid, base_resistance, np.nan)
+    skirt_resistance = np.where(_valid, skirt_resistance, np.nan)
+
+    return {
+        'sliding_capacity [kN]': base_resistance + skirt_resistance,
+        'base_resistance [kN]': base_resistance,
+        'skirt_resistance [kN]': skirt_resistance,
+    }
+
+
 SLIDINGCAPACITY_DRAINED_API = {
     'vertical_load': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'effective_friction_angle': {'type': 'float', 'min_value': 20.0, 'max_value': 50.0},
@@ -499,6 +691,42 @@ def slidingcapacity_drained_api(vertical_load, effective_friction_angle, effecti
         'K_p [-]': K_p,
     }
 
+
+def slidingcapacity_drained_api_array(vertical_load, effective_friction_angle, effective_unit_weight,
+                                      embedded_section_area=0.0, depth_to_base=0.0, reaction_factor_override=np.nan,
+                                      **kwargs):
+    """
+    Array version of ``slidingcapacity_drained_api``. The inputs can be scalars or arrays (e.g. for all
+    vertical loads of a load case table) which are broadcast to a common shape.
+    Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``slidingcapacity_drained_api`` containing arrays
+    """
+    _valid = validation_mask(
+        SLIDINGCAPACITY_DRAINED_API, vertical_load=vertical_load, effective_friction_angle=effective_friction_angle,
+        effective_unit_weight=effective_unit_weight, embedded_section_area=embedded_section_area,
+        depth_to_base=depth_to_base, reaction_factor_override=reaction_factor_override)
+    V, phi, gamma, A_h, D, K_rd_override = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (
+            vertical_load, effective_friction_angle, effective_unit_weight, embedded_section_area, depth_to_base,
+            reaction_factor_override)])
+    _valid = np.broadcast_to(_valid, V.shape)
+
+    base_capacity = V * np.tan(np.radians(phi))
+    K_p = (np.tan(np.radians(45.0 + 0.5 * phi))) ** 2.0
+    K_rd = np.where(np.isnan(K_rd_override), K_p - (1.0 / K_p), K_rd_override)
+    skirt_capacity = 0.5 * K_rd * gamma * D * A_h
+
+    _result = {
+        'sliding_capacity [kN]': base_capacity + skirt_capacity,
+        'base_capacity [kN]': base_capacity,
+        'skirt_capacity [kN]': skirt_capacity,
+        'K_rd [-]': K_rd,
+        'K_p [-]': K_p,
+    }
+    return {_key: np.where(_valid, _value, np.nan) for _key, _value in _result.items()}
+
+
 EFFECTIVEAREA_RECTANGLE_API = {
     'length': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'width': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -583,6 +811,45 @@ def effectivearea_rectangle_api(length, width, vertical_load=np.nan, moment_leng
         'eccentricity_width [m]': eccentricity_width,
     }
 
+
+def effectivearea_rectangle_api_array(length, width, vertical_load=np.nan, moment_length=np.nan, moment_width=np.nan,
+                                      eccentricity_length=np.nan, eccentricity_width=np.nan, **kwargs):
+    """
+    Array version of ``effectivearea_rectangle_api``. The inputs can be scalars or arrays (e.g. footing dimensions
+    combined with the loads of a load case table) which are broadcast to a common shape. Eccentricities are
+    taken from the direct specification where specified and calculated from the moments otherwise.
+
+    Entries with inputs outside the validation ranges, without eccentricity specification or with an eccentricity
+    exceeding half of the foundation dimension (negative effective dimension) return NaN.
+
+    :returns: Dictionary with the same keys as ``effectivearea_rectangle_api`` containing arrays. The eccentricities used for the calculation are returned.
+    """
+    _valid = validation_mask(
+        EFFECTIVEAREA_RECTANGLE_API, length=length, width=width, vertical_load=vertical_load,
+        moment_length=moment_length, moment_width=moment_width, eccentricity_length=eccentricity_length,
+        eccentricity_width=eccentricity_width)
+    L, B, V, M1, M2, e1, e2 = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (
+            length, width, vertical_load, moment_length, moment_width, eccentricity_length, eccentricity_width)])
+    _valid = np.broadcast_to(_valid, L.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        e1 = np.where(np.isnan(e1), M1 / V, e1)
+        e2 = np.where(np.isnan(e2), M2 / V, e2)
+        effective_length = L - 2.0 * e1
+        effective_width = B - 2.0 * e2
+        _valid = _valid & (effective_length >= 0.0) & (effective_width >= 0.0)
+
+    _result = {
+        'effective_area [m2]': effective_length * effective_width,
+        'effective_length [m]': effective_length,
+        'effective_width [m]': effective_width,
+        'eccentricity_length [m]': e1,
+        'eccentricity_width [m]': e2,
+    }
+    return {_key: np.where(_valid, _value, np.nan) for _key, _value in _result.items()}
+
+
 EFFECTIVEAREA_CIRCLE_API = {
     'foundation_radius': {'type': 'float', 'min_value': 0.01, 'max_value': None},
     'vertical_load': {'type': 'float', 'min_value': 0.01, 'max_value': None},
@@ -658,6 +925,42 @@ def effectivearea_circle_api(foundation_radius, vertical_load=np.nan, overturnin
     }
 
 
+def effectivearea_circle_api_array(foundation_radius, vertical_load=np.nan, overturning_moment=np.nan,
+                                   eccentricity=np.nan, **kwargs):
+    """
+    Array version of ``effectivearea_circle_api``. The inputs can be scalars or arrays (e.g. foundation radii
+    combined with the loads of a load case table) which are broadcast to a common shape. The eccentricity is
+    taken from the direct specification where specified and calculated from the overturning moment otherwise.
+
+    Entries with inputs outside the validation ranges, without eccentricity specification or with an eccentricity
+    exceeding the foundation radius return NaN.
+
+    :returns: Dictionary with the same keys as ``effectivearea_circle_api`` containing arrays. The eccentricity used for the calculation is returned.
+    """
+    _valid = validation_mask(
+        EFFECTIVEAREA_CIRCLE_API, foundation_radius=foundation_radius, vertical_load=vertical_load,
+        overturning_moment=overturning_moment, eccentricity=eccentricity)
+    R, V, M, e2 = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (foundation_radius, vertical_load, overturning_moment, eccentricity)])
+    _valid = np.broadcast_to(_valid, R.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        e2 = np.where(np.isnan(e2), M / V, e2)
+        _valid = _valid & (e2 < R)
+        s_ecc = 0.5 * np.pi * (R ** 2.0) - (e2 * (np.sqrt((R ** 2.0) - (e2 ** 2.0))) + (R ** 2.0) * np.arcsin(e2 / R))
+        effective_length = (2.0 * s_ecc * np.sqrt((R + e2) / (R - e2))) ** 0.5
+        effective_width = effective_length * np.sqrt((R - e2) / (R + e2))
+
+    _result = {
+        'effective_area [m2]': effective_length * effective_width,
+        'effective_length [m]': effective_length,
+        'effective_width [m]': effective_width,
+        's [m2]': s_ecc,
+        'eccentricity [m]': e2,
+    }
+    return {_key: np.where(_valid, _value, np.nan) for _key, _value in _result.items()}
+
+
 ENVELOPE_DRAINED_API = {
     'vertical_effective_stress': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'effective_friction_angle': {'type': 'float', 'min_value': 20.0, 'max_value': 50.0},
@@ -788,6 +1091,89 @@ def envelope_drained_api(vertical_effective_stress,
     }
 
 
+def _expand_kwargs(kwargs):
+    """
+    Appends a trailing axis to the keyword arguments of the envelope functions for broadcasting against the
+    envelope points
+    """
+    return {_key: np.expand_dims(np.asarray(_value), -1) for _key, _value in kwargs.items()}
+
+
+def envelope_drained_api_array(vertical_effective_stress,
+                               effective_friction_angle, effective_unit_weight,
+                               effective_length, effective_width,
+                               full_area, factor_sliding=1.5, factor_bearing=2.0,
+                               effective_friction_angle_sliding=np.nan, inclinations=np.linspace(0.0, 90.0, 100),
+                               **kwargs):
+    """
+    Array version of ``envelope_drained_api``. The inputs and the optional keyword arguments of
+    ``verticalcapacity_drained_api`` and ``slidingcapacity_drained_api`` can be scalars or arrays
+    (e.g. a grid of effective footing dimensions obtained for several eccentricities with
+    ``effectivearea_rectangle_api_array``) which are broadcast to a common shape. The envelopes for all
+    entries are calculated in one pass and are stored along the last axis of the returned arrays.
+
+    Envelope points with a non-positive vertical capacity, which are removed in the scalar function, are NaN.
+    Entries with inputs outside the validation ranges return NaN for all envelope points.
+
+    :param inclinations: Load inclinations [:math:`deg`] used to construct the envelope (optional, default=100 values between 0 and 90)
+
+    :returns: Dictionary with the same keys as ``envelope_drained_api`` containing arrays with the envelope points along the last axis
+    """
+    _valid = validation_mask(
+        ENVELOPE_DRAINED_API, vertical_effective_stress=vertical_effective_stress,
+        effective_friction_angle=effective_friction_angle, effective_unit_weight=effective_unit_weight,
+        effective_length=effective_length, effective_width=effective_width, full_area=full_area,
+        factor_sliding=factor_sliding, factor_bearing=factor_bearing,
+        effective_friction_angle_sliding=effective_friction_angle_sliding)
+    p0, phi, gamma, L, B, A, fs, fb, phi_sliding = np.broadcast_arrays(*[
+        np.expand_dims(np.asarray(_value, dtype=float), -1) for _value in (
+            vertical_effective_stress, effective_friction_angle, effective_unit_weight, effective_length,
+            effective_width, full_area, factor_sliding, factor_bearing, effective_friction_angle_sliding)])
+    phi_sliding = np.where(np.isnan(phi_sliding), phi - 5, phi_sliding)
+    inclinations = np.asarray(inclinations, dtype=float)
+    _kwargs = _expand_kwargs(kwargs)
+
+    _envelope_v = verticalcapacity_drained_api_array(
+        vertical_effective_stress=p0,
+        effective_friction_angle=phi,
+        effective_unit_weight=gamma,
+        effective_length=L,
+        effective_width=B,
+        load_inclination=inclinations,
+        **_kwargs)['vertical_capacity [kN]']
+    _valid = np.expand_dims(np.broadcast_to(_valid, p0.shape[:-1]), -1) & (_envelope_v > 0.0)
+    _envelope_v = np.where(_valid, _envelope_v, np.nan)
+
+    _sliding = slidingcapacity_drained_api_array(
+        vertical_load=_envelope_v,
+        effective_friction_angle=phi_sliding,
+        effective_unit_weight=gamma,
+        **_kwargs)
+    _h_max = _sliding['sliding_capacity [kN]']
+    _h_base_outside_eff = _sliding['base_capacity [kN]'] * (1.0 - (L * B) / A)
+
+    _envelope_h_unchanged = _envelope_v * np.tan(np.radians(inclinations))
+    _envelope_h = _envelope_h_unchanged + _h_base_outside_eff + _sliding['skirt_capacity [kN]']
+
+    _v_max = np.where(_valid, _envelope_v, -np.inf).max(axis=-1, keepdims=True)
+    _v_max[np.isinf(_v_max)] = np.nan
+    _envelope_v_full = np.concatenate((_v_max, _envelope_v), axis=-1)
+    _envelope_h_full = np.concatenate((np.where(np.isnan(_v_max), np.nan, 0.0), _envelope_h), axis=-1)
+
+    return {
+        'Envelope V unfactored [kN]': _envelope_v_full,
+        'Envelope H unfactored [kN]': _envelope_h_full,
+        'Envelope V factored [kN]': _envelope_v_full / fb,
+        'Envelope H factored [kN]': _envelope_h_full / fb,
+        'Envelope V uncorrected [kN]': _envelope_v,
+        'Envelope H uncorrected [kN]': _envelope_h_unchanged,
+        'Sliding cutoff V [kN]': _envelope_v,
+        'Sliding cutoff H [kN]': _h_max,
+        'Sliding cutoff V factored [kN]': _envelope_v,
+        'Sliding cutoff H factored [kN]': _h_max / fs
+    }
+
+
 
 ENVELOPE_UNDRAINED_API = {
     'su_base': {'type': 'float', 'min_value': 0.0, 'max_value': 1000.0},
@@ -933,6 +1319,210 @@ def envelope_undrained_api(
     }
 
 
+def envelope_undrained_api_array(
+        su_base, full_area, effective_length, effective_width,
+        factor_sliding=1.5, factor_bearing=2.0, points=100, **kwargs):
+    """
+    Array version of ``envelope_undrained_api``. The inputs and the optional keyword arguments of
+    ``verticalcapacity_undrained_api`` and ``slidingcapacity_undrained_api`` can be scalars or arrays
+    (e.g. a grid of effective footing dimensions obtained for several eccentricities with
+    ``effectivearea_rectangle_api_array``) which are broadcast to a common shape. The envelopes for all
+    entries are calculated in one pass and are stored along the last axis of the returned arrays.
+
+    As in the scalar function, vertical capacities which cannot be calculated for a given horizontal load are
+    set to zero. Entries with inputs outside the validation ranges return NaN for all envelope points.
+
+    :param points: Number of horizontal load values between zero and the sliding capacity (optional, default=100)
+
+    :returns: Dictionary with the same keys as ``envelope_undrained_api`` containing arrays with the envelope points along the last axis. The values for ``'Sliding capacity'`` and ``'Bearing capacity'`` are the dictionaries returned by ``slidingcapacity_undrained_api_array`` and ``verticalcapacity_undrained_api_array``.
+    """
+    _valid = validation_mask(
+        ENVELOPE_UNDRAINED_API, su_base=su_base, full_area=full_area, effective_length=effective_length,
+        effective_width=effective_width, factor_sliding=factor_sliding, factor_bearing=factor_bearing)
+    if 'base_depth' not in kwargs.keys():
+        warnings.warn("Base depth not defined, assuming surface foundation", Warning)
+    base_depth = kwargs.get('base_depth', 0.0)
+
+    # Calculate the sliding capacity
+    _sliding_capacity = slidingcapacity_undrained_api_array(
+        su_base=su_base, foundation_area=full_area, **kwargs)
+    # Calculate the vertical bearing capacity
+    _bearing_capacity = verticalcapacity_undrained_api_array(
+        effective_length=effective_length,
+        effective_width=effective_width,
+        su_base=su_base,
+        **kwargs)
+
+    su0, A, L, B, fs, fb, D, H_max, H_base, H_skirt = np.broadcast_arrays(*[
+        np.expand_dims(np.asarray(_value, dtype=float), -1) for _value in (
+            su_base, full_area, effective_length, effective_width, factor_sliding, factor_bearing, base_depth,
+            _sliding_capacity['sliding_capacity [kN]'], _sliding_capacity['base_resistance [kN]'],
+            _sliding_capacity['skirt_resistance [kN]'])])
+    _kwargs = _expand_kwargs(kwargs)
+    _kwargs.pop('base_depth', None)
+
+    # Select horizontal loads between zero and the total sliding capacity
+    _horizontal_load = H_max * np.linspace(0.0, 1.0, points)
+    # Subtract factored sliding capacity outside effective area and factored skirt resistance from horizontal load
+    _h_outside = H_base * (1.0 - ((L * B) / A))
+    _horizontal_load_corrected = np.maximum(0.0, _horizontal_load - (_h_outside * fs) - (H_skirt * fs))
+    # Calculate the envelope (first iteration)
+    _envelope_v_raw = verticalcapacity_undrained_api_array(
+        effective_length=L,
+        effective_width=B,
+        su_base=su0,
+        base_depth=D,
+        horizontal_load=_horizontal_load_corrected,
+        **_kwargs)['vertical_capacity [kN]']
+    _shape = _envelope_v_raw.shape
+    L, su0, D, fs, fb, H_max, _horizontal_load, _horizontal_load_corrected = [
+        np.broadcast_to(_value, _shape[:-1] + _value.shape[-1:]) for _value in (
+            L, su0, D, fs, fb, H_max, _horizontal_load, _horizontal_load_corrected)]
+    # Correct the envelope for the additional eccentricity
+    with np.errstate(invalid='ignore', divide='ignore'):
+        _effective_width_corrected = np.maximum(
+            0.0, B - (2.0 * D * np.tan(np.arctan(_horizontal_load / _envelope_v_raw))))
+    _embedded = np.broadcast_to(D != 0.0, _shape)
+    _envelope_v_corrected_raw = _envelope_v_raw.copy()
+    if _embedded.any():
+        _envelope_v_corrected_raw[_embedded] = verticalcapacity_undrained_api_array(
+            effective_length=np.broadcast_to(L, _shape)[_embedded],
+            effective_width=np.broadcast_to(_effective_width_corrected, _shape)[_embedded],
+            su_base=np.broadcast_to(su0, _shape)[_embedded],
+            base_depth=np.broadcast_to(D, _shape)[_embedded],
+            horizontal_load=_horizontal_load_corrected[_embedded],
+            **{_key: np.broadcast_to(_value, _shape)[_embedded] for _key, _value in _kwargs.items()}
+        )['vertical_capacity [kN]']
+
+    _zeros = np.zeros(H_max.shape)
+    _envelope_v_uncorrected = np.concatenate((_envelope_v_raw, _zeros), axis=-1)
+    _envelope_v_unfactored = np.concatenate((_envelope_v_corrected_raw, _zeros), axis=-1)
+    _envelope_h_unfactored = np.concatenate((_horizontal_load, H_max), axis=-1)
+
+    _valid = np.expand_dims(np.broadcast_to(_valid, _shape[:-1]), -1) & ~np.isnan(H_max)
+
+    def _envelope(value):
+        return np.where(_valid, np.nan_to_num(value), np.nan)
+
+    return {
+        'Envelope V unfactored [kN]': _envelope(_envelope_v_unfactored),
+        'Envelope H unfactored [kN]': _envelope(_envelope_h_unfactored),
+        'Envelope V factored [kN]': _envelope(_envelope_v_unfactored / fb),
+        'Envelope H factored [kN]': _envelope(_envelope_h_unfactored / fs),
+        'Envelope V uncorrected [kN]': _envelope(_envelope_v_uncorrected),
+        'Envelope H uncorrected [kN]': _envelope(_envelope_h_unfactored),
+        'Sliding capacity': _sliding_capacity,
+        'Bearing capacity': _bearing_capacity,
+    }
+
+
+def _ray_segment_utilisation(horizontal_load, vertical_load, start_h, start_v, end_h, end_v):
+    """
+    Returns the utilisation for the intersection of the load direction with envelope segments.
+    NaN is returned for segments which are not intersected.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Intersection of the load direction (s * p) with the segment (a + u * (b - a)), the utilisation is 1 / s
+        _cross_pe = horizontal_load * (end_v - start_v) - vertical_load * (end_h - start_h)
+        _u = (start_h * vertical_load - start_v * horizontal_load) / _cross_pe
+        _utilisation = _cross_pe / (start_h * end_v - start_v * end_h)
+        _crossing = (_u >= -1e-12) & (_u <= 1.0 + 1e-12) & (_utilisation > 0.0) & np.isfinite(_utilisation)
+    return np.where(_crossing, _utilisation, np.nan)
+
+
+def envelope_utilisation(vertical_load, horizontal_load, envelope_v, envelope_h, max_chunk_size=1000000):
+    """
+    Calculates the utilisation of a (large) number of load cases against failure envelopes in the V-H plane.
+    The utilisation is the ratio of the magnitude of the load vector to the distance from the origin to the
+    envelope along the same direction. Load cases inside the envelope have a utilisation smaller than 1.
+
+    The envelope is the polyline through the envelope points (e.g. ``'Envelope V factored [kN]'`` and
+    ``'Envelope H factored [kN]'`` of ``envelope_undrained_api`` or its array version). NaN envelope points
+    are skipped. For drained envelopes, the sliding cutoff can be checked with a second call using the
+    sliding cutoff points.
+
+    The loads are broadcast against the envelopes without their last axis. A table with load cases of shape
+    ``(n_loads, )`` can be checked against envelopes of shape ``(n_geometries, n_points)`` by supplying
+    envelopes with shape ``(n_geometries, 1, n_points)``.
+
+    When the polar angle of the envelope points varies monotonically along the envelope (which is the case for the
+    API envelopes), the segment intersected by the load direction is found with a binary search on the polar angle.
+    For other envelopes, the intersections with all segments are calculated (in chunks to limit memory use)
+    and the intersection closest to the origin is retained.
+
+    The absolute value of the horizontal load is used. Load cases with a direction not covered by the envelope
+    (e.g. tensile vertical loads) return infinity. Load cases with zero load return zero.
+
+    :param vertical_load: Vertical loads of the load cases (:math:`V`) [:math:`kN`]
+    :param horizontal_load: Horizontal loads of the load cases (:math:`H`) [:math:`kN`]
+    :param envelope_v: Vertical load coordinates of the envelope points, envelope points along the last axis [:math:`kN`]
+    :param envelope_h: Horizontal load coordinates of the envelope points, envelope points along the last axis [:math:`kN`]
+    :param max_chunk_size: Maximum number of load case - segment combinations processed at once for envelopes with a non-monotonic polar angle (default=1000000)
+
+    .. math::
+        u = \\frac{\\sqrt{V^2 + H^2}}{\\sqrt{V_{env}^2 + H_{env}^2}}
+
+    :return: Array with the utilisation of each load case [:math:`-`]
+    """
+    vertical_load = np.asarray(vertical_load, dtype=float)
+    horizontal_load = np.abs(np.asarray(horizontal_load, dtype=float))
+    envelope_v = np.asarray(envelope_v, dtype=float)
+    envelope_h = np.asarray(envelope_h, dtype=float)
+    _points = envelope_v.shape[-1]
+    _envelope_shape = np.broadcast_shapes(envelope_v.shape[:-1], envelope_h.shape[:-1])
+    _shape = np.broadcast_shapes(vertical_load.shape, horizontal_load.shape, _envelope_shape)
+    _envelopes = int(np.prod(_envelope_shape))
+    _env_v = np.broadcast_to(envelope_v, _envelope_shape + (_points, )).reshape(_envelopes, _points)
+    _env_h = np.broadcast_to(envelope_h, _envelope_shape + (_points, )).reshape(_envelopes, _points)
+    _v = np.broadcast_to(vertical_load, _shape).ravel()
+    _h = np.broadcast_to(horizontal_load, _shape).ravel()
+    _envelope_index = np.broadcast_to(np.arange(_envelopes).reshape(_envelope_shape), _shape).ravel()
+
+    # Polar angle of the envelope points, points at the origin are skipped
+    _valid_points = ~(np.isnan(_env_v) | np.isnan(_env_h) | ((_env_v == 0.0) & (_env_h == 0.0)))
+    _theta = np.where(_valid_points, np.arctan2(_env_v, _env_h), np.nan)
+    _no_valid_points = _valid_points.sum(axis=1)
+    _previous_valid = np.maximum.accumulate(
+        np.where(_valid_points, np.arange(_points), 0), axis=1)
+    _theta_change = np.diff(np.take_along_axis(_theta, _previous_valid, axis=1), axis=1)
+    _increasing = np.nanmax(np.append(_theta_change, np.zeros((_envelopes, 1)), axis=1), axis=1) > 0
+    _decreasing = np.nanmin(np.append(_theta_change, np.zeros((_envelopes, 1)), axis=1), axis=1) < 0
+    _monotonic = ~(_increasing & _decreasing)
+
+    # Binary search on the sorted polar angles, angles of different envelopes are offset by 8 radians
+    # Points of envelopes with decreasing angle are reversed first to sort points with equal angle in envelope order
+    _reverse = np.where(_decreasing[:, None], _points - 1 - np.arange(_points), np.arange(_points))
+    _order = np.take_along_axis(_reverse, np.argsort(np.take_along_axis(
+        np.where(_valid_points, _theta, 7.0), _reverse, axis=1), axis=1, kind='stable'), axis=1)
+    _sorted_theta = np.take_along_axis(np.where(_valid_points, _theta, 7.0), _order, axis=1)
+    _sorted_v = np.take_along_axis(_env_v, _order, axis=1)
+    _sorted_h = np.take_along_axis(_env_h, _order, axis=1)
+    _keys = (_sorted_theta + 8.0 * np.arange(_envelopes)[:, None]).ravel()
+    _index = np.searchsorted(
+        _keys, np.arctan2(_v, _h) + 8.0 * _envelope_index, side='right') - _points * _envelope_index
+    _index = np.clip(_index, 1, np.maximum(_no_valid_points[_envelope_index] - 1, 1))
+    utilisation = _ray_segment_utilisation(
+        _h, _v,
+        _sorted_h[_envelope_index, _index - 1], _sorted_v[_envelope_index, _index - 1],
+        _sorted_h[_envelope_index, _index], _sorted_v[_envelope_index, _index])
+
+    # Intersection with all segments for envelopes with non-monotonic polar angle
+    _other = np.where(~_monotonic[_envelope_index])[0]
+    _chunk = max(max_chunk_size // max(_points - 1, 1), 1)
+    for _start in range(0, _other.__len__(), _chunk):
+        _cases = _other[_start:_start + _chunk]
+        _rows = _envelope_index[_cases]
+        utilisation[_cases] = np.fmax.reduce(_ray_segment_utilisation(
+            _h[_cases][:, None], _v[_cases][:, None],
+            _env_h[_rows, :-1], _env_v[_rows, :-1], _env_h[_rows, 1:], _env_v[_rows, 1:]), axis=1)
+
+    utilisation[np.isnan(utilisation)] = np.inf
+    utilisation[(_v == 0.0) & (_h == 0.0)] = 0.0
+    utilisation[np.isnan(_v) | np.isnan(_h) | (_no_valid_points[_envelope_index] == 0)] = np.nan
+
+    return utilisation.reshape(_shape)
+
+
 NQ_FRICTIONANGLE_SAND = {
     'friction_angle': {'type': 'float', 'min_value': 20.0, 'max_value': 50.0},
 }
@@ -1198,6 +1788,84 @@ def failuremechanism_prandtl(
     }
 
 
+def failuremechanism_prandtl_array(friction_angle, width, no_points=250, base_depth=0.0,
+                                   layer_depth_from=None, layer_depth_to=None, **kwargs):
+    """
+    Array version of ``failuremechanism_prandtl``. The friction angle and width can be scalars or arrays
+    (e.g. for many footings or a sensitivity study) which are broadcast to a common shape. The coordinates
+    of the failure surface are returned in arrays with an additional last dimension for the points
+    along the failure surface. All mechanisms have the same number of points. Entries with inputs outside
+    the validation ranges return NaN. No figure is generated.
+
+    The depth of the mechanism below the base of the footing and the horizontal extent from the footing center
+    are calculated directly rather than from the discretised failure surface. The deepest point of the log-spiral
+    is found for :math:`\\omega = \\theta` where the tangent to the spiral is horizontal.
+
+    When the depths of the top and bottom of soil layers are provided, the layers intersected by the failure
+    mechanism are identified. A layer is intersected when it overlaps the depth range between the base
+    of the footing and the deepest point of the mechanism.
+
+    :param friction_angle: Sand angle of internal friction (:math:`\\varphi^{\\prime}`) [:math:`deg`] - Suggested range: 0.0 <= friction_angle <= 60.0
+    :param width: Width of the footing (full width) (:math:`B`) [:math:`m`] - Suggested range: width >= 0.0
+    :param no_points: Number of points along the log-spiral (optional, default=250)
+    :param base_depth: Depth of the footing base below the soil surface (optional, default=0.0) [:math:`m`]
+    :param layer_depth_from: Depths of the tops of the soil layers below the soil surface (optional) [:math:`m`]
+    :param layer_depth_to: Depths of the bottoms of the soil layers below the soil surface (optional) [:math:`m`]
+
+    .. math::
+        z_{max} = r_0 \\cdot e^{\\theta \\tan \\varphi^{\\prime}} \\cos \\varphi^{\\prime}
+
+        x_{max} = \\frac{B}{2} + 2 \\cdot r_0 \\cdot e^{\\frac{\\pi}{2} \\tan \\varphi^{\\prime}} \\sin \\theta
+
+        r_0 = \\frac{B}{2 \\cos \\theta}
+
+    :returns: Dictionary with the following keys:
+
+        - 'X [m]': Array with X-coordinates of the points forming the failure surface (:math:`X`)  [:math:`m`]
+        - 'Y [m]': Array with Y-coordinates of the points forming the failure surface (:math:`Y`)  [:math:`m`]
+        - 'Depth [m]': Depth of the deepest point of the mechanism below the footing base (:math:`z_{max}`)  [:math:`m`]
+        - 'X depth [m]': X-coordinate of the deepest point of the mechanism  [:math:`m`]
+        - 'Extent [m]': X-coordinate of the end of the mechanism at the surface (:math:`x_{max}`)  [:math:`m`]
+        - 'Layers intersected': Boolean array with an additional last dimension for the layers (only when layer depths are provided)
+
+    """
+    _valid = validation_mask(
+        FAILUREMECHANISM_PRANDTL, friction_angle=friction_angle, width=width, **kwargs)
+    phi, B = np.broadcast_arrays(*[np.asarray(_value, dtype=float) for _value in (friction_angle, width)])
+    _valid = np.broadcast_to(_valid, phi.shape)
+    phi = np.where(_valid, np.radians(phi), np.nan)
+    B = np.where(_valid, B, np.nan)
+
+    theta = 0.25 * np.pi + 0.5 * phi
+    r0 = 0.5 * B / np.cos(theta)
+
+    # Dimensions: mechanisms, points
+    omega = np.linspace(0, 0.5 * np.pi, no_points)
+    r = r0[..., np.newaxis] * np.exp(omega * np.tan(phi)[..., np.newaxis])
+    x_spiral = 0.5 * B[..., np.newaxis] - r * np.cos(theta[..., np.newaxis] + omega)
+    y_spiral = r * np.sin(theta[..., np.newaxis] + omega)
+    x_surface = x_spiral[..., -1:] + (x_spiral[..., -1:] - 0.5 * B[..., np.newaxis])
+
+    _r_depth = r0 * np.exp(theta * np.tan(phi))
+    _depth = _r_depth * np.cos(phi)
+    _x_depth = 0.5 * B + _r_depth * np.sin(phi)
+    _extent = 0.5 * B + 2 * r0 * np.exp(0.5 * np.pi * np.tan(phi)) * np.sin(theta)
+
+    _result = {
+        'X [m]': np.concatenate([x_spiral, x_surface], axis=-1),
+        'Y [m]': np.concatenate([y_spiral, np.zeros(x_surface.shape)], axis=-1),
+        'Depth [m]': _depth,
+        'X depth [m]': _x_depth,
+        'Extent [m]': _extent,
+    }
+    if (layer_depth_from is not None) and (layer_depth_to is not None):
+        _base = np.asarray(base_depth, dtype=float)[..., np.newaxis]
+        _result['Layers intersected'] = \
+            (np.asarray(layer_depth_from, dtype=float) < _base + _depth[..., np.newaxis]) & \
+            (np.asarray(layer_depth_to, dtype=float) > _base)
+    return _result
+
+
 class ShallowFoundationCapacity(object):
 
     def __init__(self, title):
@@ -1612,3 +2280,215 @@ class ShallowFoundationCapacityDrained(ShallowFoundationCapacity):
         return fig
 
 
+def _footing_design_sweep(load_cases, lengths, widths, utilisation_func, vertical_key, horizontal_key,
+                          moment_length_key, moment_width_key, points, max_chunk_size):
+    """
+    Shared code for the drained and undrained footing design sweeps. The candidate geometries are processed in
+    chunks. ``utilisation_func`` returns the utilisation matrix (geometries x load cases) for a chunk of geometries
+    and accumulates the calculation times in the timing dictionary.
+    """
+    _start_time = time.perf_counter()
+    lengths = np.atleast_1d(np.asarray(lengths, dtype=float))
+    widths = np.atleast_1d(np.asarray(widths, dtype=float))
+    _length, _width = np.meshgrid(lengths, widths, indexing='ij')
+    _selected = _width <= _length
+    if not _selected.any():
+        raise ValueError("At least one candidate geometry should have a width smaller than or equal to the length")
+    _length = _length[_selected]
+    _width = _width[_selected]
+
+    _vertical_load = np.asarray(load_cases[vertical_key], dtype=float)
+    _horizontal_load = np.asarray(load_cases[horizontal_key], dtype=float)
+    _moments = []
+    for _key in (moment_length_key, moment_width_key):
+        if _key in load_cases.keys():
+            _moments.append(np.abs(np.asarray(load_cases[_key], dtype=float)))
+        else:
+            _moments.append(np.zeros(_vertical_load.shape))
+
+    timings = {'Effective area': 0.0, 'Envelope': 0.0, 'Utilisation': 0.0, 'Total': 0.0}
+    utilisation = np.full((_length.__len__(), _vertical_load.__len__()), np.nan)
+    _chunk = max(max_chunk_size // max(_vertical_load.__len__() * (points + 1), 1), 1)
+    for _start in range(0, _length.__len__(), _chunk):
+        _step_time = time.perf_counter()
+        _L = _length[_start:_start + _chunk, np.newaxis]
+        _B = _width[_start:_start + _chunk, np.newaxis]
+        _effective_area = effectivearea_rectangle_api_array(
+            length=_L, width=_B, vertical_load=_vertical_load,
+            moment_length=_moments[0], moment_width=_moments[1])
+        timings['Effective area'] += time.perf_counter() - _step_time
+        utilisation[_start:_start + _chunk] = utilisation_func(
+            _L, _B, _effective_area['effective_length [m]'], _effective_area['effective_width [m]'],
+            _vertical_load, _horizontal_load, timings)
+
+    _maximum_utilisation = np.where(np.isnan(utilisation), np.inf, utilisation).max(axis=1)
+    geometries = pd.DataFrame({
+        'Length [m]': _length,
+        'Width [m]': _width,
+        'Area [m2]': _length * _width,
+        'Maximum utilisation [-]': _maximum_utilisation,
+        'Governing load case': np.asarray(load_cases.index)[
+            np.where(np.isnan(utilisation), np.inf, utilisation).argmax(axis=1)],
+        'Feasible': _maximum_utilisation <= 1.0
+    })
+    _feasible = geometries[geometries['Feasible']]
+    if _feasible.__len__() == 0:
+        warnings.warn("None of the candidate geometries meets all load cases")
+        optimum = None
+    else:
+        optimum = _feasible.sort_values(['Area [m2]', 'Maximum utilisation [-]'], kind='stable').iloc[0]
+    timings['Total'] = time.perf_counter() - _start_time
+
+    return {
+        'Geometries': geometries,
+        'Optimum': optimum,
+        'Utilisation [-]': utilisation,
+        'Timings [s]': timings,
+        'Number of evaluations [-]': utilisation.size,
+    }
+
+
+def footing_design_sweep_undrained(load_cases, lengths, widths, unit_weight, su_base, su_increase=0.0,
+                                   su_above_base=np.nan, depth=0.0, skirted=False, factor_sliding=1.5,
+                                   factor_bearing=2.0, vertical_key='V [kN]', horizontal_key='H [kN]',
+                                   moment_length_key='M length [kNm]', moment_width_key='M width [kNm]',
+                                   points=100, max_chunk_size=1000000, **kwargs):
+    """
+    Finds the rectangular footing with the minimum area meeting all factored load cases in undrained conditions.
+    Every combination of the candidate lengths and widths (with the width not exceeding the length) is checked
+    against every load case.
+
+    The effective area for each combination of geometry and load case follows from the moments
+    (``effectivearea_rectangle_api_array``). The factored undrained envelopes are calculated with
+    ``envelope_undrained_api_array`` for all combinations at once and the utilisation of each load case is
+    determined with ``envelope_utilisation``. The soil parameters are used as in ``ShallowFoundationCapacityUndrained``.
+
+    Geometries are processed in chunks to limit memory use. The time spent in each step is returned
+    to show how the evaluation scales with the number of load cases and geometries.
+
+    :param load_cases: Dataframe with the factored load cases. Columns for the moments are optional.
+    :param lengths: Array with candidate foundation lengths (:math:`L`) [:math:`m`]
+    :param widths: Array with candidate foundation widths (:math:`B`) [:math:`m`]
+    :param unit_weight: Unit weight of the soil, used to calculate stress at base level (:math:`\\gamma`) [:math:`kN/m3`]
+    :param su_base: Undrained shear strength at foundation base level (:math:`S_{uo}`) [:math:`kPa`]
+    :param su_increase: Linear increase in undrained shear strength (:math:`\\kappa`) [:math:`kPa/m`] (optional, default=0.0)
+    :param su_above_base: Average undrained shear strength above base level (:math:`s_{u,ave}`) [:math:`kPa`] (optional, default=np.nan for the undrained shear strength at base level)
+    :param depth: Depth from the soil surface to the base of the foundation (:math:`D`) [:math:`m`] (optional, default=0.0)
+    :param skirted: Boolean determining whether seabed penetrating skirts are used or not (optional, default=False)
+    :param factor_sliding: Resistance factor for sliding (:math:`\\gamma_{sliding}`) [:math:`-`] (optional, default=1.5)
+    :param factor_bearing: Resistance factor for bearing failure (:math:`\\gamma_{bearing}`) [:math:`-`] (optional, default=2.0)
+    :param vertical_key: Column with the vertical loads [:math:`kN`] (optional, default='V [kN]')
+    :param horizontal_key: Column with the horizontal loads [:math:`kN`] (optional, default='H [kN]')
+    :param moment_length_key: Column with the overturning moments aligned with the length [:math:`kNm`] (optional, default='M length [kNm]')
+    :param moment_width_key: Column with the overturning moments aligned with the width [:math:`kNm`] (optional, default='M width [kNm]')
+    :param points: Number of horizontal load values for the envelopes (optional, default=100)
+    :param max_chunk_size: Maximum number of envelope points calculated at once (optional, default=1000000)
+    :param kwargs: Optional keyword arguments for ``verticalcapacity_undrained_api`` and ``slidingcapacity_undrained_api``
+
+    :returns: Dictionary with the following keys:
+
+        - 'Geometries': Dataframe with the columns ``Length [m]``, ``Width [m]``, ``Area [m2]``, ``Maximum utilisation [-]``, ``Governing load case`` (index of the load case) and ``Feasible``
+        - 'Optimum': Row of the geometries dataframe for the feasible geometry with the minimum area (lowest utilisation for equal areas), None if no geometry is feasible
+        - 'Utilisation [-]': Array with the utilisation for all geometries (rows) and load cases (columns)
+        - 'Timings [s]': Dictionary with the time spent on the effective area, envelope and utilisation calculation and the total time
+        - 'Number of evaluations [-]': Number of combinations of geometries and load cases
+    """
+    if np.isnan(su_above_base):
+        su_above_base = su_base
+
+    def utilisation_func(length, width, effective_length, effective_width, vertical_load, horizontal_load,
+                         timings):
+        _step_time = time.perf_counter()
+        _envelope = envelope_undrained_api_array(
+            su_base=su_base, full_area=length * width, effective_length=effective_length,
+            effective_width=effective_width, factor_sliding=factor_sliding, factor_bearing=factor_bearing,
+            points=points, su_increase=su_increase, su_above_base=su_above_base, base_depth=depth,
+            skirted=skirted, base_sigma_v=unit_weight * depth, embedded_section_area=depth * length, **kwargs)
+        timings['Envelope'] += time.perf_counter() - _step_time
+        _step_time = time.perf_counter()
+        _utilisation = envelope_utilisation(
+            vertical_load=vertical_load, horizontal_load=horizontal_load,
+            envelope_v=_envelope['Envelope V factored [kN]'], envelope_h=_envelope['Envelope H factored [kN]'])
+        timings['Utilisation'] += time.perf_counter() - _step_time
+        return _utilisation
+
+    return _footing_design_sweep(
+        load_cases, lengths, widths, utilisation_func, vertical_key=vertical_key, horizontal_key=horizontal_key,
+        moment_length_key=moment_length_key, moment_width_key=moment_width_key, points=points,
+        max_chunk_size=max_chunk_size)
+
+
+def footing_design_sweep_drained(load_cases, lengths, widths, effective_unit_weight, friction_angle,
+                                 effective_stress_base, interface_frictionangle=np.nan, depth=0.0, skirted=False,
+                                 factor_sliding=1.5, factor_bearing=2.0, vertical_key='V [kN]',
+                                 horizontal_key='H [kN]', moment_length_key='M length [kNm]',
+                                 moment_width_key='M width [kNm]', inclinations=np.linspace(0.0, 90.0, 100),
+                                 max_chunk_size=1000000, **kwargs):
+    """
+    Finds the rectangular footing with the minimum area meeting all factored load cases in drained conditions.
+    Every combination of the candidate lengths and widths (with the width not exceeding the length) is checked
+    against every load case.
+
+    The effective area for each combination of geometry and load case follows from the moments
+    (``effectivearea_rectangle_api_array``). The factored drained envelopes are calculated with
+    ``envelope_drained_api_array`` for all combinations at once and the utilisation in bearing is determined
+    with ``envelope_utilisation``. The sliding utilisation is the ratio of the horizontal load to the factored
+    sliding capacity for the vertical load of the load case (``slidingcapacity_drained_api_array``).
+    The largest of both is retained. The soil parameters are used as in ``ShallowFoundationCapacityDrained``.
+
+    Geometries are processed in chunks to limit memory use. The time spent in each step is returned
+    to show how the evaluation scales with the number of load cases and geometries.
+
+    :param load_cases: Dataframe with the factored load cases. Columns for the moments are optional.
+    :param lengths: Array with candidate foundation lengths (:math:`L`) [:math:`m`]
+    :param widths: Array with candidate foundation widths (:math:`B`) [:math:`m`]
+    :param effective_unit_weight: Effective unit weight of the soil (:math:`\\gamma^{\\prime}`) [:math:`kN/m3`]
+    :param friction_angle: Effective friction angle for the soil below foundation base level (:math:`\\varphi^{\\prime}`) [:math:`deg`]
+    :param effective_stress_base: Vertical effective stress at base (or skirt tip) level (:math:`\\sigma_{v0}^{\\prime}`) [:math:`kPa`]
+    :param interface_frictionangle: Friction angle for sliding (:math:`\\delta^{\\prime}`) [:math:`deg`] (optional, default=np.nan for the friction angle - 5°)
+    :param depth: Depth from the soil surface to the base of the foundation (:math:`D`) [:math:`m`] (optional, default=0.0)
+    :param skirted: Boolean determining whether seabed penetrating skirts are used or not (optional, default=False)
+    :param factor_sliding: Resistance factor for sliding (:math:`\\gamma_{sliding}`) [:math:`-`] (optional, default=1.5)
+    :param factor_bearing: Resistance factor for bearing failure (:math:`\\gamma_{bearing}`) [:math:`-`] (optional, default=2.0)
+    :param vertical_key: Column with the vertical loads [:math:`kN`] (optional, default='V [kN]')
+    :param horizontal_key: Column with the horizontal loads [:math:`kN`] (optional, default='H [kN]')
+    :param moment_length_key: Column with the overturning moments aligned with the length [:math:`kNm`] (optional, default='M length [kNm]')
+    :param moment_width_key: Column with the overturning moments aligned with the width [:math:`kNm`] (optional, default='M width [kNm]')
+    :param inclinations: Load inclinations [:math:`deg`] used to construct the envelopes (optional, default=100 values between 0 and 90)
+    :param max_chunk_size: Maximum number of envelope points calculated at once (optional, default=1000000)
+    :param kwargs: Optional keyword arguments for ``verticalcapacity_drained_api`` and ``slidingcapacity_drained_api``
+
+    :returns: Dictionary with the same keys as ``footing_design_sweep_undrained``
+    """
+    if np.isnan(interface_frictionangle):
+        interface_frictionangle = friction_angle - 5
+
+    def utilisation_func(length, width, effective_length, effective_width, vertical_load, horizontal_load,
+                         timings):
+        _step_time = time.perf_counter()
+        _envelope = envelope_drained_api_array(
+            vertical_effective_stress=effective_stress_base, effective_friction_angle=friction_angle,
+            effective_unit_weight=effective_unit_weight, effective_length=effective_length,
+            effective_width=effective_width, full_area=length * width, factor_sliding=factor_sliding,
+            factor_bearing=factor_bearing, effective_friction_angle_sliding=interface_frictionangle,
+            inclinations=inclinations, base_depth=depth, skirted=skirted,
+            embedded_section_area=depth * length, depth_to_base=depth, **kwargs)
+        _sliding = slidingcapacity_drained_api_array(
+            vertical_load=vertical_load, effective_friction_angle=interface_frictionangle,
+            effective_unit_weight=effective_unit_weight, embedded_section_area=depth * length,
+            depth_to_base=depth, **kwargs)
+        timings['Envelope'] += time.perf_counter() - _step_time
+        _step_time = time.perf_counter()
+        _utilisation = envelope_utilisation(
+            vertical_load=vertical_load, horizontal_load=horizontal_load,
+            envelope_v=_envelope['Envelope V factored [kN]'], envelope_h=_envelope['Envelope H factored [kN]'])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            _utilisation = np.fmax(
+                _utilisation, np.abs(horizontal_load) / (_sliding['sliding_capacity [kN]'] / factor_sliding))
+        timings['Utilisation'] += time.perf_counter() - _step_time
+        return _utilisation
+
+    return _footing_design_sweep(
+        load_cases, lengths, widths, utilisation_func, vertical_key=vertical_key, horizontal_key=horizontal_key,
+        moment_length_key=moment_length_key, moment_width_key=moment_width_key,
+        points=np.asarray(inclinations).__len__(), max_chunk_size=max_chunk_size)
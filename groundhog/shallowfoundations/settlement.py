@@ -12,11 +12,11 @@ from mimetypes import init
 import numpy as np
 
 # Project imports
-from groundhog.general.validation import Validator
+from groundhog.general.validation import Validator, validation_mask
 from groundhog.siteinvestigation.classification.phaserelations import voidratio_bulkunitweight
 from groundhog.general.plotting import LogPlot
 from groundhog.shallowfoundations.stressdistribution import stresses_stripload, stresses_circle, \
-    stresses_rectangle
+    stresses_rectangle, stresses_stripload_array, stresses_circle_array, stress_field
 from groundhog.general.soilprofile import CalculationGrid, profile_from_dataframe
 
 
@@ -171,6 +171,47 @@ def primaryconsolidationsettlement_oc(
         'e final [-]': _e_final
     }
 
+
+def primaryconsolidationsettlement_oc_array(
+        initial_height, initial_voidratio, initial_effective_stress, preconsolidation_pressure,
+        effective_stress_increase, compression_index, recompression_index, e_min=0.3,
+        **kwargs):
+    """
+    Array version of ``primaryconsolidationsettlement_oc``. The inputs can be scalars or arrays (e.g. for all
+    sublayers, plan positions and load stages at once) which are broadcast to a common shape.
+    Entries with inputs outside the validation ranges return NaN. The validation ranges can be overridden
+    with keyword arguments ending with ``__min`` and ``__max``, as for the scalar function.
+
+    :returns: Dictionary with the same keys as ``primaryconsolidationsettlement_oc`` containing arrays
+    """
+    _valid = validation_mask(
+        PRIMARYCONSOLIDATIONSETTLEMENT_OC, initial_height=initial_height, initial_voidratio=initial_voidratio,
+        initial_effective_stress=initial_effective_stress, preconsolidation_pressure=preconsolidation_pressure,
+        effective_stress_increase=effective_stress_increase, compression_index=compression_index,
+        recompression_index=recompression_index, e_min=e_min, **kwargs)
+    H_0, e_0, p_0, p_c, delta_p, C_c, C_r, e_min = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (
+            initial_height, initial_voidratio, initial_effective_stress, preconsolidation_pressure,
+            effective_stress_increase, compression_index, recompression_index, e_min)])
+    _valid = np.broadcast_to(_valid, H_0.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        _final_stress = p_0 + delta_p
+        _delta_e = np.where(
+            _final_stress < p_c,
+            C_r * np.log10(_final_stress / p_0),
+            C_r * np.log10(p_c / p_0) + C_c * np.log10(_final_stress / p_c))
+        _delta_e = np.where((e_0 - _delta_e) > e_min, _delta_e, e_0 - e_min)
+        _delta_z = (H_0 / (1 + e_0)) * _delta_e
+        _e_final = e_0 - _delta_e
+
+    return {
+        'delta z [m]': np.where(_valid, _delta_z, np.nan),
+        'delta e [-]': np.where(_valid, _delta_e, np.nan),
+        'e final [-]': np.where(_valid, _e_final, np.nan)
+    }
+
+
 CONSOLIDATIONSETTLEMENT_MV = {
     'initial_height': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'effective_stress_increase': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -220,6 +261,32 @@ def consolidationsettlement_mv(
         'delta epsilon [-]': _delta_epsilon
     }
 
+
+def consolidationsettlement_mv_array(
+        initial_height, effective_stress_increase, compressibility,
+        **kwargs):
+    """
+    Array version of ``consolidationsettlement_mv``. The inputs can be scalars or arrays (e.g. for all
+    sublayers, plan positions and load stages at once) which are broadcast to a common shape.
+    Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``consolidationsettlement_mv`` containing arrays
+    """
+    _valid = validation_mask(
+        CONSOLIDATIONSETTLEMENT_MV, initial_height=initial_height,
+        effective_stress_increase=effective_stress_increase, compressibility=compressibility, **kwargs)
+    H_0, delta_p, m_v = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (initial_height, effective_stress_increase, compressibility)])
+    _valid = np.broadcast_to(_valid, H_0.shape)
+
+    _delta_epsilon = m_v * delta_p
+    _delta_z = _delta_epsilon * H_0
+    return {
+        'delta z [m]': np.where(_valid, _delta_z, np.nan),
+        'delta epsilon [-]': np.where(_valid, _delta_epsilon, np.nan)
+    }
+
+
 class SettlementCalculation(object):
     """
     Calculates shallow foundation settlement under a certain distributed load
@@ -285,7 +352,8 @@ class SettlementCalculation(object):
                     saturation=1,
                     specific_gravity=specific_gravity,
                     unitweight_water=unitweight_water)['e [-]']
-        if 'mv [1/kPa]' in self.soilprofile.numerical_soil_parameters():
+        if 'mv [1/kPa]' in self.soilprofile.numerical_soil_parameters() and \
+                'OCR [-]' not in self.soilprofile.numerical_soil_parameters():
             pass
         else:
             self.soilprofile['pc from [kPa]'] = self.soilprofile['Vertical effective stress from [kPa]'] * \
@@ -386,60 +454,65 @@ class SettlementCalculation(object):
         """
         self.grid = CalculationGrid(soilprofile=self.soilprofile, dz=dz, custom_nodes=custom_nodes, **kwargs)
         
-    def calculate_foundation_stress(self, applied_stress, offset=0, poissonsratio=0.3, **kwargs):
+    def foundation_stress(self, x, y, z, applied_stress, poissonsratio=0.3, **kwargs):
         """
-        Calculates the vertical stress increase below the foundation.
-        By default, the calculation happens below the center of the foundation (``offset=0``).
-        The Boussinesq solution for the selected foundation shape is used.
+        Calculates the (absolute) vertical stress increase due to the foundation at points with plan
+        coordinates ``x`` (in the direction of the width) and ``y`` (in the direction of the length) relative to the
+        center of the foundation and depth ``z``. The inputs are broadcast to a common shape.
+
+        The Boussinesq solution for the selected foundation shape is used. For strip foundations, ``y`` is not used.
+        For rectangular foundations, the stresses at points off-center are obtained by superposition
+        of the corner solution (see ``stress_field``). For circular foundations, only the stress below the center
+        is available.
+
+        :param x: Horizontal offset from the center of the foundation in the direction of the width [m]
+        :param y: Horizontal offset from the center of the foundation in the direction of the length [m]
+        :param z: Depth below the foundation [m]
+        :param applied_stress: Uniform stress applied by the foundation [kPa]
+        :param poissonsratio: Poisson's ratio used for circular foundations (default=0.3)
+        :return: Array with the vertical stress increase [kPa]
         """
-        self.applied_stress = applied_stress
+        x, y, z = np.broadcast_arrays(*[np.asarray(_value, dtype=float) for _value in (x, y, z)])
         if self.shape == 'strip':
-            self.grid.elements['delta sigma v [kPa]'] = list(map(lambda _z: np.abs(stresses_stripload(
-                _z,
-                x=self.width * 0.5 + offset,
-                width=self.width,
-                imposedstress=applied_stress,
-                **kwargs)['delta sigma z [kPa]']), self.grid.elements['z [m]']))
-            self.grid.nodes['delta sigma v [kPa]'] = list(map(lambda _z: np.abs(stresses_stripload(
-                _z,
-                x=self.width * 0.5 + offset,
+            _delta_sigma_v = stresses_stripload_array(
+                z,
+                x=self.width * 0.5 + x,
                 width=self.width,
                 imposedstress=applied_stress,
-                **kwargs)['delta sigma z [kPa]']), self.grid.nodes['z [m]']))
+                **kwargs)['delta sigma z [kPa]']
         elif self.shape == 'circular':
-            if offset != 0:
+            if (x != 0).any() or (y != 0).any():
                 warnings.warn('Only stress below the center available for circular footing')
-            self.grid.elements['delta sigma v [kPa]'] = list(map(lambda _z: np.abs(stresses_circle(
-                _z,
+            _delta_sigma_v = stresses_circle_array(
+                z,
                 footing_radius=0.5 * self.width,
                 imposedstress=applied_stress,
                 poissonsratio=poissonsratio,
-                **kwargs)['delta sigma z [kPa]']), self.grid.elements['z [m]']))
-            self.grid.nodes['delta sigma v [kPa]'] = list(map(lambda _z: np.abs(stresses_circle(
-                _z,
-                footing_radius=0.5 * self.width,
-                imposedstress=applied_stress,
-                poissonsratio=poissonsratio,
-                **kwargs)['delta sigma z [kPa]']), self.grid.nodes['z [m]']))
+                **kwargs)['delta sigma z [kPa]']
         elif self.shape == 'rectangular':
-            if offset == 0:
-                self.grid.elements['delta sigma v [kPa]'] = list(map(lambda _z: 4 * np.abs(stresses_rectangle(
-                    z=_z,
-                    width=0.5 * self.width,
-                    imposedstress=applied_stress,
-                    length=0.5 * self.length,
-                    **kwargs)['delta sigma z [kPa]']), self.grid.elements['z [m]']))
-                self.grid.nodes['delta sigma v [kPa]'] = list(map(lambda _z: 4 * np.abs(stresses_rectangle(
-                    z=_z,
-                    width=0.5 * self.width,
-                    imposedstress=applied_stress,
-                    length=0.5 * self.length,
-                    **kwargs)['delta sigma z [kPa]']), self.grid.nodes['z [m]']))
-            else:
-                raise ValueError("Calculation for points off-center not implemented yet")
+            _delta_sigma_v = stress_field(
+                x=x, y=y, z=z, rectangles={
+                    'X [m]': [0, ], 'Y [m]': [0, ],
+                    'Length x [m]': [self.width, ], 'Length y [m]': [self.length, ],
+                    'Imposed stress [kPa]': [applied_stress, ]}, **kwargs)['delta sigma z [kPa]']
         else:
             raise ValueError("Foundation shape must be one of: 'strip', 'circular', 'rectangular'")
-    
+        return np.abs(_delta_sigma_v)
+
+    def calculate_foundation_stress(self, applied_stress, offset=0, poissonsratio=0.3, **kwargs):
+        """
+        Calculates the vertical stress increase below the foundation.
+        By default, the calculation happens below the center of the foundation (``offset=0``).
+        The offset is measured in the direction of the foundation width.
+        The Boussinesq solution for the selected foundation shape is used, stresses are calculated
+        for all nodes and elements at once using ``foundation_stress``.
+        """
+        self.applied_stress = applied_stress
+        for _table in [self.grid.elements, self.grid.nodes]:
+            _table['delta sigma v [kPa]'] = self.foundation_stress(
+                x=offset, y=0, z=_table['z [m]'].values, applied_stress=applied_stress,
+                poissonsratio=poissonsratio, **kwargs)
+
     def plot_stress_increase(self, plot_title="", fillcolordict={'SAND': 'yellow', 'CLAY': 'brown'}, latex_titles=True, **kwargs):
         """
         Plots the initial stress vs depth and the stress increase
@@ -487,16 +560,15 @@ class SettlementCalculation(object):
         """
         Calculates the consolidation settlement using the specified grid, foundation shape and loading
         """
-        for i, row in self.grid.elements.iterrows():
-            self.grid.elements.loc[i, "delta z [m]"] = primaryconsolidationsettlement_oc(
-                initial_height=row['dz [m]'],
-                initial_voidratio=row['e0 [-]'],
-                initial_effective_stress=row['Vertical effective stress [kPa]'],
-                preconsolidation_pressure=row['pc [kPa]'],
-                effective_stress_increase=row['delta sigma v [kPa]'],
-                compression_index=row['Cc [-]'],
-                recompression_index=row['Cr [-]'],
-                **kwargs)['delta z [m]']
+        self.grid.elements["delta z [m]"] = primaryconsolidationsettlement_oc_array(
+            initial_height=self.grid.elements['dz [m]'].values,
+            initial_voidratio=self.grid.elements['e0 [-]'].values,
+            initial_effective_stress=self.grid.elements['Vertical effective stress [kPa]'].values,
+            preconsolidation_pressure=self.grid.elements['pc [kPa]'].values,
+            effective_stress_increase=self.grid.elements['delta sigma v [kPa]'].values,
+            compression_index=self.grid.elements['Cc [-]'].values,
+            recompression_index=self.grid.elements['Cr [-]'].values,
+            **kwargs)['delta z [m]']
         self.settlement = self.grid.elements['delta z [m]'].cumsum().iloc[-1]
         self.grid.nodes['Vertical effective stress final [kPa]'] = \
             self.grid.nodes['Vertical effective stress [kPa]'] + \
@@ -514,12 +586,11 @@ class SettlementCalculation(object):
         Calculates the consolidation settlement using the specified grid, foundation shape and loading.
         Instead of using the compression index and recompression index, the modulus of volumetric compressibility :math:`m_v` is used.
         """
-        for i, row in self.grid.elements.iterrows():
-            self.grid.elements.loc[i, "delta z [m]"] = consolidationsettlement_mv(
-                initial_height=row['dz [m]'],
-                effective_stress_increase=row['delta sigma v [kPa]'],
-                compressibility=row['mv [1/kPa]'],
-                **kwargs)['delta z [m]']
+        self.grid.elements["delta z [m]"] = consolidationsettlement_mv_array(
+            initial_height=self.grid.elements['dz [m]'].values,
+            effective_stress_increase=self.grid.elements['delta sigma v [kPa]'].values,
+            compressibility=self.grid.elements['mv [1/kPa]'].values,
+            **kwargs)['delta z [m]']
         self.settlement = self.grid.elements['delta z [m]'].cumsum().iloc[-1]
         self.grid.nodes['Vertical effective stress final [kPa]'] = \
             self.grid.nodes['Vertical effective stress [kPa]'] + \
@@ -528,6 +599,69 @@ class SettlementCalculation(object):
             self.grid.elements['Vertical effective stress [kPa]'] + \
             self.grid.elements['delta sigma v [kPa]']
         
+    def calculate_settlement_map(self, x, load_increments, y=0, poissonsratio=0.3, method='compression index',
+                                 max_chunk_size=1000000, **kwargs):
+        """
+        Calculates the consolidation settlement at many plan positions and for a sequence of load stages in one pass.
+        The applied stress of a load stage is the sum of the load increments up to and including that stage.
+
+        The stress increase for a unit applied stress is calculated for all plan positions and elements of the
+        grid at once using ``foundation_stress`` and scaled with the applied stress of each stage
+        (the elastic stress distribution is linear in the applied stress). The settlement of all elements is then
+        calculated with ``primaryconsolidationsettlement_oc_array`` (``method='compression index'``, as for ``calculate``)
+        or with ``consolidationsettlement_mv_array`` (``method='mv'``, as for ``calculate_mv``).
+        Elements for which the settlement cannot be calculated do not contribute.
+
+        Plan positions are processed in chunks to limit the number of position-element-stage combinations
+        evaluated at once to ``max_chunk_size``.
+
+        The settlement matrix is stored in the attribute ``settlement_map`` with the shape of the broadcast
+        plan coordinates followed by the load stages. The applied stress for each stage is stored in ``stage_stresses``.
+
+        :param x: Horizontal offsets from the center of the foundation in the direction of the width [m]
+        :param load_increments: Increments of the applied stress for the successive load stages [kPa]
+        :param y: Horizontal offsets from the center of the foundation in the direction of the length [m] (default=0)
+        :param poissonsratio: Poisson's ratio used for circular foundations (default=0.3)
+        :param method: Settlement formulation - Options: ('compression index', 'mv') (default='compression index')
+        :param max_chunk_size: Maximum number of position-element-stage combinations evaluated at once (default=1000000)
+        :param kwargs: Optional keyword arguments for the settlement calculation (e.g. ``compression_index__min``)
+        """
+        if method not in ('compression index', 'mv'):
+            raise ValueError("Method %s not recognised. Select from ('compression index', 'mv')" % method)
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        _shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        self.stage_stresses = np.cumsum(np.atleast_1d(np.asarray(load_increments, dtype=float)))
+        _elements = self.grid.elements
+
+        self.settlement_map = np.zeros((x.size, self.stage_stresses.size))
+        _chunk = max(int(max_chunk_size // max(_elements.__len__() * self.stage_stresses.size, 1)), 1)
+        for _start in range(0, x.size, _chunk):
+            _slice = slice(_start, _start + _chunk)
+            # Dimensions: positions, elements, stages
+            _influence = self.foundation_stress(
+                x=x[_slice, np.newaxis], y=y[_slice, np.newaxis], z=_elements['z [m]'].values[np.newaxis, :],
+                applied_stress=1.0, poissonsratio=poissonsratio)[:, :, np.newaxis]
+            _delta_sigma_v = _influence * np.abs(self.stage_stresses)[np.newaxis, np.newaxis, :]
+            if method == 'mv':
+                _delta_z = consolidationsettlement_mv_array(
+                    initial_height=_elements['dz [m]'].values[:, np.newaxis],
+                    effective_stress_increase=_delta_sigma_v,
+                    compressibility=_elements['mv [1/kPa]'].values[:, np.newaxis],
+                    **kwargs)['delta z [m]']
+            else:
+                _delta_z = primaryconsolidationsettlement_oc_array(
+                    initial_height=_elements['dz [m]'].values[:, np.newaxis],
+                    initial_voidratio=_elements['e0 [-]'].values[:, np.newaxis],
+                    initial_effective_stress=_elements['Vertical effective stress [kPa]'].values[:, np.newaxis],
+                    preconsolidation_pressure=_elements['pc [kPa]'].values[:, np.newaxis],
+                    effective_stress_increase=_delta_sigma_v,
+                    compression_index=_elements['Cc [-]'].values[:, np.newaxis],
+                    recompression_index=_elements['Cr [-]'].values[:, np.newaxis],
+                    **kwargs)['delta z [m]']
+            self.settlement_map[_slice] = np.nansum(_delta_z, axis=1)
+        self.settlement_map = self.settlement_map.reshape(_shape + (self.stage_stresses.size, ))
+
     def plot_result(self, plot_title="", fillcolordict={'SAND': 'yellow', 'CLAY': 'brown'}, latex_titles=True, **kwargs):
         """
         Plots the settlement resulting from the stress increase
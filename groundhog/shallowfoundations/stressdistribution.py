@@ -7,9 +7,10 @@ __author__ = 'Bruno Stuyts'
 
 # 3rd party packages
 import numpy as np
+import pandas as pd
 
 # Project imports
-from groundhog.general.validation import Validator
+from groundhog.general.validation import Validator, validation_mask
 
 STRESSES_POINTLOAD = {
     'pointload': {'type': 'float', 'min_value': None, 'max_value': None},
@@ -90,6 +91,43 @@ def stresses_pointload(
     }
 
 
+def stresses_pointload_array(pointload, z, r, poissonsratio, **kwargs):
+    """
+    Array version of ``stresses_pointload``. The inputs can be scalars or arrays (e.g. for a grid of points
+    or many point loads) which are broadcast to a common shape. Entries with inputs outside the validation
+    ranges return NaN.
+
+    The vertical stress is calculated as :math:`3 Q z^3 / (2 \\pi R^5)` with :math:`R = \\sqrt{r^2 + z^2}`,
+    which is identical to the formula of ``stresses_pointload`` but remains defined at the surface (:math:`z = 0`)
+    away from the load.
+
+    :returns: Dictionary with the same keys as ``stresses_pointload`` containing arrays
+    """
+    _valid = validation_mask(
+        STRESSES_POINTLOAD, pointload=pointload, z=z, r=r, poissonsratio=poissonsratio, **kwargs)
+    Q, z, r, nu = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (pointload, z, r, poissonsratio)])
+    _valid = np.broadcast_to(_valid, Q.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        R = np.sqrt(r ** 2 + z ** 2)
+        _delta_sigma_z = (3 * Q * z ** 3) / (2 * np.pi * R ** 5)
+        _delta_sigma_r = (Q / (2 * np.pi)) * (
+            ((3 * r ** 2 * z) / (R ** 5)) -
+            (1 - 2 * nu) / (R ** 2 + z * R))
+        _delta_sigma_theta = (Q / (2 * np.pi)) * (1 - 2 * nu) * (
+            (z / (R ** 3)) -
+            (1 / (R ** 2 + z * R)))
+        _delta_tau_rz = ((3 * Q) / (2 * np.pi)) * ((r * z ** 2) / (R ** 5))
+
+    return {
+        'delta sigma z [kPa]': np.where(_valid, _delta_sigma_z, np.nan),
+        'delta sigma r [kPa]': np.where(_valid, _delta_sigma_r, np.nan),
+        'delta sigma theta [kPa]': np.where(_valid, _delta_sigma_theta, np.nan),
+        'delta tau rz [kPa]': np.where(_valid, _delta_tau_rz, np.nan),
+    }
+
+
 STRESSES_STRIPLOAD = {
     'z': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'x': {'type': 'float', 'min_value': None, 'max_value': None},
@@ -207,6 +245,58 @@ def stresses_stripload(z, x, width, imposedstress, triangular=False, **kwargs):
     }
 
 
+def stresses_stripload_array(z, x, width, imposedstress, triangular=False, **kwargs):
+    """
+    Array version of ``stresses_stripload``. The inputs can be scalars or arrays (e.g. for a grid of depths
+    and horizontal offsets) which are broadcast to a common shape. Entries with inputs outside the validation
+    ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``stresses_stripload`` containing arrays
+    """
+    _valid = validation_mask(
+        STRESSES_STRIPLOAD, z=z, x=x, width=width, imposedstress=imposedstress, **kwargs)
+    z, x, B, q = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (z, x, width, imposedstress)])
+    _valid = np.broadcast_to(_valid, z.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        R_1 = np.sqrt(x ** 2 + z ** 2)
+        R_2 = np.sqrt((x - B) ** 2 + z ** 2)
+
+        _theta1 = np.arccos(z / R_1)
+        _theta2 = np.arccos(z / R_2)
+        beta = np.where(x < B, -_theta2, _theta2)
+        alpha = _theta1 - beta
+
+        if triangular:
+            _delta_sigma_z = (q / np.pi) * (
+                (x / B) * alpha -
+                0.5 * np.sin(2 * beta))
+            _delta_sigma_x = (q / np.pi) * (
+                (x / B) * alpha -
+                (z / B) * np.log((R_1 ** 2) / (R_2 ** 2)) +
+                0.5 * np.sin(2 * beta))
+            _delta_tau_zx = (q / (2 * np.pi)) * (
+                1 +
+                np.cos(2 * beta) -
+                2 * (z / B) * alpha)
+        else:
+            _delta_sigma_z = (q / np.pi) * (
+                alpha +
+                np.sin(alpha) * np.cos(alpha + 2 * beta))
+            _delta_sigma_x = (q / np.pi) * (
+                alpha -
+                np.sin(alpha) * np.cos(alpha + 2 * beta))
+            _delta_tau_zx = (q / np.pi) * (
+                np.sin(alpha) * np.sin(alpha + 2 * beta))
+
+    return {
+        'delta sigma z [kPa]': np.where(_valid, _delta_sigma_z, np.nan),
+        'delta sigma x [kPa]': np.where(_valid, _delta_sigma_x, np.nan),
+        'delta tau zx [kPa]': np.where(_valid, _delta_tau_zx, np.nan),
+    }
+
+
 STRESSES_CIRCLE = {
     'z': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'footing_radius': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -260,6 +350,36 @@ def stresses_circle(z, footing_radius, imposedstress, poissonsratio, **kwargs):
     }
 
 
+def stresses_circle_array(z, footing_radius, imposedstress, poissonsratio, **kwargs):
+    """
+    Array version of ``stresses_circle``. The inputs can be scalars or arrays (e.g. for a grid of depths)
+    which are broadcast to a common shape. Entries with inputs outside the validation ranges return NaN.
+
+    :returns: Dictionary with the same keys as ``stresses_circle`` containing arrays
+    """
+    _valid = validation_mask(
+        STRESSES_CIRCLE, z=z, footing_radius=footing_radius, imposedstress=imposedstress,
+        poissonsratio=poissonsratio, **kwargs)
+    z, r_0, q, nu = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (z, footing_radius, imposedstress, poissonsratio)])
+    _valid = np.broadcast_to(_valid, z.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        _ratio_squared = (r_0 / z) ** 2
+        _delta_sigma_z = q * (
+            1 -
+            (1 / (1 + _ratio_squared)) ** (3 / 2))
+        _delta_sigma_r = 0.5 * q * (
+            (1 + 2 * nu) -
+            (4 * (1 + nu)) / np.sqrt(1 + _ratio_squared) +
+            (1 / ((1 + _ratio_squared) ** (3 / 2))))
+
+    return {
+        'delta sigma z [kPa]': np.where(_valid, _delta_sigma_z, np.nan),
+        'delta sigma r [kPa]': np.where(_valid, _delta_sigma_r, np.nan),
+    }
+
+
 STRESSES_RECTANGLE = {
     'imposedstress': {'type': 'float', 'min_value': None, 'max_value': None},
     'length': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -350,6 +470,52 @@ def stresses_rectangle(
     }
 
 
+def stresses_rectangle_array(imposedstress, length, width, z, **kwargs):
+    """
+    Array version of ``stresses_rectangle``. The inputs can be scalars or arrays (e.g. for a grid of depths
+    or many rectangles) which are broadcast to a common shape. Entries with inputs outside the validation
+    ranges return NaN.
+
+    The stresses at the surface (:math:`z = 0`) and for rectangles with a zero dimension are evaluated
+    as the limit of the corner solution, which makes the function suitable for superposition of rectangles
+    with arbitrary positions relative to the point of interest.
+
+    :returns: Dictionary with the same keys as ``stresses_rectangle`` containing arrays
+    """
+    _valid = validation_mask(
+        STRESSES_RECTANGLE, imposedstress=imposedstress, length=length, width=width, z=z, **kwargs)
+    q, L, B, z = np.broadcast_arrays(*[
+        np.asarray(_value, dtype=float) for _value in (imposedstress, length, width, z)])
+    _valid = np.broadcast_to(_valid, q.shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        R_1_squared = L ** 2 + z ** 2
+        R_2_squared = B ** 2 + z ** 2
+        R_3 = np.sqrt(L ** 2 + B ** 2 + z ** 2)
+        # The numerators vanish when a denominator is zero, the denominators are replaced to avoid 0 / 0
+        R_1_squared = np.where(R_1_squared > 0, R_1_squared, 1.0)
+        R_2_squared = np.where(R_2_squared > 0, R_2_squared, 1.0)
+        _R_2 = np.sqrt(R_2_squared)
+        R_3 = np.where(R_3 > 0, R_3, 1.0)
+
+        _angle = np.arctan2(L * B, z * R_3)
+        _delta_sigma_z = (q / (2 * np.pi)) * (
+            _angle + ((L * B * z) / R_3) * ((1 / R_1_squared) + (1 / R_2_squared)))
+        _delta_sigma_x = (q / (2 * np.pi)) * (
+            _angle - ((L * B * z) / (R_1_squared * R_3)))
+        _delta_sigma_y = (q / (2 * np.pi)) * (
+            _angle - ((L * B * z) / (R_2_squared * R_3)))
+        _delta_tau_zx = (q / (2 * np.pi)) * (
+            (B / _R_2) - ((z ** 2 * B) / (R_1_squared * R_3)))
+
+    return {
+        'delta sigma z [kPa]': np.where(_valid, _delta_sigma_z, np.nan),
+        'delta sigma x [kPa]': np.where(_valid, _delta_sigma_x, np.nan),
+        'delta sigma y [kPa]': np.where(_valid, _delta_sigma_y, np.nan),
+        'delta tau zx [kPa]': np.where(_valid, _delta_tau_zx, np.nan),
+    }
+
+
 STRESSES_LINELOAD_RETAININGWALL = {
     'lineload': {'type': 'float', 'min_value': 0.0, 'max_value': None},
     'toe_depth': {'type': 'float', 'min_value': 0.0, 'max_value': None},
@@ -488,4 +654,124 @@ def stresses_stripload_retainingwall(imposedstress, width, offset, toe_depth, de
         'R 2 [m]': _R_2,
         'alpha [deg]': _alpha,
         'beta [deg]': _beta,
-    }
\ No newline at end of file
+    }
+
+
+def _rectangle_field_contribution(x, y, z, x_min, x_max, y_min, y_max, imposedstress, **kwargs):
+    """
+    Returns the vertical and horizontal stress increase due to uniformly loaded rectangles at points with
+    arbitrary plan positions by superposition of the corner solution for the four rectangles
+    spanned between the point of interest and the corners of each loaded rectangle.
+    Distances are signed, rectangles at the opposite side of the point are subtracted.
+    """
+    _delta_sigma_z = 0.0
+    _delta_sigma_x = 0.0
+    _delta_sigma_y = 0.0
+    for _x_corner, _y_corner, _sign in (
+            (x_max, y_max, 1.0), (x_min, y_max, -1.0), (x_max, y_min, -1.0), (x_min, y_min, 1.0)):
+        _dx = _x_corner - x
+        _dy = _y_corner - y
+        _corner = stresses_rectangle_array(
+            imposedstress=imposedstress, length=np.abs(_dx), width=np.abs(_dy), z=z, **kwargs)
+        _factor = _sign * np.sign(_dx) * np.sign(_dy)
+        _delta_sigma_z = _delta_sigma_z + _factor * _corner['delta sigma z [kPa]']
+        # The horizontal stress in the direction of the length of the corner solution is the stress in x-direction
+        _delta_sigma_x = _delta_sigma_x + _factor * _corner['delta sigma x [kPa]']
+        _delta_sigma_y = _delta_sigma_y + _factor * _corner['delta sigma y [kPa]']
+    return _delta_sigma_z, _delta_sigma_x, _delta_sigma_y
+
+
+def stress_field(x, y, z, rectangles=None, pointloads=None, max_chunk_size=1000000, **kwargs):
+    """
+    Calculates the stress increase due to a set of uniformly loaded rectangles and point loads at the surface
+    on a grid of points. The coordinates of the points can be scalars or arrays which are broadcast to a common shape.
+    A 3-D field is obtained with arrays created by ``np.meshgrid`` and a 2-D section by specifying a scalar
+    for one of the plan coordinates.
+
+    Because the solutions are elastic, the contributions of all loads are superposed. The stresses due to
+    a rectangle at points with arbitrary plan position (inside or outside the rectangle) are obtained
+    from the corner solution of ``stresses_rectangle`` applied to the four rectangles spanned between the point
+    and the corners of the loaded rectangle. Rectangles are aligned with the x- and y-axis.
+
+    The horizontal stresses of the corner solution correspond to a Poisson's ratio of 0.5. For consistency,
+    the stresses due to point loads are calculated with ``stresses_pointload`` using a Poisson's ratio of 0.5
+    and the radial stress is projected on the x- and y-direction. The stresses directly below a point load are
+    singular at the surface.
+
+    The evaluation is vectorised over points and loads. Points are processed in chunks to limit the number
+    of point-load combinations evaluated at once to ``max_chunk_size``.
+
+    :param x: x-coordinate of the points [:math:`m`]
+    :param y: y-coordinate of the points [:math:`m`]
+    :param z: Depth of the points below the loaded surface [:math:`m`] - Suggested range: z >= 0.0
+    :param rectangles: Dataframe (or dictionary) with the columns ``X [m]`` and ``Y [m]`` for the center of the rectangles, ``Length x [m]`` and ``Length y [m]`` for the dimensions in x- and y-direction and ``Imposed stress [kPa]`` for the uniform stress on each rectangle (default=None for no rectangles)
+    :param pointloads: Dataframe (or dictionary) with the columns ``X [m]``, ``Y [m]`` and ``Load [kN]`` (default=None for no point loads)
+    :param max_chunk_size: Maximum number of point-load combinations evaluated at once (default=1000000)
+    :param kwargs: Optional keyword arguments passed to the array versions of the stress functions (e.g. validation overrides ending with ``__min`` or ``__max``)
+
+    :returns: Dictionary with the following keys:
+
+        - 'delta sigma z [kPa]': Increase in vertical stress (:math:`\\Delta \\sigma_z`) [:math:`kPa`]
+        - 'delta sigma x [kPa]': Increase in horizontal stress in x-direction (:math:`\\Delta \\sigma_x`) [:math:`kPa`]
+        - 'delta sigma y [kPa]': Increase in horizontal stress in y-direction (:math:`\\Delta \\sigma_y`) [:math:`kPa`]
+
+    """
+    x, y, z = np.broadcast_arrays(*[np.asarray(_value, dtype=float) for _value in (x, y, z)])
+    _shape = x.shape
+    x, y, z = x.ravel(), y.ravel(), z.ravel()
+    if (z < 0).any():
+        raise ValueError("Depths of the points should be positive")
+
+    if rectangles is None:
+        _rectangles = np.zeros((0, 5))
+    else:
+        _rectangles = pd.DataFrame(rectangles)[
+            ['X [m]', 'Y [m]', 'Length x [m]', 'Length y [m]', 'Imposed stress [kPa]']].to_numpy(dtype=float)
+        if (_rectangles[:, 2:4] < 0).any():
+            raise ValueError("Dimensions of the rectangles should be positive")
+    if pointloads is None:
+        _pointloads = np.zeros((0, 3))
+    else:
+        _pointloads = pd.DataFrame(pointloads)[['X [m]', 'Y [m]', 'Load [kN]']].to_numpy(dtype=float)
+
+    _x_min = _rectangles[:, 0] - 0.5 * _rectangles[:, 2]
+    _x_max = _rectangles[:, 0] + 0.5 * _rectangles[:, 2]
+    _y_min = _rectangles[:, 1] - 0.5 * _rectangles[:, 3]
+    _y_max = _rectangles[:, 1] + 0.5 * _rectangles[:, 3]
+
+    _delta_sigma_z = np.zeros(x.shape)
+    _delta_sigma_x = np.zeros(x.shape)
+    _delta_sigma_y = np.zeros(x.shape)
+
+    _loads = max(_rectangles.shape[0] + _pointloads.shape[0], 1)
+    _chunk = max(int(max_chunk_size // _loads), 1)
+    for _start in range(0, x.size, _chunk):
+        _slice = slice(_start, _start + _chunk)
+        _x = x[_slice, np.newaxis]
+        _y = y[_slice, np.newaxis]
+        _z = z[_slice, np.newaxis]
+        if _rectangles.shape[0] > 0:
+            _rectangle_z, _rectangle_x, _rectangle_y = _rectangle_field_contribution(
+                x=_x, y=_y, z=_z, x_min=_x_min, x_max=_x_max, y_min=_y_min, y_max=_y_max,
+                imposedstress=_rectangles[:, 4], **kwargs)
+            _delta_sigma_z[_slice] += _rectangle_z.sum(axis=1)
+            _delta_sigma_x[_slice] += _rectangle_x.sum(axis=1)
+            _delta_sigma_y[_slice] += _rectangle_y.sum(axis=1)
+        if _pointloads.shape[0] > 0:
+            _dx = _x - _pointloads[:, 0]
+            _dy = _y - _pointloads[:, 1]
+            _r = np.sqrt(_dx ** 2 + _dy ** 2)
+            _point = stresses_pointload_array(
+                pointload=_pointloads[:, 2], z=_z, r=_r, poissonsratio=0.5, **kwargs)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                # Directly below the load, the radial stress vanishes for a Poisson's ratio of 0.5
+                _cos_squared = np.where(_r > 0, _dx ** 2 / _r ** 2, 0.5)
+            _delta_sigma_z[_slice] += _point['delta sigma z [kPa]'].sum(axis=1)
+            _delta_sigma_x[_slice] += (_point['delta sigma r [kPa]'] * _cos_squared).sum(axis=1)
+            _delta_sigma_y[_slice] += (_point['delta sigma r [kPa]'] * (1 - _cos_squared)).sum(axis=1)
+
+    return {
+        'delta sigma z [kPa]': _delta_sigma_z.reshape(_shape),
+        'delta sigma x [kPa]': _delta_sigma_x.reshape(_shape),
+        'delta sigma y [kPa]': _delta_sigma_y.reshape(_shape),
+    }
@@ -26,7 +26,8 @@ from groundhog.general.parameter_mapping import SOIL_PARAMETER_MAPPING, merge_tw
 from groundhog.siteinvestigation.insitutests.pcpt_correlations import *
 from groundhog.general.soilprofile import SoilProfile, plot_fence_diagram, retrieve_geological_profile_dov, retrieve_geological_profile_bro
 from groundhog.general.parameter_mapping import offsets, latlon_distance
-from groundhog.general.agsconversion import AGSConverter
+from groundhog.general.sitecatalog import SiteCatalog
+from groundhog.general.agsconversion import AGSConverter, AGS_TABLES
 
 DEFAULT_CONE_PROPERTIES = SoilProfile({
     'Depth from [m]': [0, ],
@@ -422,6 +423,111 @@ class PCPTProcessing(InsituTestProcessing):
             add_zero_row=add_zero_row,
             **kwargs)
 
+    @classmethod
+    def from_ags_multi(cls, path, z_key=None, qc_key=None, fs_key=None, u2_key=None, push_key='Push',
+                       qc_multiplier=1, fs_multiplier=1, u2_multiplier=1, add_zero_row=True,
+                       ags_group="SCPT", general_group="SCPG", location_group="LOCA", location_key=None,
+                       easting_key="LOCA_NATE [m]", northing_key="LOCA_NATN [m]", elevation_key="LOCA_GL [m]",
+                       srid=None, datum='mLAT', verbose_keys=False, use_shorthands=False,
+                       waterunitweight=10.25, agsformat="4"):
+        """
+        Creates ``PCPTProcessing`` objects for all locations in an AGS file. The AGS file is parsed only once.
+        The groups with the CPT data (default ``SCPT``), general test information (default ``SCPG``)
+        and location details (default ``LOCA``) are converted and the CPT data is split by location identifier.
+
+        The position of each CPT is set from the location group. The coordinates are read using the AGS code keys
+        (e.g. ``LOCA_NATE [m]``), irrespective of the setting of ``verbose_keys``. When a location is not found
+        in the location group, the position is left undefined. The rows of the general group for each location
+        are stored under the key ``general_group`` in the ``additionaldata`` attribute.
+
+        The column keys and multipliers have the same meaning as for ``load_ags``.
+
+        :param path: Path to the ags file
+        :param z_key: Column key for depth. Optional, default=None when 'z [m]' is the column key.
+        :param qc_key: Column key for cone tip resistance. Optional, default=None when 'qc [MPa]' is the column key.
+        :param fs_key: Column key for sleeve friction. Optional, default=None when 'fs [MPa]' is the column key.
+        :param u2_key: Column key for pore pressure at shoulder. Optional, default=None when 'u2 [MPa]' is the column key.
+        :param push_key: Column key for the current push (for downhole PCPT). Optional, default=None for a continuous push.
+        :param qc_multiplier: Multiplier applied on cone tip resistance to convert to MPa (e.g. 0.001 to convert from kPa to MPa)
+        :param fs_multiplier: Multiplier applied on sleeve friction to convert to MPa (e.g. 0.001 to convert from kPa to MPa)
+        :param u2_multiplier: Multiplier applied on pore pressure at shoulder to convert to MPa (e.g. 0.001 to convert from kPa to MPa)
+        :param add_zero_row: Boolean determining whether a datapoint needs to be added at zero depth.
+        :param ags_group: Name of the AGS group with the CPT data (default= ``"SCPT"``)
+        :param general_group: Name of the AGS group with general test information (default= ``"SCPG"``). Use None to skip.
+        :param location_group: Name of the AGS group with the location details (default= ``"LOCA"``). Use None to skip.
+        :param location_key: Column key with the location identifier in the CPT data group. Default=None leads to ``LOCA_ID`` or its verbose equivalent.
+        :param easting_key: Column key in the location group with the easting (default= ``"LOCA_NATE [m]"``)
+        :param northing_key: Column key in the location group with the northing (default= ``"LOCA_NATN [m]"``)
+        :param elevation_key: Column key in the location group with the elevation (default= ``"LOCA_GL [m]"``)
+        :param srid: SRID of the coordinate system of the locations (default=None for an unspecified coordinate system)
+        :param datum: Chart datum used for the elevation (default= ``"mLAT"``)
+        :param verbose_keys: Boolean for using verbose keys in the AGS converter (default=False)
+        :param use_shorthands: Boolean for using shorthands in the AGS converter (default=False)
+        :param waterunitweight: Unit weight of water used for effective stress calculations (default=10.25kN/m3 for seawater)
+        :param agsformat: Format of the AGS file (default=``"4"``)
+        :return: Dictionary with the ``PCPTProcessing`` objects, using the location identifiers as keys
+        """
+        if location_key is None:
+            if verbose_keys:
+                location_key = AGS_TABLES.get(ags_group, dict()).get('LOCA_ID', 'LOCA_ID')
+            else:
+                location_key = 'LOCA_ID'
+
+        try:
+            converter = AGSConverter(path=path, agsformat=agsformat)
+            converter.create_dataframes(
+                selectedgroups=[_group for _group in [ags_group, general_group] if _group is not None],
+                verbose_keys=verbose_keys, use_shorthands=use_shorthands)
+            cpt_data = converter.data[ags_group]
+        except Exception as err:
+            raise ValueError("Error during reading of AGS file. Review the error message and try again. - %s" % (
+                str(err)))
+
+        if location_key not in cpt_data.columns:
+            raise ValueError("Location key %s not found in group %s. Available keys are %s" % (
+                location_key, ags_group, list(cpt_data.columns)))
+
+        # Location details are converted with AGS code keys so the coordinate keys do not depend on verbosity
+        positions = pd.DataFrame()
+        if location_group is not None:
+            try:
+                positions = converter.convert_ags_group(groupname=location_group).drop_duplicates(
+                    subset='LOCA_ID').set_index('LOCA_ID')
+            except Exception as err:
+                warnings.warn("Location group %s could not be converted, positions are not set - %s" % (
+                    location_group, str(err)))
+
+        general_data = dict()
+        if (general_group is not None) and (general_group in converter.data.keys()):
+            if location_key in converter.data[general_group].columns:
+                general_data = dict(list(converter.data[general_group].groupby(location_key, sort=False)))
+
+        cpts = dict()
+        for _location, _data in cpt_data.groupby(location_key, sort=False):
+            _cpt = cls(title=str(_location), waterunitweight=waterunitweight)
+            _cpt.load_pandas(
+                df=_data.reset_index(drop=True),
+                z_key=z_key,
+                qc_key=qc_key,
+                fs_key=fs_key,
+                u2_key=u2_key,
+                push_key=push_key,
+                qc_multiplier=qc_multiplier,
+                fs_multiplier=fs_multiplier,
+                u2_multiplier=u2_multiplier,
+                add_zero_row=add_zero_row)
+            if _location in positions.index:
+                _cpt.set_position(
+                    easting=positions.loc[_location].get(easting_key, np.nan),
+                    northing=positions.loc[_location].get(northing_key, np.nan),
+                    elevation=positions.loc[_location].get(elevation_key, np.nan),
+                    srid=srid, datum=datum)
+            if _location in general_data.keys():
+                _cpt.additionaldata[general_group] = general_data[_location].reset_index(drop=True)
+            cpts[_location] = _cpt
+
+        return cpts
+
     def load_asc(self, path, column_widths=[], skiprows=None, custom_headers=None,
                  z_key=None, qc_key=None, fs_key=None, u2_key=None, push_key='Push',
                  qc_multiplier=1, fs_multiplier=1, u2_multiplier=1, add_zero_row=True, **kwargs):
@@ -2635,20 +2741,10 @@ def plot_longitudinal_profile(
     :return: Plotly figure object
     """
 
-    cpt_names = []
-    x_coords = []
-    y_coords = []
-    elevations = []
-    for _cpt in cpts:
-        try:
-            x_coords.append(_cpt.easting)
-            y_coords.append(_cpt.northing)
-            elevations.append(_cpt.elevation)
-            cpt_names.append(_cpt.title)
-        except Exception as err:
-            warnings.warn(
-                "CPT %s - Error during processing for profile - %s" % (_cpt.title, str(err)))
-            raise
+    catalog = SiteCatalog(cpts, latlon=latlon)
+    cpt_names = catalog.titles
+    x_coords = list(catalog.x)
+    y_coords = list(catalog.y)
 
     if option == 'name':
         start_point = (x_coords[cpt_names.index(start)], y_coords[cpt_names.index(start)])
@@ -2663,46 +2759,9 @@ def plot_longitudinal_profile(
     else:
         raise ValueError("option should be 'name' or 'coords'")
 
-    cpt_df = pd.DataFrame({
-        'CPT objects': cpts,
-        'CPT titles': cpt_names,
-        'X': x_coords,
-        'Y': y_coords,
-        'Z': elevations
-    })
-    for i, row in cpt_df.iterrows():
-        if row['X'] == start_point[0] and row['Y'] == start_point[1]:
-            cpt_df.loc[i, "Offset"] = 0
-            cpt_df.loc[i, "Projected offset"] = 0
-            cpt_df.loc[i, "Before start"] = False
-            cpt_df.loc[i, "Behind end"] = False
-        elif row['X'] == end_point[0] and row['Y'] == end_point[1]:
-            cpt_df.loc[i, "Offset"] = 0
-            if latlon:
-                cpt_df.loc[i, "Projected offset"] = latlon_distance(
-                    start_point[0], start_point[1], end_point[0], end_point[1])
-            else:
-                cpt_df.loc[i, "Projected offset"] = np.sqrt(
-                    (start_point[0] - end_point[0]) ** 2 +
-                    (start_point[1] - end_point[1]) ** 2)
-            cpt_df.loc[i, "Before start"] = False
-            cpt_df.loc[i, "Behind end"] = False
-        else:
-            result = offsets(start_point, end_point, (row['X'], row['Y']), latlon=latlon)
-            cpt_df.loc[i, "Offset"] = result['offset to line']
-            cpt_df.loc[i, "Projected offset"] = result['offset to start projected']
-            cpt_df.loc[i, "Before start"] = result['before start']
-            cpt_df.loc[i, "Behind end"] = result['behind end']
-
-    if extend_profile:
-        selected_cpts = deepcopy(cpt_df[cpt_df['Offset'] <= band])
-    else:
-        selected_cpts = deepcopy(cpt_df[
-            (cpt_df['Offset'] <= band) &
-            (cpt_df['Before start'] == False) &
-            (cpt_df['Behind end'] == False)])
-
-    selected_cpts.sort_values('Projected offset', inplace=True)
+    selected_cpts = catalog.corridor(
+        start_point, end_point, band=band, extend_profile=extend_profile).rename(
+        columns={'Objects': 'CPT objects', 'Titles': 'CPT titles'})
 
     if plotmap:
         fig = subplots.make_subplots(rows=1, cols=2, print_grid=False, column_widths=[0.7, 0.3],
@@ -2801,7 +2860,7 @@ def plot_longitudinal_profile(
     if plotmap:
         fig.update_layout(
             mapbox_style='open-street-map', mapbox_zoom=mapbox_zoom,
-            mapbox_center={'lat': cpt_df['Y'].mean(), 'lon': cpt_df['X'].mean()}
+            mapbox_center={'lat': np.nanmean(catalog.y), 'lon': np.nanmean(catalog.x)}
         )
 
     if showfig:
@@ -2853,20 +2912,10 @@ def plot_combined_longitudinal_profile(
     :return: Plotly figure object
     """
 
-    cpt_names = []
-    x_coords = []
-    y_coords = []
-    elevations = []
-    for _cpt in cpts:
-        try:
-            x_coords.append(_cpt.easting)
-            y_coords.append(_cpt.northing)
-            elevations.append(_cpt.elevation)
-            cpt_names.append(_cpt.title)
-        except Exception as err:
-            warnings.warn(
-                "CPT %s - Error during processing for profile - %s" % (_cpt.title, str(err)))
-            raise
+    catalog = SiteCatalog(cpts, latlon=latlon)
+    cpt_names = catalog.titles
+    x_coords = list(catalog.x)
+    y_coords = list(catalog.y)
 
     if option == 'name':
         start_point = (x_coords[cpt_names.index(start)], y_coords[cpt_names.index(start)])
@@ -2895,46 +2944,9 @@ def plot_combined_longitudinal_profile(
         distance_unit=distance_unit,
         return_layers=True)
 
-    cpt_df = pd.DataFrame({
-        'CPT objects': cpts,
-        'CPT titles': cpt_names,
-        'X': x_coords,
-        'Y': y_coords,
-        'Z': elevations
-    })
-    for i, row in cpt_df.iterrows():
-        if row['X'] == start_point[0] and row['Y'] == start_point[1]:
-            cpt_df.loc[i, "Offset"] = 0
-            cpt_df.loc[i, "Projected offset"] = 0
-            cpt_df.loc[i, "Before start"] = False
-            cpt_df.loc[i, "Behind end"] = False
-        elif row['X'] == end_point[0] and row['Y'] == end_point[1]:
-            cpt_df.loc[i, "Offset"] = 0
-            if latlon:
-                cpt_df.loc[i, "Projected offset"] = latlon_distance(
-                    start_point[0], start_point[1], end_point[0], end_point[1])
-            else:
-                cpt_df.loc[i, "Projected offset"] = np.sqrt(
-                    (start_point[0] - end_point[0]) ** 2 +
-                    (start_point[1] - end_point[1]) ** 2)
-            cpt_df.loc[i, "Before start"] = False
-            cpt_df.loc[i, "Behind end"] = False
-        else:
-            result = offsets(start_point, end_point, (row['X'], row['Y']), latlon=latlon)
-            cpt_df.loc[i, "Offset"] = result['offset to line']
-            cpt_df.loc[i, "Projected offset"] = result['offset to start projected']
-            cpt_df.loc[i, "Before start"] = result['before start']
-            cpt_df.loc[i, "Behind end"] = result['behind end']
-
-    if extend_profile:
-        selected_cpts = deepcopy(cpt_df[cpt_df['Offset'] <= band])
-    else:
-        selected_cpts = deepcopy(cpt_df[
-            (cpt_df['Offset'] <= band) &
-            (cpt_df['Before start'] == False) &
-            (cpt_df['Behind end'] == False)])
-
-    selected_cpts.sort_values('Projected offset', inplace=True)
+    selected_cpts = catalog.corridor(
+        start_point, end_point, band=band, extend_profile=extend_profile).rename(
+        columns={'Objects': 'CPT objects', 'Titles': 'CPT titles'})
 
     fig = subplots.make_subplots(rows=1, cols=1, print_grid=False)
 
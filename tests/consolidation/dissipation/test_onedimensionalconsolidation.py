@@ -11,6 +11,7 @@ import numpy as np
 
 # Project imports
 from groundhog.consolidation.dissipation import onedimensionalconsolidation
+from groundhog.general.soilprofile import SoilProfile
 
 
 class Test_onedimensionalsolutions(unittest.TestCase):
@@ -108,4 +109,78 @@ class Test_onedimensionalsolutions(unittest.TestCase):
             np.interp(0, calc.z, calc.u_steps[-1]),
             39.98,
             2
-        )
\ No newline at end of file
+        )
+
+    def test_consolidation_degree_terzaghi(self):
+        result = onedimensionalconsolidation.consolidation_degree_terzaghi(
+            time=np.array([-1, 0, 1e4, 5e4]), cv=100, drainage_length=0.5)
+        self.assertEqual(result['U [pct]'][0], 0)
+        self.assertEqual(result['U [pct]'][1], 0)
+        # Agreement with the interpolated published solution
+        for i, _time in enumerate([1e4, 5e4]):
+            self.assertAlmostEqual(
+                result['U [pct]'][i + 2],
+                onedimensionalconsolidation.consolidation_degree(
+                    time=_time, cv=100, drainage_length=0.5)['U [pct]'], delta=1)
+        # Exact values at the transition between both solutions and for large time factors
+        _cv_m2_s = 100 / (365 * 24 * 3600)
+        result = onedimensionalconsolidation.consolidation_degree_terzaghi(
+            time=np.array([0.2, 0.2 * (1 - 1e-12), 10]) / _cv_m2_s, cv=100, drainage_length=1)
+        self.assertAlmostEqual(result['U [pct]'][0], 50.4088, 4)
+        self.assertAlmostEqual(result['U [pct]'][1], result['U [pct]'][0], 6)
+        self.assertAlmostEqual(result['U [pct]'][2], 100, 6)
+        self.assertTrue(np.isnan(
+            onedimensionalconsolidation.consolidation_degree_terzaghi(time=1, cv=0.01, drainage_length=1)['U [pct]']))
+
+    def test_time_settlement(self):
+        year = 365 * 24 * 3600
+        profile = SoilProfile({
+            'Depth from [m]': [0, 2, 6],
+            'Depth to [m]': [2, 6, 10],
+            'Soil type': ['SAND', 'CLAY', 'CLAY'],
+            'cv [m2/yr]': [np.nan, 2, 5],
+            'mv [1/kPa]': [1e-4, 1e-3, 5e-4]
+        })
+        calc = onedimensionalconsolidation.TimeSettlementCalculation(profile)
+        calc.set_loading(load_increments=[50, 30], start_times=[0, year], influence_factors=[1, 0.9, 0.7])
+        times = np.array([0, 0.5, 1, 2, 100]) * year
+        calc.calculate(times=times, max_chunk_size=10)
+        self.assertEqual(calc.layer_settlement.shape, (3, 5))
+        # The sand layer settles immediately
+        self.assertAlmostEqual(calc.settlement[0], 1e-4 * 2 * 50, 10)
+        self.assertAlmostEqual(calc.layer_settlement[0, -1], 1e-4 * 2 * 80, 10)
+        # Superposition of both load stages for the clay layer
+        _U = onedimensionalconsolidation.consolidation_degree_terzaghi(
+            time=np.array([2, 1]) * year, cv=2, drainage_length=2)['U [pct]']
+        self.assertAlmostEqual(
+            calc.layer_settlement[1, 3],
+            1e-3 * 4 * 0.9 * (50 * 0.01 * _U[0] + 30 * 0.01 * _U[1]), 10)
+        self.assertAlmostEqual(calc.results['Settlement [m]'].iloc[-1], 0.416, 3)
+        self.assertAlmostEqual(calc.results['U [pct]'].iloc[-1], 100, 3)
+        # Single drainage slows down consolidation
+        calc_single = onedimensionalconsolidation.TimeSettlementCalculation(profile, drainage='single')
+        calc_single.set_loading(load_increments=[50, 30], start_times=[0, year], influence_factors=[1, 0.9, 0.7])
+        calc_single.calculate(times=times)
+        self.assertLess(calc_single.settlement[2], calc.settlement[2])
+        self.assertRaises(
+            KeyError, onedimensionalconsolidation.TimeSettlementCalculation, profile, cv_key='ch [m2/yr]')
+
+    def test_time_settlement_high_cv(self):
+        year = 365 * 24 * 3600
+        profile = SoilProfile({
+            'Depth from [m]': [0, 2],
+            'Depth to [m]': [2, 6],
+            'Soil type': ['SAND', 'CLAY'],
+            'cv [m2/yr]': [3000, 2],
+            'mv [1/kPa]': [1e-4, 1e-3]
+        })
+        calc = onedimensionalconsolidation.TimeSettlementCalculation(profile)
+        calc.set_loading(load_increments=[50, ], start_times=[0, ])
+        calc.calculate(times=np.array([0, 1e-3, 1, 100]) * year)
+        self.assertFalse(np.isnan(calc.settlement).any())
+        # The sand layer consolidates within days
+        self.assertAlmostEqual(calc.layer_settlement[0, 2], 1e-4 * 2 * 50, 10)
+        self.assertLess(calc.layer_settlement[0, 1], 1e-4 * 2 * 50)
+        self.assertAlmostEqual(calc.settlement[-1], 1e-4 * 2 * 50 + 1e-3 * 4 * 50, 6)
+        profile['cv [m2/yr]'] = [0, 2]
+        self.assertRaises(ValueError, onedimensionalconsolidation.TimeSettlementCalculation, profile)
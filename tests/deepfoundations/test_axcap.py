@@ -118,4 +118,50 @@ class Test_axcapcalc_AlmHamre(unittest.TestCase):
     def test_pilepenetration(self):
         self.test_gridding()
         self.calc_almhamre.set_pilepenetration(pile_penetration=18)
-        self.assertEqual(self.calc_almhamre.output["Depth to [m]"].max(), 18)
\ No newline at end of file
+        self.assertEqual(self.calc_almhamre.output["Depth to [m]"].max(), 18)
+
+    def test_capacity_profile(self):
+        self.test_gridding()
+        self.calc_almhamre.calculate_capacity_profile(
+            circumference=2 * np.pi, base_area=np.pi, internal_circumference=1.9 * np.pi, annulus_area=0.1,
+            pile_weight_permeter=5, soilplug_weight_permeter=10)
+        self.assertEqual(self.calc_almhamre.capacity_profile.__len__(), 20)
+        # Compare with the calculation at selected pile penetrations
+        for _penetration in [4, 13]:
+            self.calc_almhamre.set_pilepenetration(pile_penetration=_penetration)
+            self.calc_almhamre.calculate_unitskinfriction()
+            self.calc_almhamre.calculate_unitendbearing()
+            self.calc_almhamre.calculate_pilecapacity(
+                circumference=2 * np.pi, base_area=np.pi, internal_circumference=1.9 * np.pi, annulus_area=0.1,
+                pile_weight=5 * _penetration, soilplug_weight=10 * _penetration)
+            _row = self.calc_almhamre.capacity_profile[
+                self.calc_almhamre.capacity_profile["Pile penetration [m]"] == _penetration].iloc[0]
+            for _key in ['Rs compression plugged [kN]', 'Rb coring [kN]', 'Rt compression [kN]', 'Rt tension [kN]']:
+                self.assertAlmostEqual(_row[_key], self.calc_almhamre.result[_key], 6)
+            self.assertEqual(_row['Plugged compression'], self.calc_almhamre.result['Plugged compression'])
+
+    def test_design_sweep(self):
+        self.test_checking()
+        result = axcap.pile_design_sweep(
+            self.calc_almhamre.sp, diameters=[1.5, 2], wall_thicknesses=[0.04, 0.05],
+            target_loads=[2000, 8000, 1e6])
+        self.assertEqual(result.__len__(), 12)
+        self.assertTrue(np.isnan(result[result['Target load [kN]'] == 1e6]['Minimum penetration [m]']).all())
+        # Compare with the capacity profile for a single geometry
+        _row = result[(result['Diameter [m]'] == 2) & (result['Wall thickness [m]'] == 0.05) &
+                      (result['Target load [kN]'] == 8000)].iloc[0]
+        self.calc_almhamre.create_grid()
+        self.calc_almhamre.calculate_capacity_profile(
+            circumference=2 * np.pi, base_area=np.pi, internal_circumference=1.9 * np.pi,
+            annulus_area=0.25 * np.pi * (4 - 1.9 ** 2), pile_weight_permeter=_row['Pile weight [kN/m]'])
+        _profile = self.calc_almhamre.capacity_profile
+        self.assertEqual(
+            _row['Minimum penetration [m]'],
+            _profile[_profile['Rt compression [kN]'] >= 8000]['Pile penetration [m]'].min())
+        result_locations = axcap.pile_design_sweep_locations(
+            {'A': self.calc_almhamre.sp, 'B': self.calc_almhamre.sp}, processes=2,
+            diameters=[1.5, 2], wall_thicknesses=[0.04, 0.05], target_loads=[2000, 8000, 1e6])
+        self.assertEqual(result_locations.__len__(), 24)
+        np.testing.assert_equal(
+            np.array(result_locations[result_locations['Location'] == 'B']['Minimum penetration [m]']),
+            np.array(result['Minimum penetration [m]']))
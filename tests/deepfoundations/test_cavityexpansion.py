@@ -80,4 +80,65 @@ class Test_cavityexpansionfunctions(unittest.TestCase):
             undrained_shear_strength=10,
             shear_modulus=1000)
         self.assertTrue(collapsed_result['yielding'])
-        self.assertTrue(np.isnan(collapsed_result['elastic wall expansion [m]']))
\ No newline at end of file
+        self.assertTrue(np.isnan(collapsed_result['elastic wall expansion [m]']))
+
+    def test_expansion_tresca_thicksphere_array(self):
+        internal_pressures = np.array([110, 120, 135, 150])
+        result = cavityexpansion.expansion_tresca_thicksphere_array(
+            undrained_shear_strength=10,
+            internal_radius=1,
+            external_radius=np.array([[10], [5]]),
+            internal_pressure=internal_pressures,
+            external_pressure=100,
+            youngs_modulus=1000,
+            poissons_ratio=0.495)
+        self.assertEqual(result['plastic_radius [m]'].shape, (2, 4))
+        self.assertAlmostEqual(result['expanded_radius [m]'][0, 3], 1.250, 3)
+        for i, _external_radius in enumerate([10, 5]):
+            for j, _pressure in enumerate(internal_pressures):
+                try:
+                    _scalar = cavityexpansion.expansion_tresca_thicksphere(
+                        undrained_shear_strength=10, internal_radius=1, external_radius=_external_radius,
+                        internal_pressure=_pressure, external_pressure=100, youngs_modulus=1000,
+                        poissons_ratio=0.495, fail_silently=False)
+                except ValueError:
+                    # No feasible plastic radius
+                    self.assertTrue(np.isnan(result['plastic_radius [m]'][i, j]))
+                    continue
+                self.assertAlmostEqual(
+                    result['plastic_radius [m]'][i, j], _scalar['plastic_radius [m]'], 8)
+                self.assertAlmostEqual(
+                    result['expanded_radius [m]'][i, j], _scalar['expanded_radius [m]'], 8)
+                self.assertAlmostEqual(
+                    result['yielding_pressure [kPa]'][i, j], _scalar['yielding_pressure [kPa]'], 8)
+
+    def test_expansion_cylinder_tresca_array(self):
+        depths = np.linspace(1, 30, 30)
+        insitu_pressures = 6 * depths
+        undrained_shear_strengths = 10 + 2 * depths
+        borehole_pressures = np.array([0, 50, 105, 120, 250, 500])
+        result = cavityexpansion.expansion_cylinder_tresca_array(
+            insitu_pressure=insitu_pressures[:, np.newaxis],
+            borehole_pressure=borehole_pressures[np.newaxis, :],
+            diameter=0.4,
+            undrained_shear_strength=undrained_shear_strengths[:, np.newaxis],
+            shear_modulus=100 * undrained_shear_strengths[:, np.newaxis])
+        self.assertEqual(result['plastic radius [m]'].shape, (30, 6))
+        self.assertEqual(result['pressure expansion function']['pressure difference [kPa]'].shape, (30, 1, 250))
+        self.assertTrue((result['minimum pressure [kPa]'] <= result['yielding pressure [kPa]']).all())
+        self.assertTrue((result['yielding pressure [kPa]'] <= result['maximum pressure [kPa]']).all())
+        for i in range(30):
+            for j, _pressure in enumerate(borehole_pressures):
+                _scalar = cavityexpansion.expansion_cylinder_tresca(
+                    insitu_pressure=insitu_pressures[i], borehole_pressure=_pressure, diameter=0.4,
+                    undrained_shear_strength=undrained_shear_strengths[i],
+                    shear_modulus=100 * undrained_shear_strengths[i], fail_silently=False)
+                self.assertEqual(result['yielding'][i, j], _scalar['yielding'])
+                for _key in ['elastic wall expansion [m]', 'plastic wall expansion [m]', 'plastic radius [m]']:
+                    if np.isnan(_scalar[_key]):
+                        self.assertTrue(np.isnan(result[_key][i, j]))
+                    else:
+                        self.assertAlmostEqual(result[_key][i, j], _scalar[_key], 8)
+            self.assertTrue(np.allclose(
+                result['pressure expansion function']['pressure difference [kPa]'][i, 0],
+                _scalar['pressure expansion function']['pressure difference [kPa]']))
@@ -78,6 +78,14 @@ class Test_shaftcalcdebeer(unittest.TestCase):
             2
         )
 
+    def test_baseresistance_diameters(self):
+        qb = self.calc.calculate_base_resistance_diameters(diameters=[0.4, 0.5, 0.9])
+        self.assertEqual(qb.shape, (self.calc.depth.__len__(), 3))
+        self.assertAlmostEqual(np.interp(15, self.calc.calculation_data['z [m]'], qb[:, 0]), 5.26, 2)
+        self.calc.diameter_pile = 0.5
+        self.calc.calculate_base_resistance()
+        self.assertTrue(np.allclose(qb[:, 1], self.calc.qb, rtol=1e-10, atol=1e-10))
+
     def test_shaftresistance(self):
         self.calc.correct_shaft_qc()
         self.calc.calculate_average_qc()
@@ -85,4 +93,29 @@ class Test_shaftcalcdebeer(unittest.TestCase):
             self.calc.layering['qc avg [MPa]'].iloc[0],
             0.85,
             2
-        )
\ No newline at end of file
+        )
+        for i, row in self.calc.layering.iterrows():
+            self.assertAlmostEqual(
+                row['qc avg [MPa]'],
+                np.nan_to_num(self.calc.qc_corrected[
+                    (self.calc.depth_raw >= row['Depth from [m]']) &
+                    (self.calc.depth_raw <= row['Depth to [m]'])]).mean(),
+                10)
+        self.calc.calculate_unit_shaft_friction()
+        self.assertAlmostEqual(
+            self.calc.layering['qs [kPa]'].iloc[0], 1000 * self.calc.layering['qc avg [MPa]'].iloc[0] / 30, 10)
+
+
+class Test_betadebeer(unittest.TestCase):
+
+    def test_beta_lookup(self):
+        hd = np.append(np.linspace(0, 60, 241), [-1, 1e6])
+        frictionangle = np.deg2rad(np.linspace(0.01, 50, 243))
+        beta_table = debeer.beta_debeer(hd, frictionangle)
+        beta_exact = debeer.beta_debeer(hd, frictionangle, exact=True)
+        self.assertLess(np.abs(beta_table - beta_exact).max(), 1e-9)
+        self.assertEqual(beta_table[0], 0)
+        self.assertEqual(beta_table[-2], 0.5 * np.pi)
+        self.assertEqual(beta_table[-1], 0.5 * np.pi)
+        beta = debeer.beta_debeer(3, np.deg2rad(45))
+        self.assertAlmostEqual(debeer.DeBeerCalculation.optimisation_func(beta, 3, np.deg2rad(45)), 0, 8)
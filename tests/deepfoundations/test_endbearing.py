@@ -41,10 +41,39 @@ class Test_unitendbearing_sand_almhamre(unittest.TestCase):
         self.assertAlmostEqual(
             result['q_b_coring [kPa]'], 6129.157, 3)
 
+
 class Test_unitendbearing_clay_almhamre(unittest.TestCase):
 
     def test_unitendbearing_clay_almhamre(self):
         result = endbearing.unitendbearing_clay_almhamre(
             qt=1.5)
         self.assertAlmostEqual(
-            result['q_b_coring [kPa]'], 900, 3)
\ No newline at end of file
+            result['q_b_coring [kPa]'], 900, 3)
+
+
+class Test_unitendbearing_array(unittest.TestCase):
+
+    def test_api(self):
+        result = endbearing.API_unit_end_bearing_sand_rp2geo_array(
+            api_relativedensity=np.array(["Medium dense", "Very dense", "Loose"], dtype=object),
+            api_soildescription="Sand-silt", sigma_vo_eff=np.array([100.0, 400.0, 100.0]), qb_limit=True)
+        np.testing.assert_allclose(result['q_b_plugged [kPa]'], [1200.0, 10000.0, np.nan])
+        result = endbearing.API_unit_end_bearing_clay_array(undrained_shear_strength=np.array([100.0, -10.0]))
+        np.testing.assert_allclose(result['q_b_coring [kPa]'], [900.0, np.nan])
+
+    def test_api_array_limit(self):
+        result = endbearing.API_unit_end_bearing_sand_rp2geo_array(
+            api_relativedensity="Dense", api_soildescription="Sand", sigma_vo_eff=400.0,
+            qb_limit=np.array([True, False]))
+        np.testing.assert_allclose(result['q_b_plugged [kPa]'], [10000.0, 16000.0])
+        result = endbearing.API_unit_end_bearing_clay_array(
+            undrained_shear_strength=np.array([100.0, -10.0]), undrained_shear_strength__min=-20.0)
+        np.testing.assert_allclose(result['q_b_coring [kPa]'], [900.0, -90.0])
+
+    def test_almhamre(self):
+        result = endbearing.unitendbearing_sand_almhamre_array(qt=np.array([10.0, 20.0]), sigma_vo_eff=100.0)
+        self.assertAlmostEqual(
+            result['q_b_coring [kPa]'][1],
+            endbearing.unitendbearing_sand_almhamre(qt=20.0, sigma_vo_eff=100.0)['q_b_coring [kPa]'], 6)
+        result = endbearing.unitendbearing_clay_almhamre_array(qt=np.array([1.5, 150.0]))
+        np.testing.assert_allclose(result['q_b_coring [kPa]'], [900.0, np.nan])
@@ -69,4 +69,19 @@ class Test_pilecalckoppejan(unittest.TestCase):
         self.assertAlmostEqual(self.koppejan.qcII, 16.13, 2)
         self.assertAlmostEqual(self.koppejan.qcIII, 8.02, 2)
         self.assertAlmostEqual(self.koppejan.qcI, 12.51, 2)
-        self.assertAlmostEqual(self.koppejan.Frb, 1404, 0)
\ No newline at end of file
+        self.assertAlmostEqual(self.koppejan.Frb, 1404, 0)
+
+    def test_resistance_profile(self):
+        """
+        Test the base and shaft resistance calculation for all penetrations
+        """
+        self.test_mapping()
+        self.koppejan.calculate_resistance_profile(alpha_s=0.01, alpha_p=1)
+        profile = self.koppejan.resistance_profile
+        self.assertLessEqual(profile['Penetration [m]'].max(), self.cpt_data['z [m]'].max() - 4 * 0.4)
+        selected = profile[np.isclose(profile['Penetration [m]'], 16.5)].iloc[0]
+        self.assertAlmostEqual(selected['qcII [MPa]'], 16.13, 2)
+        self.assertAlmostEqual(selected['qcIII [MPa]'], 8.02, 2)
+        self.assertAlmostEqual(selected['qcI [MPa]'], 12.51, 2)
+        self.assertAlmostEqual(selected['Frb [kN]'], 1404, 0)
+        self.assertAlmostEqual(selected['Frs [kN]'], 1132, 0)
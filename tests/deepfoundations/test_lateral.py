@@ -2,6 +2,9 @@ __author__ = "Wouter Karreman and Ping Li"
 
 import unittest
 
+# 3rd party packages
+import numpy as np
+
 # Project imports
 from groundhog.deepfoundations.lateralresponse import lateral
 
@@ -26,4 +29,37 @@ class Test_lateral(unittest.TestCase):
         )
         self.assertAlmostEqual(result['efficiencies'][0], 0.404, 3)
         self.assertAlmostEqual(result['efficiencies'][-1], 0.707, 3)
-        
\ No newline at end of file
+        self.assertIsNone(result['pile_fig'])
+        result = lateral.pilegroupeffect_reesevanimpe(
+            pile_x=[0, 1.58], pile_y=[0, 0], pile_diameters=[0.42, 0.42],
+            load_x=2, load_y=2, show_fig=False, plot_fig=True)
+        self.assertIsNotNone(result['pile_fig'])
+
+    def test_pilegroupeffect_reesevanimpe_directions(self):
+        pile_x = [0, 1.58, 0, 1.58, 0, 1.58, 0, 1.58]
+        pile_y = [0, 0, 1.08, 1.08, 2.16, 2.16, 3.18, 3.18]
+        pile_diameters = [0.42, 0.42, 0.42, 0.42, 0.42, 0.42, 0.42, 0.42]
+        angles = np.radians(np.arange(0, 360, 45))
+        result = lateral.pilegroupeffect_reesevanimpe_directions(
+            pile_x=pile_x, pile_y=pile_y, pile_diameters=pile_diameters,
+            load_x=np.cos(angles), load_y=np.sin(angles), max_chunk_size=100)
+        self.assertEqual(result['efficiency_matrix'].shape, (8, 8, 8))
+        for i, _angle in enumerate(angles):
+            _single = lateral.pilegroupeffect_reesevanimpe(
+                pile_x=pile_x, pile_y=pile_y, pile_diameters=pile_diameters,
+                load_x=np.cos(_angle), load_y=np.sin(_angle), show_fig=False, plot_fig=False)
+            self.assertIsNone(_single['pile_fig'])
+            self.assertTrue(np.allclose(result['efficiency_matrix'][i], _single['efficiency_matrix']))
+            self.assertTrue(np.allclose(result['efficiencies'][i], _single['efficiencies']))
+        self.assertAlmostEqual(result['efficiencies'][1, 0], 0.404, 3)
+
+    def test_pilegroupeffect_largegroup(self):
+        # 500 piles and 36 load directions
+        x, y = np.meshgrid(np.arange(25) * 2.5, np.arange(20) * 2.5)
+        angles = np.radians(np.arange(0, 360, 10))
+        result = lateral.pilegroupeffect_reesevanimpe_directions(
+            pile_x=x.flatten(), pile_y=y.flatten(), pile_diameters=np.ones(500),
+            load_x=np.cos(angles), load_y=np.sin(angles))
+        self.assertEqual(result['efficiencies'].shape, (36, 500))
+        # Symmetry of the regular grid for opposite load directions
+        self.assertTrue(np.allclose(result['efficiencies'][0], result['efficiencies'][18][::-1]))
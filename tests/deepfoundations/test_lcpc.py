@@ -48,3 +48,83 @@ class Test_pilecalclcpc(unittest.TestCase):
         self.assertAlmostEqual(result["Rs [kN]"], 783, 0)
         self.assertAlmostEqual(result["Rb [kN]"], 2166, 0)
         self.assertAlmostEqual(result["Rc [kN]"], 2948, 0)
+
+    def test_qca_multiple_diameters(self):
+        result = lcpc.qca_lcpc(
+            depth=self.cpt_data['z [m]'], qc=self.cpt_data['qc [MPa]'], diameters=[0.4, 0.8], max_chunk_size=5000)
+        self.assertEqual(result['qca [MPa]'].shape, (2, self.cpt_data.__len__()))
+        for i, _diameter in enumerate([0.4, 0.8]):
+            # Direct calculation of the clipped average at a selected depth
+            _z = self.cpt_data['z [m]'].iloc[500]
+            _window = self.cpt_data[
+                (self.cpt_data['z [m]'] > _z - 1.5 * _diameter) &
+                (self.cpt_data['z [m]'] < _z + 1.5 * _diameter)]['qc [MPa]']
+            _mean = _window.mean()
+            self.assertAlmostEqual(result['qca prime [MPa]'][i, 500], _mean, 6)
+            self.assertAlmostEqual(
+                result['qca [MPa]'][i, 500],
+                _window[(_window >= 0.7 * _mean) & (_window <= 1.3 * _mean)].mean(), 6)
+
+    @staticmethod
+    def _qca_loop(depth, qc, diameter):
+        # Direct calculation of the averages over every window
+        _data = pd.DataFrame({'z [m]': depth, 'qc [MPa]': qc})
+        qca_prime = np.full(_data.__len__(), np.nan)
+        qca = np.full(_data.__len__(), np.nan)
+        for i, row in _data.iterrows():
+            _window = _data[
+                (_data['z [m]'] > row['z [m]'] - 1.5 * diameter) &
+                (_data['z [m]'] < row['z [m]'] + 1.5 * diameter)]['qc [MPa]'].copy()
+            qca_prime[i] = _window.mean()
+            _window[(_window < 0.7 * qca_prime[i]) | (_window > 1.3 * qca_prime[i])] = np.nan
+            qca[i] = _window.mean()
+        return qca_prime, qca
+
+    def test_qca_regression(self):
+        diameters = [0.4, 0.8, 1.5]
+        result = lcpc.qca_lcpc(
+            depth=self.cpt_data['z [m]'], qc=self.cpt_data['qc [MPa]'], diameters=diameters, max_chunk_size=5000)
+        for i, _diameter in enumerate(diameters):
+            qca_prime, qca = self._qca_loop(self.cpt_data['z [m]'], self.cpt_data['qc [MPa]'], _diameter)
+            np.testing.assert_array_equal(result['qca prime [MPa]'][i], qca_prime)
+            np.testing.assert_array_equal(result['qca [MPa]'][i], qca)
+        self.assertAlmostEqual(result['qca [MPa]'][1, 232], 1.3295, 4)
+
+    def test_qca_factor_bounds(self):
+        # Windows of three points with an average of 10MPa and points at exactly 0.7 and 1.3 times the average
+        depth = np.arange(0.0, 30.0, 1.0)
+        qc = np.tile([10.0, 7.0, 13.0], 10)
+        qc[[5, 17]] = np.nan
+        result = lcpc.qca_lcpc(depth=depth, qc=qc, diameters=1)
+        qca_prime, qca = self._qca_loop(depth, qc, 1)
+        np.testing.assert_array_equal(result['qca prime [MPa]'][0], qca_prime)
+        np.testing.assert_array_equal(result['qca [MPa]'][0], qca)
+        np.testing.assert_array_equal(result['qca [MPa]'][0, 1:4], [10.0, 10.0, 10.0])
+
+    def test_pilegroups(self):
+        calc = lcpc.LCPCAxcapCalculation(
+            depth=self.cpt_data['z [m]'],
+            qc=self.cpt_data['qc [MPa]'],
+            diameter_pile=0.4,
+            group_base='II', group_shaft='IA')
+        calc.set_soil_layers(soilprofile=SoilProfile({
+            'Depth from [m]': [0, 3, 6, 15, 20],
+            'Depth to [m]': [3, 6, 15, 20, 25],
+            "Total unit weight [kN/m3]": [16, 19, 17.5, 20, 21],
+            'Soil type': ['Clay', 'Sand', 'Silt', 'Gravel', 'Chalk'],
+            "Ignore shaft friction": [True, False, False, False, False]
+        }))
+        calc.qca_calculation()
+        calc.calculate_resistance_pilegroups()
+        result = calc.get_axialpileresistance_pilegroups(17)
+        self.assertEqual(result.__len__(), 8)
+        _selected = result[(result['Group base'] == 'II') & (result['Group shaft'] == 'IA')].iloc[0]
+        self.assertAlmostEqual(_selected["Rs [kN]"], 783, 0)
+        self.assertAlmostEqual(_selected["Rb [kN]"], 2166, 0)
+        self.assertAlmostEqual(_selected["Rc [kN]"], 2948, 0)
+        codes = lcpc.soiltype_lcpc_codes(qc=[0.5, 8, 20, 3], soiltype=['Clay', 'Sand', 'Gravel', 'Chalk'])
+        self.assertEqual(
+            [lcpc.LCPC_SOILTYPES_DETAIL[_code] for _code in codes],
+            [calc.soiltype_lcpc(0.5, 'Clay'), calc.soiltype_lcpc(8, 'Sand'),
+             calc.soiltype_lcpc(20, 'Gravel'), calc.soiltype_lcpc(3, 'Chalk')])
+        self.assertRaises(ValueError, lcpc.soiltype_lcpc_codes, [3, ], ['Gravel', ])
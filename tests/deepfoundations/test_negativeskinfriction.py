@@ -52,3 +52,82 @@ class Test_negativeskinfriction_pilegroup_zeevaertdebeer(unittest.TestCase):
         self.assertAlmostEqual(
             result['negative_skin_friction_group [kN]'], 127.19, 2
         )
+
+    def test_linear_recursion(self):
+        a = np.linspace(0.01, 0.99, 2000)
+        b = np.vstack((np.linspace(0, 1, 2000), np.linspace(1, 2, 2000)))
+        result = negativeskinfriction._linear_recursion(a=a, b=b, initial=[1, 2])
+        expected = np.zeros((2, 2001))
+        expected[:, 0] = [1, 2]
+        for i in range(2000):
+            expected[:, i + 1] = a[i] * expected[:, i] + b[:, i]
+        self.assertTrue(np.allclose(result, expected, rtol=1e-10, atol=0))
+
+
+class Test_negativeskinfriction_zeevaertdebeer_scenarios(unittest.TestCase):
+
+    def setUp(self):
+        self.depth = np.linspace(0, 4.5, 250)
+        self.K0 = np.ones(250) * 0.8
+        self.delta = np.ones(250) * 25
+        self.gamma_eff = np.ones(250) * 8
+
+    def test_scenarios(self):
+        result = negativeskinfriction.negativeskinfriction_zeevaertdebeer_scenarios(
+            depths=self.depth,
+            effective_unit_weights=self.gamma_eff,
+            lateral_earth_pressure_coefficients=self.K0,
+            interface_friction_angles=self.delta,
+            diameter=0.4,
+            diameter_influence=3,
+            surcharges=[[0], [51]],
+            drawdowns=[0, 2],
+            pile_load=200,
+            base_resistance=300)
+        self.assertEqual(result['group_effective_stress [kPa]'].shape, (4, 250))
+        for i, (_surcharge, _drawdown) in enumerate(zip(result['surcharge [kPa]'], result['drawdown [m]'])):
+            _single = negativeskinfriction.negativeskinfriction_pilegroup_zeevaertdebeer(
+                depths=self.depth,
+                effective_unit_weights=self.gamma_eff + 10 * ((self.depth > 0) & (self.depth <= _drawdown)),
+                lateral_earth_pressure_coefficients=self.K0,
+                interface_friction_angles=self.delta,
+                surcharge=_surcharge,
+                diameter=0.4,
+                diameter_influence=3,
+                fail_silently=False)
+            self.assertAlmostEqual(
+                result['negative_skin_friction [kN]'][i], _single['negative_skin_friction [kN]'], 6)
+            self.assertAlmostEqual(
+                result['negative_skin_friction_group [kN]'][i], _single['negative_skin_friction_group [kN]'], 6)
+            self.assertTrue(np.allclose(
+                result['group_effective_stress [kPa]'][i], _single['group_effective_stress [kPa]']))
+        self.assertAlmostEqual(result['negative_skin_friction_group [kN]'][2], 127.19, 2)
+        # Force equilibrium at the neutral plane
+        self.assertTrue(np.allclose(
+            200 + result['drag_load_group [kN]'][2:],
+            300 + result['negative_skin_friction_group [kN]'][2:] - result['drag_load_group [kN]'][2:]))
+        self.assertAlmostEqual(
+            np.interp(result['neutral_plane_group [m]'][2], self.depth,
+                      result['negative_skin_friction_profile_group [kN]'][2]),
+            result['drag_load_group [kN]'][2], 1)
+        # Base resistance exceeding the sum of the pile head load and negative skin friction
+        self.assertEqual(result['neutral_plane_group [m]'][0], 4.5)
+        self.assertAlmostEqual(
+            result['drag_load_group [kN]'][0], result['negative_skin_friction_group [kN]'][0], 6)
+
+    def test_failure(self):
+        result = negativeskinfriction.negativeskinfriction_zeevaertdebeer_scenarios(
+            depths=self.depth,
+            effective_unit_weights=self.gamma_eff,
+            lateral_earth_pressure_coefficients=self.K0,
+            interface_friction_angles=self.delta,
+            diameter=0.4,
+            diameter_influence=[1.2, 3],
+            surcharges=51,
+            pile_load=[1000, 200],
+            base_resistance=300)
+        self.assertTrue(np.isnan(result['neutral_plane_single [m]'][0]))
+        self.assertFalse(np.isnan(result['neutral_plane_single [m]'][1]))
+        self.assertRaises(
+            ValueError, negativeskinfriction.negativeskinfriction_zeevaertdebeer_scenarios,
+            self.depth, self.gamma_eff, self.K0, self.delta, 0.4, 0.3)
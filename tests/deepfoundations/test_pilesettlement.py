@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Bruno Stuyts'
+
+# Native Python packages
+import unittest
+
+# 3rd party packages
+import numpy as np
+
+# Project imports
+from groundhog.deepfoundations.axialresponse import settlement
+from groundhog.deepfoundations.axialcapacity import axcap
+from groundhog.general.soilprofile import SoilProfile
+
+
+class Test_pile_loadtransfer(unittest.TestCase):
+
+    def setUp(self):
+        self.depth_from = np.linspace(0, 30, 301)[:-1]
+        self.depth_to = np.linspace(0, 30, 301)[1:]
+        self.shaft_resistance = np.pi * 0.1 * np.linspace(5, 120, 300)
+        self.base_resistance = 0.25 * np.pi * 5000
+
+    def test_equilibrium(self):
+        loads = np.linspace(0, 0.95 * (self.shaft_resistance.sum() + self.base_resistance), 100)
+        result = settlement.pile_loadtransfer(
+            depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=self.shaft_resistance,
+            base_resistance=self.base_resistance, axial_stiffness=1.3e7, loads=loads, diameter=1)
+        self.assertTrue(result['converged'].all())
+        self.assertTrue((np.diff(result['w head [m]']) > 0).all())
+        self.assertTrue((result['N [kN]'][:, 0] <= loads).all())
+        self.assertTrue((np.abs(result['N [kN]'][:, -1] - result['Fb [kN]']) <=
+                         0.5 * self.shaft_resistance[-1] +
+                         1e-6 * (self.shaft_resistance.sum() + self.base_resistance)).all())
+        self.assertTrue((result['w head [m]'] >= result['w tip [m]']).all())
+        # Mobilised t-z resistance integrated over the elements
+        curves = settlement.pile_settlement_curves(
+            diameter=1, shaft_resistance=1, base_resistance=1, pile_type='driven')
+        curves['shaft_normalised']['Fs/Fsmax [-]'][0] = 0
+        _w_avg = 0.5 * (result['w [m]'][:, :-1] + result['w [m]'][:, 1:])
+        _fs = (self.shaft_resistance * np.interp(
+            _w_avg, curves['shaft_normalised']['w [m]'], curves['shaft_normalised']['Fs/Fsmax [-]'])).sum(axis=1)
+        np.testing.assert_allclose(result['Fs [kN]'], _fs, rtol=1e-9)
+        np.testing.assert_allclose(
+            result['Fs [kN]'] + result['Fb [kN]'], loads,
+            atol=1e-5 * (self.shaft_resistance.sum() + self.base_resistance))
+
+    def test_custom_curves(self):
+        tz_curve = {'w [m]': np.array([0, 0.01, 0.1]), 'Fs/Fsmax [-]': np.array([0.1, 1, 1])}
+        qz_curve = {'w/D [-]': np.array([0, 0.1, 1]), 'Fb/Fbmax [-]': np.array([0, 1, 1])}
+        result = settlement.pile_loadtransfer(
+            depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=self.shaft_resistance,
+            base_resistance=self.base_resistance, axial_stiffness=1.3e7, loads=[1000], diameter=1,
+            tz_curve=tz_curve, qz_curve=qz_curve)
+        # Custom curves are used as given, without resetting the mobilisation at zero displacement
+        self.assertEqual(tz_curve['Fs/Fsmax [-]'][0], 0.1)
+        _w_avg = 0.5 * (result['w [m]'][0, :-1] + result['w [m]'][0, 1:])
+        self.assertAlmostEqual(
+            result['Fs [kN]'][0],
+            (self.shaft_resistance * np.interp(_w_avg, tz_curve['w [m]'], tz_curve['Fs/Fsmax [-]'])).sum(), 6)
+
+    def test_rigid_pile(self):
+        loads = np.linspace(100, 0.9 * (self.shaft_resistance.sum() + self.base_resistance), 20)
+        result = settlement.pile_loadtransfer(
+            depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=self.shaft_resistance,
+            base_resistance=self.base_resistance, axial_stiffness=1e13, loads=loads, diameter=1, pile_type='bored')
+        curves = settlement.pile_settlement_curves(
+            diameter=1, shaft_resistance=self.shaft_resistance.sum(), base_resistance=self.base_resistance,
+            pile_type='bored')
+        # Mobilisation curves start from zero resistance at zero displacement
+        curves['shaft_normalised']['Fs/Fsmax [-]'][0] = 0
+        curves['base_normalised']['Fb/Fbmax [-]'][0] = 0
+        _w = result['w head [m]']
+        _fs = self.shaft_resistance.sum() * np.interp(
+            _w, curves['shaft_normalised']['w [m]'], curves['shaft_normalised']['Fs/Fsmax [-]'])
+        _fb = self.base_resistance * np.interp(
+            _w, curves['base_normalised']['w/D [-]'], curves['base_normalised']['Fb/Fbmax [-]'])
+        self.assertTrue(np.allclose(_fs + _fb, loads, rtol=1e-3))
+
+    def test_elastic_shortening(self):
+        result = settlement.pile_loadtransfer(
+            depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=np.zeros(300),
+            base_resistance=self.base_resistance, axial_stiffness=1.3e7, loads=[1000, 2000], diameter=1)
+        self.assertAlmostEqual(result['w head [m]'][0] - result['w tip [m]'][0], 1000 * 30 / 1.3e7, 8)
+        self.assertAlmostEqual(result['Fb [kN]'][1], 2000, 4)
+
+    def test_failure(self):
+        result = settlement.pile_loadtransfer(
+            depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=self.shaft_resistance,
+            base_resistance=self.base_resistance, axial_stiffness=1.3e7,
+            loads=[1000, 2 * (self.shaft_resistance.sum() + self.base_resistance)], diameter=1)
+        self.assertTrue(result['converged'][0])
+        self.assertFalse(result['converged'][1])
+        self.assertTrue(np.isnan(result['w head [m]'][1]))
+
+    def test_tension(self):
+        loads = -np.linspace(0, 0.9 * self.shaft_resistance.sum(), 20)
+        result = settlement.pile_loadtransfer(
+            depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=self.shaft_resistance,
+            base_resistance=self.base_resistance, axial_stiffness=1.3e7, loads=loads, diameter=1)
+        self.assertTrue(result['converged'].all())
+        self.assertTrue((result['w tip [m]'][1:] < 0).all())
+        # The base does not carry tension
+        np.testing.assert_array_equal(result['Fb [kN]'], 0)
+        np.testing.assert_allclose(
+            result['Fs [kN]'], loads, atol=1e-5 * (self.shaft_resistance.sum() + self.base_resistance))
+        # Tension loads above the shaft resistance cannot be resisted by the base
+        result = settlement.pile_loadtransfer(
+            depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=self.shaft_resistance,
+            base_resistance=self.base_resistance, axial_stiffness=1.3e7,
+            loads=[-1.1 * self.shaft_resistance.sum()], diameter=1)
+        self.assertFalse(result['converged'][0])
+        self.assertTrue(np.isnan(result['w head [m]'][0]))
+
+    def test_invalid_resistance(self):
+        shaft_resistance = self.shaft_resistance.copy()
+        shaft_resistance[[10, 20]] = np.nan
+        with self.assertRaisesRegex(ValueError, r"\[10, 20\]"):
+            settlement.pile_loadtransfer(
+                depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=shaft_resistance,
+                base_resistance=self.base_resistance, axial_stiffness=1.3e7, loads=[1000], diameter=1)
+        with self.assertRaises(ValueError):
+            settlement.pile_loadtransfer(
+                depth_from=self.depth_from, depth_to=self.depth_to, shaft_resistance=self.shaft_resistance,
+                base_resistance=np.nan, axial_stiffness=1.3e7, loads=[1000], diameter=1)
+
+    def _axcap_calculation(self):
+        calc = axcap.AxCapCalculation(SoilProfile({
+            'Depth from [m]': [0, 5, 10],
+            'Depth to [m]': [5, 10, 20],
+            'Soil type': ['SAND', 'CLAY', 'SAND'],
+            'Total unit weight [kN/m3]': [20, 18, 20],
+            'Unit skin friction': ['API RP2 GEO Sand', 'API RP2 GEO Clay', 'API RP2 GEO Sand'],
+            'Unit end bearing': ['API RP2 GEO Sand', 'API RP2 GEO Clay', 'API RP2 GEO Sand'],
+            'API soil description': ['Sand-silt', None, 'Sand'],
+            'API relative density description': ['Medium dense', None, 'Dense'],
+            'Undrained shear strength from [kPa]': [np.nan, 100, np.nan],
+            'Undrained shear strength to [kPa]': [np.nan, 150, np.nan]
+        }))
+        calc.sp.calculate_overburden()
+        calc.check_methods(raise_errors=True)
+        calc.create_grid(dz=0.5)
+        calc.set_pilepenetration(pile_penetration=18)
+        calc.calculate_unitskinfriction()
+        calc.calculate_unitendbearing()
+        calc.calculate_pilecapacity(circumference=np.pi, base_area=0.25 * np.pi)
+        return calc
+
+    def test_axcap(self):
+        calc = self._axcap_calculation()
+        result = settlement.pile_loadtransfer_axcap(
+            calculation=calc, circumference=np.pi, base_area=0.25 * np.pi, axial_stiffness=1.3e7,
+            loads=np.linspace(0, 0.9 * calc.result['Rt compression plugged [kN]'], 50), diameter=1)
+        self.assertTrue(result['converged'].all())
+        self.assertEqual(result['z [m]'][-1], 18)
+        self.assertEqual(result['w [m]'].shape, (50, 37))
+
+    def test_axcap_nan_friction(self):
+        calc = self._axcap_calculation()
+        _friction = calc.output['Unit skin friction outside compression [kPa]'].copy()
+        calc.output.loc[calc.output.index[5], 'Unit skin friction outside compression [kPa]'] = np.nan
+        result = settlement.pile_loadtransfer_axcap(
+            calculation=calc, circumference=np.pi, base_area=0.25 * np.pi, axial_stiffness=1.3e7,
+            loads=[1000], diameter=1, internal_circumference=0.9 * np.pi)
+        self.assertTrue(result['converged'][0])
+        calc.output['Unit skin friction outside compression [kPa]'] = _friction
+        calc.output.loc[calc.output.index[5], 'Unit skin friction outside compression [kPa]'] = 0
+        result_zero = settlement.pile_loadtransfer_axcap(
+            calculation=calc, circumference=np.pi, base_area=0.25 * np.pi, axial_stiffness=1.3e7,
+            loads=[1000], diameter=1, internal_circumference=0.9 * np.pi)
+        self.assertAlmostEqual(result['w head [m]'][0], result_zero['w head [m]'][0], 10)
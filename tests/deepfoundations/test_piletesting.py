@@ -32,4 +32,28 @@ class Test_chinkondler(unittest.TestCase):
         )
         self.assertAlmostEqual(result['slope [1/kN]'], 0.00043958, 5)
         self.assertAlmostEqual(result['Qdisp [kN]'], 1832.3, 1)
-        
\ No newline at end of file
+
+    def test_batch(self):
+        loads = [0, 100.0, 200.0, 300.0, 400.0, 501.0, 601.0, 701.0, 801.0, 901.0, 1001.0, 1101.0]
+        settlements = [0.0, 0.82, 1.34, 1.82, 2.33, 2.97, 3.59, 4.44, 5.45, 6.59, 8.02, 9.61]
+        tests = pd.DataFrame({
+            'Test': ['B'] * 12 + ['A'] * 12,
+            'Load [kN]': loads + list(2 * np.array(loads)),
+            'Settlement [mm]': settlements + settlements})
+        result = piletesting.piletest_chinkondler_batch(
+            tests, no_discard_points=5, selected_settlement=42)
+        self.assertEqual(list(result['Test']), ['B', 'A'])
+        self.assertEqual(result['Number of points [-]'].iloc[0], 7)
+        self.assertAlmostEqual(result['slope [1/kN]'].iloc[0], 0.00043958, 5)
+        self.assertAlmostEqual(result['Qdisp [kN]'].iloc[0], 1832.3, 0)
+        self.assertAlmostEqual(result['Qmax [kN]'].iloc[1], 2 * result['Qmax [kN]'].iloc[0], 6)
+        self.assertNotIn('construction_fig', result.columns)
+        single = piletesting.piletest_chinkondler(
+            loads=loads, settlements=settlements, no_discard_points=5, show_fig=False)
+        self.assertAlmostEqual(
+            result['Correlation coefficient [-]'].iloc[0], single['Correlation coefficient [-]'], 10)
+        self.assertAlmostEqual(result['intercept [mm/kN]'].iloc[0], single['intercept [mm/kN]'], 10)
+        result = piletesting.piletest_chinkondler_batch(
+            tests, no_discard_points=5, create_figs=True, processes=2)
+        self.assertEqual(result['construction_fig'].__len__(), 2)
+        self.assertAlmostEqual(result['slope [1/kN]'].iloc[0], 0.00043958, 5)
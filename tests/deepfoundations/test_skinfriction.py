@@ -90,4 +90,67 @@ class Test_almhamre_unitskinfriction_clay(unittest.TestCase):
         self.assertAlmostEqual(
             result['f_s_res [kPa]'], 5.775, 3)
         self.assertAlmostEqual(
-            result['f_s_comp_out [kPa]'], 125.464, 3)
\ No newline at end of file
+            result['f_s_comp_out [kPa]'], 125.464, 3)
+
+
+class Test_unitskinfriction_array(unittest.TestCase):
+
+    def test_api_sand(self):
+        densities = np.array(["Medium dense", "Dense", "Loose", "Very dense", None], dtype=object)
+        descriptions = np.array(["Sand", "Sand-silt", "Sand", "Gravel", "Sand"], dtype=object)
+        stresses = np.array([50.0, 100.0, 100.0, 300.0, 50.0])
+        result = skinfriction.API_unit_shaft_friction_sand_rp2geo_array(
+            densities, descriptions, stresses, fs_limit=True)
+        for i in range(5):
+            _scalar = skinfriction.API_unit_shaft_friction_sand_rp2geo(
+                densities[i], descriptions[i], stresses[i], fs_limit=True)
+            for _key in ['f_s_comp_out [kPa]', 'f_s_tens_in [kPa]', 'beta [-]']:
+                np.testing.assert_equal(result[_key][i], _scalar[_key])
+
+    def test_api_sand_array_limit(self):
+        result = skinfriction.API_unit_shaft_friction_sand_rp2geo_array(
+            "Dense", "Sand", np.array([300.0, 300.0]), fs_limit=np.array([True, False]))
+        np.testing.assert_allclose(result['f_s_comp_out [kPa]'], [96.0, 138.0])
+
+    def test_api_validation_override(self):
+        result = skinfriction.API_unit_shaft_friction_clay_array(
+            undrained_shear_strength=np.array([50.0, 500.0]), sigma_vo_eff=100.0, undrained_shear_strength__max=1000.0)
+        self.assertAlmostEqual(
+            result['f_s_comp_out [kPa]'][1],
+            skinfriction.API_unit_shaft_friction_clay(
+                500.0, 100.0, undrained_shear_strength__max=1000.0)['f_s_comp_out [kPa]'], 6)
+        result = skinfriction.API_unit_shaft_friction_clay_array(
+            undrained_shear_strength=np.array([50.0, 500.0]), sigma_vo_eff=100.0,
+            customvalidation={
+                'undrained_shear_strength': {'type': 'float', 'min_value': 0.0, 'max_value': 40.0},
+                'sigma_vo_eff': {'type': 'float', 'min_value': 0.0, 'max_value': None}})
+        self.assertTrue(np.isnan(result['f_s_comp_out [kPa]']).all())
+
+    def test_api_clay(self):
+        result = skinfriction.API_unit_shaft_friction_clay_array(
+            undrained_shear_strength=np.array([50.0, 200.0, 500.0]), sigma_vo_eff=100.0)
+        self.assertAlmostEqual(result['f_s_comp_out [kPa]'][0], 35.355, 3)
+        self.assertAlmostEqual(
+            result['f_s_comp_out [kPa]'][1],
+            skinfriction.API_unit_shaft_friction_clay(200.0, 100.0)['f_s_comp_out [kPa]'], 6)
+        self.assertTrue(np.isnan(result['f_s_comp_out [kPa]'][2]))
+
+    def test_almhamre_friction_fatigue(self):
+        embedded_lengths = np.array([20.0, 30.0, 40.0])
+        result = skinfriction.unitskinfriction_sand_almhamre_array(
+            qt=15, sigma_vo_eff=100, interface_friction_angle=28, depth=20, embedded_length=embedded_lengths)
+        for i, _length in enumerate(embedded_lengths):
+            self.assertAlmostEqual(
+                result['f_s_comp_out [kPa]'][i],
+                skinfriction.unitskinfriction_sand_almhamre(
+                    qt=15, sigma_vo_eff=100, interface_friction_angle=28, depth=20,
+                    embedded_length=_length)['f_s_comp_out [kPa]'], 6)
+        result = skinfriction.unitskinfriction_clay_almhamre_array(
+            depth=np.array([[5.0], [10.0]]), embedded_length=embedded_lengths, qt=np.array([[1.5], [150.0]]),
+            fs=0.05, sigma_vo_eff=80)
+        self.assertEqual(result['f_s_comp_out [kPa]'].shape, (2, 3))
+        self.assertAlmostEqual(
+            result['f_s_comp_out [kPa]'][0, 1],
+            skinfriction.unitskinfriction_clay_almhamre(
+                depth=5, embedded_length=30, qt=1.5, fs=0.05, sigma_vo_eff=80)['f_s_comp_out [kPa]'], 6)
+        self.assertTrue(np.isnan(result['f_s_comp_out [kPa]'][1]).all())
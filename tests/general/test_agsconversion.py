@@ -48,6 +48,29 @@ class Test_ags4conversion(unittest.TestCase):
             51.85
         )
 
+    def test_agsconversion_dtypes(self):
+        geol = self.ags.convert_ags_group('GEOL')
+        self.assertEqual(geol['GEOL_TOP [m]'].dtype, np.float64)
+        self.assertEqual(geol['GEOL_BASE [m]'].dtype, np.float64)
+        # Columns which are not numerical in the TYPE row are kept as strings
+        self.assertEqual(geol['GEOL_LEG'].iloc[0], '401')
+        self.assertEqual(geol['LOCA_ID'].iloc[0], 'BH-WFS4-7')
+
+    def test_convert_ags_headers(self):
+        df = pd.DataFrame({
+            'HEADING': ['UNIT', 'TYPE', 'DATA', 'DATA'],
+            'LOCA_ID': [np.nan, 'ID', 'BH-1', 'BH-2'],
+            'SCPT_DPTH': ['m', '2DP', '1.00', 'N/A'],
+            'SCPT_RES': ['MN/m2', '3SF', '2.955', '5.17']})
+        converted = agsconversion.AGSConverter.convert_ags_headers(df, agsformat='4')
+        self.assertEqual(
+            list(converted.columns), ['HEADING [UNIT]', 'LOCA_ID', 'SCPT_DPTH [m]', 'SCPT_RES [MN/m2]'])
+        self.assertEqual(converted['SCPT_DPTH [m]'].iloc[0], 1)
+        self.assertTrue(np.isnan(converted['SCPT_DPTH [m]'].iloc[1]))
+        self.assertEqual(converted['SCPT_RES [MN/m2]'].iloc[0], 2.955)
+        self.assertEqual(converted['LOCA_ID'].iloc[1], 'BH-2')
+
+
 class Test_ags31conversion(unittest.TestCase):
 
     def setUp(self):
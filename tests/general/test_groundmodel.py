@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Bruno Stuyts'
+
+# Native Python packages
+import unittest
+
+# 3rd party packages
+import pandas as pd
+import numpy as np
+
+# Project imports
+from groundhog.general.groundmodel import GroundModel
+from groundhog.general.soilprofile import SoilProfile
+from groundhog.siteinvestigation.insitutests.pcpt_processing import PCPTProcessing
+
+
+class Test_GroundModel(unittest.TestCase):
+
+    def setUp(self):
+        self.profiles = []
+        for i, (_x, _y, _sand_base, _su) in enumerate([(0, 0, 4, 40), (100, 0, 6, 60), (0, 100, 8, 80)]):
+            _profile = SoilProfile({
+                'Depth from [m]': [0, _sand_base],
+                'Depth to [m]': [_sand_base, 20],
+                'Unit': ['A', 'B'],
+                'Soil type': ['SAND', 'CLAY'],
+                'Total unit weight [kN/m3]': [20, 18],
+                'Su from [kPa]': [np.nan, _su],
+                'Su to [kPa]': [np.nan, _su + 20]
+            })
+            _profile.title = "BH%i" % (i + 1)
+            _profile.set_position(easting=_x, northing=_y, elevation=-20 - i)
+            self.profiles.append(_profile)
+        self.model = GroundModel(self.profiles)
+
+    def test_interpolate_exact_location(self):
+        values = self.model.interpolate(x=[100, 0], y=[0, 100], z=[13, 14], parameter='Su [kPa]')
+        self.assertAlmostEqual(values[0], 70, 5)
+        self.assertAlmostEqual(values[1], 90, 5)
+
+    def test_interpolate_idw(self):
+        values = self.model.interpolate(
+            x=np.array([50, 50]), y=np.array([0, 0]), z=np.array([20, 2]),
+            parameter='Su [kPa]', n_neighbours=2)
+        self.assertAlmostEqual(values[0], 70, 5)
+        # Su is not defined in the sand
+        self.assertTrue(np.isnan(values[1]))
+        values = self.model.interpolate(
+            x=50, y=0, z=-30, parameter='Total unit weight [kN/m3]', reference='elevation', n_neighbours=2)
+        # Depth of 10m at BH1 and 9m at BH2
+        self.assertAlmostEqual(values[0], 18, 5)
+
+    def test_interpolate_cpt(self):
+        cpt = PCPTProcessing(title='CPT1')
+        cpt.load_pandas(pd.DataFrame({
+            'z [m]': [0, 10, 20],
+            'qc [MPa]': [0, 10, 20],
+            'fs [MPa]': [0, 0.1, 0.2],
+            'u2 [MPa]': [0, 0.1, 0.2]}))
+        cpt.set_position(easting=50, northing=50, elevation=-20)
+        model = GroundModel(self.profiles + [cpt, ])
+        values = model.interpolate(x=[50, 52], y=[50, 50], z=[5, 25], parameter='qc [MPa]')
+        self.assertAlmostEqual(values[0], 5, 5)
+        self.assertTrue(np.isnan(values[1]))
+
+    def test_horizon_surfaces(self):
+        surfaces = self.model.horizon_surfaces(
+            x=[50, 0], y=[0, 100], horizon_key='Unit', n_neighbours=2, parameters=['Su from [kPa]'])
+        self.assertEqual(surfaces.__len__(), 4)
+        self.assertEqual(list(surfaces['Horizon']), ['A', 'B', 'A', 'B'])
+        self.assertAlmostEqual(surfaces['Base'].iloc[0], 5, 5)
+        self.assertAlmostEqual(surfaces['Top'].iloc[1], 5, 5)
+        self.assertAlmostEqual(surfaces['Su from [kPa]'].iloc[1], 50, 5)
+        self.assertAlmostEqual(surfaces['Top'].iloc[3], 8, 5)
+
+    def test_soilprofile_at(self):
+        profile = self.model.soilprofile_at(
+            x=50, y=0, horizon_key='Unit', n_neighbours=2,
+            parameters=['Total unit weight [kN/m3]', 'Su from [kPa]', 'Su to [kPa]'])
+        self.assertEqual(profile['Depth to [m]'].iloc[0], 5)
+        self.assertEqual(profile['Depth to [m]'].iloc[-1], 20)
+        self.assertEqual(list(profile['Unit']), ['A', 'B'])
+        self.assertAlmostEqual(profile['Su to [kPa]'].iloc[-1], 70, 5)
+        self.assertAlmostEqual(profile.parameter_at_depth(12.5, 'Su [kPa]'), 60, 5)
+
+    def test_many_targets(self):
+        x, y = np.meshgrid(np.linspace(0, 100, 100), np.linspace(0, 100, 100))
+        values = self.model.interpolate(
+            x=x.flatten(), y=y.flatten(), z=15, parameter='Su [kPa]')
+        self.assertEqual(values.__len__(), 10000)
+        # Values are bounded by the values at the three locations (53.75kPa, 72.86kPa and 91.67kPa)
+        self.assertTrue((values >= 53.75).all() and (values <= 91.67).all())
@@ -117,4 +117,61 @@ class Test_offsets(unittest.TestCase):
 
     def test_offset_latlon(self):
         distance = parameter_mapping.latlon_distance(lat1=51.215431, lon1=2.928656, lat2=51.315090, lon2=3.130940)
-        self.assertAlmostEqual(distance, 17952, 0)
\ No newline at end of file
+        self.assertAlmostEqual(distance, 17952, 0)
+
+class Test_offsets_array(unittest.TestCase):
+
+    def test_offsets_array(self):
+        points = np.array([[-1, 1], [0.5, -2], [3, 0.5]])
+        result = parameter_mapping.offsets_array(
+            startpoints=(0, 0), endpoints=(1, 0), points=points)
+        for i, _point in enumerate(points):
+            _result = parameter_mapping.offsets(startpoint=(0, 0), endpoint=(1, 0), point=_point)
+            for _key in _result.keys():
+                self.assertAlmostEqual(result[_key][i], _result[_key], 5)
+
+    def test_offsets_array_multiple_lines(self):
+        result = parameter_mapping.offsets_array(
+            startpoints=np.array([[0, 0], [2, 2]]),
+            endpoints=np.array([[0, 2], [0, 0]]),
+            points=np.array([[1, 1], [-1, 0]]))
+        self.assertEqual(result['offset to line'].shape, (2, 2))
+        self.assertAlmostEqual(result['offset to line'][0, 0], 1, 5)
+        self.assertAlmostEqual(result['offset to start projected'][0, 0], 1, 5)
+        self.assertAlmostEqual(result['offset to line'][1, 1], np.sqrt(0.5), 5)
+        self.assertAlmostEqual(result['offset to end projected'][1, 1], -np.sqrt(0.5), 5)
+        self.assertTrue(result['behind end'][1, 1])
+        self.assertFalse(result['before start'][1, 1])
+
+    def test_offsets_array_latlon(self):
+        result = parameter_mapping.offsets_array(
+            startpoints=(2.928656, 51.215431), endpoints=(3.130940, 51.315090),
+            points=np.array([[3.130940, 51.315090], [2.9, 51.2]]), latlon=True)
+        self.assertAlmostEqual(result['offset start to point'][0], 17951.85, 1)
+        self.assertAlmostEqual(result['offset to start projected'][0], 17951.85, 1)
+        self.assertAlmostEqual(result['offset to line'][0], 0, 1)
+        self.assertTrue(result['before start'][1])
+        self.assertAlmostEqual(result['offset to start projected'][1], -2635.45, 1)
+
+    def test_offsets_array_endpoint(self):
+        _scalar = parameter_mapping.offsets(startpoint=(0, 0), endpoint=(1, 0), point=(1, 0))
+        result = parameter_mapping.offsets_array(
+            startpoints=(0, 0), endpoints=(1, 0), points=np.array([[1, 0], [0, 0]]))
+        self.assertEqual(result['behind end'][0], _scalar['behind end'])
+        self.assertEqual(result['before start'][0], _scalar['before start'])
+        self.assertTrue(result['behind end'][0])
+        self.assertFalse(result['before start'][1])
+        result = parameter_mapping.offsets_array(
+            startpoints=(2.928656, 51.215431), endpoints=(3.130940, 51.315090),
+            points=np.array([[3.130940, 51.315090], [2.928656, 51.215431]]), latlon=True)
+        self.assertTrue(result['behind end'][0])
+        self.assertFalse(result['before start'][0])
+        self.assertFalse(result['behind end'][1])
+        self.assertFalse(result['before start'][1])
+
+    def test_latlon_distance_array(self):
+        distances = parameter_mapping.latlon_distance(
+            lat1=np.array([51.215431, 51.215431]), lon1=np.array([2.928656, 2.928656]),
+            lat2=np.array([51.315090, 51.215431]), lon2=np.array([3.130940, 2.928656]))
+        self.assertAlmostEqual(distances[0], 17951.85, 1)
+        self.assertEqual(distances[1], 0)
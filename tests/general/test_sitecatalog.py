@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Bruno Stuyts'
+
+# Native Python packages
+import unittest
+
+# 3rd party packages
+import pandas as pd
+import numpy as np
+
+# Project imports
+from groundhog.general.sitecatalog import SiteCatalog
+from groundhog.general.soilprofile import SoilProfile, plot_fence_diagram
+from groundhog.general.parameter_mapping import offsets, latlon_distance
+
+
+class Test_SiteCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.profiles = []
+        for i, (_x, _y) in enumerate([(0, 0), (100, 10), (200, -50), (300, 500), (-50, 20), (400, 0)]):
+            _profile = SoilProfile({
+                'Depth from [m]': [0, 5],
+                'Depth to [m]': [5, 10],
+                'Soil type': ['SAND', 'CLAY']
+            })
+            _profile.title = "BH%i" % (i + 1)
+            _profile.set_position(easting=_x, northing=_y, elevation=-20 - i)
+            self.profiles.append(_profile)
+        self.catalog = SiteCatalog(self.profiles)
+
+    def test_nearest(self):
+        result = self.catalog.nearest((90, 0), n=2)
+        self.assertEqual(list(result['Titles']), ['BH2', 'BH1'])
+        self.assertAlmostEqual(result['Distance'].iloc[0], np.sqrt(200), 5)
+        self.assertEqual(result.index[0], 1)
+
+    def test_within_radius(self):
+        result = self.catalog.within_radius((0, 0), radius=110)
+        self.assertEqual(list(result['Titles']), ['BH1', 'BH5', 'BH2'])
+
+    def test_section_offsets(self):
+        result = self.catalog.section_offsets((0, 0), (400, 0))
+        for i, row in result.iterrows():
+            if i in [0, 5]:
+                continue
+            _offsets = offsets((0, 0), (400, 0), (row['X'], row['Y']))
+            self.assertAlmostEqual(row['Offset'], _offsets['offset to line'], 5)
+            self.assertAlmostEqual(row['Projected offset'], _offsets['offset to start projected'], 5)
+            self.assertEqual(row['Before start'], _offsets['before start'])
+            self.assertEqual(row['Behind end'], _offsets['behind end'])
+        self.assertEqual(result.loc[5, 'Projected offset'], 400)
+        self.assertFalse(result.loc[5, 'Behind end'])
+
+    def test_corridor(self):
+        result = self.catalog.corridor((0, 0), (400, 0), band=60)
+        self.assertEqual(list(result['Titles']), ['BH1', 'BH2', 'BH3', 'BH6'])
+        result = self.catalog.corridor((0, 0), (400, 0), band=60, extend_profile=True)
+        self.assertEqual(list(result['Titles']), ['BH5', 'BH1', 'BH2', 'BH3', 'BH6'])
+        self.assertAlmostEqual(result['Projected offset'].iloc[0], -50, 5)
+
+    def test_missing_position(self):
+        self.profiles[2].set_position(easting=np.nan, northing=np.nan, elevation=np.nan)
+        catalog = SiteCatalog(self.profiles)
+        result = catalog.corridor((0, 0), (400, 0), band=60)
+        self.assertEqual(list(result['Titles']), ['BH1', 'BH2', 'BH6'])
+
+    def test_unreadable_position(self):
+        self.profiles[1].easting = 'unknown'
+        with self.assertWarns(UserWarning):
+            catalog = SiteCatalog(self.profiles + [object()])
+        self.assertEqual(catalog.titles[1], 'BH2')
+        self.assertIsNone(catalog.titles[-1])
+        self.assertFalse(catalog.valid[1])
+        self.assertFalse(catalog.valid[-1])
+        result = catalog.corridor((0, 0), (400, 0), band=60)
+        self.assertEqual(list(result['Titles']), ['BH1', 'BH3', 'BH6'])
+
+    def test_latlon(self):
+        profiles = []
+        for i, (_lon, _lat) in enumerate([(2.928656, 51.215431), (3.130940, 51.315090), (3.03, 51.265)]):
+            _profile = SoilProfile({
+                'Depth from [m]': [0, ],
+                'Depth to [m]': [10, ],
+                'Soil type': ['SAND', ]
+            })
+            _profile.title = "BH%i" % (i + 1)
+            _profile.set_position(easting=_lon, northing=_lat, elevation=0)
+            profiles.append(_profile)
+        catalog = SiteCatalog(profiles, latlon=True)
+        result = catalog.corridor((2.928656, 51.215431), (3.130940, 51.315090), band=500)
+        self.assertEqual(list(result['Titles']), ['BH1', 'BH3', 'BH2'])
+        self.assertAlmostEqual(
+            result['Projected offset'].iloc[-1],
+            latlon_distance(lon1=2.928656, lat1=51.215431, lon2=3.130940, lat2=51.315090), -1)
+
+    def test_fence_diagram(self):
+        fig = plot_fence_diagram(
+            profiles=self.profiles, start='BH1', end='BH6', band=60, showfig=False)
+        self.assertEqual(fig['layout']['shapes'].__len__(), 8)
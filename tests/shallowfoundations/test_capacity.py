@@ -14,6 +14,7 @@ import numpy as np
 # Project imports
 from groundhog.shallowfoundations.capacity import ShallowFoundationCapacityUndrained, \
     ShallowFoundationCapacityDrained, failuremechanism_prandtl
+from groundhog.shallowfoundations import capacity
 
 
 class Test_UndrainedCapacity(unittest.TestCase):
@@ -391,4 +392,224 @@ class Test_DrainedCapacity(unittest.TestCase):
         result = failuremechanism_prandtl(
             friction_angle=0, width=5)
 
-        self.assertAlmostEqual(result['X [m]'].max(), 1.5 * 5, 4)
\ No newline at end of file
+        self.assertAlmostEqual(result['X [m]'].max(), 1.5 * 5, 4)
+
+
+class Test_CapacityArray(unittest.TestCase):
+
+    def test_verticalcapacity_undrained_array(self):
+        horizontal_loads = np.linspace(0, 300, 7)
+        for kwargs in [
+                dict(),
+                dict(su_increase=2, su_above_base=5, base_depth=1),
+                dict(su_increase=2, su_above_base=5, base_depth=1, skirted=False, base_sigma_v=10)]:
+            result = capacity.verticalcapacity_undrained_api_array(
+                effective_length=4, effective_width=3, su_base=10, horizontal_load=horizontal_loads, **kwargs)
+            for i, _load in enumerate(horizontal_loads):
+                scalar_result = capacity.verticalcapacity_undrained_api(
+                    effective_length=4, effective_width=3, su_base=10, horizontal_load=_load, **kwargs)
+                for _key, _value in scalar_result.items():
+                    np.testing.assert_allclose(result[_key][i], _value, rtol=1e-10)
+        # Horizontal load exceeding the capacity of the effective area
+        self.assertTrue(np.isnan(result['vertical_capacity [kN]'][-1]))
+
+    def test_verticalcapacity_drained_array(self):
+        inclinations = np.linspace(0, 80, 9)
+        result = capacity.verticalcapacity_drained_api_array(
+            vertical_effective_stress=10, effective_friction_angle=35, effective_unit_weight=9,
+            effective_length=5, effective_width=4, base_depth=1, skirted=False, load_inclination=inclinations)
+        for i, _inclination in enumerate(inclinations):
+            scalar_result = capacity.verticalcapacity_drained_api(
+                vertical_effective_stress=10, effective_friction_angle=35, effective_unit_weight=9,
+                effective_length=5, effective_width=4, base_depth=1, skirted=False, load_inclination=_inclination)
+            for _key, _value in scalar_result.items():
+                np.testing.assert_allclose(result[_key][i], _value, rtol=1e-10)
+
+    def test_effectivearea_array(self):
+        result = capacity.effectivearea_rectangle_api_array(
+            length=np.array([5, 10]), width=4, vertical_load=100, moment_length=50, moment_width=np.array([50, 250]))
+        self.assertAlmostEqual(result['effective_area [m2]'][0], 4 * 3, 10)
+        self.assertTrue(np.isnan(result['effective_area [m2]'][1]))
+        result = capacity.effectivearea_circle_api_array(foundation_radius=2.5, eccentricity=np.array([0, 0.5]))
+        scalar_result = capacity.effectivearea_circle_api(foundation_radius=2.5, eccentricity=0.5)
+        self.assertAlmostEqual(result['effective_area [m2]'][0], np.pi * 2.5 ** 2, 10)
+        self.assertAlmostEqual(result['effective_area [m2]'][1], scalar_result['effective_area [m2]'], 10)
+
+    def test_envelope_undrained_array(self):
+        result = capacity.envelope_undrained_api_array(
+            su_base=10, full_area=25, effective_length=5, effective_width=np.array([3, 4, 5]),
+            base_depth=1, embedded_section_area=5, su_above_base=8)
+        self.assertEqual(result['Envelope V unfactored [kN]'].shape, (3, 101))
+        for i, _width in enumerate([3, 4, 5]):
+            scalar_result = capacity.envelope_undrained_api(
+                su_base=10, full_area=25, effective_length=5, effective_width=_width,
+                base_depth=1, embedded_section_area=5, su_above_base=8)
+            for _key in ['Envelope V unfactored [kN]', 'Envelope H unfactored [kN]', 'Envelope V factored [kN]',
+                         'Envelope H factored [kN]', 'Envelope V uncorrected [kN]']:
+                np.testing.assert_allclose(result[_key][i], scalar_result[_key], rtol=1e-10)
+
+    def test_envelope_drained_array(self):
+        result = capacity.envelope_drained_api_array(
+            vertical_effective_stress=10, effective_friction_angle=35, effective_unit_weight=9,
+            full_area=25, effective_length=5, effective_width=np.array([3, 4]))
+        scalar_result = capacity.envelope_drained_api(
+            vertical_effective_stress=10, effective_friction_angle=35, effective_unit_weight=9,
+            full_area=25, effective_length=5, effective_width=4)
+        for _key, _value in scalar_result.items():
+            _array_value = result[_key][1]
+            np.testing.assert_allclose(_array_value[~np.isnan(_array_value)], _value, rtol=1e-10)
+
+    def test_envelope_utilisation(self):
+        envelope = capacity.envelope_undrained_api(
+            su_base=10, full_area=25, effective_length=5, effective_width=5, base_depth=0)
+        vertical_capacity = envelope['Envelope V unfactored [kN]'].max()
+        result = capacity.envelope_utilisation(
+            vertical_load=[0, 0.5 * vertical_capacity, -10, np.nan],
+            horizontal_load=[0, 0, 10, 10],
+            envelope_v=envelope['Envelope V unfactored [kN]'],
+            envelope_h=envelope['Envelope H unfactored [kN]'])
+        self.assertEqual(result[0], 0)
+        self.assertAlmostEqual(result[1], 0.5, 10)
+        self.assertTrue(np.isinf(result[2]))
+        self.assertTrue(np.isnan(result[3]))
+        # Load cases on a scaled envelope
+        scale = np.array([0.5, 1, 2])[:, None]
+        result = capacity.envelope_utilisation(
+            vertical_load=scale * envelope['Envelope V unfactored [kN]'][1:-1],
+            horizontal_load=scale * envelope['Envelope H unfactored [kN]'][1:-1],
+            envelope_v=envelope['Envelope V unfactored [kN]'],
+            envelope_h=envelope['Envelope H unfactored [kN]'])
+        np.testing.assert_allclose(result, np.broadcast_to(scale, result.shape), rtol=1e-8)
+        # Envelope with non-monotonic polar angle, the intersection closest to the origin is used
+        result = capacity.envelope_utilisation(
+            vertical_load=[10, 7], horizontal_load=[9, 5],
+            envelope_v=[10, 10, 5, 2, 0], envelope_h=[0, 10, 4, 10, 12])
+        self.assertAlmostEqual(result[0], 87 / 42, 10)
+        self.assertAlmostEqual(result[1], 0.7, 10)
+
+    def test_envelope_utilisation_grid(self):
+        lengths = np.linspace(4, 10, 4)[:, None, None]
+        widths = np.linspace(4, 10, 4)[None, :, None]
+        eccentricities = np.linspace(0, 1, 3)
+        effective_area = capacity.effectivearea_rectangle_api_array(
+            length=lengths, width=widths, eccentricity_length=eccentricities, eccentricity_width=eccentricities)
+        envelopes = capacity.envelope_undrained_api_array(
+            su_base=10, full_area=lengths * widths, effective_length=effective_area['effective_length [m]'],
+            effective_width=effective_area['effective_width [m]'], base_depth=0.5, embedded_section_area=0.5 * lengths)
+        self.assertEqual(envelopes['Envelope V factored [kN]'].shape, (4, 4, 3, 101))
+        vertical_loads = np.linspace(0, 2000, 50)
+        horizontal_loads = np.linspace(0, 200, 50)
+        result = capacity.envelope_utilisation(
+            vertical_load=vertical_loads, horizontal_load=horizontal_loads,
+            envelope_v=envelopes['Envelope V factored [kN]'][..., None, :],
+            envelope_h=envelopes['Envelope H factored [kN]'][..., None, :])
+        self.assertEqual(result.shape, (4, 4, 3, 50))
+        # Utilisation increases with eccentricity and decreases with footing size
+        self.assertTrue((np.diff(result[..., 1:], axis=2) > 0).all())
+        self.assertTrue((np.diff(result[..., 1:], axis=0) < 0).all())
+        for i, j, k in [(0, 0, 0), (3, 1, 2)]:
+            scalar_result = capacity.envelope_utilisation(
+                vertical_load=vertical_loads, horizontal_load=horizontal_loads,
+                envelope_v=envelopes['Envelope V factored [kN]'][i, j, k],
+                envelope_h=envelopes['Envelope H factored [kN]'][i, j, k])
+            np.testing.assert_allclose(result[i, j, k], scalar_result, rtol=1e-12)
+
+    def test_failuremechanism_prandtl_array(self):
+        friction_angles = np.array([0.0, 20.0, 35.0, 60.0, 70.0])
+        widths = np.array([5.0, 2.0, 3.0, 1.0, 2.0])
+        result = capacity.failuremechanism_prandtl_array(
+            friction_angle=friction_angles, width=widths, base_depth=0.5,
+            layer_depth_from=[0, 1, 3, 10], layer_depth_to=[1, 3, 10, 20])
+        self.assertEqual(result['X [m]'].shape, (5, 251))
+        self.assertEqual(result['Layers intersected'].shape, (5, 4))
+        for i, (_angle, _width) in enumerate(zip(friction_angles[:-1], widths[:-1])):
+            scalar_result = capacity.failuremechanism_prandtl(
+                friction_angle=float(_angle), width=float(_width), showfig=False)
+            np.testing.assert_allclose(result['X [m]'][i], scalar_result['X [m]'], rtol=1e-12)
+            np.testing.assert_allclose(result['Y [m]'][i], scalar_result['Y [m]'], rtol=1e-12)
+            self.assertAlmostEqual(result['Extent [m]'][i], scalar_result['X [m]'][-1], 10)
+            self.assertAlmostEqual(result['Depth [m]'][i], scalar_result['Y [m]'].max(), 3)
+            self.assertGreaterEqual(result['Depth [m]'][i], scalar_result['Y [m]'].max())
+        # Circular slip surface around the footing edge for zero friction angle
+        self.assertAlmostEqual(result['Depth [m]'][0], 2.5 * np.sqrt(2), 10)
+        self.assertAlmostEqual(result['X depth [m]'][0], 2.5, 10)
+        self.assertEqual(list(result['Layers intersected'][1]), [True, True, False, False])
+        self.assertTrue(np.isnan(result['X [m]'][-1]).all())
+        self.assertFalse(result['Layers intersected'][-1].any())
+
+
+class Test_FootingDesignSweep(unittest.TestCase):
+
+    def setUp(self):
+        random_generator = np.random.default_rng(0)
+        self.load_cases = pd.DataFrame({
+            'V [kN]': random_generator.uniform(500, 3000, 20),
+            'H [kN]': random_generator.uniform(0, 300, 20),
+            'M length [kNm]': random_generator.uniform(0, 1000, 20),
+            'M width [kNm]': random_generator.uniform(0, 500, 20)})
+        self.dimensions = np.arange(2, 15, 0.5)
+
+    def test_sweep_undrained(self):
+        result = capacity.footing_design_sweep_undrained(
+            self.load_cases, lengths=self.dimensions, widths=self.dimensions, unit_weight=17, su_base=20,
+            depth=0.5, skirted=True)
+        self.assertEqual(result['Utilisation [-]'].shape, (result['Geometries'].__len__(), 20))
+        self.assertEqual(result['Number of evaluations [-]'], result['Geometries'].__len__() * 20)
+        self.assertTrue((result['Geometries']['Width [m]'] <= result['Geometries']['Length [m]']).all())
+        for _key in ['Effective area', 'Envelope', 'Utilisation', 'Total']:
+            self.assertGreaterEqual(result['Timings [s]'][_key], 0)
+        optimum = result['Optimum']
+        self.assertLessEqual(optimum['Maximum utilisation [-]'], 1)
+        self.assertFalse(result['Geometries'][
+            result['Geometries']['Area [m2]'] < optimum['Area [m2]']]['Feasible'].any())
+        # Comparison with ShallowFoundationCapacityUndrained for the optimum geometry
+        utilisation = []
+        for i, row in self.load_cases.iterrows():
+            analysis = ShallowFoundationCapacityUndrained(title="Optimum")
+            analysis.set_geometry(length=optimum['Length [m]'], width=optimum['Width [m]'], depth=0.5, skirted=True)
+            analysis.set_soilparameters_undrained(unit_weight=17, su_base=20)
+            analysis.set_eccentricity(
+                eccentricity_length=row['M length [kNm]'] / row['V [kN]'],
+                eccentricity_width=row['M width [kNm]'] / row['V [kN]'])
+            analysis.calculate_envelope(skirted=True, base_sigma_v=17 * 0.5)
+            utilisation.append(capacity.envelope_utilisation(
+                row['V [kN]'], row['H [kN]'], analysis.envelope_V_factored, analysis.envelope_H_factored))
+        self.assertAlmostEqual(max(utilisation), optimum['Maximum utilisation [-]'], 8)
+
+    def test_sweep_drained(self):
+        result = capacity.footing_design_sweep_drained(
+            self.load_cases, lengths=self.dimensions, widths=self.dimensions, effective_unit_weight=9,
+            friction_angle=35, effective_stress_base=5, depth=0.5, skirted=True, max_chunk_size=100000)
+        optimum = result['Optimum']
+        self.assertFalse(result['Geometries'][
+            result['Geometries']['Area [m2]'] < optimum['Area [m2]']]['Feasible'].any())
+        # Comparison with ShallowFoundationCapacityDrained for the optimum geometry
+        utilisation = []
+        for i, row in self.load_cases.iterrows():
+            analysis = ShallowFoundationCapacityDrained(title="Optimum")
+            analysis.set_geometry(length=optimum['Length [m]'], width=optimum['Width [m]'], depth=0.5, skirted=True)
+            analysis.set_soilparameters_drained(effective_unit_weight=9, friction_angle=35, effective_stress_base=5)
+            analysis.set_eccentricity(
+                eccentricity_length=row['M length [kNm]'] / row['V [kN]'],
+                eccentricity_width=row['M width [kNm]'] / row['V [kN]'])
+            analysis.calculate_envelope(
+                base_depth=0.5, embedded_section_area=0.5 * optimum['Length [m]'], depth_to_base=0.5)
+            analysis.calculate_sliding_capacity(vertical_load=row['V [kN]'])
+            utilisation.append(max(
+                capacity.envelope_utilisation(
+                    row['V [kN]'], row['H [kN]'], analysis.envelope_V_factored, analysis.envelope_H_factored),
+                row['H [kN]'] / (analysis.sliding_full / 1.5)))
+        self.assertAlmostEqual(max(utilisation), optimum['Maximum utilisation [-]'], 8)
+
+    def test_sweep_infeasible(self):
+        with self.assertWarns(Warning):
+            result = capacity.footing_design_sweep_undrained(
+                self.load_cases, lengths=[2, 3], widths=[2, 3], unit_weight=17, su_base=20)
+        self.assertIsNone(result['Optimum'])
+        self.assertFalse(result['Geometries']['Feasible'].any())
+
+    def test_reduced_width_drained(self):
+        result = capacity.verticalcapacity_drained_api(
+            vertical_effective_stress=5, effective_friction_angle=35, effective_unit_weight=9,
+            effective_length=5, effective_width=4, base_depth=1, load_inclination=70)
+        self.assertTrue(np.isnan(result['vertical_capacity [kN]']))
@@ -98,4 +98,106 @@ class Test_settlement(unittest.TestCase):
         calc.set_foundation(shape='rectangular', length=8, width=5)
         calc.calculate_foundation_stress(applied_stress=100)
         calc.calculate_mv()
-        self.assertAlmostEqual(calc.settlement, 0.864, 3)
\ No newline at end of file
+        self.assertAlmostEqual(calc.settlement, 0.864, 3)
+
+    def test_settlement_array(self):
+        result = settlement.primaryconsolidationsettlement_oc_array(
+            initial_height=2, initial_voidratio=1.1, initial_effective_stress=np.array([40, 40, 40]),
+            preconsolidation_pressure=np.array([50, 120, 120]), effective_stress_increase=60,
+            compression_index=np.array([0.3, 0.3, 0.9]), recompression_index=0.03)
+        for i, (_pc, _cc) in enumerate([(50, 0.3), (120, 0.3)]):
+            self.assertAlmostEqual(
+                result['delta z [m]'][i],
+                settlement.primaryconsolidationsettlement_oc(
+                    initial_height=2, initial_voidratio=1.1, initial_effective_stress=40,
+                    preconsolidation_pressure=_pc, effective_stress_increase=60,
+                    compression_index=_cc, recompression_index=0.03)['delta z [m]'], 10)
+        self.assertTrue(np.isnan(result['delta z [m]'][2]))
+        result = settlement.primaryconsolidationsettlement_oc_array(
+            initial_height=2, initial_voidratio=1.1, initial_effective_stress=40,
+            preconsolidation_pressure=50, effective_stress_increase=60,
+            compression_index=0.9, recompression_index=0.03, compression_index__max=1)
+        self.assertFalse(np.isnan(result['delta z [m]']))
+
+    def test_settlement_map(self):
+        sp = SoilProfile({
+            'Depth from [m]': [0, 4.2],
+            'Depth to [m]': [4.2, 20],
+            'Soil type': ['Clay', 'Clay'],
+            'Total unit weight [kN/m3]': [15, 17],
+            'Cc [-]': [0.7, 0.45],
+            'Cr [-]': [0.07, 0.045],
+            'OCR [-]': [1, 4]
+        })
+        calc = settlement.SettlementCalculation(sp)
+        calc.calculate_initial_state(waterlevel=0.8)
+        calc.create_grid()
+        calc.set_foundation(shape='strip', width=5)
+        offsets = np.array([0, 1.3, 6])
+        calc.calculate_settlement_map(x=offsets, load_increments=[50, 30, 20], max_chunk_size=100)
+        self.assertEqual(calc.settlement_map.shape, (3, 3))
+        np.testing.assert_allclose(calc.stage_stresses, [50, 80, 100])
+        for i, _offset in enumerate(offsets):
+            for j, _stress in enumerate(calc.stage_stresses):
+                calc.calculate_foundation_stress(applied_stress=_stress, offset=_offset)
+                calc.calculate()
+                self.assertAlmostEqual(calc.settlement_map[i, j], calc.settlement, 10)
+        self.assertAlmostEqual(calc.settlement_map[0, -1], 0.771, 3)
+        # Rectangular foundation with plan positions off-center
+        calc.set_foundation(shape='rectangular', length=8, width=5)
+        x, y = np.meshgrid([-2, 0, 3], [0, 5])
+        calc.calculate_settlement_map(x=x, y=y, load_increments=[100, ])
+        self.assertEqual(calc.settlement_map.shape, (2, 3, 1))
+        self.assertAlmostEqual(calc.settlement_map[0, 1, 0], 0.741, 3)
+        calc.calculate_foundation_stress(applied_stress=100, offset=3)
+        calc.calculate()
+        self.assertAlmostEqual(calc.settlement_map[0, 2, 0], calc.settlement, 10)
+        self.assertLess(calc.settlement_map[1, 2, 0], calc.settlement_map[0, 2, 0])
+        # Validation overrides reach the stress functions for all foundation shapes
+        for _shape in ['rectangular', 'strip', 'circular']:
+            calc.set_foundation(shape=_shape, length=8, width=5)
+            self.assertTrue(np.isnan(calc.foundation_stress(
+                x=0, y=0, z=np.array([1, 2]), applied_stress=100, imposedstress__max=50)).all())
+
+    def test_settlement_map_mv(self):
+        sp = SoilProfile({
+            'Depth from [m]': [0, 4.2],
+            'Depth to [m]': [4.2, 20],
+            'Soil type': ['Clay', 'Clay'],
+            'Total unit weight [kN/m3]': [15, 17],
+            'mv [1/kPa]': [1e-3, 2e-3]
+        })
+        calc = settlement.SettlementCalculation(sp)
+        calc.calculate_initial_state(waterlevel=0.8)
+        calc.create_grid()
+        calc.set_foundation(shape='rectangular', length=8, width=5)
+        calc.calculate_settlement_map(x=[0, 4], load_increments=[50, 50], method='mv')
+        self.assertAlmostEqual(calc.settlement_map[0, 1], 0.864, 3)
+        # Settlement is linear in the applied stress for constant compressibility
+        self.assertAlmostEqual(calc.settlement_map[1, 1], 2 * calc.settlement_map[1, 0], 10)
+        with self.assertRaises(ValueError):
+            calc.calculate_settlement_map(x=[0, 4], load_increments=[50, 50], method='Cc')
+
+    def test_settlement_map_method(self):
+        sp = SoilProfile({
+            'Depth from [m]': [0, 4.2],
+            'Depth to [m]': [4.2, 20],
+            'Soil type': ['Clay', 'Clay'],
+            'Total unit weight [kN/m3]': [15, 17],
+            'Cc [-]': [0.7, 0.45],
+            'Cr [-]': [0.07, 0.045],
+            'OCR [-]': [1, 4],
+            'mv [1/kPa]': [1e-3, 2e-3]
+        })
+        calc = settlement.SettlementCalculation(sp)
+        calc.calculate_initial_state(waterlevel=0.8)
+        calc.create_grid()
+        calc.set_foundation(shape='strip', width=5)
+        calc.calculate_foundation_stress(applied_stress=100, offset=1)
+        # The compression indices are used by default, also when mv is defined
+        calc.calculate_settlement_map(x=1, load_increments=[100, ])
+        calc.calculate()
+        self.assertAlmostEqual(calc.settlement_map[0], calc.settlement, 10)
+        calc.calculate_settlement_map(x=1, load_increments=[100, ], method='mv')
+        calc.calculate_mv()
+        self.assertAlmostEqual(calc.settlement_map[0], calc.settlement, 10)
@@ -84,4 +84,89 @@ class Test_stressdistributions(unittest.TestCase):
             depth=5
         )
         self.assertAlmostEqual(result['delta sigma x [kPa]'], 11.85, 2)
-        self.assertAlmostEqual(result['delta P x [kN/m]'], 121.83, 2)
\ No newline at end of file
+        self.assertAlmostEqual(result['delta P x [kN/m]'], 121.83, 2)
+
+class Test_stressfield(unittest.TestCase):
+
+    def setUp(self):
+        self.square = {
+            'X [m]': [0, ], 'Y [m]': [0, ], 'Length x [m]': [2, ], 'Length y [m]': [2, ],
+            'Imposed stress [kPa]': [100, ]}
+
+    def test_array_functions(self):
+        result = stressdistribution.stresses_rectangle_array(
+            imposedstress=100, length=np.array([1, 3, -1]), width=1, z=1)
+        self.assertAlmostEqual(result['delta sigma z [kPa]'][0], 17.52, 2)
+        self.assertAlmostEqual(
+            result['delta sigma x [kPa]'][1],
+            stressdistribution.stresses_rectangle(imposedstress=100, length=3, width=1, z=1)['delta sigma x [kPa]'],
+            10)
+        self.assertTrue(np.isnan(result['delta sigma z [kPa]'][2]))
+        result = stressdistribution.stresses_pointload_array(
+            pointload=100, z=1, r=np.array([0, 2]), poissonsratio=0.3)
+        self.assertAlmostEqual(result['delta sigma z [kPa]'][0], 47.75, 2)
+        self.assertAlmostEqual(result['delta sigma theta [kPa]'][0], 3.18, 2)
+        self.assertAlmostEqual(
+            result['delta sigma r [kPa]'][1],
+            stressdistribution.stresses_pointload(pointload=100, z=1, r=2, poissonsratio=0.3)['delta sigma r [kPa]'],
+            10)
+        result = stressdistribution.stresses_stripload_array(
+            z=1, x=np.array([1, 0.5, 2]), width=1, imposedstress=100, triangular=False)
+        self.assertAlmostEqual(result['delta sigma z [kPa]'][0], 40.92, 2)
+        self.assertAlmostEqual(
+            result['delta tau zx [kPa]'][1],
+            stressdistribution.stresses_stripload(z=1, x=0.5, width=1, imposedstress=100)['delta tau zx [kPa]'], 10)
+        result = stressdistribution.stresses_stripload_array(
+            z=np.array([1, 2]), x=1, width=1, imposedstress=100, triangular=True)
+        self.assertAlmostEqual(result['delta sigma x [kPa]'][0], 2.94, 2)
+        result = stressdistribution.stresses_circle_array(
+            z=np.array([0, 1]), footing_radius=1, imposedstress=100, poissonsratio=0.3)
+        self.assertAlmostEqual(result['delta sigma z [kPa]'][0], 100, 10)
+        self.assertAlmostEqual(result['delta sigma r [kPa]'][1], -86.17, 2)
+
+    def test_stress_field_rectangle(self):
+        result = stressdistribution.stress_field(x=0, y=0, z=1, rectangles=self.square)
+        self.assertAlmostEqual(
+            result['delta sigma z [kPa]'],
+            4 * stressdistribution.stresses_rectangle(imposedstress=100, length=1, width=1, z=1)['delta sigma z [kPa]'],
+            10)
+        # Stresses at the surface inside, at the edge, at the corner and outside the rectangle
+        result = stressdistribution.stress_field(
+            x=np.array([0, 1, 1, 2]), y=np.array([0, 0, 1, 0]), z=0, rectangles=self.square)
+        np.testing.assert_allclose(result['delta sigma z [kPa]'], [100, 50, 25, 0], atol=1e-10)
+
+    def test_stress_field_strip(self):
+        # A long rectangle reproduces the strip load solution
+        x = np.array([-0.5, 0.3, 2.0])
+        result = stressdistribution.stress_field(
+            x=x, y=0, z=1.5, rectangles={
+                'X [m]': [0, ], 'Y [m]': [0, ], 'Length x [m]': [2, ], 'Length y [m]': [1e5, ],
+                'Imposed stress [kPa]': [100, ]})
+        for i, _x in enumerate(x):
+            _strip = stressdistribution.stresses_stripload(z=1.5, x=_x + 1, width=2, imposedstress=100)
+            self.assertAlmostEqual(result['delta sigma z [kPa]'][i], _strip['delta sigma z [kPa]'], 6)
+            self.assertAlmostEqual(result['delta sigma x [kPa]'][i], _strip['delta sigma x [kPa]'], 6)
+
+    def test_stress_field_superposition(self):
+        rectangles = pd.DataFrame({
+            'X [m]': [0, 5, 2], 'Y [m]': [0, 1, 6], 'Length x [m]': [2, 3, 1], 'Length y [m]': [2, 1, 4],
+            'Imposed stress [kPa]': [100, 150, 80]})
+        pointloads = {'X [m]': [3, ], 'Y [m]': [3, ], 'Load [kN]': [500, ]}
+        x, y, z = np.meshgrid(np.linspace(-2, 8, 6), np.linspace(-2, 8, 5), np.linspace(0.5, 5, 4), indexing='ij')
+        result = stressdistribution.stress_field(x, y, z, rectangles=rectangles, pointloads=pointloads)
+        self.assertEqual(result['delta sigma z [kPa]'].shape, (6, 5, 4))
+        _sum = stressdistribution.stress_field(x, y, z, pointloads=pointloads)['delta sigma z [kPa]']
+        for i in range(3):
+            _sum = _sum + stressdistribution.stress_field(
+                x, y, z, rectangles=rectangles.iloc[i:i + 1])['delta sigma z [kPa]']
+        np.testing.assert_allclose(result['delta sigma z [kPa]'], _sum, rtol=1e-10)
+        _point = stressdistribution.stresses_pointload(
+            pointload=500, z=z[0, 0, 0], r=np.sqrt(50), poissonsratio=0.5)
+        self.assertAlmostEqual(
+            stressdistribution.stress_field(x[0, 0, 0], y[0, 0, 0], z[0, 0, 0], pointloads=pointloads)[
+                'delta sigma z [kPa]'], _point['delta sigma z [kPa]'], 10)
+        chunked = stressdistribution.stress_field(
+            x, y, z, rectangles=rectangles, pointloads=pointloads, max_chunk_size=10)
+        np.testing.assert_allclose(chunked['delta sigma x [kPa]'], result['delta sigma x [kPa]'], rtol=1e-12)
+        self.assertRaises(
+            ValueError, stressdistribution.stress_field, x=0, y=0, z=-1, rectangles=rectangles)
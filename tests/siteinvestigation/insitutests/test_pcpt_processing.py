@@ -374,4 +374,29 @@ class Test_AGSFile_reading(unittest.TestCase):
         )
         self.assertEqual(ags_pcpt.data['z [m]'].iloc[0], 0)
         self.assertEqual(ags_pcpt.data['z [m]'].iloc[1], 10)
-        self.assertEqual(ags_pcpt.data['qc [MPa]'].iloc[1], 2.955)
\ No newline at end of file
+        self.assertEqual(ags_pcpt.data['qc [MPa]'].iloc[1], 2.955)
+
+    def test_from_ags_multi(self):
+        cpts = pcpt_processing.PCPTProcessing.from_ags_multi(
+            os.path.join(TESTS_DATA_DIR, 'multi_location_scpt.ags'),
+            z_key="Depth [m]",
+            qc_key="qc [MN/m2]",
+            fs_key="fs [kN/m2]",
+            u2_key="u2 [kN/m2]",
+            push_key="Test reference or push number",
+            fs_multiplier=0.001, u2_multiplier=0.001,
+            verbose_keys=True, use_shorthands=True, srid=25831
+        )
+        self.assertEqual(list(cpts.keys()), ['WTG01', 'WTG02', 'WTG03'])
+        self.assertEqual(cpts['WTG01'].title, 'WTG01')
+        self.assertEqual(cpts['WTG01'].data['z [m]'].iloc[0], 0)
+        self.assertEqual(cpts['WTG01'].data['qc [MPa]'].iloc[1], 2.955)
+        self.assertAlmostEqual(cpts['WTG01'].data['fs [MPa]'].iloc[1], 0.015, 6)
+        self.assertEqual(cpts['WTG02'].data.__len__(), 4)
+        self.assertEqual(cpts['WTG02'].data['Push'].iloc[-1], 'CPT02')
+        self.assertEqual(cpts['WTG02'].easting, 503512.20)
+        self.assertEqual(cpts['WTG02'].northing, 5733102.91)
+        self.assertEqual(cpts['WTG02'].elevation, -27.35)
+        self.assertEqual(cpts['WTG02'].srid, 25831)
+        self.assertTrue(np.isnan(cpts['WTG03'].elevation))
+        self.assertEqual(cpts['WTG02'].additionaldata['SCPG'].__len__(), 2)
\ No newline at end of file